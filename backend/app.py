@@ -1,17 +1,42 @@
+"""Ocean Control Room API.
+
+Read endpoints (``/api/state``, ``/api/actors``, ``/api/coverage``, ``/api/chat``) are
+served from a per-root cache keyed by the mtimes/sizes of the files they are built from,
+so a GET on an unchanged project only stats a handful of files; concurrent viewers of one
+root share a single rebuild. Every JSON read carries an ``ETag`` and answers a matching
+``If-None-Match`` with 304. LLM-backed endpoints (``/api/chat`` POST, ``/api/ocean/turn``,
+``/api/jobs/plan``) run on their own small pool (``OCEAN_CONTROL_ROOM_LLM_WORKERS``,
+default 2) so slow advisor calls cannot starve the threadpool the reads use.
+
+``/api/events/stream`` pushes incremental activity (events, chat, actors, state diffs) as
+server-sent events; see ``ocean.activity_stream``.
+"""
+
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
 
-from ocean.actors import add_actor_skill, coverage_report, load_actors, save_actors, update_actor
+from ocean import chat_log
+from ocean.activity_stream import ActivityStream, Cursor, sse
+from ocean.actors import actor_store_path, add_actor_skill, coverage_report, load_actors, save_actors, update_actor
+from ocean.file_index import index_for
 from ocean.jobs import plan_jobs
-from ocean.product_chat import product_chat, recent_chat
+from ocean.product_chat import product_chat
 from ocean.product_loop import DOCTRINE_FILES, bootstrap_doctrine, record_feedback, turn
 
 
@@ -36,6 +61,100 @@ if STATIC_UI_DIR.exists():
     app.mount("/ui", StaticFiles(directory=str(STATIC_UI_DIR), html=True), name="ui")
 
 
+def _env_int(name: str, default: int) -> int:
+    raw = (os.getenv(name) or "").strip()
+    try:
+        v = int(raw)
+    except ValueError:
+        return default
+    return v if v > 0 else default
+
+
+_LLM_POOL = ThreadPoolExecutor(
+    max_workers=_env_int("OCEAN_CONTROL_ROOM_LLM_WORKERS", 2), thread_name_prefix="control-room-llm"
+)
+
+
+async def _offload(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a slow (LLM-backed) call on the dedicated pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_LLM_POOL, functools.partial(fn, *args, **kwargs))
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = (os.getenv(name) or "").strip()
+    try:
+        v = float(raw)
+    except ValueError:
+        return default
+    return v if v > 0 else default
+
+
+def _signature(paths: list[Path]) -> tuple[Any, ...]:
+    sig = []
+    for path in paths:
+        try:
+            st = path.stat()
+        except OSError:
+            sig.append(None)
+            continue
+        sig.append((st.st_mtime_ns, st.st_size))
+    return tuple(sig)
+
+
+def _encode(payload: Any) -> tuple[bytes, str]:
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return body, '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+
+
+class ReadCache:
+    """Encoded payloads keyed by (endpoint, root), valid while their source files are unchanged."""
+
+    def __init__(self) -> None:
+        # key -> (signature of deps, body, etag)
+        self._entries: dict[tuple[str, str], tuple[tuple[Any, ...], bytes, str]] = {}
+        self._locks: dict[tuple[str, str], threading.Lock] = {}
+        self._guard = threading.Lock()
+        self.builds = 0
+
+    def get(
+        self, key: tuple[str, str], deps: list[Path], build: Callable[[], Any]
+    ) -> tuple[bytes, str]:
+        hit = self._entries.get(key)
+        if hit is not None and hit[0] == _signature(deps):
+            return hit[1], hit[2]
+        with self._guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:  # one rebuild per key; other viewers wait for it instead of repeating it
+            sig = _signature(deps)
+            hit = self._entries.get(key)
+            if hit is not None and hit[0] == sig:
+                return hit[1], hit[2]
+            self.builds += 1
+            body, etag = _encode(build())
+            # Keep the pre-build signature: if the build itself wrote a dependency (doctrine
+            # bootstrap), the next request rebuilds once from the settled files.
+            self._entries[key] = (sig, body, etag)
+            return body, etag
+
+
+_read_cache = ReadCache()
+
+
+def _json_response(request: Request, body: bytes, etag: str) -> Response:
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def _cached(
+    request: Request, endpoint: str, root: Path, deps: list[Path], build: Callable[[], Any]
+) -> Response:
+    body, etag = await run_in_threadpool(_read_cache.get, (endpoint, str(root)), deps, build)
+    return _json_response(request, body, etag)
+
+
 class ProjectRequest(BaseModel):
     project_root: str = Field(default_factory=lambda: str(ROOT))
 
@@ -120,21 +239,31 @@ def healthz():
 
 
 @app.get("/api/state")
-def state(project_root: str = str(ROOT)):
+async def state(request: Request, project_root: str = str(ROOT)):
     root = _resolve_root(project_root)
-    bootstrap_doctrine(root)
-    return {
-        "project_root": str(root),
-        "actors": load_actors(root),
-        "coverage": coverage_report(root),
-        "doctrine": _read_doctrine(root),
-    }
+
+    def build() -> dict[str, Any]:
+        bootstrap_doctrine(root)
+        return {
+            "project_root": str(root),
+            "actors": load_actors(root),
+            "coverage": coverage_report(root),
+            "doctrine": _read_doctrine(root),
+        }
+
+    return await _cached(request, "state", root, _state_deps(root), build)
 
 
 @app.get("/api/actors")
-def actors(project_root: str = str(ROOT)):
+async def actors(request: Request, project_root: str = str(ROOT)):
     root = _resolve_root(project_root)
-    return {"project_root": str(root), "actors": load_actors(root)}
+    return await _cached(
+        request,
+        "actors",
+        root,
+        [actor_store_path(root)],
+        lambda: {"project_root": str(root), "actors": load_actors(root)},
+    )
 
 
 @app.put("/api/actors")
@@ -158,16 +287,23 @@ def create_actor_skill(actor_id: str, request: SkillRequest):
 
 
 @app.get("/api/coverage")
-def coverage(project_root: str = str(ROOT)):
+async def coverage(request: Request, project_root: str = str(ROOT)):
     root = _resolve_root(project_root)
-    return {"project_root": str(root), "coverage": coverage_report(root)}
+    return await _cached(
+        request,
+        "coverage",
+        root,
+        [actor_store_path(root)],
+        lambda: {"project_root": str(root), "coverage": coverage_report(root)},
+    )
 
 
 @app.post("/api/ocean/turn")
-def ocean_turn(request: TurnRequest):
+async def ocean_turn(request: TurnRequest):
     root = _resolve_root(request.project_root)
     try:
-        return turn(
+        return await _offload(
+            turn,
             root,
             user_turn=request.user_turn,
             feedback=request.feedback,
@@ -180,10 +316,11 @@ def ocean_turn(request: TurnRequest):
 
 
 @app.post("/api/jobs/plan")
-def jobs_plan(request: JobPlanRequest):
+async def jobs_plan(request: JobPlanRequest):
     root = _resolve_root(request.project_root)
     try:
-        return plan_jobs(
+        return await _offload(
+            plan_jobs,
             root,
             user_turn=request.user_turn,
             test_results=request.test_results,
@@ -210,20 +347,29 @@ def feedback(request: FeedbackRequest):
 
 
 @app.get("/api/chat")
-def chat_history(project_root: str = str(ROOT)):
+async def chat_history(request: Request, project_root: str = str(ROOT), limit: int = 40, before: str = ""):
+    """Latest ``limit`` entries; ``before`` (a previous ``next_before``) pages further back."""
     root = _resolve_root(project_root)
-    return {"project_root": str(root), "messages": recent_chat(root, limit=40)}
+
+    def build() -> dict[str, Any]:
+        return {"project_root": str(root), **chat_log.page(root, limit=limit, before=before or None)}
+
+    if before:
+        # Older pages never change; no need to keep them in the cache
+        return _json_response(request, *_encode(await run_in_threadpool(build)))
+    return await _cached(request, f"chat:{limit}", root, [chat_log.chat_path(root)], build)
 
 
 @app.post("/api/chat")
-def chat(request: ChatRequest):
+async def chat(request: ChatRequest):
     root = _resolve_root(request.project_root)
     shots = [
         shot.model_dump() if hasattr(shot, "model_dump") else shot.dict()
         for shot in request.screenshots
     ]
     try:
-        return product_chat(
+        return await _offload(
+            product_chat,
             root,
             request.message,
             screenshots=shots,
@@ -235,10 +381,37 @@ def chat(request: ChatRequest):
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
+@app.get("/api/events/stream")
+async def events_stream(request: Request, project_root: str = str(ROOT), last_event_id: str = ""):
+    """Server-sent activity stream; resumes from ``Last-Event-ID`` (header or query)."""
+    root = _resolve_root(project_root)
+    stream = ActivityStream(root, Cursor.decode(request.headers.get("last-event-id") or last_event_id))
+    poll = _env_float("OCEAN_STREAM_POLL", 1.0)
+    heartbeat = _env_float("OCEAN_STREAM_HEARTBEAT", 15.0)
+
+    async def body():
+        yield "retry: 3000\n\n"
+        quiet = 0.0
+        while not await request.is_disconnected():
+            messages = await run_in_threadpool(stream.poll)
+            for message in messages:
+                yield sse(message)
+            quiet = 0.0 if messages else quiet + poll
+            if quiet >= heartbeat:
+                yield ": keep-alive\n\n"
+                quiet = 0.0
+            await asyncio.sleep(poll)
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(body(), media_type="text/event-stream", headers=headers)
+
+
 @app.get("/api/files")
-def files(project_root: str = str(ROOT), limit: int = 160):
+async def files(request: Request, project_root: str = str(ROOT), limit: int = 160, offset: int = 0, prefix: str = ""):
     root = _resolve_root(project_root)
-    return {"project_root": str(root), "files": _file_tree(root, limit=limit)}
+    # The file index is already cached and mtime-refreshed; only the page is encoded here
+    page = await run_in_threadpool(index_for(root).query, prefix=prefix, offset=offset, limit=limit)
+    return _json_response(request, *_encode({"project_root": str(root), **page}))
 
 
 @app.post("/api/files/read")
@@ -278,8 +451,11 @@ def _resolve_root(project_root: str) -> Path:
     return root
 
 
+def _state_deps(root: Path) -> list[Path]:
+    return [actor_store_path(root), *(root / name for name in DOCTRINE_FILES)]
+
+
 def _read_doctrine(root: Path) -> dict[str, str]:
-    bootstrap_doctrine(root)
     result: dict[str, str] = {}
     for name in DOCTRINE_FILES:
         path = root / name
@@ -293,17 +469,3 @@ def _safe_child(root: Path, rel_path: str) -> Path:
     if root not in path.parents and path != root:
         raise HTTPException(status_code=400, detail="Path escapes project root")
     return path
-
-
-def _file_tree(root: Path, *, limit: int = 160) -> list[dict[str, Any]]:
-    ignored = {".git", ".ocean", "__pycache__", ".pytest_cache", "node_modules", "venv", ".venv", "logs", "dist", "build"}
-    files: list[dict[str, Any]] = []
-    for path in sorted(root.rglob("*")):
-        rel = path.relative_to(root)
-        if any(part in ignored for part in rel.parts):
-            continue
-        if path.is_file():
-            files.append({"path": str(rel), "size": path.stat().st_size})
-        if len(files) >= limit:
-            break
-    return files
@@ -0,0 +1,254 @@
+"""Incremental Control Room activity behind ``/api/events/stream`` (server-sent events).
+
+``ActivityStream(root, cursor).poll()`` returns what changed since ``cursor``:
+
+- ``event``: new lines of the project's newest ``logs/events-*.jsonl`` (by the session
+  timestamp in its name, so concurrent sessions writing their own logs don't flip it),
+  read from the last delivered ``seq`` with the event bus's index seek;
+- ``chat``: entries appended to ``.ocean/chat.jsonl`` past a segment and byte offset
+  (``chat_log`` numbering); after a rotation the rest of that segment comes from its
+  archive, then the live file from the start;
+- ``actors``: the actor list, when ``.ocean/actors.json`` changed;
+- ``state``: changed parts of the Control Room state (``coverage`` and individual doctrine
+  files; a deleted file maps to ``null``). A connection without a usable cursor starts
+  with one ``full`` snapshot.
+
+Every message carries the cursor *after* it as its SSE ``id``; a reconnecting client
+sends it back as ``Last-Event-ID`` and resumes without gaps or repeats. A poll where
+nothing changed costs a few ``stat`` calls.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from . import chat_log, event_bus
+from .actors import actor_store_path, coverage_report, load_actors
+from .product_loop import DOCTRINE_FILES
+
+DEFAULT_BACKLOG = 50  # events replayed to a fresh connection
+DEFAULT_BATCH = 200  # events per poll; the rest follow on the next one
+_SESSION_LOG = re.compile(r"events-(\d{8}-\d{6})\.jsonl")
+
+
+@dataclass
+class Cursor:
+    log: str = ""  # events file name the seq belongs to
+    seq: int = -1  # last delivered event seq
+    chat: int = -1  # byte offset into chat segment ``chat_seg`` (-1: not positioned yet)
+    state: str = ""  # digest of the last state the client has
+    chat_seg: int = 0  # chat_log.segments() number the offset belongs to
+
+    def encode(self) -> str:
+        return f"v2|{self.log}|{self.seq}|{self.chat_seg}:{self.chat}|{self.state}"
+
+    @classmethod
+    def decode(cls, raw: Optional[str]) -> Optional["Cursor"]:
+        parts = (raw or "").strip().split("|")
+        if len(parts) != 5 or parts[0] != "v2":
+            return None
+        seg, _, offset = parts[3].partition(":")
+        try:
+            return cls(parts[1], int(parts[2]), int(offset), parts[4], int(seg))
+        except ValueError:
+            return None
+
+
+def _log_key(name: str) -> tuple[int, str]:
+    """Sort key for events logs: session-stamped names by stamp, after any other name."""
+    m = _SESSION_LOG.fullmatch(name)
+    return (1, m.group(1)) if m else (0, "")
+
+
+def events_file(root: Path) -> Optional[Path]:
+    """Newest ``logs/events-*.jsonl`` under ``root`` (else ``OCEAN_EVENTS_FILE`` if it exists).
+
+    "Newest" is the latest session timestamp in the name; mtime only breaks ties between
+    logs without one, since every running session keeps touching its own log.
+    """
+    newest: Optional[tuple[tuple[int, str], float, Path]] = None
+    try:
+        for p in (root / "logs").glob("events-*.jsonl"):
+            try:
+                mtime = p.stat().st_mtime
+            except OSError:
+                continue
+            cand = (_log_key(p.name), mtime, p)
+            if newest is None or cand[:2] > newest[:2]:
+                newest = cand
+    except OSError:
+        pass
+    if newest is not None:
+        return newest[2]
+    env = os.getenv("OCEAN_EVENTS_FILE")
+    return Path(env) if env and Path(env).exists() else None
+
+
+def _signature(paths: list[Path]) -> tuple[Any, ...]:
+    sig = []
+    for path in paths:
+        try:
+            st = path.stat()
+        except OSError:
+            sig.append(None)
+            continue
+        sig.append((st.st_mtime_ns, st.st_size))
+    return tuple(sig)
+
+
+def _digest(data: Any) -> str:
+    return hashlib.sha1(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+class ActivityStream:
+    def __init__(self, root: Path, cursor: Optional[Cursor] = None, *, backlog: int = DEFAULT_BACKLOG) -> None:
+        self.root = Path(root)
+        self.fresh = cursor is None
+        self.cursor = cursor or Cursor()
+        self.backlog = backlog
+        self._sig: Optional[tuple[Any, ...]] = None
+        self._snapshot: Optional[dict[str, Any]] = None
+
+    def _message(self, kind: str, data: Any) -> dict[str, Any]:
+        return {"id": self.cursor.encode(), "type": kind, "data": data}
+
+    def poll(self, limit: int = DEFAULT_BATCH) -> list[dict[str, Any]]:
+        """Messages since the cursor, each ``{"id", "type", "data"}``; advances the cursor."""
+        out: list[dict[str, Any]] = []
+        self._poll_chat(out)
+        self._poll_state(out)
+        self._poll_events(out, limit)
+        self.fresh = False
+        return out
+
+    # --- events log ----------------------------------------------------------------
+
+    def _poll_events(self, out: list[dict[str, Any]], limit: int) -> None:
+        path = events_file(self.root)
+        if path is None:
+            return
+        if path.name != self.cursor.log and self.cursor.log and not self.fresh:
+            current = path.with_name(self.cursor.log)
+            if _log_key(path.name) <= _log_key(self.cursor.log) and current.exists():
+                path = current  # not strictly newer (e.g. another session's log): stay put
+        if path.name != self.cursor.log:
+            if self.fresh:
+                last = event_bus.last_seq(path)
+                start = 1 if last is None else max(1, last - self.backlog + 1)
+            else:
+                start = 1  # a newer session log appeared mid-stream: deliver all of it
+            self.cursor.log, self.cursor.seq = path.name, start - 1
+        sent = 0
+        for ev in event_bus.read(path, since_seq=self.cursor.seq + 1):
+            seq = ev.get("seq")
+            if not isinstance(seq, int) or seq <= self.cursor.seq:
+                continue
+            self.cursor.seq = seq
+            out.append(self._message("event", ev))
+            sent += 1
+            if sent >= limit:
+                break
+
+    # --- chat log ------------------------------------------------------------------
+
+    def _poll_chat(self, out: list[dict[str, Any]]) -> None:
+        path = chat_log.chat_path(self.root)
+        try:
+            st = path.stat()
+            size, ino = st.st_size, st.st_ino
+        except OSError:
+            size, ino = 0, None
+        # Listed after the stat: a rotation in between shows up as a new live segment
+        segs = chat_log.segments(path)
+        live = segs[-1][0]
+        if self.cursor.chat < 0:
+            # History comes from /api/chat; stream only what's new
+            self.cursor.chat_seg, self.cursor.chat = live, size
+            return
+        if self.cursor.chat_seg != live:
+            # Rotated since the cursor: the rest of its segment, any later archives, then live
+            for n, seg_path in segs[:-1]:
+                if n < self.cursor.chat_seg:
+                    continue
+                if n > self.cursor.chat_seg:
+                    self.cursor.chat_seg, self.cursor.chat = n, 0
+                self._read_chat(seg_path, out)
+            self.cursor.chat_seg, self.cursor.chat = live, 0
+        elif size < self.cursor.chat:
+            self.cursor.chat = 0  # truncated in place
+        if size > self.cursor.chat:
+            self._read_chat(path, out, ino)
+
+    def _read_chat(self, path: Path, out: list[dict[str, Any]], ino: Optional[int] = None) -> None:
+        try:
+            with open(path, "rb") as fh:
+                if ino is not None and os.fstat(fh.fileno()).st_ino != ino:
+                    return  # rotated since the stat; the next poll drains the archive first
+                fh.seek(self.cursor.chat)
+                data = fh.read()
+        except OSError:
+            return
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break  # partial line still being written
+            self.cursor.chat += len(line)
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(entry, dict):
+                out.append(self._message("chat", entry))
+
+    # --- actors / coverage / doctrine ---------------------------------------------
+
+    def _deps(self) -> list[Path]:
+        return [actor_store_path(self.root), *(self.root / name for name in DOCTRINE_FILES)]
+
+    def _build_snapshot(self) -> dict[str, Any]:
+        doctrine: dict[str, Optional[str]] = {}
+        for name in DOCTRINE_FILES:
+            try:
+                doctrine[name] = (self.root / name).read_text(encoding="utf-8", errors="ignore")
+            except OSError:
+                doctrine[name] = None
+        return {"actors": load_actors(self.root), "coverage": coverage_report(self.root), "doctrine": doctrine}
+
+    def _poll_state(self, out: list[dict[str, Any]]) -> None:
+        sig = _signature(self._deps())
+        if sig == self._sig:
+            return
+        # Keep the pre-build signature: if the build wrote the actor store, the next poll
+        # rebuilds once and finds nothing new
+        self._sig = sig
+        snapshot = self._build_snapshot()
+        digest = _digest(snapshot)
+        previous, self._snapshot = self._snapshot, snapshot
+        if digest == self.cursor.state:
+            return
+        self.cursor.state = digest
+        if previous is None:
+            doctrine = {k: v for k, v in snapshot["doctrine"].items() if v is not None}
+            out.append(self._message("state", {"full": True, **snapshot, "doctrine": doctrine}))
+            return
+        if snapshot["actors"] != previous["actors"]:
+            out.append(self._message("actors", {"actors": snapshot["actors"]}))
+        diff: dict[str, Any] = {"full": False}
+        if snapshot["coverage"] != previous["coverage"]:
+            diff["coverage"] = snapshot["coverage"]
+        changed = {k: v for k, v in snapshot["doctrine"].items() if previous["doctrine"].get(k) != v}
+        if changed:
+            diff["doctrine"] = changed
+        if len(diff) > 1:
+            out.append(self._message("state", diff))
+
+
+def sse(message: dict[str, Any]) -> str:
+    """One message in ``text/event-stream`` framing."""
+    data = json.dumps(message["data"], ensure_ascii=False, separators=(",", ":"))
+    return f"id: {message['id']}\nevent: {message['type']}\ndata: {data}\n\n"
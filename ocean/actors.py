@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import json
+import os
+import threading
 from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import Any
@@ -81,15 +83,27 @@ def actor_store_path(project_root: str | Path | None = None) -> Path:
     return root / ".ocean" / "actors.json"
 
 
+# path -> ((mtime_ns, size), file text, merged actors). Reads are lock-free: a hit only
+# needs a stat, and entries are replaced whole. Writers serialize on _WRITE_LOCK.
+_CACHE: dict[Path, tuple[tuple[int, int], str, list[dict[str, Any]]]] = {}
+_WRITE_LOCK = threading.Lock()
+
+
 def load_actors(project_root: str | Path | None = None) -> list[dict[str, Any]]:
+    """Current actors; only touches disk when the store is missing or needs normalizing."""
     path = actor_store_path(project_root)
+    key = _stat_key(path)
+    hit = _CACHE.get(path)
+    if hit is not None and key is not None and hit[0] == key:
+        return _copy(hit[2])
     default = [asdict(actor) for actor in DEFAULT_ACTORS]
-    if not path.exists():
+    if key is None:
         return save_actors(default, project_root)
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
+        raw = path.read_text(encoding="utf-8")
+        data = json.loads(raw)
     except Exception:
-        data = default
+        raw, data = "", default
     if not isinstance(data, list):
         data = default
 
@@ -110,15 +124,32 @@ def load_actors(project_root: str | Path | None = None) -> list[dict[str, Any]]:
                 }
             )
         )
-    return save_actors(merged[:5], project_root)
+    merged = merged[:5]
+    if _dumps(merged) != raw:
+        return save_actors(merged, project_root)
+    _CACHE[path] = (key, raw, merged)
+    return _copy(merged)
 
 
 def save_actors(actors: list[dict[str, Any]], project_root: str | Path | None = None) -> list[dict[str, Any]]:
     path = actor_store_path(project_root)
-    path.parent.mkdir(parents=True, exist_ok=True)
     normalized = [_normalize_actor(actor) for actor in actors[:5]]
-    path.write_text(json.dumps(normalized, indent=2) + "\n", encoding="utf-8")
-    return normalized
+    text = _dumps(normalized)
+    with _WRITE_LOCK:
+        try:
+            unchanged = path.read_text(encoding="utf-8") == text
+        except OSError:
+            unchanged = False
+        if not unchanged:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Replace atomically so lock-free readers never see a half-written file
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(text, encoding="utf-8")
+            os.replace(tmp, path)
+        key = _stat_key(path)
+        if key is not None:
+            _CACHE[path] = (key, text, normalized)
+    return _copy(normalized)
 
 
 def update_actor(actor_id: str, patch: dict[str, Any], project_root: str | Path | None = None) -> dict[str, Any]:
@@ -171,6 +202,23 @@ def coverage_report(project_root: str | Path | None = None) -> dict[str, Any]:
     }
 
 
+def _stat_key(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _dumps(actors: list[dict[str, Any]]) -> str:
+    return json.dumps(actors, indent=2) + "\n"
+
+
+def _copy(actors: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Callers mutate what they get back (update_actor, add_actor_skill); never hand out cached lists."""
+    return [{**actor, "skills": list(actor["skills"]), "tools": list(actor["tools"])} for actor in actors]
+
+
 def _normalize_actor(actor: dict[str, Any]) -> dict[str, Any]:
     actor_id = str(actor.get("id") or actor.get("name") or "actor").strip().lower().replace(" ", "-")
     return {
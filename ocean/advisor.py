@@ -9,7 +9,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
-import httpx
+from . import llm_transport, rate_limiter
+from .json_extract import extract_json
 
 
 @dataclass(frozen=True)
@@ -141,7 +142,9 @@ def _run_codex_advisor(prompt: str, *, cwd: Path, timeout: int) -> AdvisorResult
         "read-only",
         prompt,
     ]
-    proc = subprocess.run(cmd, capture_output=True, text=True, cwd=str(cwd), timeout=timeout, check=False)
+    with rate_limiter.acquire("codex") as lease:
+        proc = subprocess.run(cmd, capture_output=True, text=True, cwd=str(cwd), timeout=timeout, check=False)
+        lease.report_output((proc.stderr or "") if proc.returncode else "", proc.returncode)
     text = (proc.stdout or proc.stderr or "").strip()
     if not text:
         text = f"codex advisor exited {proc.returncode} without output"
@@ -168,8 +171,8 @@ def _run_openai_chat_advisor(prompt: str, *, cwd: Path, timeout: int) -> Advisor
         ],
         "temperature": 0.3,
     }
-    resp = httpx.post(
-        "https://api.openai.com/v1/chat/completions",
+    resp = llm_transport.post(
+        llm_transport.url("openai", "/v1/chat/completions"),
         headers={"Authorization": f"Bearer {key}", "Content-Type": "application/json"},
         json=body,
         timeout=timeout,
@@ -187,7 +190,7 @@ def _run_gemini_chat_advisor(prompt: str, *, cwd: Path, timeout: int) -> Advisor
     from .backends import get_gemini_model
 
     model = get_gemini_model(cwd).strip()
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+    url = llm_transport.url("gemini", f"/v1beta/models/{model}:generateContent")
     body: dict[str, Any] = {
         "systemInstruction": {
             "parts": [
@@ -199,7 +202,7 @@ def _run_gemini_chat_advisor(prompt: str, *, cwd: Path, timeout: int) -> Advisor
         "contents": [{"role": "user", "parts": [{"text": prompt}]}],
         "generationConfig": {"temperature": 0.3},
     }
-    resp = httpx.post(
+    resp = llm_transport.post(
         url,
         headers={"Content-Type": "application/json", "x-goog-api-key": key},
         json=body,
@@ -223,12 +226,4 @@ def _run_gemini_chat_advisor(prompt: str, *, cwd: Path, timeout: int) -> Advisor
 
 
 def _extract_json(text: str) -> dict[str, Any] | None:
-    start = text.find("{")
-    end = text.rfind("}")
-    if start == -1 or end <= start:
-        return None
-    try:
-        data = json.loads(text[start : end + 1])
-    except Exception:
-        return None
-    return data if isinstance(data, dict) else None
+    return extract_json(text)
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Iterable, List
+from typing import Dict, Iterable, List, Optional
 import subprocess
 import sys
 import os
@@ -51,6 +51,8 @@ class AgentBase:
     name: str
     role: str
     tools: list[str] = field(default_factory=list)
+    # Codegen results fetched ahead by a batched request, keyed by CodegenJob.key
+    _prefetched: Dict[str, Optional[Dict[str, str]]] = field(default_factory=dict, repr=False)
 
     def introduce(self) -> str:
         info = f"{self.name}: {self.role}"
@@ -77,6 +79,20 @@ class AgentBase:
         """Execute tasks using Codex MCP - to be implemented by subclasses"""
         return list(tasks)
 
+    def batchable(self, task: Task) -> bool:
+        """Whether ``task``'s codegen may share one request with this agent's other batchable tasks."""
+        return False
+
+    def _prefetch_codegen(self, jobs: list[codex_exec.CodegenJob], bundle: Path) -> None:
+        """Run several codegen jobs as one batched request; ``_codegen`` consumes the results."""
+        self._prefetched.update(codex_exec.generate_batch(jobs, bundle, agent=self.name))
+
+    def _codegen(self, job: codex_exec.CodegenJob, bundle: Path) -> Optional[Dict[str, str]]:
+        """Prefetched result for ``job`` if a batch already ran it, else a single request."""
+        if job.key in self._prefetched:
+            return self._prefetched.pop(job.key)
+        return codex_exec.generate_files(job.instruction, job.files, bundle, agent=self.name)
+
 
 class Moroni(AgentBase):
     def __init__(self) -> None:
@@ -122,6 +138,7 @@ class Moroni(AgentBase):
                     description="Create CLI architecture and user interaction design",
                     owner=self.name,
                     files_touched=["docs/architecture.md", "docs/cli_design.md"],
+                    inputs=["docs/prd.md", "docs/project.json"],
                 )
             ]
         elif spec.kind == "web":
@@ -131,6 +148,7 @@ class Moroni(AgentBase):
                     description="Create frontend/backend architecture and data flow",
                     owner=self.name,
                     files_touched=["docs/architecture.md", "docs/api_design.md"],
+                    inputs=["docs/prd.md", "docs/project.json"],
                 )
             ]
         else:
@@ -140,6 +158,7 @@ class Moroni(AgentBase):
                     description="Create appropriate architecture for project type",
                     owner=self.name,
                     files_touched=["docs/architecture.md"],
+                    inputs=["docs/prd.md", "docs/project.json"],
                 )
             ]
 
@@ -269,6 +288,7 @@ class Q(AgentBase):
                     description="Implement core application functionality and CLI interface",
                     owner=self.name,
                     files_touched=["main.py", "game.py", "cli.py"],
+                    inputs=["docs/architecture.md", "docs/cli_design.md"],
                 )
             ]
         elif spec.kind == "web":
@@ -278,6 +298,7 @@ class Q(AgentBase):
                     description="Implement FastAPI backend with endpoints",
                     owner=self.name,
                     files_touched=["backend/app.py", "backend/models.py"],
+                    inputs=["docs/architecture.md", "docs/api_design.md"],
                 )
             ]
         else:
@@ -287,6 +308,7 @@ class Q(AgentBase):
                     description="Implement core application logic",
                     owner=self.name,
                     files_touched=["app.py"],
+                    inputs=["docs/architecture.md"],
                 )
             ]
 
@@ -519,6 +541,7 @@ class Edna(AgentBase):
                     description="Design terminal-based user interface and interaction patterns",
                     owner=self.name,
                     files_touched=["docs/cli_design.md", "docs/ux_patterns.md"],
+                    inputs=["docs/prd.md"],
                 )
             ]
         elif spec.kind == "web":
@@ -528,6 +551,7 @@ class Edna(AgentBase):
                     description="Design web-based user interface and user experience",
                     owner=self.name,
                     files_touched=["ui/index.html", "ui/styles.css", "docs/design_system.md"],
+                    inputs=["docs/architecture.md", "docs/api_design.md"],
                 )
             ]
         else:
@@ -537,6 +561,7 @@ class Edna(AgentBase):
                     description="Design appropriate user interface for project type",
                     owner=self.name,
                     files_touched=["docs/interface_design.md"],
+                    inputs=["docs/architecture.md"],
                 )
             ]
 
@@ -688,6 +713,37 @@ class Mario(AgentBase):
         self.last_ui_url: str | None = None
         self.last_runtime_summary: str | None = None
 
+    # Title fragment -> codegen job key for the tasks that can share one request
+    _CODEGEN_TASKS = {"ci workflow": "ci", "dockerfile": "docker", "deployment config": "deploy"}
+
+    def _job_key(self, task: Task) -> str | None:
+        title = task.title.lower()
+        return next((k for frag, k in self._CODEGEN_TASKS.items() if frag in title), None)
+
+    def batchable(self, task: Task) -> bool:
+        return self._job_key(task) is not None
+
+    def _codegen_jobs(self, spec: ProjectSpec) -> dict[str, codex_exec.CodegenJob]:
+        return {
+            "ci": codex_exec.CodegenJob(
+                "ci",
+                "Generate a GitHub Actions CI workflow for Python 3.11 running pytest and basic lint. "
+                "Save as .github/workflows/ci.yml.",
+                [".github/workflows/ci.yml"],
+            ),
+            "docker": codex_exec.CodegenJob(
+                "docker",
+                f"Generate Dockerfile and .dockerignore for a FastAPI app named '{spec.name}'. "
+                "Expose 8000 and run uvicorn backend.app:app.",
+                ["Dockerfile", ".dockerignore"],
+            ),
+            "deploy": codex_exec.CodegenJob(
+                "deploy",
+                f"Generate devops/deploy.yaml for a {spec.name} FastAPI app with /healthz health endpoint.",
+                ["devops/deploy.yaml"],
+            ),
+        }
+
     def propose_tasks(self, spec: ProjectSpec) -> list[Task]:
         """Propose DevOps tasks based on project type"""
         tasks = [
@@ -696,12 +752,14 @@ class Mario(AgentBase):
                 description="Compress project context and write docs/context_summary.md",
                 owner=self.name,
                 files_touched=["docs/context_summary.md"],
+                inputs=["docs/prd.md", "docs/architecture.md"],
             ),
             Task(
                 title="Add CI workflow",
                 description="Set up automated testing and quality checks",
                 owner=self.name,
                 files_touched=[".github/workflows/ci.yml"],
+                inputs=["docs/architecture.md"],
             )
         ]
         
@@ -712,18 +770,21 @@ class Mario(AgentBase):
                     description="Containerize application for deployment",
                     owner=self.name,
                     files_touched=["Dockerfile", ".dockerignore"],
+                    inputs=["backend/*", "ui/*", "*.py", "requirements.txt"],
                 ),
                 Task(
                     title="Create deployment config",
                     description="Set up deployment configuration for cloud platforms",
                     owner=self.name,
                     files_touched=["devops/deploy.yaml"],
+                    inputs=["Dockerfile"],
                 ),
                 Task(
                     title="Start local runtime",
                     description="Launch local backend (and UI if present) and print URL",
                     owner=self.name,
                     files_touched=[],
+                    inputs=["backend/*", "ui/*"],
                 ),
             ])
         
@@ -732,6 +793,12 @@ class Mario(AgentBase):
     def execute(self, tasks: Iterable[Task], spec: ProjectSpec) -> List[Task]:
         """Mario executes DevOps tasks using Codex MCP"""
         MCP.start_for_agent(self.name, Path("logs"))
+        tasks = list(tasks)
+        keys = [k for k in (self._job_key(t) for t in tasks) if k]
+        if len(keys) > 1 and codex_exec.available():
+            # One request (and one context-bundle upload) for all of this batch's codegen
+            jobs = self._codegen_jobs(spec)
+            self._prefetch_codegen([jobs[k] for k in keys], ctx.build_context_bundle(spec))
         executed = []
         for task in tasks:
             if "codegen context" in task.title.lower():
@@ -758,55 +825,13 @@ class Mario(AgentBase):
     def _prepare_codegen_context(self) -> Path:
         """Create a compressed context summary for codex exec prompts.
 
-        Writes docs/context_summary.md with:
-        - project.json, backlog.json, plan.md (truncated)
-        - prd.md (truncated)
+        Writes docs/context_summary.md (via the cached ``context`` builder) within the
+        ``OCEAN_CONTEXT_TOKENS`` budget:
+        - project.json, backlog.json, plan.md, prd.md (each capped to a budget share)
         - repo tree (depth<=3)
-        - samples of backend/ui/docs files
+        - backend/ui/docs samples, newest first; large files outlined to signatures
         """
-        root = Path('.')
-        docs = Path('docs')
-        docs.mkdir(exist_ok=True)
-        out = docs / 'context_summary.md'
-        lines: list[str] = []
-        def add_file(label: str, p: Path, limit: int = 8000):
-            if p.exists():
-                try:
-                    lines.append(f'## {label}')
-                    lines.append(p.read_text(encoding='utf-8')[:limit])
-                except Exception:
-                    pass
-        add_file('project.json', docs / 'project.json', 6000)
-        add_file('backlog.json', docs / 'backlog.json', 6000)
-        add_file('plan.md', docs / 'plan.md', 6000)
-        add_file('prd.md (truncated)', docs / 'prd.md', 8000)
-        lines.append('## repository tree (depth=3)')
-        for base in ['.', 'backend', 'ui', 'devops', 'docs']:
-            p = Path(base)
-            if not p.exists():
-                continue
-            lines.append(f'# {base}')
-            for path in sorted(p.rglob('*')):
-                try:
-                    rel = path.relative_to(root)
-                    if len(rel.parts) > 3 or path.is_dir():
-                        continue
-                    lines.append(str(rel))
-                except Exception:
-                    continue
-        lines.append('## file samples (truncated)')
-        for base in ['backend', 'ui', 'docs']:
-            p = Path(base)
-            if not p.exists():
-                continue
-            for f in sorted(p.rglob('*')):
-                if f.is_file() and f.suffix in {'.py', '.md', '.json', '.yml', '.yaml', '.html', '.css'}:
-                    try:
-                        lines.append(f'### {f}')
-                        lines.append(f.read_text(encoding='utf-8')[:4000])
-                    except Exception:
-                        pass
-        out.write_text('\n\n'.join(lines) + '\n', encoding='utf-8')
+        out = ctx.build_context_summary()
         from .feed import agent_say as _say
         _say("Mario", f'"Prepared codegen context: {out}"')
         return out
@@ -823,11 +848,7 @@ class Mario(AgentBase):
             if verbose:
                 from .feed import agent_say as _say
                 _say("Mario", f'"{_context_msg(bundle)}"')
-            instruction = (
-                "Generate a GitHub Actions CI workflow for Python 3.11 running pytest and basic lint. "
-                "Save as .github/workflows/ci.yml."
-            )
-            files = codex_exec.generate_files(instruction, [".github/workflows/ci.yml"], bundle, agent=self.name)
+            files = self._codegen(self._codegen_jobs(spec)["ci"], bundle)
             if files:
                 for rel, content in files.items():
                     Path(rel).parent.mkdir(parents=True, exist_ok=True)
@@ -892,11 +913,7 @@ jobs:
             if verbose:
                 from .feed import agent_say as _say
                 _say("Mario", f'"{_context_msg(bundle)}"')
-            instruction = (
-                f"Generate Dockerfile and .dockerignore for a FastAPI app named '{spec.name}'. "
-                "Expose 8000 and run uvicorn backend.app:app."
-            )
-            files = codex_exec.generate_files(instruction, ["Dockerfile", ".dockerignore"], bundle, agent=self.name)
+            files = self._codegen(self._codegen_jobs(spec)["docker"], bundle)
             if files:
                 for rel, content in files.items():
                     Path(rel).parent.mkdir(parents=True, exist_ok=True)
@@ -941,10 +958,7 @@ jobs:
             if verbose:
                 from .feed import agent_say as _say
                 _say("Mario", f'"{_context_msg(bundle)}"')
-            instruction = (
-                f"Generate devops/deploy.yaml for a {spec.name} FastAPI app with /healthz health endpoint."
-            )
-            files = codex_exec.generate_files(instruction, ["devops/deploy.yaml"], bundle, agent=self.name)
+            files = self._codegen(self._codegen_jobs(spec)["deploy"], bundle)
             if files:
                 for rel, content in files.items():
                     Path(rel).parent.mkdir(parents=True, exist_ok=True)
@@ -1125,6 +1139,7 @@ class Tony(AgentBase):
                 description="Execute pytest (if present) and record a concise report",
                 owner=self.name,
                 files_touched=["docs/test_report.md"],
+                inputs=["*"],
             )
         ]
 
@@ -1141,26 +1156,27 @@ class Tony(AgentBase):
         return executed
 
     def _run_tests_and_report(self) -> None:
-        """Run pytest -q if available; write docs/test_report.md.
+        """Run pytest once (parallel when possible); write docs/test_report.md.
 
-        If pytest is not available or no tests exist, generate a simple exploratory note.
+        Counts and failures also go to the events stream. If pytest cannot run,
+        generate a simple exploratory note.
         """
         docs = Path("docs")
         docs.mkdir(exist_ok=True)
         report = docs / "test_report.md"
-        import subprocess
-        import sys
-        lines: list[str] = ["# Test Report", "", f"Generated: {datetime.now().isoformat()}", ""]
+        from .events_emit import emit_event
+        from .pytest_runner import format_report, run_pytest
+
+        generated = datetime.now().isoformat()
         try:
-            code = subprocess.call([sys.executable, "-m", "pytest", "-q"], stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
-            # Rerun capturing output for report
-            out = subprocess.run([sys.executable, "-m", "pytest", "-q"], capture_output=True, text=True)
-            lines.append("## Pytest Output\n")
-            lines.append("````\n" + (out.stdout or '') + (out.stderr or '') + "\n````")
-            lines.append("")
-            lines.append(f"Exit code: {code}")
+            run = run_pytest(Path.cwd())
         except Exception as e:
+            lines = ["# Test Report", "", f"Generated: {generated}", ""]
             lines.append("## Exploratory\n")
             lines.append(f"Pytest not available or failed to run: {e}")
             lines.append("Performed smoke checks and manual interactions.")
-        report.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            report.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            emit_event("tests", agent=self.name, ok=False, error=str(e))
+            return
+        report.write_text(format_report(run, generated), encoding="utf-8")
+        emit_event("tests", agent=self.name, ok=run.exit_code in (0, 5), report=str(report), **run.summary())
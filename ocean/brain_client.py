@@ -7,8 +7,7 @@ import os
 from pathlib import Path
 from typing import Any
 
-import httpx
-
+from . import llm_transport
 from .backends import get_codegen_backend, get_gemini_model, get_openai_model
 
 
@@ -70,8 +69,8 @@ def _openai_brain(*, cwd: Path, timeout: float) -> str | None:
         {"role": "user", "content": _brain_user_prompt(cwd)},
     ]
     body: dict[str, Any] = {"model": api_model, "messages": messages, "temperature": 0.3}
-    resp = httpx.post(
-        "https://api.openai.com/v1/chat/completions",
+    resp = llm_transport.post(
+        llm_transport.url("openai", "/v1/chat/completions"),
         headers=headers,
         json=body,
         timeout=timeout,
@@ -86,7 +85,7 @@ def _gemini_brain(*, cwd: Path, timeout: float, api_key: str | None = None) -> s
     if not key:
         return None
     model = get_gemini_model(cwd).strip()
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+    url = llm_transport.url("gemini", f"/v1beta/models/{model}:generateContent")
     headers = {"Content-Type": "application/json", "x-goog-api-key": key}
     body: dict[str, Any] = {
         "systemInstruction": {
@@ -99,7 +98,7 @@ def _gemini_brain(*, cwd: Path, timeout: float, api_key: str | None = None) -> s
         "contents": [{"role": "user", "parts": [{"text": _brain_user_prompt(cwd)}]}],
         "generationConfig": {"temperature": 0.3},
     }
-    resp = httpx.post(url, headers=headers, json=body, timeout=timeout)
+    resp = llm_transport.post(url, headers=headers, json=body, timeout=timeout)
     data = resp.json()
     if resp.status_code >= 400:
         err = data.get("error") if isinstance(data.get("error"), dict) else {}
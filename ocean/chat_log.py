@@ -0,0 +1,175 @@
+"""Product chat log (``.ocean/chat.jsonl``): rotated appends and tail-seek reads.
+
+``recent_chat`` used to read and JSON-parse the whole file to return its last few
+entries, and nothing bounded the file. Reads now walk backwards from the end in
+``_BLOCK``-sized chunks and parse only the lines they return, so the cost follows the
+page size, not the log's age.
+
+Rotation: once the live file passes ``OCEAN_CHAT_MAX_MB`` (default 8) the next append
+renames it to ``chat.jsonl.<n>`` and starts a fresh one; ``OCEAN_CHAT_KEEP`` (default
+10) archives are kept. Appends and rotation run under an ``flock`` on
+``chat.jsonl.lock``.
+
+Pagination: ``page()`` returns entries oldest-first plus a ``next_before`` cursor
+(``"<segment>:<offset>"``) that ``page(before=...)`` continues from, across archives.
+The live file's segment number is the one it gets when rotated, so cursors stay valid.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+try:  # POSIX only; elsewhere appends stay unlocked
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+_BLOCK = 16 * 1024
+
+
+def _env_num(name: str, default: float) -> float:
+    raw = (os.getenv(name) or "").strip()
+    try:
+        v = float(raw)
+    except ValueError:
+        return default
+    return v if v > 0 else default
+
+
+def chat_path(root: Path) -> Path:
+    return root / ".ocean" / "chat.jsonl"
+
+
+def _archives(path: Path) -> list[tuple[int, Path]]:
+    pat = re.compile(re.escape(path.name) + r"\.(\d+)$")
+    out: list[tuple[int, Path]] = []
+    try:
+        names = os.listdir(path.parent)
+    except OSError:
+        return out
+    for name in names:
+        m = pat.match(name)
+        if m:
+            out.append((int(m.group(1)), path.parent / name))
+    return sorted(out)
+
+
+def segments(path: Path) -> list[tuple[int, Path]]:
+    """(segment number, path) oldest → newest; the live file is numbered last archive + 1."""
+    segs = _archives(path)
+    live = (segs[-1][0] if segs else 0) + 1
+    return segs + [(live, path)]
+
+
+@contextmanager
+def _locked(path: Path) -> Iterator[None]:
+    if fcntl is None:
+        yield
+        return
+    with open(path.with_name(path.name + ".lock"), "a") as fh:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+def _rotate(path: Path) -> None:
+    segs = segments(path)
+    os.replace(path, path.with_name(f"{path.name}.{segs[-1][0]}"))
+    keep = int(_env_num("OCEAN_CHAT_KEEP", 10))
+    archives = _archives(path)
+    for _, old in archives[: max(0, len(archives) - keep)]:
+        try:
+            old.unlink()
+        except OSError:
+            pass
+
+
+def append(root: Path, entry: dict[str, Any]) -> None:
+    path = chat_path(root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps(entry) + "\n"
+    with _locked(path):
+        try:
+            size = path.stat().st_size
+        except OSError:
+            size = 0
+        if size and size + len(line) > _env_num("OCEAN_CHAT_MAX_MB", 8) * 1024 * 1024:
+            _rotate(path)
+        with path.open("a", encoding="utf-8") as handle:
+            handle.write(line)
+
+
+def _tail(path: Path, end: Optional[int], want: int) -> list[tuple[int, bytes]]:
+    """Up to ``want`` complete lines ending before byte ``end`` (None: EOF), with offsets."""
+    try:
+        fh = open(path, "rb")
+    except OSError:
+        return []
+    with fh:
+        if end is None:
+            end = os.fstat(fh.fileno()).st_size
+        pos, buf = end, b""
+        while pos > 0 and buf.count(b"\n") <= want:
+            step = min(_BLOCK, pos)
+            pos -= step
+            fh.seek(pos)
+            buf = fh.read(step) + buf
+    buf = buf[: buf.rfind(b"\n") + 1]  # a trailing partial line is still being written
+    start = buf.find(b"\n") + 1 if pos > 0 else 0  # the first piece may start mid-line
+    out: list[tuple[int, bytes]] = []
+    offset = pos + start
+    for line in buf[start:].splitlines(keepends=True):
+        out.append((offset, line))
+        offset += len(line)
+    return out[-want:] if want else []
+
+
+def _parse_cursor(before: Optional[str]) -> Optional[tuple[int, int]]:
+    if not before:
+        return None
+    seg, _, offset = str(before).partition(":")
+    try:
+        return int(seg), int(offset)
+    except ValueError:
+        return None
+
+
+def page(root: Path, *, limit: int = 40, before: Optional[str] = None) -> dict[str, Any]:
+    """``{"messages": [...oldest first], "next_before": cursor | None}``."""
+    path = chat_path(root)
+    segs = segments(path)
+    cursor = _parse_cursor(before)
+    idx, end = len(segs) - 1, None
+    if cursor is not None:
+        ids = [n for n, _ in segs]
+        if cursor[0] not in ids:
+            return {"messages": [], "next_before": None}  # pruned or unknown
+        idx, end = ids.index(cursor[0]), cursor[1]
+    found: list[tuple[int, int, dict[str, Any]]] = []  # newest first
+    while idx >= 0 and len(found) < max(0, limit):
+        seg, seg_path = segs[idx]
+        lines = _tail(seg_path, end, limit - len(found))
+        for offset, line in reversed(lines):
+            try:
+                data = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(data, dict):
+                found.append((seg, offset, data))
+        if lines and lines[0][0] > 0:
+            end = lines[0][0]
+        else:
+            idx, end = idx - 1, None
+    found.reverse()
+    more = bool(found) and (found[0][1] > 0 or any(n < found[0][0] for n, _ in segs))
+    return {
+        "messages": [data for _, _, data in found],
+        "next_before": f"{found[0][0]}:{found[0][1]}" if more else None,
+    }
@@ -3,13 +3,14 @@ from __future__ import annotations
 
 import json
 import os
-import re
 import shutil
 import subprocess
 from pathlib import Path
 from typing import Optional, Dict
 
+from . import rate_limiter
 from .feed import feed as _feed
+from .json_extract import extract_json, is_file_map
 
 
 class ClaudeUnavailable(Exception):
@@ -34,41 +35,17 @@ def _extract_json(text: str) -> Optional[Dict[str, str]]:
         if isinstance(obj, dict):
             # Handle claude --output-format json wrapper: {"result": "...", ...}
             if "result" in obj and isinstance(obj["result"], str):
-                inner = obj["result"].strip()
-                # Strip markdown code fence if present
-                inner = re.sub(r"^```[a-z]*\n?", "", inner)
-                inner = re.sub(r"\n?```$", "", inner.strip())
-                try:
-                    obj2 = json.loads(inner)
-                    if isinstance(obj2, dict) and all(isinstance(v, str) for v in obj2.values()):
-                        return obj2
-                except Exception:
-                    pass
+                inner = extract_json(obj["result"], is_file_map, require_match=True)
+                if inner:
+                    return inner  # type: ignore[return-value]
             # Direct file map
             if all(isinstance(v, str) for v in obj.values()):
                 return obj
     except Exception:
         pass
 
-    # Try to find a JSON block in the output
-    for m in re.finditer(r"```(?:json)?\s*(\{[\s\S]*?\})\s*```", text):
-        try:
-            obj = json.loads(m.group(1))
-            if isinstance(obj, dict) and all(isinstance(v, str) for v in obj.values()):
-                return obj
-        except Exception:
-            continue
-
-    # Last resort: find any { } block
-    for m in re.finditer(r"(\{[\s\S]*\})", text):
-        try:
-            obj = json.loads(m.group(1))
-            if isinstance(obj, dict) and all(isinstance(v, str) for v in obj.values()):
-                return obj
-        except Exception:
-            continue
-
-    return None
+    # Fenced ```json blocks, banners and prose: first file map in a single pass
+    return extract_json(text, is_file_map, require_match=True)  # type: ignore[return-value]
 
 
 def generate_files(
@@ -113,13 +90,17 @@ def generate_files(
         _feed("🌊 Ocean: Dispatching to Claude CLI…")
 
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            cwd=str(Path.cwd()),
-        )
+        with rate_limiter.acquire("claude") as lease:
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+                cwd=str(Path.cwd()),
+            )
+            # Only a failed run's output is checked; generated code may mention rate limits
+            failed = (result.stderr or "") + (result.stdout or "") if result.returncode else ""
+            lease.report_output(failed, result.returncode)
     except subprocess.TimeoutExpired:
         _feed("🌊 Ocean: Claude CLI timed out.")
         return None
@@ -14,19 +14,11 @@ from typing import Optional
 
 import typer
 from click.exceptions import Abort
-from rich import print as rprint
-from rich.console import Console
-from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.prompt import Prompt, Confirm
 
 from . import __version__
-from .agents import default_agents
 from .models import ProjectSpec
-from .planner import generate_backlog, execute_backlog
 from .mcp import MCP
 from . import context as ctx
-from . import codex_exec
 from .persona import agent_voice_skills_chat_lines, crew_cards_plain_text, voice_brief
 from .feed import feed as feed_line, you_say, agent_say as feed_agent_say
 from .personas import AGENT_EMOJI, CREW_SUMMARY
@@ -42,8 +34,8 @@ from .backends import (
     set_codegen_backend_env,
 )
 from .dotenv_merge import merge_dotenv_assignments
-from .events_emit import emit_setup
-from .runtime import format_status_text, ingest_message, run_cycle
+from .events_emit import emit_event, emit_setup
+from .runtime import format_status_text, ingest_message
 from . import token_budget
 
 
@@ -58,22 +50,45 @@ def _is_test_env() -> bool:
 def _external_startup_disabled() -> bool:
     return _is_test_env() or os.getenv("OCEAN_DISABLE_CODEX") in ("1", "true", "True")
 
-console = Console()
-# Route all console output through the feed by default to avoid column offsets and stray ANSI
-if os.getenv("OCEAN_FEED_ONLY", "1") not in ("0", "false", "False"):
-    import re as _re
-    _RICH_TAG = _re.compile(r"\[/?[a-zA-Z][^\[\]]*\]")
+_FEED_ONLY = os.getenv("OCEAN_FEED_ONLY", "1") not in ("0", "false", "False")
+_RICH_TAG = re.compile(r"\[/?[a-zA-Z][^\[\]]*\]")
 
-    def _cprint_to_feed(*args, **kwargs):  # noqa: ANN001
+
+class _LazyConsole:
+    """rich Console built on first real use; feed-only ``print`` never imports rich."""
+
+    def __init__(self) -> None:
+        self._console = None
+
+    def _real(self):  # noqa: ANN202
+        if self._console is None:
+            from rich.console import Console
+
+            self._console = Console()
+        return self._console
+
+    def print(self, *args, **kwargs) -> None:  # noqa: ANN002, ANN003
+        # Route all console output through the feed by default to avoid column offsets and stray ANSI
+        if not _FEED_ONLY:
+            self._real().print(*args, **kwargs)
+            return
         try:
             msg = " ".join(str(a) for a in args)
         except Exception:
             msg = " ".join(map(str, args))
         feed(_RICH_TAG.sub("", msg))
-    try:
-        console.print = _cprint_to_feed  # type: ignore[attr-defined]
-    except Exception:
-        pass
+
+    def __getattr__(self, name: str):  # noqa: ANN204
+        return getattr(self._real(), name)
+
+
+def rprint(*args, **kwargs) -> None:  # noqa: ANN002, ANN003
+    from rich import print as _rprint
+
+    _rprint(*args, **kwargs)
+
+
+console = _LazyConsole()
 app = typer.Typer(add_completion=False, no_args_is_help=False, help="OCEAN CLI orchestrator")
 # Sub-apps
 version_app = typer.Typer(help="Versioning utilities")
@@ -656,6 +671,7 @@ def _quickstart_login_if_possible(root: Path) -> str:
     for line in lines:
         feed(line)
     try:
+        from rich.prompt import Prompt
         choice = Prompt.ask(
             "Choose login",
             choices=list(choices.keys()),
@@ -687,6 +703,7 @@ def _quickstart_login_if_possible(root: Path) -> str:
         key = _extract_api_key_candidate(raw)
         if not backend:
             try:
+                from rich.prompt import Prompt
                 provider = Prompt.ask(
                     "Which provider is this key for?",
                     choices=["gemini", "openai"],
@@ -1266,6 +1283,7 @@ def _ask(label: str, default: str = "", choices: Optional[list[str]] = None) ->
 
     # Pytest harness: Rich Prompt stays monkeypatch-friendly.
     if _is_test_env():
+        from rich.prompt import Prompt
         return Prompt.ask(label, default=default, choices=choices)
 
     # Non-interactive stdin: avoid Rich Prompt (EOF prints "Aborted." and exits).
@@ -1566,6 +1584,7 @@ def chat(
         _do_crew(log)
     else:
         console.print("\n[bold blue]🌊 OCEAN:[/bold blue] Here's your engineering crew.\n")
+        from rich.progress import Progress, SpinnerColumn, TextColumn
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -1663,6 +1682,7 @@ def chat(
         feed(f"📝 Session log: {log}")
         return
     else:
+        from rich.progress import Progress, SpinnerColumn, TextColumn
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -1815,6 +1835,7 @@ def _do_clarify(log: Path) -> None:
         if spec.get("ai_identity"):
             feed(f"🌊 Ocean: Summary — AI identity: {spec['ai_identity']}")
     else:
+        from rich.table import Table
         table = Table(title="📋 Project Summary (from Moroni's analysis)")
         table.add_column("Field", style="cyan")
         table.add_column("Value", style="green")
@@ -1858,6 +1879,7 @@ def _do_crew(log: Path) -> None:
     feed("🌊 Ocean: Each agent brings unique expertise to your project…")
     
     crew_lines: list[tuple[str, str, str]] = []
+    from .agents import default_agents
     for agent in default_agents():
         intro_full = agent.introduce()
         feed_agent_say(agent.name, agent.introduce_detail())
@@ -1870,6 +1892,7 @@ def _do_crew(log: Path) -> None:
             role_sp, spec_sp = summary
             crew_lines.append((agent.name, role_sp, spec_sp))
     if os.getenv("OCEAN_SIMPLE_FEED") != "1":
+        from rich.table import Table
         crew_table = Table(title="🤖 The OCEAN Crew (Assembled by OCEAN)")
         crew_table.add_column("Agent", style="cyan", no_wrap=True)
         crew_table.add_column("Role", style="blue")
@@ -1900,6 +1923,7 @@ def _do_plan(log: Path) -> None:
         console.print("[bold blue]🌊 OCEAN:[/bold blue] Moroni, Q, Edna, and Mario are analyzing your requirements...")
     
     # Generate backlog from agent proposals
+    from .planner import execute_backlog, generate_backlog
     backlog = generate_backlog(spec)
     
     # EXECUTE the backlog using agent capabilities
@@ -1927,6 +1951,7 @@ def _do_plan(log: Path) -> None:
     
     # Show backlog summary
     if os.getenv("OCEAN_SIMPLE_FEED") != "1":
+        from rich.table import Table
         backlog_table = Table(title="📋 Project Backlog (EXECUTED by OCEAN's Crew)")
         backlog_table.add_column("Task", style="cyan")
         backlog_table.add_column("Owner", style="blue")
@@ -2280,6 +2305,7 @@ def test():
             raise typer.Exit(code=1)
 
         # Confirm before network operations
+        from rich.prompt import Confirm
         if Confirm.ask("📦 Install/upgrade test dependencies with pip?", default=False):
             console.print("📦 Installing test dependencies...")
             subprocess.run([sys.executable, "-m", "pip", "install", "fastapi[all]", "pytest", "httpx"],
@@ -2330,6 +2356,7 @@ def deploy(dry_run: bool = typer.Option(True, "--dry-run/--no-dry-run", help="Pr
             feed("💡 This is a preview. Run with --no-dry-run to execute.")
         else:
             console.print("\n[bold blue]🚀 Deployment Plan (Dry Run)[/bold blue]")
+            from rich.table import Table
             plan_table = Table(title="📋 Deployment Steps")
             plan_table.add_column("Step", style="cyan")
             plan_table.add_column("Description", style="green")
@@ -2422,6 +2449,7 @@ def chat_repl():
             if os.getenv("OCEAN_SIMPLE_FEED") == "1":
                 line = input("ocean> ").strip()
             else:
+                from rich.prompt import Prompt
                 line = Prompt.ask("ocean").strip()
         except (KeyboardInterrupt, EOFError):
             break
@@ -2548,6 +2576,7 @@ def autostart():
     spec = ProjectSpec.from_dict(spec_dict)
 
     # Generate and execute backlog, which emits events as it progresses
+    from .planner import execute_backlog, generate_backlog
     backlog = generate_backlog(spec)
     execute_backlog(backlog, DOCS, spec)
     # No exit code significance; this is a fire-and-forget command
@@ -2556,7 +2585,8 @@ def autostart():
 
 @app.command(help="Continuous build-test loop (never exits; emits events for the REPL)")
 def loop(
-    interval: int = typer.Option(30, "--interval", help="Seconds to wait between cycles (default 30)"),
+    interval: int = typer.Option(30, "--interval", help="Max seconds between cycles (default 30); wakes early when the spec or requirements change"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Bypass the codegen response cache (.ocean/cache/)"),
 ):
     """Continuously generates a plan and executes it, emitting events each cycle.
 
@@ -2566,6 +2596,8 @@ def loop(
     """
     ensure_repo_structure()
     _load_env_file(ROOT / ".env")
+    if no_cache:
+        os.environ["OCEAN_CODEGEN_CACHE"] = "0"
     apply_backend_env_from_prefs(Path.cwd())
     _bk_loop = get_codegen_backend()
     # Hydrate API keys and ensure Codex auth so codegen works in loop mode (Codex backend only)
@@ -2629,6 +2661,7 @@ def loop(
             spec = ProjectSpec.from_dict(spec_dict)
 
             # Generate and execute backlog
+            from .planner import execute_backlog, generate_backlog
             backlog = generate_backlog(spec)
             execute_backlog(backlog, DOCS, spec)
 
@@ -2640,21 +2673,21 @@ def loop(
                 reqs, source = None, ""
             if reqs is None:
                 # Prompt to create requirements for iterative convergence
-                _emit_event("note", agent="Tony", title="No requirements file found (docs/requirements.json or .yml). Create one to drive iteration.")
-                # Sleep then continue next cycle
-                _sleep(interval)
+                emit_event("note", agent="Tony", title="No requirements file found (docs/requirements.json or .yml). Create one to drive iteration.")
+                # Wait for the next cycle (wakes early on spec/requirements edits)
+                _wait_for_continue_or_change(_spec_paths(), timeout=interval)
                 continue
             ok, results = _req.validate(reqs)
             report_path = _req.write_report(DOCS, results, source)
-            _emit_event("note", agent="Tony", title=f"Requirements report: {report_path}")
+            emit_event("note", agent="Tony", title=f"Requirements report: {report_path}")
 
             if ok:
                 # All requirements satisfied — wait for user input (/continue) or spec/req change
-                _emit_event("note", agent="Tony", title="All requirements satisfied. Waiting for /continue or requirements change…")
-                _wait_for_continue_or_change([DOCS / "requirements.json", DOCS / "requirements.yml", DOCS / "prd.md"])  # blocks
+                emit_event("note", agent="Tony", title="All requirements satisfied. Waiting for /continue or requirements change…")
+                _wait_for_continue_or_change(_spec_paths())  # blocks
             else:
                 # Not satisfied — continue iterating after a short pause
-                _sleep(interval)
+                _wait_for_continue_or_change(_spec_paths(), timeout=interval)
     except KeyboardInterrupt:
         pass
     raise typer.Exit(code=0)
@@ -2672,8 +2705,8 @@ def ingest(
 ):
     ensure_repo_structure()
     paths = [p for p in attach if p]
-    p = ingest_message(message, paths, cwd=ROOT)
-    feed(f"🌊 Ocean: inbox ← {p.name}")
+    mid = ingest_message(message, paths, cwd=ROOT)
+    feed(f"🌊 Ocean: inbox ← {mid}")
 
 
 @app.command(help="Show autonomous runtime state (.ocean/) and inbox depth")
@@ -2689,9 +2722,12 @@ def cycle_once(
         "--max-tokens",
         help="Soft cap: skip execution if estimated tokens exceed this (OCEAN_TOKEN_ESTIMATE_PER_TASK per task)",
     ),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Bypass the codegen response cache (.ocean/cache/)"),
 ):
     ensure_repo_structure()
     _load_env_file(ROOT / ".env")
+    if no_cache:
+        os.environ["OCEAN_CODEGEN_CACHE"] = "0"
     apply_backend_env_from_prefs(ROOT)
     if not os.getenv("OCEAN_EVENTS_FILE"):
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
@@ -2701,6 +2737,7 @@ def cycle_once(
             events_file.touch(exist_ok=True)
         except Exception:
             pass
+    from .runtime import run_cycle
     res = run_cycle(root=ROOT, docs_dir=DOCS, max_tokens=max_tokens)
     if not res.ok:
         feed(f"🌊 Ocean: cycle failed — {res.message}")
@@ -2708,52 +2745,45 @@ def cycle_once(
     raise typer.Exit(code=0)
 
 
-def _emit_event(kind: str, **data) -> None:
-    path = os.getenv("OCEAN_EVENTS_FILE")
-    if not path:
-        return
-    try:
-        with open(path, "a", encoding="utf-8") as f:
-            payload = {"event": kind, **data}
-            f.write(json.dumps(payload) + "\n")
-    except Exception:
-        pass
+def _spec_paths() -> list[Path]:
+    return [DOCS / "requirements.json", DOCS / "requirements.yml", DOCS / "prd.md"]
 
-def _sleep(seconds: int) -> None:
+
+def _wait_for_continue_or_change(paths: list[Path], timeout: Optional[float] = None) -> bool:
+    """Block until logs/continue is touched or any of the given files change.
+
+    Sleeps on a filesystem watcher (inotify where available) instead of polling.
+    Returns False when ``timeout`` seconds pass with no change.
+    """
     import time as _t
+
+    from .watcher import watch
+
+    cont = LOGS / "continue"
     try:
-        _t.sleep(max(1, int(seconds)))
+        LOGS.mkdir(parents=True, exist_ok=True)
     except Exception:
         pass
-
-def _wait_for_continue_or_change(paths: list[Path]) -> None:
-    """Block until logs/continue is touched or any of the given files change."""
-    import time as _t
-    cont = LOGS / "continue"
-    last_mtimes = {p: (p.stat().st_mtime if p.exists() else 0.0) for p in paths}
-    while True:
-        # Continue signal
-        if cont.exists():
-            try:
-                cont.unlink()
-            except Exception:
-                pass
-            _emit_event("note", agent="Ocean", title="Continue signal received; resuming iteration…")
-            return
-        # Requirements/spec change
-        changed = False
-        for p in paths:
-            try:
-                mt = p.stat().st_mtime if p.exists() else 0.0
-            except Exception:
-                mt = 0.0
-            if mt != last_mtimes.get(p, 0.0):
-                changed = True
-                last_mtimes[p] = mt
-        if changed:
-            _emit_event("note", agent="Ocean", title="Requirements/spec changed; resuming iteration…")
-            return
-        _t.sleep(1)
+    with watch([*paths, cont]) as w:
+        deadline = None if timeout is None else _t.monotonic() + max(1, int(timeout))
+        while True:
+            # Continue signal (checked after the watch is armed so a touch cannot be missed)
+            if cont.exists():
+                try:
+                    cont.unlink()
+                except Exception:
+                    pass
+                emit_event("note", agent="Ocean", title="Continue signal received; resuming iteration…")
+                return True
+            left = None if deadline is None else deadline - _t.monotonic()
+            if left is not None and left <= 0:
+                return False
+            changed = w.wait(left)
+            if not changed:
+                continue
+            if any(p != cont for p in changed):
+                emit_event("note", agent="Ocean", title="Requirements/spec changed; resuming iteration…")
+                return True
 
 def _codex_debug_probe(verbose: bool = False) -> None:
     """Emit a concise Codex status line to the feed, with details on failure.
@@ -2796,7 +2826,7 @@ def _codex_debug_probe(verbose: bool = False) -> None:
         feed("🌊 Ocean: Codex ready. Using subscription or API fallback.")
 
 
-@app.command(help="Run Repo-Scout: per-agent codex exec reports and Moroni synthesis")
+@app.command(help="Run Repo-Scout: concurrent per-agent codex exec reports, then Moroni synthesis")
 def scout():
     ensure_repo_structure()
     _load_env_file(ROOT / ".env")
@@ -2805,76 +2835,69 @@ def scout():
     spec = ProjectSpec.from_dict(spec_dict) if spec_dict else ProjectSpec(name=Path.cwd().name, kind="web")
     bundle = ctx.build_context_bundle(spec)
 
-    reports_dir = DOCS / "repo_scout"
-    reports_dir.mkdir(parents=True, exist_ok=True)
+    from .scout import run_scout
 
-    # Helper to emit feed lines
-    def emit(kind: str, **data):
-        path = os.getenv("OCEAN_EVENTS_FILE")
-        if not path:
-            return
-        try:
-            with open(path, "a", encoding="utf-8") as f:
-                payload = {"event": kind, **data}
-                f.write(json.dumps(payload) + "\n")
-        except Exception:
-            pass
+    run_scout(
+        bundle,
+        DOCS / "repo_scout",
+        voice=lambda agent, scope: voice_brief(agent, context=scope, search_start=ROOT),
+    )
+    raise typer.Exit(code=0)
 
-    tasks = [
-        ("Q", "backend", "Audit backend files, propose 2 PRs.", reports_dir / "Q.md"),
-        ("Edna", "frontend", "Review UI code, suggest 2 UX improvements.", reports_dir / "Edna.md"),
-        ("Mario", "infra", "Audit workflows/Docker, suggest 1 infra improvement.", reports_dir / "Mario.md"),
-        ("Tony", "tests", "Analyze tests, stress core loop, report issues.", reports_dir / "Tony.md"),
-    ]
 
-    for agent, scope, task, out_path in tasks:
-        instruction = (
-            f"You are {agent}, responsible for {scope}. Review the repository context and produce a short report with Findings and Suggestions.\n"
-            f"Scope: {scope}. Task: {task}\n"
-            "Return JSON mapping the path to Markdown content. Use headings: # Findings, # Suggestions, # Proposed PRs."
-            " Keep it concise and actionable."
-            "\nVoice: " + voice_brief(agent, context=scope, search_start=ROOT)
-        )
-        files = codex_exec.generate_files(instruction, [str(out_path.relative_to(Path.cwd()))], bundle, agent=agent)
-        if files:
-            for rel, content in files.items():
-                p = Path(rel)
-                p.parent.mkdir(parents=True, exist_ok=True)
-                p.write_text(content, encoding="utf-8")
-            emit("task_start", agent=agent, title=f"Repo-scout: {scope}", intent=task)
-            emit("task_end", agent=agent, title=f"Repo-scout: {scope}", intent=task)
-            emit("note", agent=agent, title=f"Report: {out_path}")
-
-    # Moroni synthesis
-    try:
-        combined = "\n\n".join([
-            (reports_dir / "Q.md").read_text(encoding="utf-8") if (reports_dir / "Q.md").exists() else "",
-            (reports_dir / "Edna.md").read_text(encoding="utf-8") if (reports_dir / "Edna.md").exists() else "",
-            (reports_dir / "Mario.md").read_text(encoding="utf-8") if (reports_dir / "Mario.md").exists() else "",
-            (reports_dir / "Tony.md").read_text(encoding="utf-8") if (reports_dir / "Tony.md").exists() else "",
-        ])
-        tmp = reports_dir / "_combined_reports.md"
-        tmp.write_text(combined, encoding="utf-8")
-        synth_path = reports_dir / "Moroni-synthesis.md"
-        instruction = (
-            "Synthesize the following agent reports into a cohesive architecture & roadmap. "
-            "Approve/reject proposals, and assign phased next steps. Keep it concise."
-            " Return JSON mapping to 'docs/repo_scout/Moroni-synthesis.md'."
-            "\nVoice: " + voice_brief("Moroni", context="planning", search_start=ROOT)
-        )
-        files = codex_exec.generate_files(instruction, [str(synth_path)], tmp, agent="Moroni")
-        if files:
-            for rel, content in files.items():
-                p = Path(rel)
-                p.parent.mkdir(parents=True, exist_ok=True)
-                p.write_text(content, encoding="utf-8")
-            emit("note", agent="Moroni", title=f"Synthesis: {synth_path}")
-    except Exception:
-        pass
-    raise typer.Exit(code=0)
+def parse_importtime(stderr: str) -> tuple[list[tuple[int, int, str]], list[str]]:
+    """Split ``-X importtime`` stderr into (self_us, cumulative_us, module) rows and other lines."""
+    rows: list[tuple[int, int, str]] = []
+    other: list[str] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            other.append(line)
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            rows.append((int(parts[0]), int(parts[1]), parts[2].rstrip()))
+        except ValueError:
+            continue  # header row
+    return rows, other
+
+
+def _profile_startup(args: list[str], top: int = 15) -> int:
+    """Run ``ocean <args>`` (default: import only) under ``-X importtime``; print the costliest modules."""
+    import time as _time
+
+    code = "import ocean.cli"
+    if args:
+        code = "import sys; from ocean.cli import entrypoint; sys.argv[0] = 'ocean'; entrypoint()"
+    start = _time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code, *args], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+    wall_ms = (_time.perf_counter() - start) * 1000
+    if proc.stdout:
+        sys.stdout.write(proc.stdout)
+    rows, other = parse_importtime(proc.stderr)
+    if other:
+        sys.stderr.write("\n".join(other) + "\n")
+    total_ms = sum(r[0] for r in rows) / 1000
+    print(f"ocean startup profile: {' '.join(args) or '(import only)'}")
+    print(f"  wall {wall_ms:.0f} ms (process), imports {total_ms:.0f} ms across {len(rows)} modules")
+    print(f"  {'self ms':>8}  {'cumul ms':>8}  module")
+    for self_us, cum_us, name in sorted(rows, key=lambda r: r[0], reverse=True)[:top]:
+        print(f"  {self_us / 1000:8.1f}  {cum_us / 1000:8.1f}  {name.strip()}")
+    ocean_mods = [r for r in rows if r[2].strip().startswith("ocean")]
+    if ocean_mods:
+        print("  ocean modules (cumulative):")
+        for _, cum_us, name in sorted(ocean_mods, key=lambda r: r[1], reverse=True)[:top]:
+            print(f"  {'':8}  {cum_us / 1000:8.1f}  {name.strip()}")
+    return proc.returncode
 
 
 def entrypoint():
+    # ``ocean --profile-startup [command ...]``: per-module import cost of a cold start.
+    if len(sys.argv) > 1 and sys.argv[1] == "--profile-startup":
+        raise SystemExit(_profile_startup(sys.argv[2:]))
     # Bare ``ocean`` (no subcommand): same interactive feed as ``ocean chat``.
     if len(sys.argv) == 1:
         from . import launcher
@@ -2938,6 +2961,7 @@ def _run_doctor_quick(full: bool = False) -> None:
     - Verifies codex on PATH
     - Shows codex --version and auth hint
     """
+    from rich.table import Table
     table = Table(title="🔍 Ocean Doctor")
     table.add_column("Check", style="cyan")
     table.add_column("Result", style="green")
@@ -3240,6 +3264,7 @@ def _doctor_lite() -> None:
 
 @token_app.command("doctor", help="Diagnose Codex token: presence, source, expiry, and CLI auth state")
 def token_doctor():
+    from rich.table import Table
     tab = Table(title="🔑 Codex Token Doctor")
     tab.add_column("Field", style="cyan")
     tab.add_column("Value", style="green")
@@ -3297,6 +3322,7 @@ def release(
     """
     ensure_repo_structure()
     if os.getenv("OCEAN_ALLOW_QUESTIONS", "1") not in ("0", "false", "False"):
+        from rich.prompt import Confirm
         if not Confirm.ask(f"Create release with tag '{tag}'?", default=True):
             console.print("[yellow]Release canceled by user.[/yellow]")
             raise typer.Exit(code=0)
@@ -3313,6 +3339,7 @@ def release(
             raise typer.Exit(code=code)
     if push:
         if os.getenv("OCEAN_ALLOW_QUESTIONS", "1") not in ("0", "false", "False"):
+            from rich.prompt import Confirm
             if not Confirm.ask("Push to 'origin' with --follow-tags?", default=True):
                 console.print("[yellow]Push skipped by user.[/yellow]")
                 console.print(f"✅ [green]Release created and tagged:[/green] {tag}")
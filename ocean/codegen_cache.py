@@ -0,0 +1,146 @@
+"""On-disk LRU cache for codegen responses, keyed on backend + model + prompt fingerprint.
+
+``compose_codegen_full_prompt`` is deterministic and the API backends run at
+``temperature: 0``, so an identical prompt to the same model yields the same file map;
+``ocean loop`` re-sends the same architecture/CI/deploy prompts every cycle while nothing
+changed. Entries live in ``.ocean/cache/codegen.sqlite`` with a TTL
+(``OCEAN_CODEGEN_CACHE_TTL`` seconds, default 7 days) and a total size bound
+(``OCEAN_CODEGEN_CACHE_MB``, default 64) enforced by evicting least-recently-used rows.
+
+Disable with ``OCEAN_CODEGEN_CACHE=0`` (``ocean loop --no-cache``). Every lookup emits a
+``codegen_cache`` event with running hit/miss counters.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from .events_emit import emit_event
+
+DEFAULT_TTL_S = 7 * 24 * 3600
+DEFAULT_MAX_MB = 64
+_SCHEMA = """
+create table if not exists entries (
+    key text primary key,
+    backend text not null,
+    model text not null,
+    created real not null,
+    accessed real not null,
+    size integer not null,
+    value text not null
+)
+"""
+
+_lock = threading.Lock()
+counters: dict[str, int] = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+
+def enabled() -> bool:
+    return os.getenv("OCEAN_CODEGEN_CACHE", "1") not in ("0", "false", "False")
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        v = float((os.getenv(name) or "").strip())
+    except ValueError:
+        return default
+    return v if v > 0 else default
+
+
+def cache_path(cwd: Optional[Path] = None) -> Path:
+    return (cwd or Path.cwd()) / ".ocean" / "cache" / "codegen.sqlite"
+
+
+def make_key(backend: str, model: str, prompt: str, variant: str = "") -> str:
+    """Stable fingerprint of everything that determines the response."""
+    raw = json.dumps([backend, model, variant, prompt], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@contextmanager
+def _connect(path: Path) -> Iterator[sqlite3.Connection]:
+    """Connection that commits on success and is always closed."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=5)
+    try:
+        with conn:
+            conn.execute(_SCHEMA)
+            yield conn
+    finally:
+        conn.close()
+
+
+def _event(result: str, key: str, backend: str, model: str) -> None:
+    emit_event("codegen_cache", result=result, key=key[:12], backend=backend, model=model, **counters)
+
+
+def get(key: str, *, backend: str = "", model: str = "", cwd: Optional[Path] = None) -> Optional[Dict[str, str]]:
+    """Cached file map for ``key``, or None (expired rows count as misses and are dropped)."""
+    if not enabled():
+        return None
+    now = time.time()
+    ttl = _env_float("OCEAN_CODEGEN_CACHE_TTL", DEFAULT_TTL_S)
+    value: Optional[Dict[str, str]] = None
+    try:
+        with _lock, _connect(cache_path(cwd)) as conn:
+            row = conn.execute("select created, value from entries where key = ?", (key,)).fetchone()
+            if row is not None and now - row[0] > ttl:
+                conn.execute("delete from entries where key = ?", (key,))
+                row = None
+            if row is not None:
+                conn.execute("update entries set accessed = ? where key = ?", (now, key))
+                data = json.loads(row[1])
+                if isinstance(data, dict):
+                    value = {str(k): str(v) for k, v in data.items()}
+    except (sqlite3.Error, ValueError, OSError):
+        value = None
+    counters["hits" if value is not None else "misses"] += 1
+    _event("hit" if value is not None else "miss", key, backend, model)
+    return value
+
+
+def put(key: str, mapping: Dict[str, str], *, backend: str, model: str, cwd: Optional[Path] = None) -> None:
+    if not enabled() or not mapping:
+        return
+    now = time.time()
+    blob = json.dumps(mapping, ensure_ascii=False)
+    limit = int(_env_float("OCEAN_CODEGEN_CACHE_MB", DEFAULT_MAX_MB) * 1024 * 1024)
+    try:
+        with _lock, _connect(cache_path(cwd)) as conn:
+            conn.execute(
+                "insert or replace into entries (key, backend, model, created, accessed, size, value) "
+                "values (?, ?, ?, ?, ?, ?, ?)",
+                (key, backend, model, now, now, len(blob), blob),
+            )
+            counters["stores"] += 1
+            total = conn.execute("select coalesce(sum(size), 0) from entries").fetchone()[0]
+            if total > limit:
+                # Evict least-recently-used rows until back under the bound
+                for old_key, size in conn.execute("select key, size from entries order by accessed asc").fetchall():
+                    if total <= limit or old_key == key:
+                        break
+                    conn.execute("delete from entries where key = ?", (old_key,))
+                    total -= size
+                    counters["evictions"] += 1
+    except (sqlite3.Error, OSError):
+        pass
+
+
+def stats(cwd: Optional[Path] = None) -> dict[str, int]:
+    """Process counters plus on-disk entry count and bytes."""
+    out = dict(counters)
+    try:
+        with _lock, _connect(cache_path(cwd)) as conn:
+            n, size = conn.execute("select count(*), coalesce(sum(size), 0) from entries").fetchone()
+        out.update(entries=int(n), bytes=int(size))
+    except (sqlite3.Error, OSError):
+        out.update(entries=0, bytes=0)
+    return out
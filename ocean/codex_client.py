@@ -8,6 +8,9 @@ import time
 from pathlib import Path
 from typing import Optional, Dict
 
+from . import codex_health
+from .json_extract import extract_json
+
 
 class CodexResult:
     def __init__(self, ok: bool, mode: str, reason: str = "") -> None:
@@ -21,40 +24,25 @@ def _codex_bin() -> Optional[str]:
 
 
 def _logged_in() -> bool:
+    # Explicit env flags / token take precedence over the (cached) probe
+    if os.getenv("OCEAN_CODEX_AUTH") in ("1", "true", "True"):
+        return True
+    if os.getenv("CODEX_AUTH_TOKEN"):
+        return True
     try:
-        # Explicit env flags
-        if os.getenv("OCEAN_CODEX_AUTH") in ("1", "true", "True"):
-            return True
-        # Env token takes precedence
-        if os.getenv("CODEX_AUTH_TOKEN"):
-            return True
-        codex = _codex_bin()
-        if codex:
-            out = subprocess.run([codex, "auth"], capture_output=True, text=True, timeout=5)
-            txt = (out.stdout or out.stderr or "").lower()
-            if any(k in txt for k in ("logged in", "authenticated", "already logged")):
-                return True
+        return codex_health.get().logged_in
     except Exception:
-        pass
-    # Fallback marker file
-    return (Path.home() / ".codex" / "auth.json").exists()
+        return (Path.home() / ".codex" / "auth.json").exists()
 
 
 def ensure_token_env() -> None:
     if os.getenv("CODEX_AUTH_TOKEN"):
         return
-    codex = _codex_bin()
-    if not codex:
+    if not _codex_bin():
         return
-    for args in (["auth", "print-token"], ["auth", "token"], ["auth", "--show-token"], ["auth", "export"]):
-        try:
-            tok = subprocess.run([codex, *args], capture_output=True, text=True, timeout=5)
-            cand = (tok.stdout or tok.stderr or "").strip()
-            if cand and len(cand) > 20 and "\n" not in cand:
-                os.environ["CODEX_AUTH_TOKEN"] = cand
-                break
-        except Exception:
-            continue
+    token = codex_health.get().token
+    if token:
+        os.environ["CODEX_AUTH_TOKEN"] = token
 
 
 def check() -> CodexResult:
@@ -210,14 +198,4 @@ def exec_json(
 
 
 def _extract_json(stdout: str) -> Optional[dict]:
-    start = stdout.find("{")
-    if start == -1:
-        return None
-    for end in range(len(stdout) - 1, start, -1):
-        if stdout[end] == '}':
-            chunk = stdout[start : end + 1]
-            try:
-                return json.loads(chunk)
-            except Exception:
-                continue
-    return None
+    return extract_json(stdout)
@@ -2,13 +2,14 @@ from __future__ import annotations
 
 import json
 import os
-import re
 import shutil
 import subprocess
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Callable, Optional, Dict
 from .feed import feed as _feed
-import httpx
+from .json_extract import extract_json, is_file_map
+from . import codex_health, llm_transport, rate_limiter
 import base64
 import datetime as _dt
 
@@ -89,116 +90,17 @@ def last_error() -> str:
 def _ensure_token_env() -> None:
     """Populate CODEX_AUTH_TOKEN in the environment if possible.
 
-    Tries a few codex subcommands to surface a token and caches it in env.
+    Uses the cached Codex health probe (``codex_health``); no subprocesses on a hit.
     """
     if os.getenv("CODEX_AUTH_TOKEN"):
         return
-    codex = _codex_bin()
-    if not codex:
+    if not _codex_bin():
         return
-    # Helper: decode JWT exp without verifying signature
-    def _jwt_info(tok: str) -> dict:
-        info = {"exp": None, "iat": None, "exp_iso": None, "expired": None}
-        try:
-            parts = tok.split(".")
-            if len(parts) >= 2:
-                pad = '=' * (-len(parts[1]) % 4)
-                payload = base64.urlsafe_b64decode(parts[1] + pad)
-                data = json.loads(payload.decode("utf-8", errors="ignore"))
-                exp = data.get("exp")
-                iat = data.get("iat")
-                info["exp"] = exp
-                info["iat"] = iat
-                if isinstance(exp, (int, float)):
-                    dt = _dt.datetime.fromtimestamp(exp)
-                    info["exp_iso"] = dt.isoformat(sep=" ")
-                    info["expired"] = dt < _dt.datetime.now()
-        except Exception:
-            pass
-        return info
-
-    # First, try ~/.codex/auth.json
-    try:
-        auth_json = Path.home() / ".codex" / "auth.json"
-        if auth_json.exists():
-            data = json.loads(auth_json.read_text(encoding="utf-8"))
-            tok = (data.get("id_token") or "").strip()
-            if tok:
-                os.environ["CODEX_AUTH_TOKEN"] = tok
-                os.environ["OCEAN_CODEX_AUTH"] = "1"
-                os.environ["OCEAN_CODEX_TOKEN_SOURCE"] = str(auth_json)
-                info = _jwt_info(tok)
-                try:
-                    exp_s = info.get("exp_iso") or "unknown"
-                    expired = info.get("expired")
-                    note = f"exp={exp_s}{' (expired)' if expired else ''}"
-                    _feed(f"🌊 Ocean: Found Codex token in {auth_json} (masked, {note}).")
-                except Exception:
-                    pass
-                return
-    except Exception:
-        pass
-
-    # Next, search common directories for any JWT-like token, capturing source file
-    try:
-        line = subprocess.check_output(
-            "grep -Rno 'ey[A-Za-z0-9_\\-\\.]\\{20,\\}' ~/.codex ~/.config/codex 2>/dev/null | head -n 1",
-            shell=True,
-            text=True,
-        ).strip()
-        if line:
-            # Expect: /path/to/file:LINE:eyJhbGci...
-            parts = line.rsplit(":", 2)
-            src_path = parts[0] if len(parts) == 3 else "(grep)"
-            tok = parts[-1]
-            if tok:
-                os.environ["CODEX_AUTH_TOKEN"] = tok
-                os.environ["OCEAN_CODEX_AUTH"] = "1"
-                os.environ["OCEAN_CODEX_TOKEN_SOURCE"] = src_path
-                info = _jwt_info(tok)
-                try:
-                    exp_s = info.get("exp_iso") or "unknown"
-                    expired = info.get("expired")
-                    note = f"exp={exp_s}{' (expired)' if expired else ''}"
-                    _feed(f"🌊 Ocean: Found Codex token via grep in {src_path} (masked, {note}).")
-                except Exception:
-                    pass
-                return
-    except Exception:
-        pass
-    def _scan_token(txt: str) -> Optional[str]:
-        # Common forms: raw JWT-like string, id_token=..., CODEX_AUTH_TOKEN=...
-        # 1) id_token=...
-        m = re.search(r"id_token=([A-Za-z0-9\-_.]+)", txt)
-        if m:
-            return m.group(1)
-        # 2) CODEX_AUTH_TOKEN=...
-        m = re.search(r"CODEX_AUTH_TOKEN=\"?([A-Za-z0-9\-_.]+)\"?", txt)
-        if m:
-            return m.group(1)
-        # 3) any JWT-like token
-        m = re.search(r"(ey[A-Za-z0-9_\-\.]{20,})", txt)
-        if m:
-            return m.group(1)
-        return None
-
-    # Avoid interactive flows like `codex auth login` here; only use non-interactive commands.
-    for args in (["auth", "print-token"], ["auth", "token"], ["auth", "--show-token"], ["auth", "export"], ["auth"]):
-        try:
-            tok = subprocess.run([codex, *args], capture_output=True, text=True, timeout=10)
-            txt = (tok.stdout or "") + "\n" + (tok.stderr or "")
-            cand = _scan_token(txt) or ""
-            if cand and len(cand) > 20:
-                os.environ["CODEX_AUTH_TOKEN"] = cand
-                os.environ["OCEAN_CODEX_AUTH"] = "1"
-                os.environ.setdefault("OCEAN_CODEX_TOKEN_SOURCE", f"{codex} {' '.join(args)}")
-                try:
-                    _feed("🌊 Ocean: Codex auth token acquired (masked).")
-                except Exception:
-                    pass
-                break
-        except Exception:
-            continue
+    health = codex_health.get()
+    if health.token:
+        os.environ["CODEX_AUTH_TOKEN"] = health.token
+        os.environ["OCEAN_CODEX_AUTH"] = "1"
+        os.environ.setdefault("OCEAN_CODEX_TOKEN_SOURCE", health.token_source)
 
 
 _CODEGEN_SYSTEM = (
@@ -213,11 +115,17 @@ def compose_codegen_full_prompt(
     suggested_files: Optional[list[str]] = None,
     context_file: Optional[Path] = None,
 ) -> str:
-    """Build the user-facing codegen prompt (shared by Codex, OpenAI, and Gemini)."""
+    """Build the user-facing codegen prompt (shared by Codex, OpenAI, and Gemini).
+
+    A context bundle is narrowed to the samples most relevant to ``instruction`` so the
+    prompt stays within ``OCEAN_CONTEXT_TOKENS`` (see ``context.focus_context``).
+    """
     prompt_parts: list[str] = []
     if context_file and context_file.exists():
         try:
-            ctx = context_file.read_text(encoding="utf-8")
+            from .context import focus_context
+
+            ctx = focus_context(context_file.read_text(encoding="utf-8"), instruction, suggested_files)
             prompt_parts.append("Context begins:\n" + ctx + "\nContext ends.")
         except Exception:
             pass
@@ -289,7 +197,7 @@ def _openai_api_codegen(full_prompt: str, timeout: int) -> Optional[Dict[str, st
     ]
     body = {"model": api_model, "messages": messages, "temperature": 0}
     try:
-        resp = httpx.post("https://api.openai.com/v1/chat/completions", headers=headers, json=body, timeout=timeout)
+        resp = llm_transport.post(llm_transport.url("openai", "/v1/chat/completions"), headers=headers, json=body, timeout=timeout)
         data = resp.json()
         _note_token_ledger(data.get("usage"))
         content = (((data.get("choices") or [{}])[0]).get("message") or {}).get("content") or ""
@@ -331,7 +239,7 @@ def _gemini_api_codegen(full_prompt: str, timeout: int) -> Optional[Dict[str, st
     from .backends import get_gemini_model
 
     model = get_gemini_model().strip()
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+    url = llm_transport.url("gemini", f"/v1beta/models/{model}:generateContent")
     headers = {"Content-Type": "application/json", "x-goog-api-key": key}
     sys_text = (
         "You are a code generation tool. Return ONLY JSON: a mapping of relative file paths "
@@ -345,7 +253,7 @@ def _gemini_api_codegen(full_prompt: str, timeout: int) -> Optional[Dict[str, st
     if os.getenv("OCEAN_GEMINI_JSON_MODE", "1") not in ("0", "false", "False"):
         body["generationConfig"]["responseMimeType"] = "application/json"
     try:
-        resp = httpx.post(url, headers=headers, json=body, timeout=timeout)
+        resp = llm_transport.post(url, headers=headers, json=body, timeout=timeout)
         data = resp.json()
         if resp.status_code >= 400:
             err = data.get("error") if isinstance(data.get("error"), dict) else {}
@@ -393,59 +301,45 @@ def _gemini_api_codegen(full_prompt: str, timeout: int) -> Optional[Dict[str, st
         return None
 
 
+def _codegen_shaped(obj: dict) -> bool:
+    return is_file_map(obj) or isinstance(obj.get("files"), dict) or isinstance(obj.get("content"), list)
+
+
+def _clip(text: str, n: int = 160) -> str:
+    return text[:n] + ("…" if len(text) > n else "")
+
+
+def _feed_stream_event(ev) -> None:
+    """Surface a parsed ``codex exec --json`` event succinctly (see ``codex_stream``)."""
+    if ev.kind.lower() in ("message", "assistant", "tool", "event", "agent_message", "command_execution"):
+        _feed(f"🪵 Codex: {ev.kind}: " + _clip(ev.text or "(event)"))
+    if ev.tokens:
+        _feed(f"🪵 Codex: tokens={ev.tokens}")
+
+
 def _extract_json(stdout: str) -> Optional[dict]:
-    # Try to find the first balanced JSON object in output
-    # Heuristic: find first '{' and last '}' and attempt to parse progressively
-    start = stdout.find("{")
-    if start == -1:
-        return None
-    # try multiple trailing positions from end downwards
-    for end in range(len(stdout) - 1, start, -1):
-        if stdout[end] == '}':
-            chunk = stdout[start : end + 1]
-            try:
-                return json.loads(chunk)
-            except Exception:
-                continue
-    return None
+    """First JSON object in model output, preferring codegen-shaped ones (single pass)."""
+    return extract_json(stdout, _codegen_shaped)
 
 
 def _logged_in_via_codex() -> bool:
     """Best-effort detection of Codex auth.
 
-    Heuristics, in order:
-    - Explicit token in env (CODEX_AUTH_TOKEN)
-    - "codex auth" output contains "logged in"/"authenticated"
-    - Able to obtain a token via one of: print-token, token, --show-token, export
-    - Legacy file at ~/.codex/auth.json exists
+    Explicit env hints (OCEAN_CODEX_AUTH, CODEX_AUTH_TOKEN) win; otherwise the cached
+    ``codex_health`` probe answers ("codex auth" status, a discoverable token, or
+    ~/.codex/auth.json).
     """
+    if os.getenv("OCEAN_CODEX_AUTH") in ("1", "true", "True"):
+        return True
+    if os.getenv("CODEX_AUTH_TOKEN"):
+        return True
     try:
-        # Explicit env hints first
-        if os.getenv("OCEAN_CODEX_AUTH") in ("1", "true", "True"):
-            return True
-        if os.getenv("CODEX_AUTH_TOKEN"):
-            return True
-        codex = shutil.which("codex")
-        if codex:
-            out = subprocess.run([codex, "auth"], capture_output=True, text=True, timeout=5)
-            txt = (out.stdout or out.stderr or "").lower()
-            if any(kw in txt for kw in ("logged in", "authenticated", "already logged")):
-                return True
-            # Try to surface a token and cache in env
-            for args in (["auth", "print-token"], ["auth", "token"], ["auth", "--show-token"], ["auth", "export"]):
-                try:
-                    tok = subprocess.run([codex, *args], capture_output=True, text=True, timeout=5)
-                    cand = (tok.stdout or tok.stderr or "").strip()
-                    if cand and len(cand) > 20 and "\n" not in cand:
-                        os.environ["CODEX_AUTH_TOKEN"] = cand
-                        return True
-                except Exception:
-                    continue
+        health = codex_health.get()
     except Exception:
-        pass
-    home = os.path.expanduser("~")
-    auth = Path(home) / ".codex" / "auth.json"
-    return auth.exists()
+        return (Path.home() / ".codex" / "auth.json").exists()
+    if health.token:
+        os.environ["CODEX_AUTH_TOKEN"] = health.token
+    return health.logged_in
 
 
 def generate_files(
@@ -475,7 +369,7 @@ def generate_files(
     global _last_mode
     if prefer_api_early:
         _last_mode = "api_fallback"
-        return _openai_api_codegen(full_prompt, timeout)
+        return _cached_api_codegen("openai_api", full_prompt, lambda: _openai_api_codegen(full_prompt, timeout))
 
     if not available():
         if force:
@@ -497,14 +391,7 @@ def generate_files(
     sandbox = os.getenv("OCEAN_CODEX_SANDBOX")  # read-only | workspace-write | danger-full-access
     approval = os.getenv("OCEAN_CODEX_APPROVAL")  # untrusted | on-failure | on-request | never
     want_cd = os.getenv("OCEAN_CODEX_CD", "1") not in ("0", "false", "False")
-    skip_git = False
-    try:
-        import subprocess as _sp
-        chk = _sp.run(["git", "rev-parse", "--is-inside-work-tree"], capture_output=True, text=True)
-        if chk.returncode != 0:
-            skip_git = True
-    except Exception:
-        skip_git = True
+    skip_git = not codex_health.inside_git_worktree()
     cmd = [
         _codex_bin() or "codex",
     ]
@@ -627,76 +514,42 @@ def generate_files(
                         _feed(f"🌊 Ocean: [debug] Prompt size: {len(full_prompt)} chars")
                     except Exception:
                         pass
-                if stream:
-                    # Stream JSONL/events to feed while capturing the full output
-                    try:
-                        import subprocess as _sp, json as _json, time as _time
-                        proc = _sp.Popen(
-                            [*cmd, full_prompt],
-                            stdout=_sp.PIPE,
-                            stderr=_sp.PIPE,
-                            text=True,
-                            env=env,
-                            bufsize=1,
-                        )
-                        stdout_chunks: list[str] = []
-                        stream_usage_max = 0
-                        start = _time.time()
-                        while True:
-                            if proc.stdout is None:
-                                break
-                            line = proc.stdout.readline()
-                            if not line:
-                                if proc.poll() is not None:
-                                    break
-                                # timeout check
-                                if _time.time() - start > int(os.getenv("OCEAN_CODEX_TIMEOUT", str(timeout))):
-                                    try:
-                                        proc.kill()
-                                    except Exception:
-                                        pass
-                                    raise RuntimeError("codex exec stream timed out")
-                                continue
-                            stdout_chunks.append(line)
-                            # Try to surface useful events succinctly
-                            sline = line.strip()
-                            if not sline:
-                                continue
+                with rate_limiter.acquire("codex") as lease:
+                    if stream:
+                        # Stream JSONL events to the feed; keep only the final message + a bounded tail
+                        try:
+                            from .codex_stream import run_stream
+
+                            result = run_stream(
+                                [*cmd, full_prompt],
+                                env=env,
+                                timeout=int(os.getenv("OCEAN_CODEX_TIMEOUT", str(timeout))),
+                                on_event=_feed_stream_event,
+                                on_line=lambda s: _feed("🪵 Codex: " + _clip(s)),
+                            )
+                            if result.timed_out:
+                                raise RuntimeError("codex exec stream timed out")
+                            _note_token_ledger(result.tokens)
+                            proc = result
+                            stdout = result.stdout
+                            stderr = result.stderr
+                        except Exception as _se:
+                            # Fallback to non-streaming run
                             try:
-                                evt = _json.loads(sline)
-                                if isinstance(evt, dict):
-                                    kind = str(evt.get("event") or evt.get("type") or "evt")
-                                    # Show short messages and token usage
-                                    if kind.lower() in ("message","assistant","tool","event"):
-                                        txt = evt.get("content") or evt.get("text") or evt.get("message") or "(event)"
-                                        txt = str(txt)
-                                        _feed(f"🪵 Codex: {kind}: " + (txt[:160] + ("…" if len(txt) > 160 else "")))
-                                    if "tokens" in evt or "tokens_used" in evt or "usage" in evt:
-                                        val = evt.get("usage") if isinstance(evt.get("usage"), (dict, int)) else None
-                                        if val is None:
-                                            val = evt.get("tokens_used") or evt.get("tokens")
-                                        nu = _coerce_token_count(val)
-                                        if nu > stream_usage_max:
-                                            stream_usage_max = nu
-                                        _feed(f"🪵 Codex: tokens={val}")
-                                    continue
+                                _feed(f"🌊 Ocean: stream mode error; falling back — {_se}")
                             except Exception:
                                 pass
-                            # Non-JSON line, print a short head
-                            _feed("🪵 Codex: " + (sline[:160] + ("…" if len(sline) > 160 else "")))
-                        # Read remaining stderr
-                        try:
-                            stderr = proc.stderr.read() if proc.stderr else ""
-                        except Exception:
-                            stderr = ""
-                        stdout = "".join(stdout_chunks)
-                    except Exception as _se:
-                        # Fallback to non-streaming run
-                        try:
-                            _feed(f"🌊 Ocean: stream mode error; falling back — {_se}")
-                        except Exception:
-                            pass
-                        proc = _sp.run(
+                            proc = subprocess.run(
+                                [*cmd, full_prompt],
+                                capture_output=True,
+                                text=True,
+                                timeout=int(os.getenv("OCEAN_CODEX_TIMEOUT", str(timeout))),
+                                env=env,
+                            )
+                            stdout = (proc.stdout or "")
+                            stderr = (proc.stderr or "")
+                    else:
+                        proc = subprocess.run(
                             [*cmd, full_prompt],
                             capture_output=True,
                             text=True,
@@ -705,16 +558,10 @@ def generate_files(
                         )
                         stdout = (proc.stdout or "")
                         stderr = (proc.stderr or "")
-                else:
-                    proc = subprocess.run(
-                        [*cmd, full_prompt],
-                        capture_output=True,
-                        text=True,
-                        timeout=int(os.getenv("OCEAN_CODEX_TIMEOUT", str(timeout))),
-                        env=env,
-                    )
-                    stdout = (proc.stdout or "")
-                    stderr = (proc.stderr or "")
+                    # A stream we stopped after turn.completed exits by SIGTERM, not failure
+                    rc = 0 if getattr(proc, "early_exit", False) else proc.returncode
+                    failed = stderr if (rc or not stdout.strip()) else ""
+                    lease.report_output(failed, rc)
                 if stdout.strip():
                     break
                 if debug:
@@ -787,13 +634,17 @@ def generate_files(
                     try:
                         cmd2 = list(cmd) + ["--dangerously-bypass-approvals-and-sandbox"]
                         _feed("🌊 Ocean: Retrying Codex exec with sandbox bypass due to prior failure…")
-                        proc2 = subprocess.run(
-                            [*cmd2, full_prompt],
-                            capture_output=True,
-                            text=True,
-                            timeout=int(os.getenv("OCEAN_CODEX_TIMEOUT", str(timeout))),
-                            env=env,
-                        )
+                        with rate_limiter.acquire("codex") as lease:
+                            proc2 = subprocess.run(
+                                [*cmd2, full_prompt],
+                                capture_output=True,
+                                text=True,
+                                timeout=int(os.getenv("OCEAN_CODEX_TIMEOUT", str(timeout))),
+                                env=env,
+                            )
+                            # Same rule as the main path: only a failed run's stderr is classified
+                            failed = (proc2.stderr or "") if (proc2.returncode or not (proc2.stdout or "").strip()) else ""
+                            lease.report_output(failed, proc2.returncode)
                         out2 = proc2.stdout or ""
                         err2 = proc2.stderr or ""
                         obj2 = None
@@ -837,7 +688,7 @@ def generate_files(
 
     # If we are in API fallback, call OpenAI API directly using httpx
     if _last_mode == "api_fallback" and env.get("OPENAI_API_KEY"):
-        return _openai_api_codegen(full_prompt, timeout)
+        return _cached_api_codegen("openai_api", full_prompt, lambda: _openai_api_codegen(full_prompt, timeout))
 
     # By here, obj should be parsed from Codex CLI (subscription mode)
     if not isinstance(obj, dict):
@@ -847,6 +698,35 @@ def generate_files(
     return normalize_codegen_mapping(obj)
 
 
+def _cached_api_codegen(
+    backend: str, full_prompt: str, run: Callable[[], Optional[Dict[str, str]]]
+) -> Optional[Dict[str, str]]:
+    """Serve an API backend's file map from the codegen cache, storing fresh results.
+
+    Only the temperature-0 API backends are cached; the CLI agents edit the worktree and
+    are not deterministic for a given prompt.
+    """
+    from . import codegen_cache
+    from .backends import get_gemini_model, get_openai_model
+
+    if not codegen_cache.enabled():
+        return run()
+    if backend == "openai_api":
+        model, variant = get_openai_model(), ""
+    else:
+        model = get_gemini_model().strip()
+        variant = "json" if os.getenv("OCEAN_GEMINI_JSON_MODE", "1") not in ("0", "false", "False") else ""
+    key = codegen_cache.make_key(backend, model, full_prompt, variant)
+    hit = codegen_cache.get(key, backend=backend, model=model)
+    if hit is not None:
+        _feed(f"🌊 Ocean: codegen cache hit ({backend}, {len(hit)} files) — skipping API call.")
+        return hit
+    result = run()
+    if result:
+        codegen_cache.put(key, result, backend=backend, model=model)
+    return result
+
+
 def generate_files_with_fallback(
     instruction: str,
     context_file: Optional[Path] = None,
@@ -873,7 +753,7 @@ def generate_files_with_fallback(
                 continue
             _feed(f"🌊 Ocean: {'[fallback] ' if is_fallback else ''}trying OpenAI API…")
             fp = compose_codegen_full_prompt(instruction, suggested_files, context_file)
-            result = _openai_api_codegen(fp, timeout)
+            result = _cached_api_codegen("openai_api", fp, lambda: _openai_api_codegen(fp, timeout))
             if result:
                 return result
             _feed("🌊 Ocean: OpenAI API returned nothing — trying next agent…")
@@ -883,7 +763,7 @@ def generate_files_with_fallback(
                 continue
             _feed(f"🌊 Ocean: {'[fallback] ' if is_fallback else ''}trying Gemini API…")
             fp = compose_codegen_full_prompt(instruction, suggested_files, context_file)
-            result = _gemini_api_codegen(fp, timeout)
+            result = _cached_api_codegen("gemini_api", fp, lambda: _gemini_api_codegen(fp, timeout))
             if result:
                 return result
             _feed("🌊 Ocean: Gemini API returned nothing — trying next agent…")
@@ -917,3 +797,146 @@ def generate_files_with_fallback(
 
     _feed("🌊 Ocean: all agents exhausted — no files generated.")
     return None
+
+
+# --- batched codegen ----------------------------------------------------------------
+
+DEFAULT_BATCH_TOKENS = 24000
+_TOKENS_PER_FILE = 1500  # rough allowance for each file the model has to write back
+
+
+@dataclass
+class CodegenJob:
+    """One task's share of a batched codegen request."""
+
+    key: str
+    instruction: str
+    files: list[str] = field(default_factory=list)
+
+
+def batching_enabled() -> bool:
+    return os.getenv("OCEAN_CODEGEN_BATCH", "1") not in ("0", "false", "False")
+
+
+def _batch_token_ceiling() -> int:
+    raw = (os.getenv("OCEAN_CODEGEN_BATCH_TOKENS") or "").strip()
+    try:
+        v = int(raw)
+    except ValueError:
+        return DEFAULT_BATCH_TOKENS
+    return v if v > 0 else DEFAULT_BATCH_TOKENS
+
+
+def _job_tokens(job: CodegenJob) -> int:
+    return len(job.instruction) // 4 + _TOKENS_PER_FILE * max(1, len(job.files))
+
+
+def split_batches(jobs: list[CodegenJob], context_tokens: int = 0, ceiling: Optional[int] = None) -> list[list[CodegenJob]]:
+    """Greedily pack jobs (in order) so each request stays under the token ceiling.
+
+    The context bundle is sent once per request, so it counts against every batch; a job
+    that does not fit even alone gets a request of its own.
+    """
+    limit = ceiling or _batch_token_ceiling()
+    batches: list[list[CodegenJob]] = []
+    current: list[CodegenJob] = []
+    used = context_tokens
+    for job in jobs:
+        cost = _job_tokens(job)
+        if current and used + cost > limit:
+            batches.append(current)
+            current, used = [], context_tokens
+        current.append(job)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def compose_batch_instruction(jobs: list[CodegenJob]) -> str:
+    parts = [
+        f"Complete the following {len(jobs)} tasks in one response. Return ONE JSON object "
+        "mapping every file path to its full contents, covering all tasks. Write only the "
+        "files listed for each task."
+    ]
+    for i, job in enumerate(jobs, 1):
+        files = ", ".join(job.files) or "(choose paths)"
+        parts.append(f"### Task {i} [{job.key}] — files: {files}\n{job.instruction}")
+    return "\n\n".join(parts)
+
+
+def attribute_files(jobs: list[CodegenJob], mapping: Dict[str, str]) -> Dict[str, Dict[str, str]]:
+    """Split a combined path→content mapping back into per-job mappings.
+
+    Paths a job listed go to that job; anything else goes to the first job listing a file
+    in the same directory, else to the first job that received files.
+    """
+    out: Dict[str, Dict[str, str]] = {job.key: {} for job in jobs}
+    strays: Dict[str, str] = {}
+    for path, content in mapping.items():
+        owner = next((j.key for j in jobs if path in j.files), None)
+        if owner is None:
+            strays[path] = content
+        else:
+            out[owner][path] = content
+    for path, content in strays.items():
+        parent = str(Path(path).parent)
+        owner = next((j.key for j in jobs if any(str(Path(f).parent) == parent for f in j.files)), None)
+        if owner is None:
+            owner = next((k for k, v in out.items() if v), jobs[0].key)
+        out[owner][path] = content
+    return out
+
+
+def generate_batch(
+    jobs: list[CodegenJob],
+    context_file: Optional[Path] = None,
+    timeout: int = 240,
+    agent: Optional[str] = None,
+) -> Dict[str, Optional[Dict[str, str]]]:
+    """Run several codegen jobs with as few requests as the token ceiling allows.
+
+    Returns ``{job.key: mapping or None}``. A job the merged response left empty is
+    retried once on its own, so one missed task does not fail its neighbours.
+    Emits a ``codegen_batch`` event with per-task status.
+    """
+    from .events_emit import emit_event
+
+    context_tokens = 0
+    if context_file is not None:
+        try:
+            context_tokens = context_file.stat().st_size // 4
+        except OSError:
+            context_tokens = 0
+    results: Dict[str, Optional[Dict[str, str]]] = {}
+    status: Dict[str, str] = {}
+    requests = 0
+    batches = split_batches(jobs, context_tokens) if batching_enabled() else [[j] for j in jobs]
+    for batch in batches:
+        if len(batch) == 1:
+            job = batch[0]
+            requests += 1
+            results[job.key] = generate_files(job.instruction, job.files, context_file, timeout=timeout, agent=agent)
+            status[job.key] = "ok" if results[job.key] else "failed"
+            continue
+        _feed(f"🌊 Ocean: batching {len(batch)} codegen tasks for {agent or 'Ocean'} ({', '.join(j.key for j in batch)})")
+        union = [f for j in batch for f in j.files]
+        requests += 1
+        mapping = generate_files(compose_batch_instruction(batch), union, context_file, timeout=timeout, agent=agent)
+        split = attribute_files(batch, mapping or {})
+        for job in batch:
+            if split[job.key]:
+                results[job.key], status[job.key] = split[job.key], "ok"
+                continue
+            requests += 1
+            results[job.key] = generate_files(job.instruction, job.files, context_file, timeout=timeout, agent=agent)
+            status[job.key] = "retried" if results[job.key] else "failed"
+            if not results[job.key]:
+                _feed(f"🌊 Ocean: ❌ codegen task [{job.key}] produced no files ({last_error() or 'no detail'})")
+    emit_event(
+        "codegen_batch",
+        agent=agent or "Ocean",
+        requests=requests,
+        tasks=[{"key": j.key, "status": status.get(j.key, "failed"), "files": len(results.get(j.key) or {})} for j in jobs],
+    )
+    return results
@@ -0,0 +1,223 @@
+"""Process-wide, TTL-cached Codex CLI auth/health probe.
+
+Probing Codex auth is slow: ``codex auth`` plus up to four token subcommands (each with
+a multi-second timeout) and a scan of ``~/.codex``. ``codex_exec`` and ``codex_client``
+used to repeat that on every codegen call; they now ask this registry instead.
+
+A cached result is reused while its key — the resolved ``codex`` binary (path, mtime)
+and ``~/.codex/auth.json`` (mtime, size) — is unchanged. Past ``OCEAN_CODEX_PROBE_TTL``
+seconds (default 600) the stale result is still returned and a single background thread
+re-probes; a changed key (new binary, fresh login) re-probes synchronously.
+"""
+
+from __future__ import annotations
+
+import base64
+import datetime as _dt
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from .feed import feed as _feed
+
+DEFAULT_TTL = 600.0
+_TOKEN_COMMANDS = (["auth", "print-token"], ["auth", "token"], ["auth", "--show-token"], ["auth", "export"])
+_SCAN_LIMIT = 256 * 1024  # bytes read per file when looking for a token under ~/.codex
+
+
+@dataclass(frozen=True)
+class CodexHealth:
+    bin: Optional[str]
+    logged_in: bool
+    token: str = ""
+    token_source: str = ""
+    checked_at: float = 0.0
+    key: tuple[Any, ...] = ()
+
+
+def _ttl() -> float:
+    raw = (os.getenv("OCEAN_CODEX_PROBE_TTL") or "").strip()
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return DEFAULT_TTL
+
+
+def _auth_json() -> Path:
+    return Path.home() / ".codex" / "auth.json"
+
+
+def _stat(p: Optional[str | Path]) -> Optional[tuple[int, int]]:
+    if not p:
+        return None
+    try:
+        st = os.stat(p)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _key() -> tuple[Any, ...]:
+    codex = shutil.which("codex")
+    return (codex, _stat(codex), str(_auth_json()), _stat(_auth_json()))
+
+
+def jwt_note(tok: str) -> str:
+    """``exp=<iso>[ (expired)]`` from a JWT payload (signature not verified)."""
+    exp_s, expired = "unknown", False
+    try:
+        parts = tok.split(".")
+        if len(parts) >= 2:
+            pad = "=" * (-len(parts[1]) % 4)
+            data = json.loads(base64.urlsafe_b64decode(parts[1] + pad).decode("utf-8", errors="ignore"))
+            exp = data.get("exp")
+            if isinstance(exp, (int, float)):
+                dt = _dt.datetime.fromtimestamp(exp)
+                exp_s, expired = dt.isoformat(sep=" "), dt < _dt.datetime.now()
+    except Exception:
+        pass
+    return f"exp={exp_s}{' (expired)' if expired else ''}"
+
+
+def _scan_token(txt: str) -> Optional[str]:
+    # Common forms: id_token=..., CODEX_AUTH_TOKEN=..., or any JWT-like string
+    for pattern in (r"id_token=([A-Za-z0-9\-_.]+)", r"CODEX_AUTH_TOKEN=\"?([A-Za-z0-9\-_.]+)\"?", r"(ey[A-Za-z0-9_\-\.]{20,})"):
+        m = re.search(pattern, txt)
+        if m:
+            return m.group(1)
+    return None
+
+
+def _token_from_auth_json() -> tuple[str, str]:
+    path = _auth_json()
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return "", ""
+    tok = (data.get("id_token") or "").strip() if isinstance(data, dict) else ""
+    return (tok, str(path)) if tok else ("", "")
+
+
+def _token_from_config_dirs() -> tuple[str, str]:
+    """First JWT-like string under ~/.codex or ~/.config/codex (replaces a shell ``grep -R``)."""
+    jwt = re.compile(r"ey[A-Za-z0-9_\-\.]{20,}")
+    for base in (Path.home() / ".codex", Path.home() / ".config" / "codex"):
+        if not base.is_dir():
+            continue
+        for dirpath, dirnames, filenames in os.walk(base):
+            dirnames.sort()
+            for name in sorted(filenames):
+                p = Path(dirpath) / name
+                try:
+                    with open(p, "rb") as fh:
+                        txt = fh.read(_SCAN_LIMIT).decode("utf-8", errors="ignore")
+                except OSError:
+                    continue
+                m = jwt.search(txt)
+                if m:
+                    return m.group(0), str(p)
+    return "", ""
+
+
+def probe() -> CodexHealth:
+    """Run the full (slow) detection once. Prefer ``get()``."""
+    key = _key()
+    codex = key[0]
+    token, source = _token_from_auth_json()
+    if not token:
+        token, source = _token_from_config_dirs()
+    if token:
+        try:
+            _feed(f"🌊 Ocean: Found Codex token in {source} (masked, {jwt_note(token)}).")
+        except Exception:
+            pass
+    logged_in = bool(token)
+    if codex and not token:
+        try:
+            out = subprocess.run([codex, "auth"], capture_output=True, text=True, timeout=5)
+            txt = (out.stdout or "") + "\n" + (out.stderr or "")
+            logged_in = any(kw in txt.lower() for kw in ("logged in", "authenticated", "already logged"))
+        except Exception:
+            pass
+        # Avoid interactive flows like `codex auth login`; only non-interactive commands.
+        for args in _TOKEN_COMMANDS:
+            try:
+                out = subprocess.run([codex, *args], capture_output=True, text=True, timeout=10)
+            except Exception:
+                continue
+            cand = _scan_token((out.stdout or "") + "\n" + (out.stderr or "")) or ""
+            if len(cand) > 20:
+                token, source = cand, f"{codex} {' '.join(args)}"
+                logged_in = True
+                try:
+                    _feed("🌊 Ocean: Codex auth token acquired (masked).")
+                except Exception:
+                    pass
+                break
+    if not logged_in:
+        logged_in = _auth_json().exists()
+    return CodexHealth(codex, logged_in, token, source, time.time(), key)
+
+
+_cached: Optional[CodexHealth] = None
+_lock = threading.Lock()
+_refreshing = threading.Event()
+
+
+def _refresh_in_background() -> None:
+    """Start the single refresher thread (caller holds ``_lock``)."""
+    if _refreshing.is_set():
+        return
+    _refreshing.set()
+
+    def run() -> None:
+        global _cached
+        try:
+            fresh = probe()
+            with _lock:
+                _cached = fresh
+        finally:
+            _refreshing.clear()
+
+    threading.Thread(target=run, name="ocean-codex-probe", daemon=True).start()
+
+
+def get() -> CodexHealth:
+    """Cached health; probes synchronously only on first use or when the key changed."""
+    global _cached
+    key = _key()
+    with _lock:
+        hit = _cached
+        if hit is None or hit.key != key:
+            hit = _cached = probe()
+        elif time.time() - hit.checked_at > _ttl():
+            _refresh_in_background()
+        return hit
+
+
+def invalidate() -> None:
+    global _cached
+    with _lock:
+        _cached = None
+
+
+_git_roots: dict[str, bool] = {}
+
+
+def inside_git_worktree(cwd: Optional[Path] = None) -> bool:
+    """``git rev-parse --is-inside-work-tree`` without a subprocess (memoized per directory)."""
+    d = (cwd or Path.cwd()).resolve()
+    if _git_roots.get(str(d)):
+        return True
+    # Only positives are memoized; a project may `git init` later in the session
+    found = any((p / ".git").exists() for p in (d, *d.parents))
+    if found:
+        _git_roots[str(d)] = True
+    return found
@@ -0,0 +1,244 @@
+"""Streaming runner for ``codex exec --json``.
+
+The old stream loop in ``codex_exec.generate_files`` spun a core (``readline()`` returning
+``""`` before exit just looped), read stderr only after exit (a chatty stderr could fill
+its pipe and deadlock the child), and kept every stdout line to re-scan the whole
+transcript for JSON at the end.
+
+``run_stream`` multiplexes both pipes with ``selectors`` (blocking in ``select()`` until
+data, exit, or the deadline), splits stdout into JSONL events as bytes arrive, keeps only
+a bounded tail of raw output for diagnostics, and counts tokens as usage events arrive.
+Once the final agent message is seen (``turn.completed`` / ``task_complete``) the child
+gets ``_EXIT_GRACE`` seconds to exit on its own before it is terminated.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import selectors
+import subprocess
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Mapping, Optional, Sequence
+
+_READ = 64 * 1024
+_EXIT_GRACE = 5.0
+TAIL_LINES = 200
+TAIL_BYTES = 64 * 1024
+
+
+class RingBuffer:
+    """Last ``max_lines`` lines / ``max_bytes`` bytes of a stream (oldest dropped first)."""
+
+    def __init__(self, max_lines: int = TAIL_LINES, max_bytes: int = TAIL_BYTES):
+        self.max_bytes = max_bytes
+        self._lines: deque[str] = deque(maxlen=max_lines)
+        self._size = 0
+        self.dropped = 0
+
+    def append(self, line: str) -> None:
+        if len(self._lines) == self._lines.maxlen:
+            self._size -= len(self._lines[0])
+            self.dropped += 1
+        self._lines.append(line)
+        self._size += len(line)
+        while self._size > self.max_bytes and len(self._lines) > 1:
+            self._size -= len(self._lines.popleft())
+            self.dropped += 1
+
+    def lines(self) -> list[str]:
+        return list(self._lines)
+
+    def text(self) -> str:
+        return "\n".join(self._lines)
+
+
+@dataclass
+class StreamEvent:
+    kind: str
+    text: str = ""
+    tokens: int = 0
+    final: bool = False
+    raw: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class StreamResult:
+    returncode: Optional[int]
+    final_message: Optional[str]
+    tokens: int
+    events: int
+    stdout_tail: RingBuffer
+    stderr_tail: RingBuffer
+    timed_out: bool = False
+    early_exit: bool = False
+
+    @property
+    def stdout(self) -> str:
+        """What callers parse: the final message, else the retained stdout tail."""
+        return self.final_message if self.final_message is not None else self.stdout_tail.text()
+
+    @property
+    def stderr(self) -> str:
+        return self.stderr_tail.text()
+
+
+def _usage_tokens(usage: Any) -> int:
+    from .codex_exec import _coerce_token_count
+
+    if isinstance(usage, dict) and isinstance(usage.get("total_token_usage"), dict):
+        usage = usage["total_token_usage"]
+    return _coerce_token_count(usage)
+
+
+def parse_event(evt: Mapping[str, Any]) -> StreamEvent:
+    """Normalize one ``codex exec --json`` line (current and legacy shapes)."""
+    msg = evt.get("msg")
+    if isinstance(msg, dict):  # legacy: {"id": ..., "msg": {"type": ...}}
+        kind = str(msg.get("type") or "event")
+        if kind == "agent_message":
+            return StreamEvent(kind, text=str(msg.get("message") or ""), raw=dict(evt))
+        if kind == "task_complete":
+            return StreamEvent(kind, text=str(msg.get("last_agent_message") or ""), final=True, raw=dict(evt))
+        if kind == "token_count":
+            return StreamEvent(kind, tokens=_usage_tokens(msg.get("info") or msg), raw=dict(evt))
+        return StreamEvent(kind, text=str(msg.get("message") or ""), raw=dict(evt))
+    kind = str(evt.get("type") or evt.get("event") or "evt")
+    item = evt.get("item")
+    if isinstance(item, dict) and kind.startswith("item."):
+        itype = str(item.get("type") or "")
+        text = str(item.get("text") or item.get("command") or "")
+        return StreamEvent(itype or kind, text=text, raw=dict(evt))
+    if kind in ("turn.completed", "turn.failed"):
+        return StreamEvent(kind, tokens=_usage_tokens(evt.get("usage")), final=True, raw=dict(evt))
+    tokens = 0
+    for key in ("usage", "tokens_used", "tokens"):
+        if key in evt:
+            tokens = _usage_tokens(evt.get(key))
+            break
+    text = evt.get("content") or evt.get("text") or evt.get("message") or ""
+    return StreamEvent(kind, text=str(text), tokens=tokens, raw=dict(evt))
+
+
+def run_stream(
+    cmd: Sequence[str],
+    *,
+    env: Optional[Mapping[str, str]] = None,
+    timeout: float = 240,
+    on_event: Optional[Callable[[StreamEvent], None]] = None,
+    on_line: Optional[Callable[[str], None]] = None,
+) -> StreamResult:
+    """Run ``cmd`` and consume its JSONL stdout incrementally.
+
+    ``on_event`` sees each parsed event, ``on_line`` each non-JSON stdout line. Raises
+    ``OSError`` if the process cannot be started; a timeout kills the child and is
+    reported via ``timed_out``.
+    """
+    proc = subprocess.Popen(
+        list(cmd), stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env
+    )
+    out_tail, err_tail = RingBuffer(), RingBuffer()
+    partial = {"stdout": b"", "stderr": b""}
+    last_agent: Optional[str] = None
+    final: Optional[str] = None
+    usage_max = 0
+    n_events = 0
+    timed_out = early = False
+    deadline = time.monotonic() + timeout
+    exit_by: Optional[float] = None
+
+    def handle(name: str, raw: bytes) -> None:
+        nonlocal last_agent, final, usage_max, n_events, exit_by
+        line = raw.decode("utf-8", errors="replace").rstrip("\r")
+        if name == "stderr":
+            err_tail.append(line)
+            return
+        out_tail.append(line)
+        s = line.strip()
+        if not s:
+            return
+        evt = None
+        if s.startswith("{"):
+            try:
+                evt = json.loads(s)
+            except ValueError:
+                evt = None
+        if not isinstance(evt, dict):
+            if on_line:
+                on_line(s)
+            return
+        n_events += 1
+        ev = parse_event(evt)
+        # Usage events may be cumulative or per-turn; keep the largest total seen
+        usage_max = max(usage_max, ev.tokens)
+        if ev.kind == "agent_message" and ev.text:
+            last_agent = ev.text
+        if ev.final and final is None:
+            final = ev.text or last_agent or ""
+            exit_by = time.monotonic() + _EXIT_GRACE
+        if on_event:
+            on_event(ev)
+
+    sel = selectors.DefaultSelector()
+    for name, pipe in (("stdout", proc.stdout), ("stderr", proc.stderr)):
+        if pipe is not None:
+            os.set_blocking(pipe.fileno(), False)
+            sel.register(pipe, selectors.EVENT_READ, name)
+    try:
+        while sel.get_map():
+            now = time.monotonic()
+            if now >= deadline:
+                timed_out = True
+                break
+            if exit_by is not None and now >= exit_by:
+                early = True
+                break
+            wait = min(deadline, exit_by or deadline) - now
+            for key, _ in sel.select(timeout=wait):
+                name = key.data
+                try:
+                    chunk = os.read(key.fd, _READ)
+                except BlockingIOError:
+                    continue
+                if not chunk:
+                    sel.unregister(key.fileobj)
+                    if partial[name]:
+                        handle(name, partial[name])
+                        partial[name] = b""
+                    continue
+                *lines, partial[name] = (partial[name] + chunk).split(b"\n")
+                for line in lines:
+                    handle(name, line)
+    finally:
+        sel.close()
+        if timed_out or early:
+            try:
+                proc.terminate()
+                proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+            except OSError:
+                pass
+        for pipe in (proc.stdout, proc.stderr):
+            if pipe is not None:
+                pipe.close()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+    if final is None and last_agent is not None:
+        final = last_agent
+    return StreamResult(
+        returncode=proc.returncode,
+        final_message=final,
+        tokens=usage_max,
+        events=n_events,
+        stdout_tail=out_tail,
+        stderr_tail=err_tail,
+        timed_out=timed_out,
+        early_exit=early,
+    )
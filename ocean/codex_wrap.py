@@ -339,47 +339,46 @@ def run(argv: List[str] | None = None) -> int:
             return None
 
     def events_loop():
-        last_pos = 0
-        current: Path | None = None
-        while not stop.is_set():
-            p = _find_latest_events()
-            if not p:
-                time.sleep(0.8)
-                continue
-            if p != current:
-                current = p
-                last_pos = 0
+        from . import event_bus
+        from .watcher import watch
+
+        try:
+            LOGS.mkdir(parents=True, exist_ok=True)
+        except Exception:
+            pass
+        # Prefer this session's file; otherwise wait for one to appear
+        env_path = os.getenv("OCEAN_EVENTS_FILE")
+        current = Path(env_path) if env_path else _find_latest_events()
+        if current is None:
+            with watch([LOGS / "events-*.jsonl"]) as watcher:
+                while current is None and not stop.is_set():
+                    watcher.wait(timeout=5)
+                    current = _find_latest_events()
+        if current is None:
+            return
+        # follow() shares the bus's rotation/offset handling; nothing is dropped
+        for ev in event_bus.follow(current, stop=stop, poll=5):
             try:
-                with open(current, "r", encoding="utf-8", errors="ignore") as f:
-                    f.seek(last_pos)
-                    for raw in f.readlines()[-400:]:
-                        try:
-                            import json as _json
-                            ev = _json.loads(raw)
-                        except Exception:
-                            continue
-                        ft = _format_event_for_feed(ev)
-                        if ft:
-                            who, txt = ft
-                            _append(who, txt)
-                        if ev.get("event") == "note":
-                            t = ev.get("title") or ""
-                            _append(ev.get("agent", "Ocean"), t)
-                        # Runtime hints (URLs and quick tests)
-                        if ev.get("event") == "runtime":
-                            urls = ev.get("urls") or []
-                            if isinstance(urls, list):
-                                for u in urls:
-                                    _append("Ocean", f"Runtime: {u}")
-                                    if isinstance(u, str) and u.endswith("/healthz"):
-                                        _append("Ocean", f"Test: curl -fsSL {u} | jq")
-                            _append("Ocean", "Tip: open the UI link in your browser; use the health URL to verify the backend.")
-                        if _update_task_registry(ev):
-                            _post_task_snapshot_if_needed()
-                    last_pos = f.tell()
+                ft = _format_event_for_feed(ev)
+                if ft:
+                    who, txt = ft
+                    _append(who, txt)
+                if ev.get("event") == "note":
+                    t = ev.get("title") or ""
+                    _append(ev.get("agent", "Ocean"), t)
+                # Runtime hints (URLs and quick tests)
+                if ev.get("event") == "runtime":
+                    urls = ev.get("urls") or []
+                    if isinstance(urls, list):
+                        for u in urls:
+                            _append("Ocean", f"Runtime: {u}")
+                            if isinstance(u, str) and u.endswith("/healthz"):
+                                _append("Ocean", f"Test: curl -fsSL {u} | jq")
+                    _append("Ocean", "Tip: open the UI link in your browser; use the health URL to verify the backend.")
+                if _update_task_registry(ev):
+                    _post_task_snapshot_if_needed()
             except Exception:
                 pass
-            time.sleep(0.8)
 
     t_out = threading.Thread(target=reader_loop, daemon=True)
     t_out.start()
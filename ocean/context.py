@@ -1,66 +1,392 @@
+"""Local project context for codegen prompts (``docs/context_summary.md`` / ``context_bundle.md``).
+
+The summary is built against a token budget (``OCEAN_CONTEXT_TOKENS``, default 12000):
+core docs and the repo tree get fixed shares, then file samples are packed newest-first.
+Files over the per-file share are replaced by a signature-only outline, paragraphs already
+present earlier in the summary are dropped, and whatever does not fit is listed by name.
+``focus_context`` re-ranks the samples for one instruction at prompt time.
+"""
+
 from __future__ import annotations
+import ast
+import hashlib
+import json
+import os
+import re
+import threading
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Any, Iterable, Optional
 
 from .models import ProjectSpec
 
 
 DOCS = Path("docs")
 
+_CACHE_NAME = "context_cache.json"
+_CACHE_VERSION = 2
+_TREE_BASES = [Path("."), Path("backend"), Path("ui"), Path("devops"), DOCS]
+_SAMPLE_BASES = [Path("backend"), Path("ui"), DOCS]
+_SAMPLE_SUFFIXES = {".py", ".md", ".json", ".yml", ".yaml", ".html", ".css"}
+# (label, file, share of the token budget)
+_CORE_DOCS = [
+    ("project.json", "project.json", 1 / 8),
+    ("backlog.json", "backlog.json", 1 / 8),
+    ("plan.md", "plan.md", 1 / 8),
+    ("prd.md (truncated)", "prd.md", 1 / 6),
+]
+_TREE_SHARE = 1 / 10
+_FILE_SHARE = 1 / 8  # a sample larger than this is outlined instead of inlined
+DEFAULT_TOKEN_BUDGET = 12000
+_SAMPLES_HEADING = "## file samples (truncated)"
+_FOOTER_TOKENS = 64  # reserved for the "Omitted …" line
+_MIN_DEDUPE_CHARS = 64  # shorter paragraphs (blank lines, braces, short headings) repeat legitimately
+# Agents may build bundles concurrently (see task_graph); builds share files on disk.
+_BUILD_LOCK = threading.RLock()
+
 
 def ensure_docs_dir() -> None:
     DOCS.mkdir(parents=True, exist_ok=True)
 
 
-def _truncate_read(p: Path, limit: int) -> str:
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English prose and code)."""
+    return (len(text) + 3) // 4
+
+
+def token_budget() -> int:
+    """Context token budget (``OCEAN_CONTEXT_TOKENS``, default 12000)."""
+    raw = (os.getenv("OCEAN_CONTEXT_TOKENS") or "").strip()
     try:
-        return p.read_text(encoding="utf-8")[:limit]
+        v = int(raw)
+    except ValueError:
+        return DEFAULT_TOKEN_BUDGET
+    return v if v > 0 else DEFAULT_TOKEN_BUDGET
+
+
+def _read(p: Path) -> str:
+    try:
+        return p.read_text(encoding="utf-8")
     except Exception:
         return ""
 
 
-def build_context_summary() -> Path:
-    """Create docs/context_summary.md capturing local project context."""
-    ensure_docs_dir()
-    out = DOCS / "context_summary.md"
+def _clip(text: str, tokens: int) -> str:
+    limit = tokens * 4
+    if len(text) <= limit:
+        return text
+    return text[:limit] + f"\n… (truncated, ~{estimate_tokens(text) - tokens} more tokens)"
+
+
+def outline(path: Path, text: str) -> str:
+    """Signature-only summary of a large file: defs/classes for Python, headings for
+    Markdown, top-level keys for JSON, otherwise the first lines."""
     lines: list[str] = []
-    # Core docs
-    lines.append("## project.json")
-    lines.append(_truncate_read(DOCS / "project.json", 6000))
-    lines.append("\n## backlog.json")
-    lines.append(_truncate_read(DOCS / "backlog.json", 6000))
-    lines.append("\n## plan.md")
-    lines.append(_truncate_read(DOCS / "plan.md", 6000))
-    lines.append("\n## prd.md (truncated)")
-    lines.append(_truncate_read(DOCS / "prd.md", 8000))
-
-    # Simple tree view (depth <= 3)
-    lines.append("\n## repository tree (depth=3)")
-    root = Path(".")
-    for base in [Path("."), Path("backend"), Path("ui"), Path("devops"), DOCS]:
-        if not base.exists():
+    if path.suffix == ".py":
+        try:
+            tree = ast.parse(text)
+        except (SyntaxError, ValueError):
+            tree = None
+        if tree is not None:
+            doc = ast.get_docstring(tree)
+            if doc:
+                lines.append(f'"""{doc.splitlines()[0]}"""')
+            for node in tree.body:
+                lines.extend(_py_signatures(node, ""))
+    elif path.suffix == ".md":
+        lines = [ln for ln in text.splitlines() if ln.startswith("#")]
+    elif path.suffix == ".json":
+        try:
+            data = json.loads(text)
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            lines = [f"{k}: {type(v).__name__}" for k, v in data.items()]
+        elif isinstance(data, list):
+            lines = [f"list of {len(data)} items"]
+    if not lines:
+        lines = text.splitlines()[:40]
+    total = text.count("\n") + 1
+    return "\n".join([f"(outline; {total} lines)"] + lines)
+
+
+def _py_signatures(node: ast.AST, indent: str) -> list[str]:
+    out: list[str] = []
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+        ret = f" -> {ast.unparse(node.returns)}" if node.returns is not None else ""
+        out.append(f"{indent}{prefix} {node.name}({ast.unparse(node.args)}){ret}: ...")
+        doc = ast.get_docstring(node)
+        if doc:
+            out.append(f'{indent}    """{doc.splitlines()[0]}"""')
+    elif isinstance(node, ast.ClassDef):
+        bases = ", ".join(ast.unparse(b) for b in node.bases)
+        out.append(f"{indent}class {node.name}({bases}):" if bases else f"{indent}class {node.name}:")
+        doc = ast.get_docstring(node)
+        if doc:
+            out.append(f'{indent}    """{doc.splitlines()[0]}"""')
+        for child in node.body:
+            out.extend(_py_signatures(child, indent + "    "))
+    elif isinstance(node, (ast.Assign, ast.AnnAssign)) and not indent:
+        targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+        names = [t.id for t in targets if isinstance(t, ast.Name)]
+        if names and all(n.isupper() for n in names):
+            out.append(" = ".join(names) + " = ...")
+    return out
+
+
+def _dedupe(text: str, seen: set[str]) -> str:
+    """Drop paragraphs already emitted earlier in the summary; remembers new ones."""
+    kept: list[str] = []
+    for block in text.split("\n\n"):
+        norm = block.strip()
+        if len(norm) >= _MIN_DEDUPE_CHARS:
+            h = hashlib.sha1(norm.encode("utf-8")).hexdigest()
+            if h in seen:
+                continue
+            seen.add(h)
+        kept.append(block)
+    return "\n\n".join(kept)
+
+
+def _cache_enabled() -> bool:
+    return os.getenv("OCEAN_CONTEXT_CACHE", "1") not in ("0", "false", "False")
+
+
+def _cache_path() -> Path:
+    return Path(".ocean") / _CACHE_NAME
+
+
+def _generated() -> set[Path]:
+    """Ocean's own context artifacts; never treated as inputs (they would invalidate every build)."""
+    return {DOCS / "context_summary.md", DOCS / "context_bundle.md", _cache_path()}
+
+
+def _stat_key(p: Path) -> list[int] | None:
+    try:
+        st = p.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _scan(base: Path, max_parts: int | None = None) -> list[tuple[Path, list[int] | None]]:
+    """Non-directory paths under ``base`` with their (mtime_ns, size), sorted like ``sorted(rglob)``.
+
+    ``max_parts`` prunes the walk instead of filtering afterwards, so the depth-3 tree
+    never descends into ``.git`` objects or ``node_modules``.
+    """
+    out: list[tuple[Path, list[int] | None]] = []
+    skip = _generated()
+    stack = [base]
+    while stack:
+        d = stack.pop()
+        try:
+            it = os.scandir(d)
+        except OSError:
             continue
-        lines.append(f"# {base}")
-        for path in sorted(base.rglob("*")):
-            try:
-                rel = path.relative_to(root)
-                if len(rel.parts) > 3 or path.is_dir():
+        with it:
+            for entry in it:
+                p = d / entry.name
+                try:
+                    is_dir = entry.is_dir() and not entry.is_symlink()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    if max_parts is None or len(p.parts) < max_parts:
+                        stack.append(p)
                     continue
-                lines.append(str(rel))
-            except Exception:
-                continue
+                if p in skip or (max_parts is not None and len(p.parts) > max_parts):
+                    continue
+                try:
+                    st = entry.stat()
+                    key: list[int] | None = [st.st_mtime_ns, st.st_size]
+                except OSError:
+                    key = None
+                out.append((p, key))
+    out.sort(key=lambda t: t[0])
+    return out
+
+
+def _digest(obj: Any) -> str:
+    return hashlib.sha1(json.dumps(obj, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _load_cache() -> dict[str, Any]:
+    if not _cache_enabled():
+        return {}
+    try:
+        data = json.loads(_cache_path().read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    if not isinstance(data, dict) or data.get("version") != _CACHE_VERSION:
+        return {}
+    return data
+
 
-    # File samples
-    lines.append("\n## file samples (truncated)")
-    for base in [Path("backend"), Path("ui"), DOCS]:
+def _save_cache(data: dict[str, Any]) -> None:
+    if not _cache_enabled():
+        return
+    p = _cache_path()
+    try:
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data) + "\n", encoding="utf-8")
+        os.replace(tmp, p)
+    except OSError:
+        pass
+
+
+def _section(cache: dict[str, Any], name: str, key: Any, build) -> str:
+    """Reuse cached section text when its input key is unchanged; otherwise rebuild."""
+    sections = cache.setdefault("sections", {})
+    prev = sections.get(name)
+    k = _digest(key)
+    if isinstance(prev, dict) and prev.get("key") == k and isinstance(prev.get("text"), str):
+        return prev["text"]
+    text = build()
+    sections[name] = {"key": k, "text": text}
+    return text
+
+
+def _docs_section(cache: dict[str, Any], budget: int) -> str:
+    key = [budget] + [[name, _stat_key(DOCS / name)] for _, name, _ in _CORE_DOCS]
+
+    def build() -> str:
+        lines: list[str] = []
+        for i, (label, name, share) in enumerate(_CORE_DOCS):
+            lines.append(("\n" if i else "") + f"## {label}")
+            lines.append(_clip(_read(DOCS / name), int(budget * share)))
+        return "\n\n".join(lines)
+
+    return _section(cache, "docs", key, build)
+
+
+def _tree_section(cache: dict[str, Any], budget: int) -> str:
+    listing: list[tuple[str, list[str]]] = []
+    for base in _TREE_BASES:
         if not base.exists():
             continue
-        for f in sorted(base.rglob("*")):
-            if f.is_file() and f.suffix in {".py", ".md", ".json", ".yml", ".yaml", ".html", ".css"}:
-                lines.append(f"### {f}")
-                lines.append(_truncate_read(f, 4000))
+        listing.append((str(base), [str(p) for p, _ in _scan(base, max_parts=3)]))
+
+    def build() -> str:
+        lines = ["\n## repository tree (depth=3)"]
+        left = int(budget * _TREE_SHARE)
+        for base, paths in listing:
+            lines.append(f"# {base}")
+            for i, path in enumerate(paths):
+                cost = estimate_tokens(path) + 1
+                if cost > left:
+                    lines.append(f"… ({len(paths) - i} more paths)")
+                    break
+                left -= cost
+                lines.append(path)
+        return "\n\n".join(lines)
+
+    return _section(cache, "tree", [budget, listing], build)
+
+
+def _omitted_footer(paths: list[str], tokens: int, unnamed: int = 0) -> str:
+    """``Omitted …`` line naming as many dropped paths as ``tokens`` allows."""
+    line = "Omitted (over context budget): "
+    for i, path in enumerate(paths):
+        more = f" … and {len(paths) - i + unnamed} more"
+        if estimate_tokens(line + path + ", " + more) > tokens:
+            return line.rstrip(", ") + more
+        line += path + ", "
+    return line.rstrip(", ") + (f" … and {unnamed} more" if unnamed else "")
+
+
+def _samples_section(cache: dict[str, Any], budget: int, seen: set[str]) -> str:
+    """File samples packed newest-first into ``budget`` tokens.
+
+    Only files whose (mtime, size) changed are re-read; large files are outlined, and
+    paragraphs already in ``seen`` (earlier sections) are dropped.
+    """
+    prev = cache.get("samples") if isinstance(cache.get("samples"), dict) else {}
+    fresh: dict[str, Any] = {}
+    per_file = max(256, int(token_budget() * _FILE_SHARE))
+    core = {DOCS / name for _, name, _ in _CORE_DOCS}
+    found: list[tuple[Path, list[int]]] = []
+    for base in _SAMPLE_BASES:
+        if not base.exists():
+            continue
+        for f, key in _scan(base):
+            if f.suffix not in _SAMPLE_SUFFIXES or key is None or f in core:
+                continue
+            found.append((f, key))
+    found.sort(key=lambda t: t[1][0], reverse=True)  # most recently changed first
+    lines = ["\n" + _SAMPLES_HEADING]
+    left = budget - estimate_tokens(lines[0]) - _FOOTER_TOKENS
+    omitted: list[str] = []
+    for f, key in found:
+        name = str(f)
+        hit = prev.get(name)
+        if isinstance(hit, dict) and hit.get("key") == [*key, per_file] and isinstance(hit.get("text"), str):
+            text = hit["text"]
+        else:
+            raw = _read(f)
+            text = raw if estimate_tokens(raw) <= per_file else _clip(outline(f, raw), per_file)
+        fresh[name] = {"key": [*key, per_file], "text": text}
+        body = _dedupe(text, set(seen))
+        cost = estimate_tokens(body) + estimate_tokens(name) + 2
+        if cost > left:
+            omitted.append(name)
+            continue
+        _dedupe(body, seen)
+        left -= cost
+        lines.append(f"### {f}")
+        lines.append(body)
+    if omitted:
+        lines.append(_omitted_footer(omitted, left + _FOOTER_TOKENS))
+    cache["samples"] = fresh
+    return "\n\n".join(lines)
 
-    out.write_text("\n\n".join(lines) + "\n", encoding="utf-8")
+
+def _input_keys(cache: dict[str, Any]) -> tuple[Any, Any]:
+    sections = cache.get("sections") if isinstance(cache.get("sections"), dict) else {}
+    samples = cache.get("samples") if isinstance(cache.get("samples"), dict) else {}
+    return (
+        {k: v.get("key") for k, v in sections.items() if isinstance(v, dict)},
+        {k: v.get("key") for k, v in samples.items() if isinstance(v, dict)},
+    )
+
+
+def _refresh_summary() -> tuple[Path, bool]:
+    """Rebuild docs/context_summary.md from cached sections; returns (path, rewritten)."""
+    ensure_docs_dir()
+    out = DOCS / "context_summary.md"
+    cache = _load_cache()
+    before = _input_keys(cache)
+    budget = token_budget()
+    seen: set[str] = set()
+    head = "\n\n".join([_docs_section(cache, budget), _tree_section(cache, budget)])
+    _dedupe(head, seen)
+    text = "\n\n".join([head, _samples_section(cache, budget - estimate_tokens(head) - 1, seen)]) + "\n"
+    digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+    outputs = cache.get("outputs") if isinstance(cache.get("outputs"), dict) else {}
+    if cache.get("digest") == digest and outputs.get(str(out)) == _stat_key(out):
+        # Same text; still persist refreshed keys so touched-but-unchanged files aren't re-read.
+        if _input_keys(cache) != before:
+            _save_cache(cache)
+        return out, False
+    out.write_text(text, encoding="utf-8")
+    cache["version"] = _CACHE_VERSION
+    cache["digest"] = digest
+    cache["outputs"] = {**outputs, str(out): _stat_key(out)}
+    _save_cache(cache)
+    return out, True
+
+
+def build_context_summary() -> Path:
+    """Create docs/context_summary.md capturing local project context.
+
+    The summary stays within ``OCEAN_CONTEXT_TOKENS`` (see module docstring). Sections
+    are cached in `.ocean/context_cache.json` keyed by path, mtime and size; the file is
+    only rewritten when an input changed. Set OCEAN_CONTEXT_CACHE=0 to rebuild from
+    scratch every call.
+    """
+    with _BUILD_LOCK:
+        out, _ = _refresh_summary()
     return out
 
 
@@ -71,11 +397,91 @@ def build_context_bundle(spec: Optional[ProjectSpec]) -> Path:
     """Create docs/context_bundle.md.
 
     Bundle now includes only the local context summary. Online search context is
-    delegated to Codex (--search) during codegen.
+    delegated to Codex (--search) during codegen. When no input changed since the
+    last build, the existing bundle path is returned without touching disk.
     """
+    with _BUILD_LOCK:
+        return _build_bundle()
+
+
+def _build_bundle() -> Path:
     ensure_docs_dir()
-    summary = build_context_summary()
+    summary, rewritten = _refresh_summary()
     bundle = DOCS / "context_bundle.md"
+    cache = _load_cache()
+    outputs = cache.get("outputs") if isinstance(cache.get("outputs"), dict) else {}
+    current = _stat_key(bundle)
+    if not rewritten and current is not None and outputs.get(str(bundle)) == current:
+        return bundle
     parts = [summary.read_text(encoding="utf-8")]
     bundle.write_text("\n\n".join(parts) + "\n", encoding="utf-8")
+    if cache:
+        cache["outputs"] = {**outputs, str(bundle): _stat_key(bundle)}
+        _save_cache(cache)
     return bundle
+
+
+_WORD = re.compile(r"[a-z][a-z0-9_]{3,}")
+
+
+def _relevance(path: str, body: str, words: set[str], targets: list[str]) -> float:
+    score = 0.0
+    parent = str(Path(path).parent)
+    for t in targets:
+        if path == t:
+            score += 10
+        elif parent == str(Path(t).parent) and parent != ".":
+            score += 3
+    if words:
+        hay = set(_WORD.findall(path.lower())) | set(_WORD.findall(body.lower()))
+        score += 5 * len(words & hay) / len(words)
+    return score
+
+
+def focus_context(text: str, instruction: str, suggested_files: Optional[list[str]] = None, budget: Optional[int] = None) -> str:
+    """Re-rank a summary's file samples for one instruction and fit the prompt to budget.
+
+    Samples naming a suggested file (or sharing its directory) and those sharing words
+    with the instruction move first; the newest-first order breaks ties. Lowest-ranked
+    samples are dropped until summary plus instruction fit ``budget`` tokens. Text
+    without a samples section is returned unchanged.
+    """
+    marker = "\n" + _SAMPLES_HEADING
+    cut = text.find(marker)
+    if cut < 0:
+        return text
+    head, tail = text[:cut], text[cut + len(marker):]
+    footer = ""
+    m = re.search(r"^Omitted \(over context budget\): .*\Z", tail.rstrip("\n"), flags=re.M)
+    if m:
+        footer, tail = m.group(0), tail[: m.start()]
+    # Sample paths all live under _SAMPLE_BASES, so Markdown "###" headings inside a sample don't split it
+    bases = "|".join(re.escape(str(b)) for b in _SAMPLE_BASES)
+    parts = re.split(rf"^### ((?:{bases})/\S+)$", tail, flags=re.M)
+    blocks = [(parts[i], parts[i + 1].strip("\n")) for i in range(1, len(parts) - 1, 2)]
+    words = set(_WORD.findall(instruction.lower()))
+    targets = list(suggested_files or [])
+    ranked = sorted(
+        range(len(blocks)),
+        key=lambda i: (-_relevance(blocks[i][0], blocks[i][1], words, targets), i),
+    )
+    left = (budget or token_budget()) - estimate_tokens(head + marker + instruction) - _FOOTER_TOKENS
+    out = [marker]
+    dropped: list[str] = []
+    for i in ranked:
+        path, body = blocks[i]
+        cost = estimate_tokens(body) + estimate_tokens(path) + 2
+        if cost > left:
+            dropped.append(path)
+            continue
+        left -= cost
+        out.extend([f"### {path}", body])
+    unnamed = 0
+    if footer:
+        # Names already omitted by the builder stay listed after this prompt's drops
+        names, _, more = footer.split(": ", 1)[1].partition(" … and ")
+        dropped += [p for p in names.split(", ") if p]
+        unnamed = int(more.split()[0]) if more else 0
+    if dropped or unnamed:
+        out.append(_omitted_footer(dropped, max(left, 0) + _FOOTER_TOKENS, unnamed))
+    return head + "\n\n".join(out) + "\n"
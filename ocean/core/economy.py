@@ -9,20 +9,27 @@ Session model:
 
 This means a persona that saves across sessions can place a dominant bid
 and guarantee their task goes first.
+
+Wallets live in the runtime store (``.ocean/runtime.sqlite``); minting and charging
+re-read balances inside one write transaction, so concurrent loops never spend the same
+coins twice. An existing ``docs/economy.json`` is imported on first use.
 """
 
 from __future__ import annotations
 
 import json
+import sqlite3
 import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
+from ..runtime.store import get_values, put_values, transaction
+
 PERSONAS = ["Mario", "Q", "Tony", "Moroni", "Edna"]
 HOURLY_SUPPLY = 100          # total coins minted per hour
 SESSION_BUDGET = 30          # coin budget consumed per loop session
-_ECONOMY_FILE = "docs/economy.json"
+_ECONOMY_FILE = "docs/economy.json"  # legacy; imported into the runtime store
 _MIN_MINT = 0.5              # mint when at least half a coin is due
 
 
@@ -71,81 +78,98 @@ class CoinMint:
         self._last_mint_ts: float = 0.0
         self._load()
 
-    def _path(self) -> Path:
-        return self.cwd / _ECONOMY_FILE
+    def _runtime(self) -> Path:
+        return self.cwd / ".ocean"
 
-    def _load(self) -> None:
-        path = self._path()
-        if path.exists():
-            try:
-                data = json.loads(path.read_text(encoding="utf-8"))
-                for p in PERSONAS:
-                    bal = float(data.get("wallets", {}).get(p, 0.0))
-                    self.wallets[p] = Wallet(p, bal)
-                self._last_mint_ts = float(data.get("last_mint_ts", 0.0))
-                return
-            except Exception:
-                pass
-        # Fresh start — seed each persona with their first hour allocation
-        per = HOURLY_SUPPLY / len(PERSONAS)
+    def _read(self, conn: sqlite3.Connection) -> bool:
+        """Load wallets from the store (inside the caller's transaction); False if empty."""
+        rows = dict(conn.execute("select persona, balance from wallets").fetchall())
+        if not rows:
+            return False
         for p in PERSONAS:
-            self.wallets[p] = Wallet(p, per)
-        self._last_mint_ts = time.time()
-        self._save()
-
-    def _save(self) -> None:
-        path = self._path()
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(
-            json.dumps(
-                {
-                    "wallets": {p: w.balance for p, w in self.wallets.items()},
-                    "last_mint_ts": self._last_mint_ts,
-                },
-                indent=2,
-            )
-            + "\n",
-            encoding="utf-8",
+            self.wallets[p] = Wallet(p, float(rows.get(p, 0.0)))
+        self._last_mint_ts = float(get_values(conn, "economy").get("last_mint_ts", 0.0))
+        return True
+
+    def _write(self, conn: sqlite3.Connection) -> None:
+        conn.executemany(
+            "insert into wallets (persona, balance) values (?, ?) "
+            "on conflict (persona) do update set balance = excluded.balance",
+            [(p, w.balance) for p, w in self.wallets.items()],
         )
+        put_values(conn, "economy", {"last_mint_ts": self._last_mint_ts})
+
+    def _import_legacy(self, conn: sqlite3.Connection) -> bool:
+        path = self.cwd / _ECONOMY_FILE
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            for p in PERSONAS:
+                self.wallets[p] = Wallet(p, float(data.get("wallets", {}).get(p, 0.0)))
+            self._last_mint_ts = float(data.get("last_mint_ts", 0.0))
+        except Exception:
+            return False
+        if data.get("last_task"):
+            put_values(conn, "economy", {"last_task": str(data["last_task"])})
+        try:
+            path.rename(path.with_name(path.name + ".migrated"))
+        except OSError:
+            pass
+        return True
+
+    def _load(self) -> None:
+        with transaction(self._runtime()) as conn:
+            if self._read(conn):
+                return
+            if not self._import_legacy(conn):
+                # Fresh start — seed each persona with their first hour allocation
+                per = HOURLY_SUPPLY / len(PERSONAS)
+                for p in PERSONAS:
+                    self.wallets[p] = Wallet(p, per)
+                self._last_mint_ts = time.time()
+            self._write(conn)
 
     def tick(self) -> float:
         """Mint coins proportional to elapsed time. Returns coins newly minted."""
-        now = time.time()
-        elapsed_hours = (now - self._last_mint_ts) / 3600.0
-        coins = HOURLY_SUPPLY * elapsed_hours
-        if coins >= _MIN_MINT:
+        with transaction(self._runtime()) as conn:
+            self._read(conn)
+            now = time.time()
+            elapsed_hours = (now - self._last_mint_ts) / 3600.0
+            coins = HOURLY_SUPPLY * elapsed_hours
+            if coins < _MIN_MINT:
+                return 0.0
             per = coins / len(self.wallets)
             for w in self.wallets.values():
                 w.deposit(per)
             self._last_mint_ts = now
-            self._save()
-            return round(coins, 2)
-        return 0.0
+            self._write(conn)
+        return round(coins, 2)
 
     def run_session(self, nominations: list[Nomination]) -> SessionResult:
         """Greedy fill: sort bids descending, select until session_budget consumed.
 
         Only winning personas are charged. Losers keep all their coins.
         """
-        # Only include nominations the persona can actually cover
-        valid = [n for n in nominations if self.wallets[n.persona].can_bid(n.bid)]
-        sorted_noms = sorted(valid, key=lambda n: n.bid, reverse=True)
-
-        selected: list[Nomination] = []
-        deferred: list[Nomination] = []
-        remaining = self.session_budget
-
-        for nom in sorted_noms:
-            if nom.bid <= remaining + 1e-9:
-                selected.append(nom)
-                remaining -= nom.bid
-            else:
-                deferred.append(nom)
-
-        # Charge only winners
-        for nom in selected:
-            self.wallets[nom.persona].spend(nom.bid)
-        self._save()
+        with transaction(self._runtime()) as conn:
+            self._read(conn)  # balances as of now, not as of construction
+            # Only include nominations the persona can actually cover
+            valid = [n for n in nominations if self.wallets[n.persona].can_bid(n.bid)]
+            sorted_noms = sorted(valid, key=lambda n: n.bid, reverse=True)
+
+            selected: list[Nomination] = []
+            deferred: list[Nomination] = []
+            remaining = self.session_budget
+
+            for nom in sorted_noms:
+                if nom.bid <= remaining + 1e-9:
+                    selected.append(nom)
+                    remaining -= nom.bid
+                else:
+                    deferred.append(nom)
+
+            # Charge only winners
+            for nom in selected:
+                self.wallets[nom.persona].spend(nom.bid)
+            self._write(conn)
 
         return SessionResult(
             selected=selected,
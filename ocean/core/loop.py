@@ -18,7 +18,7 @@ import time
 from pathlib import Path
 
 from ..feed import feed as _feed
-from ..token_budget import usage_recent
+from ..token_budget import seconds_until_under, usage_recent
 from .economy import CoinMint, SESSION_BUDGET
 from .scheduler import PersonaScheduler, load_project_state
 
@@ -40,28 +40,8 @@ def _token_limit(cwd: Path) -> int:
         return _DEFAULT_TOKEN_LIMIT
 
 
-def _ledger_path(cwd: Path) -> Path:
-    d = cwd / ".ocean"
-    d.mkdir(parents=True, exist_ok=True)
-    return d / "token_ledger.json"
-
-
 def _wait_seconds_until_free(cwd: Path, limit: int) -> float:
-    import json, time as _t
-    path = _ledger_path(cwd)
-    if not path.exists():
-        return 0.0
-    try:
-        events = json.loads(path.read_text()).get("events", [])
-        now = _t.time()
-        window = [e for e in events if now - float(e.get("t", 0)) <= 3600]
-        used = sum(int(e.get("n", 0)) for e in window)
-        if used < limit:
-            return 0.0
-        oldest = min(float(e.get("t", now)) for e in window)
-        return max(0.0, 3600.0 - (now - oldest))
-    except Exception:
-        return 0.0
+    return seconds_until_under(limit, cwd=cwd)
 
 
 def _dispatch(description: str, cwd: Path) -> None:
@@ -106,7 +86,7 @@ def run(cwd: Path | None = None) -> None:
             _feed(f"🌊 Ocean: +{minted:.1f} coins minted — {mint.balance_str()}")
 
         # ── token rate limit ──────────────────────────────────────────────────
-        used = usage_recent(_ledger_path(cwd))
+        used = usage_recent(cwd=cwd)
         if used >= token_limit:
             wait = _wait_seconds_until_free(cwd, token_limit)
             _feed(f"🌊 Ocean: token ceiling {used:,}/{token_limit:,} — sleeping {wait:.0f}s")
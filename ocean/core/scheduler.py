@@ -59,14 +59,13 @@ def load_project_state(cwd: Path) -> ProjectState:
     )
 
     last_task = ""
-    economy_path = cwd / "docs" / "economy.json"
-    if economy_path.exists():
-        try:
-            import json
-            data = json.loads(economy_path.read_text())
-            last_task = data.get("last_task", "")
-        except Exception:
-            pass
+    try:
+        from ..runtime.store import connect, get_values
+
+        with connect(cwd / ".ocean") as conn:
+            last_task = str(get_values(conn, "economy").get("last_task", ""))
+    except Exception:
+        pass
 
     return ProjectState(
         has_prd=has_prd,
@@ -0,0 +1,503 @@
+"""Event bus behind ``OCEAN_EVENTS_FILE``: one writer, rotation, offset index, ``follow()``.
+
+Events used to be appended by four ad-hoc helpers that reopened the file per event, and
+a long ``ocean loop`` grew a single unbounded JSONL file that the chat feed re-read
+(keeping only the last 400 lines of each read, silently dropping the rest).
+
+Writing: ``publish()`` hands events to a per-path ``EventLog`` that keeps the file open.
+Events are stamped with ``ts`` and a ``seq`` number that is monotonic across processes
+sharing the log (``ocean loop`` and ``ocean scout`` do); appends happen under a short
+``flock`` on ``<log>.lock``. With ``OCEAN_EVENTS_FLUSH_MS`` > 0 events are buffered and
+written in batches at most that often (default 0: write-through).
+
+Rotation: once the live file passes ``OCEAN_EVENTS_MAX_MB`` (default 32) or its first
+event is older than ``OCEAN_EVENTS_MAX_AGE`` seconds (default 86400) it is renamed to
+``<log>.<n>`` and a fresh live file started; ``OCEAN_EVENTS_KEEP`` (default 10) archived
+segments are kept. Archives do not match ``events-*.jsonl``, so "newest events file"
+lookups keep finding the live one.
+
+Index: every segment has a ``<segment>.idx`` sidecar of fixed-size ``(seq, ts, offset)``
+records, so ``read()`` / ``follow()`` can start at a sequence number or timestamp with a
+binary search instead of a rescan.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import re
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+try:  # POSIX only; on Windows appends stay unlocked (O_APPEND single writes)
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+_REC = struct.Struct("<QdQ")  # seq, ts (epoch seconds), byte offset of the line
+_READ_CHUNK = 64 * 1024
+
+
+def _env_num(name: str, default: float) -> float:
+    raw = (os.getenv(name) or "").strip()
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return default
+
+
+def _max_bytes() -> int:
+    return int(_env_num("OCEAN_EVENTS_MAX_MB", 32) * 1024 * 1024)
+
+
+def _max_age() -> float:
+    return _env_num("OCEAN_EVENTS_MAX_AGE", 86400)
+
+
+def _keep() -> int:
+    return int(_env_num("OCEAN_EVENTS_KEEP", 10))
+
+
+def _flush_s() -> float:
+    return _env_num("OCEAN_EVENTS_FLUSH_MS", 0) / 1000.0
+
+
+# --- segment layout ---------------------------------------------------------------
+
+
+def index_path(segment: Path) -> Path:
+    return segment.with_name(segment.name + ".idx")
+
+
+def _archives(path: Path) -> list[tuple[int, Path]]:
+    pat = re.compile(re.escape(path.name) + r"\.(\d+)$")
+    out: list[tuple[int, Path]] = []
+    try:
+        names = os.listdir(path.parent)
+    except OSError:
+        return out
+    for name in names:
+        m = pat.match(name)
+        if m:
+            out.append((int(m.group(1)), path.parent / name))
+    return sorted(out)
+
+
+def segments(path: Path | str) -> list[Path]:
+    """Archived segments oldest → newest, then the live file (if it exists)."""
+    path = Path(path)
+    segs = [p for _, p in _archives(path)]
+    if path.exists():
+        segs.append(path)
+    return segs
+
+
+def _records(segment: Path) -> list[tuple[int, float, int]]:
+    try:
+        raw = index_path(segment).read_bytes()
+    except OSError:
+        return []
+    n = len(raw) // _REC.size
+    return [_REC.unpack_from(raw, i * _REC.size) for i in range(n)]
+
+
+def _last_record(segment: Path) -> Optional[tuple[int, float, int]]:
+    try:
+        with open(index_path(segment), "rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            n = size // _REC.size
+            if not n:
+                return None
+            fh.seek((n - 1) * _REC.size)
+            return _REC.unpack(fh.read(_REC.size))
+    except OSError:
+        return None
+
+
+@contextmanager
+def _locked(path: Path) -> Iterator[None]:
+    """Exclusive cross-process lock for appends and rotation (not taken by readers)."""
+    if fcntl is None:
+        yield
+        return
+    with open(path.with_name(path.name + ".lock"), "a") as fh:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+# --- writer -----------------------------------------------------------------------
+
+
+class EventLog:
+    """Appender for one events file; share it through ``log_for()``."""
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._pending: list[tuple[float, dict[str, Any]]] = []
+        self._fh: Any = None
+        self._idx: Any = None
+        self._last_flush = 0.0
+
+    def append(self, payload: dict[str, Any]) -> None:
+        with self._lock:
+            self._pending.append((time.time(), payload))
+            if time.monotonic() - self._last_flush >= _flush_s():
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            self._close_files()
+
+    def _close_files(self) -> None:
+        for fh in (self._fh, self._idx):
+            if fh is not None:
+                try:
+                    fh.close()
+                except OSError:
+                    pass
+        self._fh = self._idx = None
+
+    def _ensure_open(self) -> None:
+        """(Re)open the live file if another process rotated it since we opened it."""
+        if self._fh is not None:
+            try:
+                if os.stat(self.path).st_ino == os.fstat(self._fh.fileno()).st_ino:
+                    return
+            except OSError:
+                pass
+            self._close_files()
+        self._fh = open(self.path, "ab")
+        self._idx = open(index_path(self.path), "a+b")
+
+    def _index_record(self, i: int) -> Optional[tuple[int, float, int]]:
+        """Record ``i`` of the live index (negative counts from the end), via the open fd."""
+        fd = self._idx.fileno()
+        n = os.fstat(fd).st_size // _REC.size
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            return None
+        raw = os.pread(fd, _REC.size, i * _REC.size)
+        return _REC.unpack(raw) if len(raw) == _REC.size else None
+
+    def _next_seq(self) -> int:
+        last = self._index_record(-1)
+        if last is None:
+            archives = _archives(self.path)
+            last = _last_record(archives[-1][1]) if archives else None
+        return (last[0] + 1) if last else 1
+
+    def _should_rotate(self, size: int, incoming: int) -> bool:
+        if size == 0:
+            return False
+        limit = _max_bytes()
+        if limit and size + incoming > limit:
+            return True
+        age = _max_age()
+        first = self._index_record(0) if age else None
+        return first is not None and time.time() - first[1] > age
+
+    def _rotate(self) -> None:
+        archives = _archives(self.path)
+        n = (archives[-1][0] + 1) if archives else 1
+        target = self.path.with_name(f"{self.path.name}.{n}")
+        self._close_files()
+        os.replace(self.path, target)
+        try:
+            os.replace(index_path(self.path), index_path(target))
+        except OSError:
+            pass
+        archives.append((n, target))
+        keep = _keep()
+        for _, old in archives[: max(0, len(archives) - keep)]:
+            for p in (old, index_path(old)):
+                try:
+                    p.unlink()
+                except OSError:
+                    pass
+
+    def _flush_locked(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with _locked(self.path):
+                self._ensure_open()
+                seq = self._next_seq()
+                lines: list[bytes] = []
+                for ts, payload in batch:
+                    lines.append((json.dumps({**payload, "seq": seq}, ensure_ascii=False) + "\n").encode("utf-8"))
+                    seq += 1
+                size = os.fstat(self._fh.fileno()).st_size
+                if self._should_rotate(size, sum(map(len, lines))):
+                    self._rotate()
+                    self._ensure_open()
+                    size = 0
+                first = seq - len(lines)
+                offset = size
+                recs = []
+                for i, (line, (ts, _)) in enumerate(zip(lines, batch)):
+                    recs.append(_REC.pack(first + i, ts, offset))
+                    offset += len(line)
+                self._fh.write(b"".join(lines))
+                self._fh.flush()
+                self._idx.write(b"".join(recs))
+                self._idx.flush()
+        except Exception:
+            # Best-effort like the helpers this replaces: never break the caller
+            self._close_files()
+
+
+_logs: dict[str, EventLog] = {}
+_logs_lock = threading.Lock()
+_flusher: Optional[threading.Thread] = None
+
+
+def log_for(path: Path | str) -> EventLog:
+    key = os.path.abspath(path)
+    with _logs_lock:
+        log = _logs.get(key)
+        if log is None:
+            log = _logs[key] = EventLog(key)
+        return log
+
+
+def _flush_periodically() -> None:
+    while True:
+        time.sleep(max(0.01, _flush_s() or 1.0))
+        flush_all()
+
+
+def _start_flusher() -> None:
+    global _flusher
+    with _logs_lock:
+        if _flusher is None:
+            _flusher = threading.Thread(target=_flush_periodically, name="ocean-events-flush", daemon=True)
+            _flusher.start()
+
+
+def publish(event: str, **data: object) -> None:
+    """Append ``{"event", "ts", **data, "seq"}`` to ``OCEAN_EVENTS_FILE`` (no-op if unset)."""
+    path = os.getenv("OCEAN_EVENTS_FILE")
+    if not path:
+        return
+    payload = {"event": event, "ts": datetime.now(timezone.utc).isoformat(), **data}
+    if _flush_s():
+        _start_flusher()
+    log_for(path).append(payload)
+
+
+def flush_all() -> None:
+    with _logs_lock:
+        logs = list(_logs.values())
+    for log in logs:
+        log.flush()
+
+
+atexit.register(flush_all)
+
+
+# --- readers ----------------------------------------------------------------------
+
+
+def seek(path: Path | str, *, seq: Optional[int] = None, ts: Optional[float] = None) -> tuple[Path, int]:
+    """(segment, byte offset) of the first event with ``seq >= seq`` / ``ts >= ts``.
+
+    Past the end of the log this is the end of the live file.
+    """
+    path = Path(path)
+    if seq is None and ts is None:
+        return path, 0
+    col = 0 if seq is not None else 1
+    target = seq if seq is not None else ts
+    for seg in segments(path):
+        recs = _records(seg)
+        if not recs or recs[-1][col] < target:
+            continue
+        lo, hi = 0, len(recs) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if recs[mid][col] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return seg, recs[lo][2]
+    try:
+        return path, path.stat().st_size
+    except OSError:
+        return path, 0
+
+
+def last_seq(path: Path | str) -> Optional[int]:
+    """``seq`` of the newest indexed event (None for an empty or unindexed log)."""
+    for seg in reversed(segments(path)):
+        rec = _last_record(seg)
+        if rec is not None:
+            return rec[0]
+    return None
+
+
+def _parse(line: bytes) -> Optional[dict[str, Any]]:
+    if not line.strip():
+        return None
+    try:
+        ev = json.loads(line)
+    except ValueError:
+        return None
+    return ev if isinstance(ev, dict) else None
+
+
+def _start(path: Path, since_seq: Optional[int], since_ts: Optional[float], from_end: bool) -> tuple[Path, int]:
+    if since_seq is not None or since_ts is not None:
+        return seek(path, seq=since_seq, ts=since_ts)
+    if from_end:
+        try:
+            return path, path.stat().st_size
+        except OSError:
+            return path, 0
+    return path, 0
+
+
+def _open_segments(path: Path, seg: Path, offset: int, *, upto_live: bool) -> list[Any]:
+    """Open ``seg`` at ``offset`` (plus every later segment when ``upto_live``)."""
+    segs = segments(path)
+    start = segs.index(seg) if seg in segs else len(segs)
+    out = []
+    for i, s in enumerate(segs[start:] if upto_live else segs[start:start + 1]):
+        try:
+            fh = open(s, "rb")
+        except OSError:
+            continue
+        if i == 0:
+            fh.seek(offset)
+        out.append(fh)
+    return out
+
+
+def read(
+    path: Path | str, *, since_seq: Optional[int] = None, since_ts: Optional[float] = None
+) -> Iterator[dict[str, Any]]:
+    """Events currently on disk, across segments, starting at ``since_seq`` / ``since_ts``.
+
+    Without either, only the live segment is read.
+    """
+    path = Path(path)
+    flush_all()
+    if not path.parent.is_dir():
+        return
+    # Seek and open under the writers' lock so a rotation cannot slip in between
+    with _locked(path):
+        seg, offset = _start(path, since_seq, since_ts, False)
+        handles = _open_segments(path, seg, offset, upto_live=True)
+    for fh in handles:
+        with fh:
+            for line in fh:
+                if not line.endswith(b"\n"):
+                    break  # partial line still being written
+                ev = _parse(line)
+                if ev is not None:
+                    yield ev
+
+
+def _reopen(path: Path, next_seq: Optional[int], ino: int) -> Any:
+    """Handle positioned at ``next_seq`` after our segment was rotated away (None: not yet)."""
+    with _locked(path):
+        if next_seq is not None:
+            seg, offset = seek(path, seq=next_seq)
+        else:
+            segs = segments(path)
+            inos = []
+            for s in segs:
+                try:
+                    inos.append(s.stat().st_ino)
+                except OSError:
+                    inos.append(None)
+            at = inos.index(ino) + 1 if ino in inos else len(segs) - 1
+            if not 0 <= at < len(segs):
+                return None
+            seg, offset = segs[at], 0
+        handles = _open_segments(path, seg, offset, upto_live=False)
+    return handles[0] if handles else None
+
+
+def follow(
+    path: Path | str,
+    *,
+    since_seq: Optional[int] = None,
+    since_ts: Optional[float] = None,
+    from_end: bool = False,
+    stop: Optional[threading.Event] = None,
+    poll: float = 1.0,
+) -> Iterator[dict[str, Any]]:
+    """Yield events as they are appended, across rotations, until ``stop`` is set.
+
+    Starts at ``since_seq`` / ``since_ts`` (index seek), at the end of the live file with
+    ``from_end``, or else at the start of the live file. Sleeps on a filesystem watcher
+    between writes; ``poll`` bounds how long ``stop`` can go unnoticed.
+    """
+    from .watcher import watch
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    flush_all()
+    fh = None
+    pending = b""
+    next_seq: Optional[int] = None
+    with watch([path]) as w:
+        try:
+            while not (stop is not None and stop.is_set()):
+                if fh is None:
+                    with _locked(path):
+                        seg, offset = _start(path, since_seq, since_ts, from_end)
+                        handles = _open_segments(path, seg, offset, upto_live=False)
+                    if not handles:
+                        w.wait(poll)
+                        continue
+                    fh = handles[0]
+                chunk = fh.read(_READ_CHUNK)
+                if chunk:
+                    *lines, pending = (pending + chunk).split(b"\n")
+                    for line in lines:
+                        ev = _parse(line)
+                        if ev is None:
+                            continue
+                        if isinstance(ev.get("seq"), int):
+                            next_seq = ev["seq"] + 1
+                        yield ev
+                    continue
+                # At EOF: move on if our segment was rotated away from the live path
+                ino = os.fstat(fh.fileno()).st_ino
+                try:
+                    live = os.stat(path).st_ino
+                except OSError:
+                    live = None
+                if live is not None and live != ino:
+                    if fh.read(1):  # final bytes written just before rotation
+                        fh.seek(-1, os.SEEK_CUR)
+                        continue
+                    nxt = _reopen(path, next_seq, ino)
+                    if nxt is not None:
+                        fh.close()
+                        fh, pending = nxt, b""
+                        continue
+                w.wait(poll)
+        finally:
+            if fh is not None:
+                fh.close()
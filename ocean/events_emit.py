@@ -1,22 +1,15 @@
-"""Append structured JSON lines to ``OCEAN_EVENTS_FILE`` for external hosts / tooling."""
+"""Append structured JSON lines to ``OCEAN_EVENTS_FILE`` for external hosts / tooling.
+
+Writes go through ``event_bus`` (shared writer, rotation, offset index).
+"""
 
 from __future__ import annotations
 
-import json
-import os
-from datetime import datetime, timezone
+from .event_bus import publish
 
 
 def emit_event(event: str, **data: object) -> None:
-    path = os.getenv("OCEAN_EVENTS_FILE")
-    if not path:
-        return
-    payload = {"event": event, "ts": datetime.now(timezone.utc).isoformat(), **data}
-    try:
-        with open(path, "a", encoding="utf-8") as fh:
-            fh.write(json.dumps(payload, ensure_ascii=False) + "\n")
-    except Exception:
-        pass
+    publish(event, **data)
 
 
 def emit_setup(kind: str, **data: object) -> None:
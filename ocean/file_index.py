@@ -0,0 +1,273 @@
+"""Pruned, incrementally refreshed file-tree index per project root.
+
+``sorted(root.rglob("*"))`` stats and sorts every path (``node_modules``, ``.git``,
+virtualenvs) before filtering. ``FileIndex`` walks with ``os.scandir``, never descends
+into ignored directories (the fixed ``IGNORED_DIRS`` plus ``.gitignore`` rules), and keeps
+the sorted file list in memory. A refresh only stats known directories: a changed
+directory mtime means entries were added/removed there, so just that directory is
+rescanned; a new, edited or deleted ignore file (root or nested ``.gitignore``,
+``.git/info/exclude``) rebuilds the index. Refreshes are throttled to
+one per ``OCEAN_FILE_INDEX_TTL`` seconds (default 2). File sizes are read at query time
+for the returned page only.
+"""
+
+from __future__ import annotations
+
+import bisect
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+IGNORED_DIRS = frozenset(
+    {".git", ".ocean", "__pycache__", ".pytest_cache", "node_modules", "venv", ".venv", "logs", "dist", "build"}
+)
+DEFAULT_TTL = 2.0
+
+
+def _ttl() -> float:
+    raw = (os.getenv("OCEAN_FILE_INDEX_TTL") or "").strip()
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return DEFAULT_TTL
+
+
+def _mtime(path: Path) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class GitIgnore:
+    """The common subset of ``.gitignore`` syntax: globs, ``**``, anchored ``/x``,
+    directory-only ``x/`` and ``!`` negation (last match wins). Rules from nested
+    ``.gitignore`` files apply relative to their own directory."""
+
+    def __init__(self) -> None:
+        # (base dir, regex, negate, dir_only)
+        self.rules: list[tuple[str, re.Pattern[str], bool, bool]] = []
+        self.loaded: dict[Path, Optional[int]] = {}  # ignore file -> mtime_ns when read (None: absent)
+
+    def add_file(self, path: Path, base: str) -> bool:
+        """Load ``path``'s rules once; True if it was not loaded before."""
+        if path in self.loaded:
+            return False
+        self.loaded[path] = _mtime(path)
+        try:
+            lines = path.read_text(encoding="utf-8", errors="ignore").splitlines()
+        except OSError:
+            return
+        for raw in lines:
+            line = raw.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            # A slash at the start or in the middle anchors the pattern to ``base``
+            anchored = "/" in line
+            line = line.lstrip("/")
+            if not line:
+                continue
+            self.rules.append((base, _glob_regex(line, anchored), negate, dir_only))
+        return True
+
+    def stale(self) -> bool:
+        """True once any loaded ignore file was edited, created or deleted."""
+        return any(_mtime(path) != seen for path, seen in self.loaded.items())
+
+    def ignored(self, rel: str, is_dir: bool) -> bool:
+        hit = False
+        for base, rx, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if base:
+                if not rel.startswith(base + "/"):
+                    continue
+                sub = rel[len(base) + 1:]
+            else:
+                sub = rel
+            if rx.fullmatch(sub):
+                hit = not negate
+        return hit
+
+
+def _glob_regex(pattern: str, anchored: bool) -> re.Pattern[str]:
+    out = ""
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out += "(?:.*/)?"
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out += ".*"
+            i += 2
+            continue
+        out += {"*": "[^/]*", "?": "[^/]"}.get(c, re.escape(c))
+        i += 1
+    # Unanchored patterns match at any depth
+    return re.compile(out if anchored else "(?:.*/)?" + out)
+
+
+class FileIndex:
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self._files: list[str] = []
+        self._dirs: dict[str, int] = {}  # rel dir ("" = root) -> mtime_ns when last scanned
+        self._children: dict[str, list[str]] = {}  # rel dir -> files directly inside
+        self._ignore = GitIgnore()
+        self._ignore_added = False  # a nested .gitignore appeared during an incremental scan
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self.scans = 0  # directories read since creation (for tests / diagnostics)
+
+    # --- walking -----------------------------------------------------------------
+
+    def _skip(self, rel: str, name: str, is_dir: bool) -> bool:
+        if is_dir and name in IGNORED_DIRS:
+            return True
+        return self._ignore.ignored(rel, is_dir)
+
+    def _scan_dir(self, rel: str) -> list[str]:
+        """Read one directory: record its files, return its subdirectories."""
+        path = self.root / rel if rel else self.root
+        self.scans += 1
+        files: list[str] = []
+        subdirs: list[str] = []
+        try:
+            st = os.stat(path)
+            it = os.scandir(path)
+        except OSError:
+            self._dirs.pop(rel, None)
+            self._children.pop(rel, None)
+            return []
+        if rel and (path / ".gitignore").is_file() and self._ignore.add_file(path / ".gitignore", rel):
+            self._ignore_added = True
+        with it:
+            for entry in it:
+                child = f"{rel}/{entry.name}" if rel else entry.name
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                if self._skip(child, entry.name, is_dir):
+                    continue
+                if is_dir:
+                    subdirs.append(child)
+                else:
+                    files.append(child)
+        self._dirs[rel] = st.st_mtime_ns
+        self._children[rel] = files
+        return subdirs
+
+    def _walk(self, rel: str) -> None:
+        stack = [rel]
+        while stack:
+            stack.extend(self._scan_dir(stack.pop()))
+
+    def _subdirs(self, rel: str) -> set[str]:
+        """Indexed directories directly inside ``rel``."""
+        if not rel:
+            return {d for d in self._dirs if d and "/" not in d}
+        prefix = rel + "/"
+        return {d for d in self._dirs if d.startswith(prefix) and "/" not in d[len(prefix):]}
+
+    def _drop_tree(self, rel: str) -> None:
+        prefix = rel + "/"
+        for d in [d for d in self._dirs if d == rel or d.startswith(prefix)]:
+            self._dirs.pop(d, None)
+            self._children.pop(d, None)
+
+    def _rebuild(self) -> None:
+        self._dirs.clear()
+        self._children.clear()
+        self._ignore = GitIgnore()
+        self._ignore.add_file(self.root / ".gitignore", "")
+        self._ignore.add_file(self.root / ".git" / "info" / "exclude", "")
+        self._walk("")
+        self._ignore_added = False
+
+    def refresh(self, force: bool = False) -> None:
+        """Bring the index up to date (no-op within the TTL unless ``force``)."""
+        now = time.monotonic()
+        with self._lock:
+            if not force and self._dirs and now - self._checked < _ttl():
+                return
+            self._checked = now
+            if not self._dirs or self._ignore.stale():
+                self._rebuild()
+            else:
+                for rel, seen in list(self._dirs.items()):
+                    if rel not in self._dirs:
+                        continue  # dropped along with a removed parent
+                    try:
+                        mtime = os.stat(self.root / rel if rel else self.root).st_mtime_ns
+                    except OSError:
+                        self._drop_tree(rel)
+                        continue
+                    if mtime == seen:
+                        continue
+                    before = self._subdirs(rel)
+                    now_sub = set(self._scan_dir(rel))
+                    for gone in before - now_sub:
+                        self._drop_tree(gone)
+                    for new in now_sub - before:
+                        self._walk(new)
+                if self._ignore_added:
+                    # Its rules may hide directories indexed before it existed
+                    self._rebuild()
+            self._files = sorted(f for files in self._children.values() for f in files)
+
+    # --- queries -----------------------------------------------------------------
+
+    def paths(self, prefix: str = "") -> list[str]:
+        self.refresh()
+        files = self._files
+        if not prefix:
+            return list(files)
+        lo = bisect.bisect_left(files, prefix)
+        hi = lo
+        while hi < len(files) and files[hi].startswith(prefix):
+            hi += 1
+        return files[lo:hi]
+
+    def query(self, *, prefix: str = "", offset: int = 0, limit: int = 160) -> dict[str, Any]:
+        """One page of ``{"path", "size"}`` items under ``prefix`` plus paging info."""
+        matches = self.paths(prefix)
+        offset = max(0, offset)
+        page: list[dict[str, Any]] = []
+        for rel in matches[offset: offset + max(0, limit)]:
+            try:
+                size = os.stat(self.root / rel).st_size
+            except OSError:
+                continue  # deleted since the last refresh
+            page.append({"path": rel, "size": size})
+        end = offset + max(0, limit)
+        return {"files": page, "total": len(matches), "next_offset": end if end < len(matches) else None}
+
+
+_indexes: dict[str, FileIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def index_for(root: Path | str) -> FileIndex:
+    """Shared index for ``root`` (one per resolved path per process)."""
+    key = str(Path(root).resolve())
+    with _indexes_lock:
+        idx = _indexes.get(key)
+        if idx is None:
+            idx = _indexes[key] = FileIndex(Path(key))
+        return idx
+
+
+def file_paths(root: Path | str, *, limit: Optional[int] = None, prefix: str = "") -> list[str]:
+    paths = index_for(root).paths(prefix)
+    return paths if limit is None else paths[:limit]
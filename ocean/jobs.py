@@ -7,7 +7,7 @@ from pathlib import Path
 from typing import Any
 
 from .actors import coverage_report, load_actors
-from .product_loop import next_action
+from .product_loop import ProjectSnapshot, next_action
 
 
 @dataclass
@@ -73,6 +73,7 @@ def plan_jobs(
     test_results: str = "",
     candidate_tasks: list[str] | None = None,
     use_advisor: bool = True,
+    snapshot: ProjectSnapshot | None = None,
 ) -> dict[str, Any]:
     root = Path(project_root).expanduser().resolve()
     guidance = next_action(
@@ -81,6 +82,7 @@ def plan_jobs(
         test_results=test_results,
         candidate_tasks=candidate_tasks or [],
         use_advisor=use_advisor,
+        snapshot=snapshot,
     )
     actors = load_actors(root)
     jobs = _jobs_from_guidance(guidance.to_dict(), actors)
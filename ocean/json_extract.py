@@ -0,0 +1,92 @@
+"""Find JSON objects embedded in model output (banners, tool logs, markdown fences).
+
+Shared by the Codex, Claude and advisor backends. Candidate starts are ``{`` followed
+by a key quote or ``}`` (braces in prose, shell output and code are skipped by the
+regex without a parse attempt). Each candidate is handed to
+``json.JSONDecoder.raw_decode``, which parses in C and stops at the end of the object;
+on success the scan resumes *after* that object, so a transcript is walked once instead
+of re-parsing every suffix. A candidate that fails to parse is skipped to its matching
+close brace (or the end of the text, when truncated), so the objects nested inside a
+malformed reply are never yielded as if they were the reply.
+"""
+
+from __future__ import annotations
+
+import re
+from json import JSONDecoder
+from typing import Any, Callable, Iterator, Optional
+
+_DECODER = JSONDecoder()
+# Failed raw_decode calls are not free (JSONDecodeError counts lines up to the error
+# offset), so only plausible object starts are tried.
+_OBJECT_START = re.compile(r'\{\s*["}]')
+_STRUCTURE = re.compile(r'[{}"]')
+_STRING_REST = re.compile(r'(?:[^"\\]|\\.)*"', re.S)
+
+
+def _skip_object(text: str, i: int) -> int:
+    """Index just past the brace matching the ``{`` at ``i`` (``len(text)`` if unbalanced)."""
+    depth, pos = 0, i
+    while True:
+        m = _STRUCTURE.search(text, pos)
+        if m is None:
+            return len(text)
+        ch, pos = m.group(), m.end()
+        if ch == '"':
+            rest = _STRING_REST.match(text, pos)
+            if rest is None:
+                return len(text)  # unterminated string
+            pos = rest.end()
+        elif ch == "{":
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return pos
+
+
+def iter_json_objects(text: str) -> Iterator[dict[str, Any]]:
+    """Yield top-level JSON objects in ``text``, left to right."""
+    if not text:
+        return
+    m = _OBJECT_START.search(text)
+    while m is not None:
+        i = m.start()
+        try:
+            obj, end = _DECODER.raw_decode(text, i)
+        except ValueError:
+            m = _OBJECT_START.search(text, _skip_object(text, i))
+            continue
+        if isinstance(obj, dict):
+            yield obj
+        m = _OBJECT_START.search(text, end)
+
+
+def extract_json(
+    text: str,
+    match: Optional[Callable[[dict[str, Any]], bool]] = None,
+    *,
+    require_match: bool = False,
+) -> Optional[dict[str, Any]]:
+    """Return the first JSON object in ``text``.
+
+    With ``match``, the first object satisfying it wins; otherwise the first object
+    found is returned (or None when ``require_match`` is set).
+    """
+    first: Optional[dict[str, Any]] = None
+    for obj in iter_json_objects(text):
+        if match is None:
+            return obj
+        try:
+            if match(obj):
+                return obj
+        except Exception:
+            pass
+        if first is None:
+            first = obj
+    return None if require_match else first
+
+
+def is_file_map(obj: dict[str, Any]) -> bool:
+    """True for a non-empty ``{path: content}`` mapping of strings."""
+    return bool(obj) and all(isinstance(k, str) and isinstance(v, str) for k, v in obj.items())
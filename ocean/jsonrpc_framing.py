@@ -0,0 +1,148 @@
+"""Chunked JSON-RPC stdio framing shared by the MCP server and client.
+
+Two wire formats are understood:
+
+- ``lsp``: ``Content-Length: N\\r\\n\\r\\n`` headers followed by an N-byte body.
+- ``ndjson``: one JSON document per line.
+
+``auto`` decides per message: a frame starting with ``{`` is NDJSON, anything else is a
+header block. Input is pulled in large chunks (``read1`` / ``os.read``) into one
+``bytearray``; headers are located with ``find`` from where the last scan stopped, and
+each body is copied out exactly once.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import BinaryIO, Optional
+
+CHUNK_SIZE = 64 * 1024
+_HEADER_END = b"\r\n\r\n"
+
+
+class FramingError(ValueError):
+    pass
+
+
+def frame_lsp(body: bytes) -> bytes:
+    return f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body
+
+
+def frame_ndjson(body: bytes) -> bytes:
+    return body + b"\n"
+
+
+def _content_length(header: bytes) -> int:
+    for line in header.split(b"\r\n"):
+        name, sep, value = line.partition(b":")
+        if sep and name.strip().lower() == b"content-length":
+            try:
+                return int(value.strip())
+            except ValueError:
+                raise FramingError(f"bad Content-Length: {value!r}") from None
+    raise FramingError("missing Content-Length header")
+
+
+class FrameReader:
+    """Incremental frame parser; ``feed`` bytes in, ``next_frame`` bodies out.
+
+    With a ``stream`` attached, ``read_frame`` blocks until a whole frame is buffered
+    (or EOF). ``last_framing`` records the format of the most recent frame so a server
+    can answer in kind.
+    """
+
+    def __init__(self, stream: Optional[BinaryIO] = None, framing: str = "auto", chunk_size: int = CHUNK_SIZE):
+        if framing not in ("auto", "lsp", "ndjson"):
+            raise ValueError(f"unknown framing: {framing}")
+        self.stream = stream
+        self.framing = framing
+        self.chunk_size = chunk_size
+        self.last_framing = "lsp" if framing == "auto" else framing
+        self._buf = bytearray()
+        self._scan = 0  # bytes already searched for a terminator
+        self._need: Optional[tuple[int, int]] = None  # (body start, body end) once header parsed
+        self._read1 = getattr(stream, "read1", None)
+        self._fd: Optional[int] = None
+        if self._read1 is None and stream is not None:
+            try:
+                self._fd = stream.fileno()
+            except (AttributeError, OSError, ValueError):
+                self._fd = None
+
+    def feed(self, data: bytes) -> None:
+        self._buf += data
+
+    def buffered(self) -> int:
+        return len(self._buf)
+
+    def _take(self, start: int, end: int, consumed: int) -> bytes:
+        body = bytes(memoryview(self._buf)[start:end])
+        del self._buf[:consumed]
+        self._scan = 0
+        self._need = None
+        return body
+
+    def next_frame(self) -> Optional[bytes]:
+        """Pop one complete frame body from the buffer, or None if more input is needed."""
+        buf = self._buf
+        while True:
+            if self._need is not None:
+                start, end = self._need
+                if len(buf) < end:
+                    return None
+                return self._take(start, end, end)
+            if not buf:
+                return None
+            mode = self.framing
+            if mode == "auto":
+                # Skip blank lines between NDJSON documents / stray CRLFs
+                i = 0
+                while i < len(buf) and buf[i] in b" \t\r\n":
+                    i += 1
+                if i:
+                    del buf[:i]
+                    self._scan = max(0, self._scan - i)
+                    if not buf:
+                        return None
+                mode = "ndjson" if buf[0:1] in (b"{", b"[") else "lsp"
+            if mode == "ndjson":
+                nl = buf.find(b"\n", self._scan)
+                if nl == -1:
+                    self._scan = len(buf)
+                    return None
+                self.last_framing = "ndjson"
+                body = self._take(0, nl, nl + 1)
+                if body.strip():
+                    return body
+                continue
+            he = buf.find(_HEADER_END, max(0, self._scan - 3))
+            if he == -1:
+                self._scan = len(buf)
+                return None
+            length = _content_length(bytes(buf[:he]))
+            start = he + len(_HEADER_END)
+            self._need = (start, start + length)
+            self.last_framing = "lsp"
+
+    def _fill(self) -> bool:
+        if self._read1 is not None:
+            data = self._read1(self.chunk_size)
+        elif self._fd is not None:
+            data = os.read(self._fd, self.chunk_size)
+        elif self.stream is not None:
+            data = self.stream.read(self.chunk_size)
+        else:
+            return False
+        if not data:
+            return False
+        self._buf += data
+        return True
+
+    def read_frame(self) -> Optional[bytes]:
+        """Block until one frame is available; None at EOF."""
+        while True:
+            body = self.next_frame()
+            if body is not None:
+                return body
+            if not self._fill():
+                return None
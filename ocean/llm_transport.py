@@ -0,0 +1,278 @@
+"""Pooled HTTP transport for the OpenAI / Gemini API backends.
+
+Every API call used to go through module-level ``httpx.post``: a fresh TCP+TLS
+connection per request, no keep-alive and no limit on parallel calls. This module keeps
+one ``httpx.Client`` per host (keep-alive, HTTP/2 when ``h2`` is installed), takes a
+``rate_limiter`` lease per attempt (per user, adapts to 429s and latency; ceilings
+``OCEAN_CONCURRENCY_OPENAI_API`` / ``OCEAN_CONCURRENCY_GEMINI_API``), and retries
+408/429/5xx and connection errors with jittered exponential backoff (``Retry-After`` wins
+when the server sends it).
+
+``generate_many`` is the async fan-out: several prompts in flight at once over one
+pooled ``AsyncClient`` per provider.
+
+Base URLs can be pointed at a local stub with ``OCEAN_OPENAI_BASE_URL`` /
+``OCEAN_GEMINI_BASE_URL``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional, Sequence
+from urllib.parse import urlsplit
+
+import httpx
+
+from . import rate_limiter
+from .task_graph import backend_concurrency
+
+PROVIDERS: dict[str, str] = {
+    "openai": "https://api.openai.com",
+    "gemini": "https://generativelanguage.googleapis.com",
+}
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+def _retryable(status: int) -> bool:
+    """Transient statuses only: a 4xx such as 409 would fail again and re-bill the prompt."""
+    return status in (408, 429) or 500 <= status < 600
+
+
+_clients: dict[str, httpx.Client] = {}
+_lock = threading.Lock()
+
+
+def base_url(provider: str) -> str:
+    override = (os.getenv(f"OCEAN_{provider.upper()}_BASE_URL") or "").strip()
+    return (override or PROVIDERS[provider]).rstrip("/")
+
+
+def url(provider: str, path: str) -> str:
+    return base_url(provider) + path
+
+
+def _provider_for(target: str) -> str:
+    host = urlsplit(target).netloc
+    for name in PROVIDERS:
+        if urlsplit(base_url(name)).netloc == host:
+            return name
+    return host
+
+
+def _backend_for(target: str) -> Optional[str]:
+    """Limiter backend for a URL (None for hosts Ocean doesn't know)."""
+    provider = _provider_for(target)
+    return f"{provider}_api" if provider in PROVIDERS else None
+
+
+def _max_retries() -> int:
+    raw = (os.getenv("OCEAN_HTTP_RETRIES") or "").strip()
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        return 2
+
+
+def _limit(provider: str) -> int:
+    return backend_concurrency(f"{provider}_api")
+
+
+def _backoff(attempt: int, resp: Optional[httpx.Response]) -> float:
+    if resp is not None:
+        try:
+            return min(30.0, max(0.0, float(resp.headers.get("retry-after", ""))))
+        except ValueError:
+            pass
+    return min(8.0, 0.5 * 2**attempt) * random.uniform(0.5, 1.5)
+
+
+def client(target: str) -> httpx.Client:
+    """Shared keep-alive client for the host of ``target``."""
+    host = urlsplit(target).netloc
+    with _lock:
+        c = _clients.get(host)
+        if c is None or c.is_closed:
+            n = _limit(_provider_for(target))
+            c = _clients[host] = httpx.Client(
+                http2=_HTTP2,
+                limits=httpx.Limits(max_connections=n, max_keepalive_connections=n),
+            )
+        return c
+
+
+def post(
+    target: str,
+    *,
+    headers: Optional[dict[str, str]] = None,
+    json: Any = None,
+    timeout: float = 60,
+) -> httpx.Response:
+    """POST through the pooled client; retries 429/5xx and connection errors.
+
+    Each attempt holds a ``rate_limiter`` lease and reports its outcome, so a 429 here
+    also slows every other caller of the same backend. Returns the last response
+    (callers inspect ``status_code`` as before) or raises the last transport error once
+    retries are exhausted.
+    """
+    retries = _max_retries()
+    backend = _backend_for(target)
+    for attempt in range(retries + 1):
+        resp: Optional[httpx.Response] = None
+        with rate_limiter.acquire(backend) as lease:
+            try:
+                resp = client(target).post(target, headers=headers, json=json, timeout=timeout)
+            except httpx.TransportError as e:
+                lease.report(rate_limiter.TIMEOUT if isinstance(e, httpx.TimeoutException) else rate_limiter.ERROR)
+                if attempt >= retries:
+                    raise
+            else:
+                lease.report_status(resp.status_code, resp.headers.get("retry-after"))
+        if resp is not None and (not _retryable(resp.status_code) or attempt >= retries):
+            return resp
+        time.sleep(_backoff(attempt, resp))
+    raise AssertionError("unreachable")  # pragma: no cover
+
+
+def close() -> None:
+    with _lock:
+        for c in _clients.values():
+            c.close()
+        _clients.clear()
+
+
+# --- request/response shapes shared by codegen, advisor and brain -----------------
+
+
+def build_request(
+    provider: str,
+    prompt: str,
+    *,
+    model: str,
+    api_key: str,
+    system: str = "",
+    temperature: float = 0,
+    json_mode: bool = False,
+) -> tuple[str, dict[str, str], dict[str, Any]]:
+    """(url, headers, body) for a single-turn generation on ``provider``."""
+    if provider == "openai":
+        messages = ([{"role": "system", "content": system}] if system else []) + [{"role": "user", "content": prompt}]
+        body: dict[str, Any] = {"model": model, "messages": messages, "temperature": temperature}
+        if json_mode:
+            body["response_format"] = {"type": "json_object"}
+        headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+        return url("openai", "/v1/chat/completions"), headers, body
+    if provider == "gemini":
+        body = {
+            "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+            "generationConfig": {"temperature": temperature},
+        }
+        if system:
+            body["systemInstruction"] = {"parts": [{"text": system}]}
+        if json_mode:
+            body["generationConfig"]["responseMimeType"] = "application/json"
+        headers = {"Content-Type": "application/json", "x-goog-api-key": api_key}
+        return url("gemini", f"/v1beta/models/{model}:generateContent"), headers, body
+    raise ValueError(f"unknown provider: {provider}")
+
+
+def response_text(provider: str, data: dict[str, Any]) -> str:
+    """Concatenated text of the first choice / candidate."""
+    if provider == "openai":
+        return str((((data.get("choices") or [{}])[0]).get("message") or {}).get("content") or "")
+    text = ""
+    cands = data.get("candidates") or []
+    if cands and isinstance(cands[0], dict):
+        parts = ((cands[0].get("content") or {}).get("parts")) or []
+        if isinstance(parts, list):
+            for p in parts:
+                if isinstance(p, dict) and p.get("text"):
+                    text += str(p["text"])
+    return text
+
+
+def error_message(data: Any) -> str:
+    err = data.get("error") if isinstance(data, dict) else None
+    msg = err.get("message") if isinstance(err, dict) else None
+    return str(msg or data)[:300]
+
+
+@dataclass
+class Generation:
+    text: str = ""
+    status: int = 0
+    data: dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def _apost(
+    ac: httpx.AsyncClient, sem: asyncio.Semaphore, target: str, headers: dict[str, str], body: Any, timeout: float
+) -> httpx.Response:
+    retries = _max_retries()
+    backend = _backend_for(target)
+    async with sem:
+        for attempt in range(retries + 1):
+            resp: Optional[httpx.Response] = None
+            # The limiter blocks on a file lock; keep it off the event loop
+            lease = await asyncio.to_thread(rate_limiter.acquire, backend)
+            with lease:
+                try:
+                    resp = await ac.post(target, headers=headers, json=body, timeout=timeout)
+                except httpx.TransportError as e:
+                    lease.report(rate_limiter.TIMEOUT if isinstance(e, httpx.TimeoutException) else rate_limiter.ERROR)
+                    if attempt >= retries:
+                        raise
+                else:
+                    lease.report_status(resp.status_code, resp.headers.get("retry-after"))
+            if resp is not None and (not _retryable(resp.status_code) or attempt >= retries):
+                return resp
+            await asyncio.sleep(_backoff(attempt, resp))
+    raise AssertionError("unreachable")  # pragma: no cover
+
+
+async def generate_many(
+    prompts: Sequence[str],
+    *,
+    provider: str,
+    model: str,
+    api_key: str,
+    system: str = "",
+    temperature: float = 0,
+    json_mode: bool = False,
+    timeout: float = 120,
+    concurrency: Optional[int] = None,
+) -> list[Generation]:
+    """Run several prompts concurrently; results are returned in prompt order.
+
+    Failures are reported per prompt (``Generation.error``) rather than raised, so one
+    bad prompt does not discard the others.
+    """
+    n = concurrency or _limit(provider)
+    sem = asyncio.Semaphore(n)
+    limits = httpx.Limits(max_connections=n, max_keepalive_connections=n)
+
+    async def one(ac: httpx.AsyncClient, prompt: str) -> Generation:
+        target, headers, body = build_request(
+            provider, prompt, model=model, api_key=api_key, system=system, temperature=temperature, json_mode=json_mode
+        )
+        try:
+            resp = await _apost(ac, sem, target, headers, body, timeout)
+            data = resp.json()
+        except Exception as e:
+            return Generation(error=str(e) or type(e).__name__)
+        if not isinstance(data, dict):
+            data = {}
+        if resp.status_code >= 400:
+            return Generation(status=resp.status_code, data=data, error=f"HTTP {resp.status_code}: {error_message(data)}")
+        return Generation(text=response_text(provider, data), status=resp.status_code, data=data)
+
+    async with httpx.AsyncClient(http2=_HTTP2, limits=limits) as ac:
+        return list(await asyncio.gather(*(one(ac, p) for p in prompts)))
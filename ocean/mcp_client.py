@@ -11,6 +11,8 @@ from pathlib import Path
 from queue import Queue, Empty
 from typing import Any, Optional
 
+from .jsonrpc_framing import FrameReader, frame_lsp
+
 
 def _default_cmd() -> list[str]:
     cmd = os.getenv("OCEAN_MCP_CMD") or "codex mcp"
@@ -51,30 +53,15 @@ class StdioJsonRpcClient:
             env=(os.environ | env) if env else None,
         )
 
-        # Reader thread for stdout
+        # Reader thread for stdout: chunked reads, frames parsed from one buffer
         def _reader():
             assert self.proc and self.proc.stdout
-            if self._framing == "ndjson":
-                # Read line-by-line
-                while True:
-                    line = self.proc.stdout.readline()
-                    if not line:
-                        break
-                    self._in_q.put(line.rstrip(b"\n"))
-            else:
-                buf = b""
-                while True:
-                    chunk = self.proc.stdout.read(1)
-                    if not chunk:
-                        break
-                    buf += chunk
-                    # Try to parse frames as they arrive
-                    while True:
-                        msg, rest = self._try_parse_frame(buf)
-                        if msg is None:
-                            break
-                        buf = rest
-                        self._in_q.put(msg)
+            reader = FrameReader(self.proc.stdout, framing="ndjson" if self._framing == "ndjson" else "lsp")
+            while True:
+                body = reader.read_frame()
+                if body is None:
+                    break
+                self._in_q.put(body)
 
         t_out = threading.Thread(target=_reader, daemon=True)
         t_out.start()
@@ -106,32 +93,6 @@ class StdioJsonRpcClient:
         with self._log.open("ab") as f:
             f.write(f"[{direction}] ".encode("utf-8") + payload + b"\n")
 
-    @staticmethod
-    def _frame_lsp(body: bytes) -> bytes:
-        headers = f"Content-Length: {len(body)}\r\n\r\n".encode("utf-8")
-        return headers + body
-
-    @staticmethod
-    def _try_parse_frame(buf: bytes) -> tuple[Optional[bytes], bytes]:
-        try:
-            header_end = buf.index(b"\r\n\r\n")
-        except ValueError:
-            return None, buf
-        header = buf[:header_end].decode("utf-8", errors="ignore")
-        length = 0
-        for line in header.split("\r\n"):
-            if line.lower().startswith("content-length:"):
-                try:
-                    length = int(line.split(":", 1)[1].strip())
-                except Exception:
-                    pass
-        rest = buf[header_end + 4 :]
-        if len(rest) < length:
-            return None, buf
-        body = rest[:length]
-        remaining = rest[length:]
-        return body, remaining
-
     def rpc(self, method: str, params: Optional[dict[str, Any]] = None, timeout: float = 10.0) -> Any:
         if not self.proc or not self.proc.stdin:
             raise MCPError("process not started")
@@ -148,7 +109,7 @@ class StdioJsonRpcClient:
             if self._framing == "ndjson":
                 self.proc.stdin.write(body + b"\n")
             else:
-                framed = self._frame_lsp(body)
+                framed = frame_lsp(body)
                 self.proc.stdin.write(framed)
             self.proc.stdin.flush()
 
@@ -185,7 +146,7 @@ class StdioJsonRpcClient:
         if self._framing == "ndjson":
             self.proc.stdin.write(body + b"\n")
         else:
-            self.proc.stdin.write(self._frame_lsp(body))
+            self.proc.stdin.write(frame_lsp(body))
         self.proc.stdin.flush()
 
     # Convenience wrappers
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import json
+import os
 import sys
+import threading
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, BinaryIO, Callable
 
 from . import __version__
+from .jsonrpc_framing import FrameReader, frame_lsp, frame_ndjson
 from .product_loop import (
     bootstrap_doctrine,
     dumps_result,
@@ -265,46 +268,133 @@ HANDLERS: dict[str, ToolHandler] = {
 }
 
 
+# Seconds before a tools/call is answered with a timeout error (OCEAN_MCP_TOOL_TIMEOUT overrides).
+TOOL_TIMEOUTS: dict[str, float] = {
+    "ocean_turn": 120.0,
+    "ocean_next_action": 120.0,
+}
+DEFAULT_TOOL_TIMEOUT = 60.0
+DEFAULT_WORKERS = 4
+
+
+def _tool_timeout(name: str) -> float:
+    raw = (os.getenv("OCEAN_MCP_TOOL_TIMEOUT") or "").strip()
+    try:
+        v = float(raw)
+        if v > 0:
+            return v
+    except ValueError:
+        pass
+    return TOOL_TIMEOUTS.get(name, DEFAULT_TOOL_TIMEOUT)
+
+
 class MCPServer:
-    def __init__(self) -> None:
-        self._buffer = b""
+    """Stdio MCP server.
+
+    ``tools/call`` runs on daemon worker threads (at most ``OCEAN_MCP_WORKERS``, default 4)
+    so ``ping``/``tools/list`` stay responsive while a slow ``ocean_turn`` is in flight.
+    Responses go out as they complete, matched by id. ``notifications/cancelled`` drops
+    the pending response (and skips the call if it has not started); a call that outlives
+    its tool timeout is answered with an error and its late result discarded. At stdin EOF
+    ``run`` stops reading but returns only once every in-flight call has been answered.
+    """
+
+    def __init__(self, stdin: BinaryIO | None = None, stdout: BinaryIO | None = None) -> None:
+        self._stdin = stdin
+        self._stdout = stdout
+        self._reader: FrameReader | None = None
+        self._write_lock = threading.Lock()
+        self._pending: dict[Any, threading.Timer | None] = {}
+        self._pending_lock = threading.Lock()
+        self._idle = threading.Condition(self._pending_lock)
+        self._writing = 0  # responses taken off _pending but not yet written
+        try:
+            workers = int(os.getenv("OCEAN_MCP_WORKERS") or DEFAULT_WORKERS)
+        except ValueError:
+            workers = DEFAULT_WORKERS
+        self._slots = threading.BoundedSemaphore(max(1, workers))
 
     def run(self) -> None:
         while True:
             message = self._read_message()
             if message is None:
+                self._drain()
                 return
+            if message.get("method") == "tools/call" and message.get("id") is not None:
+                self._dispatch_tool_call(message)
+                continue
             response = self._handle_message(message)
             if response is not None:
                 self._write_message(response)
 
+    def _drain(self) -> None:
+        # Each pending call ends in a response, a timeout error or a cancellation
+        with self._idle:
+            self._idle.wait_for(lambda: not self._pending and not self._writing)
+
     def _read_message(self) -> dict[str, Any] | None:
-        while b"\r\n\r\n" not in self._buffer:
-            chunk = sys.stdin.buffer.read(1)
-            if not chunk:
-                return None
-            self._buffer += chunk
-        header, rest = self._buffer.split(b"\r\n\r\n", 1)
-        length = 0
-        for line in header.decode("utf-8", errors="ignore").split("\r\n"):
-            if line.lower().startswith("content-length:"):
-                length = int(line.split(":", 1)[1].strip())
-                break
-        if length <= 0:
-            raise ValueError("missing Content-Length header")
-        while len(rest) < length:
-            chunk = sys.stdin.buffer.read(length - len(rest))
-            if not chunk:
-                return None
-            rest += chunk
-        body, self._buffer = rest[:length], rest[length:]
-        return json.loads(body.decode("utf-8"))
+        if self._reader is None:
+            self._reader = FrameReader(self._stdin or sys.stdin.buffer)
+        body = self._reader.read_frame()
+        if body is None:
+            return None
+        return json.loads(body)
 
     def _write_message(self, message: dict[str, Any]) -> None:
         body = json.dumps(message, separators=(",", ":")).encode("utf-8")
-        sys.stdout.buffer.write(f"Content-Length: {len(body)}\r\n\r\n".encode("utf-8"))
-        sys.stdout.buffer.write(body)
-        sys.stdout.buffer.flush()
+        # Answer in the framing the host used (Content-Length by default, NDJSON if it sent lines)
+        ndjson = self._reader is not None and self._reader.last_framing == "ndjson"
+        out = self._stdout or sys.stdout.buffer
+        with self._write_lock:
+            out.write(frame_ndjson(body) if ndjson else frame_lsp(body))
+            out.flush()
+
+    def _dispatch_tool_call(self, message: dict[str, Any]) -> None:
+        msg_id = message.get("id")
+        name = str((message.get("params") or {}).get("name") or "")
+        timeout = _tool_timeout(name)
+        timer = threading.Timer(
+            timeout,
+            self._finish,
+            args=(msg_id, self._error(msg_id, -32001, f"tool {name or '?'} timed out after {timeout:.0f}s")),
+        )
+        timer.daemon = True
+        with self._pending_lock:
+            self._pending[msg_id] = timer
+        timer.start()
+
+        def work() -> None:
+            with self._slots:
+                with self._pending_lock:
+                    if msg_id not in self._pending:
+                        return  # cancelled or timed out while queued
+                self._finish(msg_id, self._handle_message(message))
+
+        threading.Thread(target=work, name=f"ocean-mcp-{msg_id}", daemon=True).start()
+
+    def _finish(self, msg_id: Any, response: dict[str, Any] | None) -> None:
+        """Send the first outcome for a request; later ones (late result, timeout) are dropped."""
+        with self._pending_lock:
+            if msg_id not in self._pending:
+                return
+            timer = self._pending.pop(msg_id)
+            self._writing += 1
+        if timer is not None:
+            timer.cancel()
+        try:
+            if response is not None:
+                self._write_message(response)
+        finally:
+            with self._idle:
+                self._writing -= 1
+                self._idle.notify_all()
+
+    def _cancel(self, params: dict[str, Any]) -> None:
+        with self._pending_lock:
+            timer = self._pending.pop(params.get("requestId"), None)
+            self._idle.notify_all()
+        if timer is not None:
+            timer.cancel()
 
     def _handle_message(self, message: dict[str, Any]) -> dict[str, Any] | None:
         method = message.get("method")
@@ -318,6 +408,9 @@ class MCPServer:
                 return self._response(msg_id, self._call_tool(message.get("params") or {}))
             if method in {"initialized", "notifications/initialized"}:
                 return None
+            if method == "notifications/cancelled":
+                self._cancel(message.get("params") or {})
+                return None
             if method == "ping":
                 return self._response(msg_id, {})
             if msg_id is None:
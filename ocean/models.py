@@ -43,6 +43,8 @@ class Task:
     description: str
     owner: str
     files_touched: list[str] = field(default_factory=list)
+    # Paths/fnmatch patterns this task reads; files_touched are its outputs (see task_graph)
+    inputs: list[str] = field(default_factory=list)
 
 
 @dataclass
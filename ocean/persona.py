@@ -5,16 +5,15 @@ from pathlib import Path
 from typing import Any, Dict, Optional
 import os
 
-try:
-    import yaml  # type: ignore
-except Exception:  # pragma: no cover
-    yaml = None  # type: ignore
-
 
 def _read_yaml(path: Path) -> Dict[str, Any]:
     if not path.exists():
         return {"agents": {}}
     text = path.read_text(encoding="utf-8")
+    try:  # imported on first read; keeps `ocean status` / `ocean ingest` startup lean
+        import yaml  # type: ignore
+    except Exception:  # pragma: no cover
+        yaml = None  # type: ignore
     if yaml is not None:
         return yaml.safe_load(text) or {"agents": {}}
     # Fallback minimal parser: try JSON first
@@ -3,11 +3,11 @@ from __future__ import annotations
 import json
 from pathlib import Path
 from typing import Iterable, Optional
-import os
 
 from .agents import default_agents
 from .backends import get_codegen_backend, write_cursor_handoffs
 from .models import ProjectSpec, Task
+from .events_emit import emit_event
 from .feed import agent_say
 
 
@@ -27,19 +27,38 @@ def generate_backlog(spec: ProjectSpec) -> list[Task]:
     return uniq
 
 
+_ANNOUNCE = {
+    "Moroni": '"I will outline the architecture."',
+    "Q": '"API endpoints loaded and ready."',
+    "Edna": '"I’ll sprinkle some UI magic."',
+    "Mario": '"Docker spun up, runtime humming."',
+    "Tony": '"Let me hammer this build with tests…"',
+}
+# Agents that never call a codegen model hold no backend slot.
+_OFFLINE_OWNERS = {"Tony"}
+
+
 def execute_backlog(backlog: Iterable[Task], docs_dir: Path, spec: ProjectSpec) -> tuple[Path, Path, Optional[str]]:
-    """Execute the backlog in phases and return paths and runtime URL summary.
+    """Execute the backlog as a dependency graph and return paths and runtime URL summary.
 
-    Phases:
-    1) Moroni (architecture)
-    2) Q and Edna (implementation/UI) in parallel
-    3) Mario (DevOps) last; may start local runtime
+    Tasks run on a bounded worker pool (see ``task_graph``): a task waits only for
+    earlier tasks of the same owner and for tasks whose outputs it reads
+    (``Task.inputs`` vs ``Task.files_touched``). Codegen tasks take a per-backend slot
+    (``OCEAN_CONCURRENCY_<BACKEND>``) instead of serializing every agent in Codex mode.
+    Tony always runs last-in-graph (his tests read every output).
+
+    With ``OCEAN_CODEGEN_BATCH`` on (default), an agent's batchable tasks run as one
+    composite task so their codegen shares a single request (``AgentBase.batchable``);
+    task events still fire once per member.
 
     Non-Codex modes (see docs/ocean_prefs.json / OCEAN_CODEGEN_BACKEND):
     - dry_plan_only: write backlog + plan only.
     - cursor_handoff: write docs/handoffs/*.md for Cursor; skip CLI/API codegen.
     """
-    from concurrent.futures import ThreadPoolExecutor, wait
+    import threading
+
+    from .codex_exec import batching_enabled
+    from .task_graph import TaskScheduler, batch_groups, merge_tasks
 
     docs_dir.mkdir(parents=True, exist_ok=True)
 
@@ -58,129 +77,79 @@ def execute_backlog(backlog: Iterable[Task], docs_dir: Path, spec: ProjectSpec)
         return bj, pm, None
 
     agents = {agent.name: agent for agent in default_agents()}
-    executed_tasks: list[Task] = []
     runtime_summary: Optional[str] = None
 
-    # Partition tasks by owner
-    moroni_tasks = [t for t in backlog if t.owner == "Moroni"]
-    q_tasks = [t for t in backlog if t.owner == "Q"]
-    edna_tasks = [t for t in backlog if t.owner == "Edna"]
-    mario_tasks = [t for t in backlog if t.owner == "Mario"]
-
-    # Helper: emit structured event to OCEAN_EVENTS_FILE
-    def emit(kind: str, **data):
-        path = os.getenv("OCEAN_EVENTS_FILE")
-        if not path:
-            return
-        try:
-            with open(path, "a", encoding="utf-8") as f:
-                payload = {"event": kind, **data}
-                f.write(json.dumps(payload) + "\n")
-        except Exception:
-            pass
-
-    # Phase 1: Moroni
-    if moroni_tasks:
-        agent_say("Ocean", f"Executing {len(moroni_tasks)} task(s) for Moroni…")
-        agent_say("Moroni", '"I will outline the architecture."')
-        emit("phase_start", agent="Moroni", count=len(moroni_tasks))
-        for t in moroni_tasks:
-            emit("task_start", agent="Moroni", title=t.title, intent=t.description)
-        executed_tasks.extend(agents["Moroni"].execute(moroni_tasks, spec))
-        for t in moroni_tasks:
-            emit("task_end", agent="Moroni", title=t.title, intent=t.description)
-        emit("phase_end", agent="Moroni")
-
-    # Phase 2: Q and Edna — serialize in Codex mode to avoid rate limits
-    try:
-        from . import codex_client as _cc
-        st = _cc.check()
-        codex_mode = st.mode if st.ok else "none"
-    except Exception:
-        codex_mode = "none"
-
-    if codex_mode in ("subscription", "api_fallback"):
-        if q_tasks:
-            agent_say("Ocean", f"Executing {len(q_tasks)} task(s) for Q…")
-            agent_say("Q", '"API endpoints loaded and ready."')
-            emit("phase_start", agent="Q", count=len(q_tasks))
-            for t in q_tasks:
-                emit("task_start", agent="Q", title=t.title, intent=t.description)
-            executed_tasks.extend(agents["Q"].execute(q_tasks, spec))
-            for t in q_tasks:
-                emit("task_end", agent="Q", title=t.title, intent=t.description)
-            emit("phase_end", agent="Q")
-        if edna_tasks:
-            agent_say("Ocean", f"Executing {len(edna_tasks)} task(s) for Edna…")
-            agent_say("Edna", '"I’ll sprinkle some UI magic."')
-            emit("phase_start", agent="Edna", count=len(edna_tasks))
-            for t in edna_tasks:
-                emit("task_start", agent="Edna", title=t.title, intent=t.description)
-            executed_tasks.extend(agents["Edna"].execute(edna_tasks, spec))
-            for t in edna_tasks:
-                emit("task_end", agent="Edna", title=t.title, intent=t.description)
-            emit("phase_end", agent="Edna")
-    else:
-        with ThreadPoolExecutor(max_workers=2) as pool:
-            futures = []
-            if q_tasks:
-                agent_say("Ocean", f"Executing {len(q_tasks)} task(s) for Q…")
-                agent_say("Q", '"API endpoints loaded and ready."')
-                emit("phase_start", agent="Q", count=len(q_tasks))
-                for t in q_tasks:
-                    emit("task_start", agent="Q", title=t.title, intent=t.description)
-                futures.append(pool.submit(agents["Q"].execute, q_tasks, spec))
-            if edna_tasks:
-                agent_say("Ocean", f"Executing {len(edna_tasks)} task(s) for Edna…")
-                agent_say("Edna", '"I’ll sprinkle some UI magic."')
-                emit("phase_start", agent="Edna", count=len(edna_tasks))
-                for t in edna_tasks:
-                    emit("task_start", agent="Edna", title=t.title, intent=t.description)
-                futures.append(pool.submit(agents["Edna"].execute, edna_tasks, spec))
-            if futures:
-                done, _ = wait(futures)
-                for fut in done:
-                    executed_tasks.extend(fut.result())
-                for t in q_tasks:
-                    emit("task_end", agent="Q", title=t.title, intent=t.description)
-                for t in edna_tasks:
-                    emit("task_end", agent="Edna", title=t.title, intent=t.description)
-                if q_tasks:
-                    emit("phase_end", agent="Q")
-                if edna_tasks:
-                    emit("phase_end", agent="Edna")
-
-    # Phase 3: Mario
-    if mario_tasks:
-        agent_say("Ocean", f"Executing {len(mario_tasks)} task(s) for Mario…")
-        agent_say("Mario", '"Docker spun up, runtime humming."')
-        emit("phase_start", agent="Mario", count=len(mario_tasks))
-        for t in mario_tasks:
-            emit("task_start", agent="Mario", title=t.title, intent=t.description)
-        executed_tasks.extend(agents["Mario"].execute(mario_tasks, spec))
-        for t in mario_tasks:
-            emit("task_end", agent="Mario", title=t.title, intent=t.description)
-        emit("phase_end", agent="Mario")
-        runtime_summary = getattr(agents["Mario"], "last_runtime_summary", None)
-        # Emit runtime info to the feed so users see where to test right away
-        if runtime_summary:
-            urls = [u.strip() for u in runtime_summary.split("|") if u.strip()]
-            emit("runtime", agent="Mario", urls=urls, summary=runtime_summary)
-
-    # Phase 4: Tony (always run at least one test task)
-    tony_tasks = [t for t in backlog if t.owner == "Tony"]
-    if not tony_tasks:
-        tony_tasks = [
+    # Tony always runs at least one test task
+    if not any(t.owner == "Tony" for t in backlog_list):
+        backlog_list.append(
             Task(
                 title="Run test suite and write report",
                 description="Execute pytest (if present) and record a concise report",
                 owner="Tony",
                 files_touched=["docs/test_report.md"],
+                inputs=["*"],
             )
-        ]
-    agent_say("Ocean", f"Executing {len(tony_tasks)} task(s) for Tony…")
-    agent_say("Tony", '"Let me hammer this build with tests…"')
-    executed_tasks.extend(agents["Tony"].execute(tony_tasks, spec))
+        )
+    runnable = [t for t in backlog_list if t.owner in agents]
+    units = [[t] for t in runnable]
+    if batching_enabled():
+        units = [[runnable[i] for i in g] for g in batch_groups(runnable, lambda t: agents[t.owner].batchable(t))]
+    members: dict[int, list[Task]] = {}
+    scheduled: list[Task] = []
+    for u in units:
+        if len(u) == 1:
+            scheduled.append(u[0])
+            continue
+        composite = merge_tasks(u)
+        members[id(composite)] = u
+        scheduled.append(composite)
+
+    # Phase events bracket each owner's first start and last finish.
+    remaining = {name: sum(1 for t in runnable if t.owner == name) for name in agents}
+    started: set[str] = set()
+    lock = threading.Lock()
+
+    def on_start(c: Task) -> None:
+        for t in members.get(id(c), [c]):
+            _member_start(t)
+
+    def on_end(c: Task) -> None:
+        for t in members.get(id(c), [c]):
+            _member_end(t)
+
+    def _member_start(t: Task) -> None:
+        with lock:
+            first = t.owner not in started
+            started.add(t.owner)
+        if first:
+            agent_say("Ocean", f"Executing {remaining[t.owner]} task(s) for {t.owner}…")
+            if t.owner in _ANNOUNCE:
+                agent_say(t.owner, _ANNOUNCE[t.owner])
+            emit_event("phase_start", agent=t.owner, count=remaining[t.owner])
+        emit_event("task_start", agent=t.owner, title=t.title, intent=t.description)
+
+    def _member_end(t: Task) -> None:
+        emit_event("task_end", agent=t.owner, title=t.title, intent=t.description)
+        with lock:
+            remaining[t.owner] -= 1
+            last = remaining[t.owner] == 0
+        if last:
+            emit_event("phase_end", agent=t.owner)
+
+    scheduler = TaskScheduler(
+        lambda t: agents[t.owner].execute(members.get(id(t), [t]), spec),
+        backend_for=lambda t: None if t.owner in _OFFLINE_OWNERS else mode,
+        on_start=on_start,
+        on_end=on_end,
+    )
+    executed_tasks = scheduler.run(scheduled)
+
+    if any(t.owner == "Mario" for t in runnable):
+        runtime_summary = getattr(agents["Mario"], "last_runtime_summary", None)
+        # Emit runtime info to the feed so users see where to test right away
+        if runtime_summary:
+            urls = [u.strip() for u in runtime_summary.split("|") if u.strip()]
+            emit_event("runtime", agent="Mario", urls=urls, summary=runtime_summary)
 
     # Write documentation
     bj, pm = write_backlog(executed_tasks, docs_dir)
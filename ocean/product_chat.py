@@ -7,9 +7,10 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from . import chat_log
 from .actors import load_actors
 from .advisor import ask_chat_advisor
-from .product_loop import DOCTRINE_FILES, collect_build_context, read_doctrine_summary, record_feedback, turn
+from .product_loop import DOCTRINE_FILES, ProjectSnapshot, record_feedback, turn
 
 
 def product_chat(
@@ -32,6 +33,8 @@ def product_chat(
     if update_feedback and message.strip():
         feedback_result = record_feedback(root, message, test_context=test_notes or None)
 
+    # Shared with turn() and plan_jobs() below so git, the file tree and the PM advisor run once
+    snapshot = ProjectSnapshot.capture(root)
     payload = {
         "project_root": str(root),
         "message": message.strip(),
@@ -40,8 +43,8 @@ def product_chat(
         "referenced_files": referenced_files,
         "file_updates": file_updates,
         "actors": load_actors(root),
-        "doctrine_summary": read_doctrine_summary(root),
-        "build_context": collect_build_context(root),
+        "doctrine_summary": snapshot.doctrine_summary,
+        "build_context": snapshot.build_context,
         "recent_chat": recent_chat(root),
     }
     prompt = build_product_chat_prompt(payload)
@@ -60,11 +63,14 @@ def product_chat(
             feedback=message if update_feedback else "",
             test_results=test_notes,
             use_advisor=use_advisor,
+            snapshot=snapshot,
         )
         try:
             from .jobs import plan_jobs
 
-            job_plan = plan_jobs(root, user_turn=message, test_results=test_notes, use_advisor=use_advisor)
+            job_plan = plan_jobs(
+                root, user_turn=message, test_results=test_notes, use_advisor=use_advisor, snapshot=snapshot
+            )
         except Exception:
             job_plan = None
 
@@ -210,18 +216,7 @@ def save_screenshots(root: Path, screenshots: list[dict[str, str]]) -> list[dict
 
 
 def recent_chat(root: Path, limit: int = 8) -> list[dict[str, Any]]:
-    path = root / ".ocean" / "chat.jsonl"
-    if not path.exists():
-        return []
-    entries: list[dict[str, Any]] = []
-    for line in path.read_text(encoding="utf-8", errors="ignore").splitlines()[-limit:]:
-        try:
-            data = json.loads(line)
-        except Exception:
-            continue
-        if isinstance(data, dict):
-            entries.append(data)
-    return entries
+    return chat_log.page(root, limit=limit)["messages"]
 
 
 def read_referenced_files(root: Path, message: str, *, limit: int = 5) -> list[dict[str, str]]:
@@ -285,10 +280,7 @@ def _with_heading(name: str, body: str) -> str:
 
 
 def append_chat(root: Path, entry: dict[str, Any]) -> None:
-    path = root / ".ocean" / "chat.jsonl"
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(entry) + "\n")
+    chat_log.append(root, entry)
 
 
 def _fallback_response(payload: dict[str, Any]) -> str:
@@ -15,6 +15,7 @@ from typing import Any
 
 from .advisor import AdvisorResult, ask_pm_advisor, build_pm_prompt
 from .actors import load_actors
+from .file_index import file_paths
 
 
 DOCTRINE_FILES = [
@@ -134,6 +135,75 @@ class TurnGuidance:
         }
 
 
+@dataclass
+class ProjectSnapshot:
+    """Request-scoped doctrine + build context, computed once and shared across APIs.
+
+    ``product_chat`` hands one snapshot to ``turn`` and ``plan_jobs`` so a chat request
+    runs the git subprocesses, file-tree walk and PM advisor once instead of three times.
+    The snapshot rebuilds itself when a doctrine file or git HEAD changes (e.g. feedback
+    recorded mid-request); guidance is memoized per ``next_action`` argument set.
+    """
+
+    project_root: Path
+    fingerprint: tuple[Any, ...] = ()
+    doctrine_summary: dict[str, str] = field(default_factory=dict)
+    build_context: dict[str, Any] = field(default_factory=dict)
+    _guidance: dict[tuple[Any, ...], "TurnGuidance"] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def capture(cls, project_root: str | Path | None = None) -> "ProjectSnapshot":
+        snapshot = cls(resolve_project_root(project_root))
+        snapshot.refresh()
+        return snapshot
+
+    def refresh(self) -> None:
+        self.fingerprint = _snapshot_fingerprint(self.project_root)
+        self.doctrine_summary = read_doctrine_summary(self.project_root)
+        self.build_context = collect_build_context(self.project_root)
+        self._guidance.clear()
+
+    def current(self) -> "ProjectSnapshot":
+        """Return self after rebuilding if doctrine or HEAD moved since capture."""
+        if _snapshot_fingerprint(self.project_root) != self.fingerprint:
+            self.refresh()
+        return self
+
+
+def _snapshot_fingerprint(root: Path) -> tuple[Any, ...]:
+    doctrine = []
+    for name in DOCTRINE_FILES:
+        try:
+            st = (root / name).stat()
+            doctrine.append((name, st.st_mtime_ns, st.st_size))
+        except OSError:
+            doctrine.append((name, None, None))
+    return (tuple(doctrine), _git_head(root))
+
+
+def _git_head(root: Path) -> str:
+    """Commit HEAD points at, read from ``.git`` directly (no subprocess)."""
+    git = root / ".git"
+    try:
+        head = (git / "HEAD").read_text(encoding="utf-8").strip()
+    except OSError:
+        return ""
+    if not head.startswith("ref:"):
+        return head
+    ref = head[4:].strip()
+    try:
+        return (git / ref).read_text(encoding="utf-8").strip()
+    except OSError:
+        pass
+    try:
+        for line in (git / "packed-refs").read_text(encoding="utf-8").splitlines():
+            if line.endswith(" " + ref):
+                return line.split(" ", 1)[0]
+    except OSError:
+        pass
+    return head
+
+
 def resolve_project_root(project_root: str | Path | None = None) -> Path:
     root = Path(project_root or ".").expanduser().resolve()
     if not root.exists():
@@ -213,11 +283,49 @@ def next_action(
     candidate_tasks: list[str] | None = None,
     max_tasks: int = 5,
     use_advisor: bool = True,
+    snapshot: ProjectSnapshot | None = None,
 ) -> TurnGuidance:
     root = resolve_project_root(project_root)
     bootstrap_doctrine(root)
-    summaries = read_doctrine_summary(root)
-    build_context = collect_build_context(root)
+    if snapshot is not None and snapshot.project_root == root:
+        snapshot.current()
+        key = (user_turn, test_results, tuple(candidate_tasks or []), max_tasks, use_advisor)
+        cached = snapshot._guidance.get(key)
+        if cached is None:
+            cached = snapshot._guidance[key] = _next_action(
+                root,
+                snapshot.doctrine_summary,
+                snapshot.build_context,
+                user_turn=user_turn,
+                test_results=test_results,
+                candidate_tasks=candidate_tasks,
+                max_tasks=max_tasks,
+                use_advisor=use_advisor,
+            )
+        return cached
+    return _next_action(
+        root,
+        read_doctrine_summary(root),
+        collect_build_context(root),
+        user_turn=user_turn,
+        test_results=test_results,
+        candidate_tasks=candidate_tasks,
+        max_tasks=max_tasks,
+        use_advisor=use_advisor,
+    )
+
+
+def _next_action(
+    root: Path,
+    summaries: dict[str, str],
+    build_context: dict[str, Any],
+    *,
+    user_turn: str,
+    test_results: str,
+    candidate_tasks: list[str] | None,
+    max_tasks: int,
+    use_advisor: bool,
+) -> TurnGuidance:
     missing = [name for name in DOCTRINE_FILES if not (root / name).exists()]
     candidates = _collect_candidates(root, user_turn, candidate_tasks or [])
     scored = sorted(
@@ -273,6 +381,7 @@ def turn(
     test_results: str = "",
     candidate_tasks: list[str] | None = None,
     use_advisor: bool = True,
+    snapshot: ProjectSnapshot | None = None,
 ) -> dict[str, Any]:
     root = resolve_project_root(project_root)
     feedback_result = None
@@ -284,6 +393,7 @@ def turn(
         test_results=test_results,
         candidate_tasks=candidate_tasks,
         use_advisor=use_advisor,
+        snapshot=snapshot,
     )
     result = guidance.to_dict()
     result["feedback_result"] = feedback_result
@@ -622,17 +732,7 @@ def _read_important_files(root: Path) -> dict[str, str]:
 
 
 def _file_tree(root: Path, *, max_files: int = 120) -> list[str]:
-    ignored = {".git", "__pycache__", ".pytest_cache", "node_modules", "venv", ".venv", "logs", "dist", "build"}
-    files: list[str] = []
-    for path in sorted(root.rglob("*")):
-        rel = path.relative_to(root)
-        if any(part in ignored for part in rel.parts):
-            continue
-        if path.is_file():
-            files.append(str(rel))
-        if len(files) >= max_files:
-            break
-    return files
+    return file_paths(root, limit=max_files)
 
 
 def _string_list(value: Any) -> list[str]:
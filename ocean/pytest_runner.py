@@ -0,0 +1,267 @@
+"""Run a project's pytest suite once and return structured results (Tony's test step).
+
+One invocation captures the console output and a JUnit XML file under ``.ocean/``;
+counts and failing node ids come from the XML rather than scraping text. Parallelism:
+
+- ``pytest-xdist`` installed → ``-n auto``;
+- otherwise, with several test files, Ocean shards by file across up to
+  ``OCEAN_TEST_WORKERS`` (default: CPU count, max 4) pytest processes and merges results;
+- ``OCEAN_TEST_WORKERS=1`` runs a single serial pytest.
+
+Failures from the previous run are kept in ``.ocean/test_lastfailed.json`` so the next
+cycle runs them first (``--ff``), or only them with ``last_failed=True`` (``--lf``).
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+
+_LASTFAILED = "test_lastfailed.json"
+_IGNORED_DIRS = {".git", ".ocean", "__pycache__", ".pytest_cache", "node_modules", "venv", ".venv", "build", "dist"}
+_MAX_FAILURES = 50
+
+
+@dataclass
+class TestRun:
+    exit_code: int
+    output: str = ""
+    mode: str = "serial"
+    shards: int = 1
+    tests: int = 0
+    passed: int = 0
+    failed: int = 0
+    errors: int = 0
+    skipped: int = 0
+    duration_s: float = 0.0
+    failures: list[str] = field(default_factory=list)
+    junit_paths: list[str] = field(default_factory=list)
+
+    __test__ = False  # not a pytest test class
+
+    def summary(self) -> dict[str, object]:
+        data = asdict(self)
+        data.pop("output")
+        return data
+
+
+def _workers() -> int:
+    raw = (os.getenv("OCEAN_TEST_WORKERS") or "").strip()
+    try:
+        v = int(raw)
+        if v > 0:
+            return v
+    except ValueError:
+        pass
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+def _has_xdist() -> bool:
+    try:
+        return importlib.util.find_spec("xdist") is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def _testpaths(root: Path) -> list[str]:
+    """``testpaths`` from the project's pytest config, so sharding collects what pytest would."""
+    import configparser
+
+    pyproject = root / "pyproject.toml"
+    if pyproject.exists():
+        try:
+            import tomllib
+
+            opts = tomllib.loads(pyproject.read_text(encoding="utf-8")).get("tool", {}).get("pytest", {}).get("ini_options", {})
+            paths = opts.get("testpaths")
+            if paths:
+                return [str(p) for p in ([paths] if isinstance(paths, str) else paths)]
+        except Exception:
+            pass
+    for name, section in (("pytest.ini", "pytest"), ("tox.ini", "pytest"), ("setup.cfg", "tool:pytest")):
+        cfg = configparser.ConfigParser()
+        try:
+            cfg.read(root / name, encoding="utf-8")
+            raw = cfg.get(section, "testpaths", fallback="")
+        except configparser.Error:
+            raw = ""
+        if raw.split():
+            return raw.split()
+    return ["."]
+
+
+def discover_test_files(root: Path) -> list[str]:
+    """Relative paths of ``test_*.py`` / ``*_test.py`` files, pytest's default pattern."""
+    found: list[str] = []
+    for base in _testpaths(root):
+        for dirpath, dirnames, filenames in os.walk(root / base):
+            dirnames[:] = sorted(d for d in dirnames if d not in _IGNORED_DIRS and not d.startswith("ocean_test_"))
+            for name in sorted(filenames):
+                if name.endswith(".py") and (name.startswith("test_") or name.endswith("_test.py")):
+                    found.append(os.path.relpath(os.path.join(dirpath, name), root))
+    return sorted(set(found))
+
+
+def _node_id(root: Path, classname: str, name: str) -> str:
+    """``path.py::[Class::]name`` from JUnit's dotted classname."""
+    parts = classname.split(".") if classname else []
+    for i in range(len(parts), 0, -1):
+        file = "/".join(parts[:i]) + ".py"
+        if (root / file).exists():
+            return "::".join([file, *parts[i:], name])
+    return f"{classname}::{name}" if classname else name
+
+
+def _load_lastfailed(root: Path) -> list[str]:
+    try:
+        data = json.loads((root / ".ocean" / _LASTFAILED).read_text(encoding="utf-8"))
+    except Exception:
+        return []
+    return [str(x) for x in data] if isinstance(data, list) else []
+
+
+def _save_lastfailed(root: Path, failures: list[str]) -> None:
+    try:
+        p = root / ".ocean" / _LASTFAILED
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(json.dumps(failures) + "\n", encoding="utf-8")
+    except OSError:
+        pass
+
+
+def _shard(files: list[str], n: int, first: set[str]) -> list[list[str]]:
+    """Round-robin files into ``n`` shards; previously failing files go out first."""
+    ordered = [f for f in files if f in first] + [f for f in files if f not in first]
+    shards: list[list[str]] = [[] for _ in range(n)]
+    for i, f in enumerate(ordered):
+        shards[i % n].append(f)
+    return [s for s in shards if s]
+
+
+def _parse_junit(root: Path, path: Path, run: TestRun) -> None:
+    try:
+        doc = ET.parse(path).getroot()
+    except (OSError, ET.ParseError):
+        return
+    suites = [doc] if doc.tag == "testsuite" else doc.findall("testsuite")
+    for suite in suites:
+        for case in suite.iter("testcase"):
+            run.tests += 1
+            if case.find("failure") is not None:
+                run.failed += 1
+            elif case.find("error") is not None:
+                run.errors += 1
+            elif case.find("skipped") is not None:
+                run.skipped += 1
+            else:
+                run.passed += 1
+                continue
+            if case.find("skipped") is None and len(run.failures) < _MAX_FAILURES:
+                run.failures.append(_node_id(root, case.get("classname") or "", case.get("name") or ""))
+
+
+def _merge_exit(codes: list[int]) -> int:
+    # 5 = "no tests collected" for that shard; only report it if every shard had none
+    real = [c for c in codes if c not in (0, 5)]
+    if real:
+        return real[0]
+    return 5 if codes and all(c == 5 for c in codes) else 0
+
+
+def _pytest(root: Path, args: list[str], junit: Path, timeout: Optional[float]) -> tuple[int, str]:
+    cmd = [sys.executable, "-m", "pytest", "-q", f"--junitxml={junit}", *args]
+    try:
+        proc = subprocess.run(cmd, cwd=str(root), capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired as exc:
+        out = exc.stdout.decode("utf-8", "replace") if isinstance(exc.stdout, bytes) else (exc.stdout or "")
+        return 124, out + f"\npytest timed out after {timeout}s\n"
+    return proc.returncode, (proc.stdout or "") + (proc.stderr or "")
+
+
+def run_pytest(
+    cwd: Optional[Path] = None,
+    *,
+    last_failed: bool = False,
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> TestRun:
+    """Run the suite once (possibly sharded) and return merged structured results."""
+    root = (cwd or Path.cwd()).resolve()
+    out_dir = root / ".ocean"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for stale in out_dir.glob("pytest_junit*.xml"):
+        stale.unlink(missing_ok=True)
+    previous = _load_lastfailed(root)
+    n = workers or _workers()
+    start = time.monotonic()
+
+    if n > 1 and _has_xdist():
+        mode, plans = "xdist", [["-n", "auto"]]
+    else:
+        files = discover_test_files(root)
+        failing_files = {f.split("::", 1)[0] for f in previous}
+        only: list[str] = []
+        if last_failed and previous:
+            only = [f for f in files if f in failing_files]
+            files = only or files
+        shards = _shard(files, n, failing_files) if n > 1 and len(files) > 1 else []
+        if shards:
+            # Shards share no pytest cache (concurrent writes would clobber it); Ocean's
+            # own last-failed list drives ordering instead.
+            mode, plans = "sharded", [["-p", "no:cacheprovider", *s] for s in shards]
+        else:
+            mode, plans = "serial", [list(only)]
+    if mode != "sharded":
+        for args in plans:
+            args.append("--lf" if last_failed else "--ff")
+
+    junits = [out_dir / ("pytest_junit.xml" if len(plans) == 1 else f"pytest_junit.{i}.xml") for i in range(len(plans))]
+    if len(plans) == 1:
+        results = [_pytest(root, plans[0], junits[0], timeout)]
+    else:
+        with ThreadPoolExecutor(max_workers=len(plans)) as pool:
+            results = list(pool.map(lambda i: _pytest(root, plans[i], junits[i], timeout), range(len(plans))))
+
+    run = TestRun(exit_code=_merge_exit([code for code, _ in results]), mode=mode, shards=len(plans))
+    if len(results) == 1:
+        run.output = results[0][1]
+    else:
+        run.output = "\n".join(f"--- shard {i + 1}/{len(results)} ---\n{out}" for i, (_, out) in enumerate(results))
+    for junit in junits:
+        if junit.exists():
+            run.junit_paths.append(str(junit.relative_to(root)))
+            _parse_junit(root, junit, run)
+    run.duration_s = round(time.monotonic() - start, 3)
+    _save_lastfailed(root, run.failures)
+    return run
+
+
+def format_report(run: TestRun, generated: str) -> str:
+    lines = ["# Test Report", "", f"Generated: {generated}", ""]
+    lines.append("## Summary\n")
+    lines.append(
+        f"- {run.passed} passed, {run.failed} failed, {run.errors} errors, {run.skipped} skipped "
+        f"({run.tests} tests) in {run.duration_s:.1f}s"
+    )
+    lines.append(f"- Mode: {run.mode}" + (f" ({run.shards} shards)" if run.shards > 1 else ""))
+    if run.junit_paths:
+        lines.append(f"- JUnit XML: {', '.join(run.junit_paths)}")
+    lines.append("")
+    if run.failures:
+        lines.append("## Failures\n")
+        lines.extend(f"- `{f}`" for f in run.failures)
+        lines.append("")
+    lines.append("## Pytest Output\n")
+    lines.append("````\n" + run.output + "\n````")
+    lines.append("")
+    lines.append(f"Exit code: {run.exit_code}")
+    return "\n".join(lines) + "\n"
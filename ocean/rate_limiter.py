@@ -0,0 +1,299 @@
+"""Per-user, adaptive rate limiter for LLM backends (codex, claude, openai_api, gemini_api).
+
+Each backend has a concurrency limit and a token bucket (requests per minute). Both adapt
+AIMD-style from what calls report:
+
+- success: concurrency grows by ``1/limit`` (≈ +1 per window of successes) and the rate by
+  5% of its configured ceiling, unless latency is well above its running average (the
+  provider is queueing us; hold steady);
+- 429 / "rate limit" output: concurrency and rate halve, and new calls wait out
+  ``Retry-After`` (or a short cooldown) before starting;
+- timeout: concurrency drops by a quarter.
+
+State lives in ``~/.ocean/limiter.json`` (``OCEAN_LIMITER_STATE`` overrides the path) and
+every acquire/release runs under an ``flock`` on the ``.lock`` file next to it, so all of a
+user's ``ocean`` processes (any project, the Control Room backend) share one budget per
+backend, as they share one provider account. In-flight leases record their pid; leases of dead processes (or older
+than ``_LEASE_TTL``) are reclaimed.
+
+Ceilings: ``OCEAN_CONCURRENCY_<BACKEND>`` (same knob as the task scheduler) and
+``OCEAN_RATE_<BACKEND>`` requests/minute. ``OCEAN_RATE_LIMITER=0`` disables limiting.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+try:  # POSIX only; elsewhere processes coordinate only within themselves
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+from .task_graph import backend_concurrency
+
+# Requests per minute before any adaptation; CLI subscriptions throttle hardest.
+DEFAULT_RATE: dict[str, float] = {
+    "codex": 20,
+    "claude": 20,
+    "openai_api": 300,
+    "gemini_api": 300,
+}
+_STATE = "limiter.json"
+_LEASE_TTL = 1800.0
+_COOLDOWN = 5.0  # after a 429 without Retry-After
+_MAX_COOLDOWN = 120.0
+_POLL = 0.25
+_SLOW = 2.0  # latency this many times the running average counts as congestion
+_RATE_LIMIT_TEXT = re.compile(r"\b429\b|rate[ _-]?limit|too many requests|quota exceeded|overloaded", re.I)
+
+OK = "ok"
+RATE_LIMITED = "rate_limited"
+TIMEOUT = "timeout"
+ERROR = "error"
+
+_local = threading.Lock()  # flock is per open file description; threads also need a mutex
+
+
+def enabled() -> bool:
+    return os.getenv("OCEAN_RATE_LIMITER", "1") not in ("0", "false", "False")
+
+
+def max_rate(backend: str) -> float:
+    """Requests/minute ceiling (``OCEAN_RATE_<BACKEND>``)."""
+    raw = (os.getenv(f"OCEAN_RATE_{backend.upper()}") or "").strip()
+    try:
+        v = float(raw)
+    except ValueError:
+        return DEFAULT_RATE.get(backend, 60)
+    return v if v > 0 else DEFAULT_RATE.get(backend, 60)
+
+
+def _state_path() -> Path:
+    override = (os.getenv("OCEAN_LIMITER_STATE") or "").strip()
+    return Path(override).expanduser() if override else Path.home() / ".ocean" / _STATE
+
+
+@contextmanager
+def _locked(path: Path) -> Iterator[None]:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _local:
+        if fcntl is None:
+            yield
+            return
+        with open(path.with_suffix(".lock"), "a") as fh:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+def _load(path: Path) -> dict[str, Any]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save(path: Path, data: dict[str, Any]) -> None:
+    tmp = path.with_suffix(".tmp")
+    try:
+        tmp.write_text(json.dumps(data) + "\n", encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def _alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+def _backend_state(data: dict[str, Any], backend: str, now: float) -> dict[str, Any]:
+    """Backend entry with ceilings applied, bucket refilled and stale leases reclaimed."""
+    ceiling, rate_cap = float(backend_concurrency(backend)), max_rate(backend)
+    st = data.get(backend)
+    if not isinstance(st, dict):
+        st = {"limit": ceiling, "rate": rate_cap, "tokens": max(1.0, ceiling), "t": now, "until": 0.0, "leases": {}}
+        data[backend] = st
+    st["limit"] = min(max(1.0, float(st.get("limit", ceiling))), ceiling)
+    st["rate"] = min(max(1.0, float(st.get("rate", rate_cap))), rate_cap)
+    burst = max(1.0, ceiling)
+    elapsed = max(0.0, now - float(st.get("t", now)))
+    st["tokens"] = min(burst, float(st.get("tokens", burst)) + elapsed * st["rate"] / 60.0)
+    st["t"] = now
+    leases = st.get("leases") if isinstance(st.get("leases"), dict) else {}
+    st["leases"] = {
+        k: v
+        for k, v in leases.items()
+        if isinstance(v, dict) and now - float(v.get("t", 0)) < _LEASE_TTL and _alive(int(v.get("pid", 0)))
+    }
+    return st
+
+
+def _wait_needed(st: dict[str, Any], now: float) -> float:
+    """Seconds until a new call may start (0 = now)."""
+    if now < float(st.get("until", 0.0)):
+        return float(st["until"]) - now
+    if len(st["leases"]) >= int(st["limit"]):
+        return _POLL
+    if st["tokens"] < 1.0:
+        return (1.0 - st["tokens"]) * 60.0 / st["rate"]
+    return 0.0
+
+
+@dataclass
+class Lease:
+    """One in-flight call. Use as a context manager; ``report`` the outcome before exit."""
+
+    backend: Optional[str]
+    id: str = ""
+    started: float = 0.0
+    outcome: Optional[str] = None
+    retry_after: Optional[float] = None
+    _released: bool = field(default=False, repr=False)
+
+    def report(self, outcome: str, retry_after: Optional[float] = None) -> None:
+        self.outcome = outcome
+        self.retry_after = retry_after
+
+    def report_status(self, status: int, retry_after: Any = None) -> None:
+        """Classify an HTTP status (429/503 → rate limited, 408/504 → timeout)."""
+        try:
+            ra = float(retry_after) if retry_after not in (None, "") else None
+        except (TypeError, ValueError):
+            ra = None
+        if status in (429, 503):
+            self.report(RATE_LIMITED, ra)
+        elif status in (408, 504):
+            self.report(TIMEOUT)
+        elif status >= 500:
+            self.report(ERROR)
+        else:
+            self.report(OK)
+
+    def report_output(self, text: str, returncode: Optional[int] = 0) -> None:
+        """Classify a CLI run from its output (rate-limit wording wins over the exit code)."""
+        if _RATE_LIMIT_TEXT.search(text or ""):
+            self.report(RATE_LIMITED)
+        else:
+            self.report(OK if returncode in (0, None) else ERROR)
+
+    def release(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        if self.backend is not None:
+            _release(self)
+
+    def __enter__(self) -> "Lease":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None and self.outcome is None:
+            self.report(TIMEOUT if "Timeout" in exc_type.__name__ else ERROR)
+        self.release()
+
+
+def acquire(backend: Optional[str], timeout: Optional[float] = None) -> Lease:
+    """Block until ``backend`` has a free slot and a rate token; return the lease.
+
+    ``backend=None`` (or the limiter disabled) returns a no-op lease. Raises
+    ``TimeoutError`` if ``timeout`` seconds pass first.
+    """
+    if backend is None or not enabled():
+        return Lease(None)
+    path = _state_path()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        with _locked(path):
+            now = time.time()
+            data = _load(path)
+            st = _backend_state(data, backend, now)
+            wait = _wait_needed(st, now)
+            if wait <= 0:
+                lease = Lease(backend, id=uuid.uuid4().hex[:12], started=now)
+                st["tokens"] -= 1.0
+                st["leases"][lease.id] = {"pid": os.getpid(), "t": now}
+                _save(path, data)
+                return lease
+            _save(path, data)
+        if deadline is not None and time.monotonic() + min(wait, _POLL) > deadline:
+            raise TimeoutError(f"rate limiter: no {backend} slot within {timeout}s")
+        time.sleep(min(wait, _POLL))
+
+
+def _release(lease: Lease) -> None:
+    from .events_emit import emit_event
+
+    path = _state_path()
+    outcome = lease.outcome or OK
+    with _locked(path):
+        now = time.time()
+        data = _load(path)
+        st = _backend_state(data, lease.backend, now)  # type: ignore[arg-type]
+        st["leases"].pop(lease.id, None)
+        before = st["limit"]
+        latency = now - lease.started
+        avg = st.get("latency")
+        if outcome == OK:
+            slow = isinstance(avg, (int, float)) and latency > _SLOW * avg
+            if not slow:
+                st["limit"] = min(float(backend_concurrency(lease.backend)), st["limit"] + 1.0 / st["limit"])
+                st["rate"] = min(max_rate(lease.backend), st["rate"] + 0.05 * max_rate(lease.backend))
+            st["latency"] = latency if avg is None else 0.8 * avg + 0.2 * latency
+        elif outcome == RATE_LIMITED:
+            st["limit"] = max(1.0, st["limit"] / 2)
+            st["rate"] = max(1.0, st["rate"] / 2)
+            st["tokens"] = 0.0
+            pause = lease.retry_after if lease.retry_after is not None else _COOLDOWN
+            st["until"] = max(float(st.get("until", 0.0)), now + min(_MAX_COOLDOWN, pause))
+        elif outcome == TIMEOUT:
+            st["limit"] = max(1.0, st["limit"] * 0.75)
+        _save(path, data)
+        snapshot = {"limit": round(st["limit"], 2), "rate": round(st["rate"], 1)}
+    if outcome == RATE_LIMITED:
+        from .feed import feed as _feed
+
+        _feed(
+            f"🌊 Ocean: {lease.backend} rate-limited — concurrency {before:.1f}→{snapshot['limit']}, "
+            f"{snapshot['rate']}/min"
+        )
+    if outcome in (RATE_LIMITED, TIMEOUT):
+        emit_event("rate_limit", backend=lease.backend, outcome=outcome, before=round(before, 2), **snapshot)
+
+
+def status(backend: Optional[str] = None) -> dict[str, Any]:
+    """Current adaptive state per backend (``limit``, ``rate``, ``in_flight``, ``cooldown``)."""
+    path = _state_path()
+    with _locked(path):
+        now = time.time()
+        data = _load(path)
+        names = [backend] if backend else sorted(set(data) | set(DEFAULT_RATE))
+        out = {}
+        for name in names:
+            st = _backend_state(data, name, now)
+            out[name] = {
+                "limit": round(st["limit"], 2),
+                "rate": round(st["rate"], 1),
+                "in_flight": len(st["leases"]),
+                "cooldown": round(max(0.0, float(st.get("until", 0.0)) - now), 1),
+            }
+    return out
@@ -1,10 +1,16 @@
 """Autonomous runtime: product state, user inbox, and single-cycle execution."""
 
-from .cycle import CycleResult, run_cycle
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
 from .inbox import ingest as ingest_message
 from .state import ProductState
 from .status import format_status_text
 
+if TYPE_CHECKING:
+    from .cycle import CycleResult, run_cycle
+
 __all__ = [
     "CycleResult",
     "ProductState",
@@ -12,3 +18,13 @@ __all__ = [
     "ingest_message",
     "run_cycle",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    # The cycle pulls in planner → agents → model backends; `ocean ingest` / `ocean status`
+    # only need the inbox and state, so it is imported on first use.
+    if name in ("CycleResult", "run_cycle"):
+        from . import cycle
+
+        return getattr(cycle, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
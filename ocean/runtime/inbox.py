@@ -6,68 +6,82 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from .paths import inbox_archive, inbox_pending, runtime_root
+from .paths import runtime_root
+from .store import connect, transaction
 
 
 def _now_iso() -> str:
     return datetime.now().isoformat()
 
 
+def _row(mid: str, ts: str, text: str, attachments: str, consumed_at: str | None) -> dict[str, Any]:
+    try:
+        atts = json.loads(attachments)
+    except ValueError:
+        atts = []
+    data: dict[str, Any] = {"id": mid, "ts": ts, "text": text, "attachments": atts, "consumed": consumed_at is not None}
+    if consumed_at is not None:
+        data["consumed_at"] = consumed_at
+    return data
+
+
 def ingest(
     message: str,
     attachments: list[Path] | None = None,
     *,
     cwd: Path | None = None,
-) -> Path:
-    """Write one inbox message to `.ocean/inbox/pending`. Returns path to message file."""
+) -> str:
+    """Add one inbox message to the runtime store. Returns its id."""
     rd = runtime_root(cwd)
-    pending = inbox_pending(rd)
     mid = str(uuid.uuid4())
     paths = [str(p.resolve()) for p in (attachments or []) if p]
-    payload: dict[str, Any] = {
-        "id": mid,
-        "ts": _now_iso(),
-        "text": message.strip(),
-        "attachments": paths,
-        "consumed": False,
-    }
-    out = pending / f"msg-{mid}.json"
-    out.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
-    return out
+    with connect(rd) as conn:
+        conn.execute(
+            "insert into inbox (id, ts, text, attachments) values (?, ?, ?, ?)",
+            (mid, _now_iso(), message.strip(), json.dumps(paths)),
+        )
+    return mid
 
 
 def list_pending(cwd: Path | None = None) -> list[dict[str, Any]]:
     rd = runtime_root(cwd)
-    pending = inbox_pending(rd)
-    rows: list[dict[str, Any]] = []
-    for p in sorted(pending.glob("msg-*.json")):
-        try:
-            rows.append(json.loads(p.read_text(encoding="utf-8")))
-        except Exception:
-            continue
-    return rows
+    with connect(rd) as conn:
+        rows = conn.execute(
+            "select id, ts, text, attachments, consumed_at from inbox where consumed_at is null order by ts, rowid"
+        ).fetchall()
+    return [_row(*r) for r in rows]
+
+
+def count_pending(cwd: Path | None = None) -> int:
+    rd = runtime_root(cwd)
+    with connect(rd) as conn:
+        return int(conn.execute("select count(*) from inbox where consumed_at is null").fetchone()[0])
+
+
+def list_archive(cwd: Path | None = None, *, limit: int = 50) -> list[dict[str, Any]]:
+    """Most recently consumed messages, newest last."""
+    rd = runtime_root(cwd)
+    with connect(rd) as conn:
+        rows = conn.execute(
+            "select id, ts, text, attachments, consumed_at from inbox where consumed_at is not null "
+            "order by consumed_at desc, rowid desc limit ?",
+            (limit,),
+        ).fetchall()
+    return [_row(*r) for r in reversed(rows)]
 
 
 def drain_pending_to_archive(
     cwd: Path | None = None,
 ) -> list[dict[str, Any]]:
-    """Move all pending messages to archive; return payloads (for merging into state)."""
+    """Mark all pending messages consumed; return payloads (for merging into state).
+
+    One transaction: concurrent drainers never hand out the same message twice.
+    """
     rd = runtime_root(cwd)
-    pending = inbox_pending(rd)
-    arch = inbox_archive(rd)
-    moved: list[dict[str, Any]] = []
-    for p in sorted(pending.glob("msg-*.json")):
-        try:
-            data = json.loads(p.read_text(encoding="utf-8"))
-        except Exception:
-            continue
-        data["consumed"] = True
-        data["consumed_at"] = _now_iso()
-        dest = arch / p.name
-        dest.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
-        try:
-            p.unlink()
-        except Exception:
-            pass
-        moved.append(data)
-    return moved
+    now = _now_iso()
+    with transaction(rd) as conn:
+        rows = conn.execute(
+            "select id, ts, text, attachments from inbox where consumed_at is null order by ts, rowid"
+        ).fetchall()
+        conn.executemany("update inbox set consumed_at = ? where id = ?", [(now, r[0]) for r in rows])
+    return [_row(*r, now) for r in rows]
@@ -10,14 +10,3 @@ def runtime_root(cwd: Path | None = None) -> Path:
     d.mkdir(parents=True, exist_ok=True)
     return d
 
-
-def inbox_pending(root: Path) -> Path:
-    p = root / "inbox" / "pending"
-    p.mkdir(parents=True, exist_ok=True)
-    return p
-
-
-def inbox_archive(root: Path) -> Path:
-    p = root / "inbox" / "archive"
-    p.mkdir(parents=True, exist_ok=True)
-    return p
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-import json
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from .store import DECISION_KEEP, add_decisions, connect, get_values, put_values, recent_decisions, store_path, transaction
+
 
 def _now_iso() -> str:
     return datetime.now().isoformat()
@@ -13,7 +14,12 @@ def _now_iso() -> str:
 
 @dataclass
 class ProductState:
-    """Shared product context for autonomous cycles (persisted under `.ocean/`)."""
+    """Shared product context for autonomous cycles (persisted in the runtime store).
+
+    Scalars and short lists live in the store's ``kv`` table; ``decision_log`` is the
+    tail of the ``decisions`` table, and ``save`` only inserts entries logged since
+    ``load``, so concurrent writers never drop each other's decisions.
+    """
 
     schema_version: int = 1
     vision_summary: str = ""
@@ -26,42 +32,52 @@ class ProductState:
     decision_log: list[dict[str, Any]] = field(default_factory=list)
     open_conflicts: list[dict[str, Any]] = field(default_factory=list)
 
+    def __post_init__(self) -> None:
+        self._saved_decisions = len(self.decision_log)
+
     @staticmethod
     def state_path(runtime: Path) -> Path:
-        return runtime / "product_state.json"
+        return store_path(runtime)
 
     @classmethod
     def load(cls, runtime: Path) -> ProductState:
-        path = cls.state_path(runtime)
-        if not path.exists():
-            return cls()
         try:
-            data = json.loads(path.read_text(encoding="utf-8"))
+            with connect(runtime) as conn:
+                data = get_values(conn, "product")
+                decisions = recent_decisions(conn)
         except Exception:
             return cls()
-        return cls(
-            schema_version=int(data.get("schema_version", 1)),
-            vision_summary=str(data.get("vision_summary", "")),
-            audience=str(data.get("audience", "")),
-            cycle_count=int(data.get("cycle_count", 0)),
-            last_cycle_at=data.get("last_cycle_at"),
-            tokens_used_last_cycle=int(data.get("tokens_used_last_cycle", 0)),
-            tokens_budget_per_cycle=data.get("tokens_budget_per_cycle"),
-            user_notes=list(data.get("user_notes", [])),
-            decision_log=list(data.get("decision_log", [])),
-            open_conflicts=list(data.get("open_conflicts", [])),
-        )
+        try:
+            return cls(
+                schema_version=int(data.get("schema_version", 1)),
+                vision_summary=str(data.get("vision_summary", "")),
+                audience=str(data.get("audience", "")),
+                cycle_count=int(data.get("cycle_count", 0)),
+                last_cycle_at=data.get("last_cycle_at"),
+                tokens_used_last_cycle=int(data.get("tokens_used_last_cycle", 0)),
+                tokens_budget_per_cycle=data.get("tokens_budget_per_cycle"),
+                user_notes=list(data.get("user_notes", [])),
+                decision_log=decisions,
+                open_conflicts=list(data.get("open_conflicts", [])),
+            )
+        except (TypeError, ValueError):
+            return cls()
 
     def save(self, runtime: Path) -> Path:
-        runtime.mkdir(parents=True, exist_ok=True)
         # Cap unbounded lists
-        if len(self.decision_log) > 500:
-            self.decision_log = self.decision_log[-500:]
         if len(self.user_notes) > 200:
             self.user_notes = self.user_notes[-200:]
-        path = self.state_path(runtime)
-        path.write_text(json.dumps(asdict(self), indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
-        return path
+        new = self.decision_log[self._saved_decisions:]
+        values = asdict(self)
+        values.pop("decision_log")
+        with transaction(runtime) as conn:
+            put_values(conn, "product", values)
+            if new:
+                add_decisions(conn, new)
+        if len(self.decision_log) > DECISION_KEEP:
+            self.decision_log = self.decision_log[-DECISION_KEEP:]
+        self._saved_decisions = len(self.decision_log)
+        return store_path(runtime)
 
     def log_decision(self, actor: str, text: str, **extra: Any) -> None:
         entry: dict[str, Any] = {"ts": _now_iso(), "actor": actor, "text": text}
@@ -0,0 +1,218 @@
+"""One SQLite store (``.ocean/runtime.sqlite``) for the runtime's small, hot state.
+
+Replaces a file per inbox message (``.ocean/inbox/pending/msg-*.json``, globbed, parsed
+and renamed on every drain), the whole-file rewrite of ``product_state.json`` (with its
+500-entry decision log) on every update, the token ledger JSONL and ``docs/economy.json``.
+
+Tables: ``inbox`` (``consumed_at`` null = pending; indexed), ``decisions`` (append-only,
+capped at ``DECISION_KEEP`` rows), ``kv`` (namespaced JSON values: product-state scalars,
+economy metadata), ``ledger`` (token usage, indexed by time) and ``wallets``.
+
+The database runs in WAL mode, so readers never block the writer; writers that read
+first (draining the inbox, charging wallets) take ``begin immediate`` through
+``transaction()`` and serialize across processes. Legacy files are imported once when the
+store is created and renamed with a ``.migrated`` suffix; the token ledger and wallets
+fold their old files in lazily (see ``token_budget`` / ``core.economy``).
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+STORE = "runtime.sqlite"
+SCHEMA_VERSION = 1
+DECISION_KEEP = 500
+_SCHEMA = """
+create table if not exists inbox (
+    id text primary key,
+    ts text not null,
+    text text not null,
+    attachments text not null default '[]',
+    consumed_at text
+);
+create index if not exists inbox_pending on inbox (consumed_at, ts);
+create table if not exists decisions (
+    id integer primary key autoincrement,
+    ts text not null,
+    actor text not null,
+    text text not null,
+    meta text
+);
+create index if not exists decisions_actor on decisions (actor, id);
+create table if not exists kv (
+    ns text not null,
+    key text not null,
+    value text not null,
+    primary key (ns, key)
+);
+create table if not exists ledger (t real not null, n integer not null);
+create index if not exists ledger_t on ledger (t);
+create table if not exists wallets (persona text primary key, balance real not null);
+"""
+
+_ready: set[Path] = set()
+_ready_lock = threading.Lock()
+
+
+def store_path(runtime: Path) -> Path:
+    return runtime / STORE
+
+
+def _open(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Autocommit mode: transactions are explicit (``begin immediate``) or per statement
+    conn = sqlite3.connect(path, timeout=10, isolation_level=None)
+    conn.execute("pragma synchronous = normal")
+    return conn
+
+
+def _ensure(runtime: Path) -> Path:
+    path = store_path(runtime)
+    if path in _ready and path.exists():
+        return path
+    with _ready_lock:
+        conn = _open(path)
+        try:
+            conn.execute("pragma journal_mode = wal")
+            conn.executescript(_SCHEMA)
+            conn.execute("begin immediate")
+            try:
+                if conn.execute("pragma user_version").fetchone()[0] < SCHEMA_VERSION:
+                    _migrate_files(conn, runtime)
+                    conn.execute(f"pragma user_version = {SCHEMA_VERSION}")
+                conn.execute("commit")
+            except BaseException:
+                conn.execute("rollback")
+                raise
+        finally:
+            conn.close()
+        _ready.add(path)
+    return path
+
+
+@contextmanager
+def connect(runtime: Path) -> Iterator[sqlite3.Connection]:
+    """Autocommit connection (each statement is its own transaction); always closed."""
+    conn = _open(_ensure(runtime))
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+@contextmanager
+def transaction(runtime: Path) -> Iterator[sqlite3.Connection]:
+    """Write transaction taken up front, so read-then-write is atomic across processes."""
+    with connect(runtime) as conn:
+        conn.execute("begin immediate")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("rollback")
+            raise
+        conn.execute("commit")
+
+
+# --- kv / decisions helpers --------------------------------------------------------
+
+
+def get_values(conn: sqlite3.Connection, ns: str) -> dict[str, Any]:
+    out: dict[str, Any] = {}
+    for key, raw in conn.execute("select key, value from kv where ns = ?", (ns,)):
+        try:
+            out[key] = json.loads(raw)
+        except ValueError:
+            continue
+    return out
+
+
+def put_values(conn: sqlite3.Connection, ns: str, values: dict[str, Any]) -> None:
+    conn.executemany(
+        "insert into kv (ns, key, value) values (?, ?, ?) on conflict (ns, key) do update set value = excluded.value",
+        [(ns, k, json.dumps(v, ensure_ascii=False)) for k, v in values.items()],
+    )
+
+
+def add_decisions(conn: sqlite3.Connection, entries: list[dict[str, Any]]) -> None:
+    conn.executemany(
+        "insert into decisions (ts, actor, text, meta) values (?, ?, ?, ?)",
+        [
+            (
+                str(e.get("ts", "")),
+                str(e.get("actor", "")),
+                str(e.get("text", "")),
+                json.dumps(e["meta"], ensure_ascii=False) if e.get("meta") is not None else None,
+            )
+            for e in entries
+        ],
+    )
+    conn.execute(
+        "delete from decisions where id <= (select max(id) from decisions) - ?",
+        (DECISION_KEEP,),
+    )
+
+
+def recent_decisions(conn: sqlite3.Connection, limit: int = DECISION_KEEP) -> list[dict[str, Any]]:
+    rows = conn.execute(
+        "select ts, actor, text, meta from decisions order by id desc limit ?", (limit,)
+    ).fetchall()
+    out: list[dict[str, Any]] = []
+    for ts, actor, text, meta in reversed(rows):
+        entry: dict[str, Any] = {"ts": ts, "actor": actor, "text": text}
+        if meta is not None:
+            try:
+                entry["meta"] = json.loads(meta)
+            except ValueError:
+                pass
+        out.append(entry)
+    return out
+
+
+# --- one-time import of the file-based layout ---------------------------------------
+
+
+def _retire(path: Path) -> None:
+    try:
+        path.rename(path.with_name(path.name + ".migrated"))
+    except OSError:
+        pass
+
+
+def _migrate_files(conn: sqlite3.Connection, runtime: Path) -> None:
+    inbox = runtime / "inbox"
+    for sub, consumed in (("archive", True), ("pending", False)):
+        for p in sorted((inbox / sub).glob("msg-*.json")):
+            try:
+                data = json.loads(p.read_text(encoding="utf-8"))
+            except Exception:
+                continue
+            if not isinstance(data, dict) or not data.get("id"):
+                continue
+            conn.execute(
+                "insert or ignore into inbox (id, ts, text, attachments, consumed_at) values (?, ?, ?, ?, ?)",
+                (
+                    str(data["id"]),
+                    str(data.get("ts", "")),
+                    str(data.get("text", "")),
+                    json.dumps(list(data.get("attachments") or [])),
+                    (str(data.get("consumed_at") or data.get("ts", "")) if consumed else None),
+                ),
+            )
+    if inbox.is_dir():
+        _retire(inbox)
+
+    legacy = runtime / "product_state.json"
+    try:
+        data = json.loads(legacy.read_text(encoding="utf-8")) if legacy.exists() else None
+    except Exception:
+        data = None
+    if isinstance(data, dict):
+        decisions = [e for e in data.pop("decision_log", None) or [] if isinstance(e, dict)]
+        put_values(conn, "product", data)
+        add_decisions(conn, decisions[-DECISION_KEEP:])
+        _retire(legacy)
@@ -0,0 +1,177 @@
+"""Repo-scout as a fan-out/fan-in pipeline.
+
+The four audits (Q, Edna, Mario, Tony) are independent and read-only, so they run on a
+bounded thread pool (``OCEAN_SCOUT_WORKERS``, default 4; codegen calls additionally pass
+through ``rate_limiter``). Each report is written and announced as soon as it lands.
+Moroni's synthesis starts when every audit finished or ``OCEAN_SCOUT_DEADLINE`` seconds
+(default 300) passed, using whatever reports exist; stragglers still write their report
+when they finish. Per-agent latency goes to ``scout_report`` events and
+``docs/repo_scout/latency.json``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+from . import codex_exec
+from .events_emit import emit_event
+from .feed import feed as _feed
+
+DEFAULT_WORKERS = 4
+DEFAULT_DEADLINE = 300.0
+
+
+@dataclass
+class ScoutJob:
+    agent: str
+    scope: str
+    task: str
+    out_path: Path
+
+
+@dataclass
+class ScoutResult:
+    reports: dict[str, Path] = field(default_factory=dict)
+    latency: dict[str, float] = field(default_factory=dict)
+    missing: list[str] = field(default_factory=list)
+    synthesis: Optional[Path] = None
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = (os.getenv(name) or "").strip()
+    try:
+        v = float(raw)
+    except ValueError:
+        return default
+    return v if v > 0 else default
+
+
+def default_jobs(reports_dir: Path) -> list[ScoutJob]:
+    return [
+        ScoutJob("Q", "backend", "Audit backend files, propose 2 PRs.", reports_dir / "Q.md"),
+        ScoutJob("Edna", "frontend", "Review UI code, suggest 2 UX improvements.", reports_dir / "Edna.md"),
+        ScoutJob("Mario", "infra", "Audit workflows/Docker, suggest 1 infra improvement.", reports_dir / "Mario.md"),
+        ScoutJob("Tony", "tests", "Analyze tests, stress core loop, report issues.", reports_dir / "Tony.md"),
+    ]
+
+
+def _rel(p: Path) -> str:
+    try:
+        return str(p.relative_to(Path.cwd()))
+    except ValueError:
+        return str(p)
+
+
+def _write(files: dict[str, str]) -> None:
+    for rel, content in files.items():
+        p = Path(rel)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(content, encoding="utf-8")
+
+
+def _audit(job: ScoutJob, bundle: Path, voice: Callable[[str, str], str]) -> tuple[bool, float]:
+    """Run one audit and write its report; returns (ok, seconds)."""
+    instruction = (
+        f"You are {job.agent}, responsible for {job.scope}. Review the repository context and produce a short report with Findings and Suggestions.\n"
+        f"Scope: {job.scope}. Task: {job.task}\n"
+        "Return JSON mapping the path to Markdown content. Use headings: # Findings, # Suggestions, # Proposed PRs."
+        " Keep it concise and actionable."
+        "\nVoice: " + voice(job.agent, job.scope)
+    )
+    title = f"Repo-scout: {job.scope}"
+    emit_event("task_start", agent=job.agent, title=title, intent=job.task)
+    start = time.monotonic()
+    files = codex_exec.generate_files(instruction, [_rel(job.out_path)], bundle, agent=job.agent)
+    seconds = time.monotonic() - start
+    if files:
+        _write(files)
+    emit_event("task_end", agent=job.agent, title=title, intent=job.task)
+    emit_event("scout_report", agent=job.agent, ok=bool(files), seconds=round(seconds, 2), path=_rel(job.out_path))
+    if files:
+        emit_event("note", agent=job.agent, title=f"Report: {job.out_path}")
+        _feed(f"🌊 Ocean: repo-scout {job.agent} report ready ({seconds:.1f}s) — {_rel(job.out_path)}")
+    else:
+        _feed(f"🌊 Ocean: repo-scout {job.agent} produced no report ({seconds:.1f}s)")
+    return bool(files), seconds
+
+
+def _synthesize(reports_dir: Path, reports: dict[str, Path], missing: list[str], voice: Callable[[str, str], str]) -> Optional[Path]:
+    parts = [p.read_text(encoding="utf-8") for p in reports.values() if p.exists()]
+    if missing:
+        parts.append("Reports not available in time: " + ", ".join(missing))
+    tmp = reports_dir / "_combined_reports.md"
+    tmp.write_text("\n\n".join(parts), encoding="utf-8")
+    synth_path = reports_dir / "Moroni-synthesis.md"
+    instruction = (
+        "Synthesize the following agent reports into a cohesive architecture & roadmap. "
+        "Approve/reject proposals, and assign phased next steps. Keep it concise."
+        " Return JSON mapping to 'docs/repo_scout/Moroni-synthesis.md'."
+        "\nVoice: " + voice("Moroni", "planning")
+    )
+    files = codex_exec.generate_files(instruction, [str(synth_path)], tmp, agent="Moroni")
+    if not files:
+        return None
+    _write(files)
+    emit_event("note", agent="Moroni", title=f"Synthesis: {synth_path}")
+    return synth_path
+
+
+def run_scout(
+    bundle: Path,
+    reports_dir: Path,
+    *,
+    jobs: Optional[list[ScoutJob]] = None,
+    voice: Callable[[str, str], str] = lambda agent, scope: "",
+    workers: Optional[int] = None,
+    deadline: Optional[float] = None,
+) -> ScoutResult:
+    """Run the audits concurrently, then Moroni's synthesis over the reports that landed."""
+    reports_dir.mkdir(parents=True, exist_ok=True)
+    jobs = jobs if jobs is not None else default_jobs(reports_dir)
+    n = workers or int(_env_float("OCEAN_SCOUT_WORKERS", DEFAULT_WORKERS))
+    limit = deadline if deadline is not None else _env_float("OCEAN_SCOUT_DEADLINE", DEFAULT_DEADLINE)
+    result = ScoutResult()
+    pool = ThreadPoolExecutor(max_workers=max(1, n), thread_name_prefix="scout")
+    pending = {pool.submit(_audit, job, bundle, voice): job for job in jobs}
+    end = time.monotonic() + limit
+    try:
+        while pending:
+            left = end - time.monotonic()
+            if left <= 0:
+                break
+            done, _ = wait(list(pending), timeout=left, return_when=FIRST_COMPLETED)
+            for fut in done:
+                job = pending.pop(fut)
+                try:
+                    ok, seconds = fut.result()
+                except Exception as e:  # one failed audit must not sink the others
+                    _feed(f"🌊 Ocean: repo-scout {job.agent} failed — {e}")
+                    ok, seconds = False, 0.0
+                result.latency[job.agent] = round(seconds, 2)
+                if ok:
+                    result.reports[job.agent] = job.out_path
+    finally:
+        # Stragglers, queued ones included, keep running and still write their report;
+        # synthesis does not wait
+        pool.shutdown(wait=False)
+    result.missing = [job.agent for job in jobs if job.agent not in result.reports]
+    late = [job.agent for job in pending.values()]
+    if late:
+        _feed(f"🌊 Ocean: repo-scout deadline ({limit:.0f}s) — synthesizing without {', '.join(late)}")
+    try:
+        (reports_dir / "latency.json").write_text(
+            json.dumps({"latency": result.latency, "late": late}, indent=2) + "\n", encoding="utf-8"
+        )
+    except OSError:
+        pass
+    try:
+        result.synthesis = _synthesize(reports_dir, result.reports, result.missing, voice)
+    except Exception:
+        result.synthesis = None
+    return result
@@ -0,0 +1,234 @@
+"""Dependency-aware backlog scheduler — runs independent tasks on a bounded worker pool.
+
+A task's outputs are ``Task.files_touched``; its inputs are ``Task.inputs`` (fnmatch
+patterns). Task B waits for an earlier task A when:
+
+- they share an owner (agents are stateful; one agent works one task at a time),
+- B reads something A writes, A reads something B writes, or both write the same path,
+- B declares ``inputs=["*"]`` (a barrier: waits for every earlier task, e.g. Tony's tests).
+
+Everything else may overlap. LLM-bound tasks additionally take a per-backend slot so
+one provider is never hit by more than its configured concurrency.
+
+``batch_groups``/``merge_tasks`` fold an owner's batchable tasks into one composite task
+so their codegen can share a single request (see ``codex_exec.generate_batch``).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from fnmatch import fnmatchcase
+from typing import Callable, Iterable, Optional, Sequence
+
+from .models import Task
+
+# Conservative defaults; CLI subscriptions rate-limit harder than raw HTTP APIs.
+BACKEND_CONCURRENCY: dict[str, int] = {
+    "codex": 2,
+    "claude": 2,
+    "openai_api": 4,
+    "gemini_api": 4,
+}
+DEFAULT_MAX_WORKERS = 4
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = (os.getenv(name) or "").strip()
+    try:
+        v = int(raw)
+    except ValueError:
+        return default
+    return v if v > 0 else default
+
+
+def max_workers() -> int:
+    """Worker pool size (``OCEAN_MAX_WORKERS``, default 4)."""
+    return _env_int("OCEAN_MAX_WORKERS", DEFAULT_MAX_WORKERS)
+
+
+def backend_concurrency(backend: str) -> int:
+    """In-flight task limit for one backend (``OCEAN_CONCURRENCY_<BACKEND>`` overrides)."""
+    return _env_int(f"OCEAN_CONCURRENCY_{backend.upper()}", BACKEND_CONCURRENCY.get(backend, 1))
+
+
+def _matches(patterns: Iterable[str], paths: Iterable[str]) -> bool:
+    paths = list(paths)
+    for pat in patterns:
+        for p in paths:
+            if p == pat or fnmatchcase(p, pat):
+                return True
+    return False
+
+
+def _data_depends(later: Task, earlier: Task) -> bool:
+    if "*" in later.inputs:
+        return True
+    if _matches(later.inputs, earlier.files_touched):
+        return True
+    if _matches(earlier.inputs, later.files_touched):
+        return True
+    return bool(set(later.files_touched) & set(earlier.files_touched))
+
+
+def _depends(later: Task, earlier: Task) -> bool:
+    return later.owner == earlier.owner or _data_depends(later, earlier)
+
+
+def build_dependencies(tasks: Sequence[Task]) -> list[set[int]]:
+    """For each task index, the indices of earlier tasks it must wait for."""
+    deps: list[set[int]] = []
+    for j, t in enumerate(tasks):
+        deps.append({i for i in range(j) if _depends(t, tasks[i])})
+    return deps
+
+
+def critical_path(tasks: Sequence[Task]) -> list[int]:
+    """Longest dependency chain (by task count) — the lower bound on sequential LLM calls."""
+    deps = build_dependencies(tasks)
+    best: list[list[int]] = []
+    for j in range(len(tasks)):
+        prev = max((best[i] for i in deps[j]), key=len, default=[])
+        best.append(prev + [j])
+    return max(best, key=len, default=[])
+
+
+def batch_groups(tasks: Sequence[Task], batchable: Callable[[Task], bool]) -> list[list[int]]:
+    """Partition task indices into run units; multi-task units share one owner.
+
+    A unit runs at the position of its first member, so a batchable task joins its
+    owner's open group only if no task in between (of any owner) has a data dependency
+    on the group in either direction. A non-batchable task of the same owner, or a
+    ``"*"`` barrier, closes the group. Units come back ordered by first member.
+    """
+    units: list[list[int]] = []
+    open_groups: dict[str, list[int]] = {}
+    between: dict[str, list[int]] = {}
+
+    def _conflict(t: Task, others: Iterable[int]) -> bool:
+        return any(_data_depends(t, tasks[i]) or _data_depends(tasks[i], t) for i in others)
+
+    for j, t in enumerate(tasks):
+        if batchable(t):
+            group = open_groups.get(t.owner)
+            if group is not None and not _conflict(t, between[t.owner]):
+                group.append(j)
+            else:
+                open_groups[t.owner], between[t.owner] = [j], []
+                units.append(open_groups[t.owner])
+        else:
+            units.append([j])
+        for owner in list(open_groups):
+            if open_groups[owner][-1] == j:
+                continue
+            if owner == t.owner or _conflict(t, open_groups[owner]):
+                del open_groups[owner], between[owner]
+            else:
+                between[owner].append(j)
+    return units
+
+
+def merge_tasks(tasks: Sequence[Task]) -> Task:
+    """Composite task covering ``tasks`` (same owner): joined titles, unioned paths."""
+    if len(tasks) == 1:
+        return tasks[0]
+
+    def _union(lists: Iterable[list[str]]) -> list[str]:
+        return list(dict.fromkeys(p for ps in lists for p in ps))
+
+    return Task(
+        title=" + ".join(t.title for t in tasks),
+        description="; ".join(t.description for t in tasks if t.description),
+        owner=tasks[0].owner,
+        files_touched=_union(t.files_touched for t in tasks),
+        # A member reading another member's output is satisfied inside the batch
+        inputs=[p for p in _union(t.inputs for t in tasks)
+                if not any(p == f or fnmatchcase(f, p) for t in tasks for f in t.files_touched)],
+    )
+
+
+class TaskScheduler:
+    """Run a backlog respecting declared dependencies and per-backend limits.
+
+    ``run_task`` executes one task and returns the executed task list (agents' ``execute``
+    contract). ``backend_for`` returns the backend slot a task needs, or None for tasks
+    that never call a model (e.g. Tony's pytest run).
+    """
+
+    def __init__(
+        self,
+        run_task: Callable[[Task], list[Task]],
+        *,
+        backend_for: Callable[[Task], Optional[str]] = lambda t: None,
+        workers: Optional[int] = None,
+        on_start: Optional[Callable[[Task], None]] = None,
+        on_end: Optional[Callable[[Task], None]] = None,
+    ) -> None:
+        self.run_task = run_task
+        self.backend_for = backend_for
+        self.workers = workers or max_workers()
+        self.on_start = on_start
+        self.on_end = on_end
+        self._slots: dict[str, threading.Semaphore] = {}
+        self._slots_lock = threading.Lock()
+
+    def _slot(self, backend: str) -> threading.Semaphore:
+        with self._slots_lock:
+            sem = self._slots.get(backend)
+            if sem is None:
+                sem = threading.Semaphore(backend_concurrency(backend))
+                self._slots[backend] = sem
+            return sem
+
+    def _execute(self, task: Task) -> list[Task]:
+        backend = self.backend_for(task)
+        sem = self._slot(backend) if backend else None
+        if sem is not None:
+            sem.acquire()
+        try:
+            if self.on_start:
+                self.on_start(task)
+            out = self.run_task(task)
+            if self.on_end:
+                self.on_end(task)
+            return out
+        finally:
+            if sem is not None:
+                sem.release()
+
+    def run(self, tasks: Iterable[Task]) -> list[Task]:
+        """Execute all tasks; results come back in backlog order.
+
+        The first exception stops scheduling new tasks, waits for in-flight ones and
+        is re-raised.
+        """
+        items = list(tasks)
+        deps = build_dependencies(items)
+        results: list[list[Task]] = [[] for _ in items]
+        done: set[int] = set()
+        pending = set(range(len(items)))
+        running: dict[Future, int] = {}
+        error: Optional[BaseException] = None
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while pending or running:
+                if error is None:
+                    for j in sorted(pending):
+                        if deps[j] <= done:
+                            pending.discard(j)
+                            running[pool.submit(self._execute, items[j])] = j
+                if not running:
+                    break
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    j = running.pop(fut)
+                    try:
+                        results[j] = fut.result()
+                    except BaseException as e:  # noqa: BLE001 - re-raised below
+                        if error is None:
+                            error = e
+                        continue
+                    done.add(j)
+        if error is not None:
+            raise error
+        return [t for group in results for t in group]
@@ -1,16 +1,30 @@
-"""Soft hourly token budget — Ocean tracks usage; warns in-feed (orchestration, not user math)."""
+"""Soft hourly token budget — Ocean tracks usage; warns in-feed (orchestration, not user math).
+
+Usage rows (``t``, ``n``) live in the ``ledger`` table of the runtime store
+(``.ocean/runtime.sqlite``, see ``runtime.store``): an insert per call, window sums are
+one indexed range query, and rows older than the window are pruned on write. Concurrent
+``ocean loop`` / ``ocean scout`` processes share it through SQLite's own locking.
+
+Callers select a project with ``cwd`` (default: the working directory). The older
+``path`` argument (``.ocean/token_ledger.jsonl``) still works: its directory selects the
+store. An old JSONL or ``token_ledger.json`` found there is folded into the store and
+removed.
+"""
 
 from __future__ import annotations
 
 import json
 import os
+import sqlite3
 import time
 from pathlib import Path
 from typing import Any, Callable
 
 from .backends import load_prefs
+from .runtime.store import connect, transaction
 
-_LEDGER = "token_ledger.json"
+_LEDGER = "token_ledger.jsonl"
+_LEGACY_LEDGER = "token_ledger.json"
 _WINDOW_S = 3600
 
 
@@ -36,66 +50,111 @@ def budget_cap(cwd: Path | None = None) -> int | None:
         return None
 
 
-def _load_ledger(path: Path) -> dict[str, Any]:
-    if not path.exists():
-        return {"events": []}
-    try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except Exception:
-        return {"events": []}
+def _rows(items: list[Any]) -> list[tuple[float, int]]:
+    out: list[tuple[float, int]] = []
+    for r in items:
+        if not isinstance(r, dict):
+            continue
+        try:
+            out.append((float(r.get("t", 0)), int(r.get("n", 0))))
+        except (TypeError, ValueError):
+            continue
+    return out
 
 
-def _save_ledger(path: Path, data: dict[str, Any]) -> None:
-    path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+def _parse_lines(raw: bytes) -> list[tuple[float, int]]:
+    out: list[tuple[float, int]] = []
+    for line in raw.splitlines():
+        if not line.strip():
+            continue
+        try:
+            e = json.loads(line)
+        except ValueError:
+            continue
+        if not isinstance(e, dict):
+            continue
+        # One-line legacy document ({"events": [...]}) is accepted as-is
+        out.extend(_rows(e["events"] if isinstance(e.get("events"), list) else [e]))
+    return out
 
 
-def usage_recent(path: Path | None = None, *, window_s: int = _WINDOW_S) -> int:
-    """Sum of recorded tokens in the last ``window_s`` seconds."""
-    p = path or _ledger_path()
+def _migrate_legacy(path: Path) -> None:
+    """Fold the old JSONL / whole-file ledgers next to ``path`` into the store once."""
+    legacy = [p for p in (path.with_name(_LEDGER), path.with_name(_LEGACY_LEDGER)) if p.exists()]
+    if not legacy:
+        return
     now = time.time()
-    data = _load_ledger(p)
-    events = data.get("events") or []
-    if not isinstance(events, list):
+    with transaction(path.parent) as conn:
+        for p in legacy:
+            try:
+                raw = p.read_bytes()  # gone if another process got here first
+            except OSError:
+                continue
+            if p.name == _LEGACY_LEDGER:
+                try:
+                    data = json.loads(raw)
+                except ValueError:
+                    data = {}
+                events = data.get("events") if isinstance(data, dict) else None
+                rows = _rows(events) if isinstance(events, list) else []
+            else:
+                rows = _parse_lines(raw)
+            keep = [(t, max(0, n)) for t, n in rows if now - t <= _WINDOW_S]
+            conn.executemany("insert into ledger (t, n) values (?, ?)", keep)
+            try:
+                p.unlink()
+            except OSError:
+                pass
+
+
+def _window(path: Path, now: float) -> list[tuple[float, int]]:
+    with connect(path.parent) as conn:
+        return conn.execute("select t, n from ledger where t >= ? order by t", (now - _WINDOW_S,)).fetchall()
+
+
+def usage_recent(path: Path | None = None, *, window_s: int = _WINDOW_S, cwd: Path | None = None) -> int:
+    """Sum of recorded tokens in the last ``window_s`` seconds (at most one hour)."""
+    p = path or _ledger_path(cwd)
+    _migrate_legacy(p)
+    since = time.time() - min(window_s, _WINDOW_S)
+    try:
+        with connect(p.parent) as conn:
+            return int(conn.execute("select coalesce(sum(n), 0) from ledger where t >= ?", (since,)).fetchone()[0])
+    except sqlite3.Error:
         return 0
-    total = 0
-    kept: list[dict[str, Any]] = []
-    for e in events:
-        if not isinstance(e, dict):
-            continue
-        try:
-            t = float(e.get("t", 0))
-            n = int(e.get("n", 0))
-        except (TypeError, ValueError):
-            continue
-        if now - t <= window_s:
-            total += max(0, n)
-            kept.append({"t": t, "n": n})
-    if len(kept) != len(events):
-        data["events"] = kept
-        try:
-            _save_ledger(p, data)
-        except OSError:
-            pass
-    return total
+
+
+def seconds_until_under(limit: int, path: Path | None = None, *, cwd: Path | None = None) -> float:
+    """Seconds until rolling-hour usage drops below ``limit`` as old events expire."""
+    p = path or _ledger_path(cwd)
+    _migrate_legacy(p)
+    now = time.time()
+    try:
+        events = _window(p, now)
+    except sqlite3.Error:
+        return 0.0
+    total = sum(n for _, n in events)
+    for t, n in events:
+        if total < limit:
+            break
+        total -= n
+        if total < limit:
+            return max(0.0, _WINDOW_S - (now - t))
+    return 0.0
 
 
 def note_usage(tokens: int, cwd: Path | None = None) -> None:
-    """Append a token estimate (call from codegen / LLM wrappers when available)."""
+    """Record a token estimate (call from codegen / LLM wrappers when available)."""
     if tokens <= 0:
         return
     p = _ledger_path(cwd)
-    data = _load_ledger(p)
-    ev = data.setdefault("events", [])
-    if not isinstance(ev, list):
-        ev = []
-        data["events"] = ev
-    ev.append({"t": time.time(), "n": int(tokens)})
-    # cap list size
-    if len(ev) > 2000:
-        data["events"] = ev[-2000:]
+    _migrate_legacy(p)
+    now = time.time()
     try:
-        _save_ledger(p, data)
-    except OSError:
+        with transaction(p.parent) as conn:
+            conn.execute("insert into ledger (t, n) values (?, ?)", (now, int(tokens)))
+            conn.execute("delete from ledger where t < ?", (now - _WINDOW_S,))
+    except (sqlite3.Error, OSError):
         pass
 
 
@@ -107,7 +166,7 @@ def feed_status_if_needed(
     cap = budget_cap(cwd)
     if cap is None:
         return
-    used = usage_recent(_ledger_path(cwd))
+    used = usage_recent(cwd=cwd)
     pct = min(100, int(100 * used / cap)) if cap else 0
     if used >= cap:
         feed(
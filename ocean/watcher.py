@@ -0,0 +1,246 @@
+"""Block until watched files change: inotify on Linux, ``stat()`` polling elsewhere.
+
+``ocean loop`` used to sleep ``--interval`` seconds between cycles and then poll
+``stat()`` on the spec files once a second while waiting for ``/continue``; the chat
+feed re-globbed ``logs/events-*.jsonl`` every 0.8s. With dozens of idle loops per host
+that polling adds up. ``watch()`` returns a ``Watcher`` whose ``wait()`` sleeps in
+``select()`` on an inotify descriptor (zero CPU while idle) and wakes as soon as a
+relevant file is created, written, renamed, or removed.
+
+Targets are file paths, directories (any child counts), or ``fnmatch`` patterns in the
+last component (``logs/events-*.jsonl``). The parent directory of each target is what
+gets watched, so files that do not exist yet are fine.
+
+The polling backend is used when inotify is unavailable (non-Linux, no libc, watch
+limit reached, parent directory missing) or when ``OCEAN_WATCHER=poll``;
+``OCEAN_WATCH_POLL`` sets its interval in seconds (default 1).
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import fnmatch
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+DEFAULT_POLL_S = 1.0
+_DEBOUNCE_S = 0.05  # collect the rest of a burst (write + rename) into one wake-up
+
+# <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+)
+_EVENT = struct.Struct("iIII")
+
+
+def _poll_interval() -> float:
+    raw = (os.getenv("OCEAN_WATCH_POLL") or "").strip()
+    try:
+        v = float(raw)
+    except ValueError:
+        return DEFAULT_POLL_S
+    return v if v > 0 else DEFAULT_POLL_S
+
+
+def _split(target: Path) -> tuple[Path, Optional[str]]:
+    """(directory to watch, name pattern or None for "anything in the directory")."""
+    if target.is_dir() and not any(ch in target.name for ch in "*?["):
+        return target, None
+    return target.parent, target.name
+
+
+class Watcher:
+    """Base interface: ``wait()`` returns the changed paths, or ``[]`` on timeout."""
+
+    backend = "none"
+
+    def __init__(self, targets: Iterable[Path | str]):
+        self.targets: list[tuple[Path, Optional[str]]] = [_split(Path(t)) for t in targets]
+
+    def _matches(self, directory: Path, name: str) -> bool:
+        for d, pattern in self.targets:
+            if d == directory and (pattern is None or fnmatch.fnmatchcase(name, pattern)):
+                return True
+        return False
+
+    def wait(self, timeout: Optional[float] = None) -> list[Path]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "Watcher":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class PollingWatcher(Watcher):
+    """Portable fallback: compares ``(mtime_ns, size)`` of matching files each interval."""
+
+    backend = "poll"
+
+    def __init__(self, targets: Iterable[Path | str], interval: Optional[float] = None):
+        super().__init__(targets)
+        self.interval = interval or _poll_interval()
+        self._last = self._snapshot()
+
+    def _snapshot(self) -> dict[Path, tuple[int, int]]:
+        snap: dict[Path, tuple[int, int]] = {}
+        for directory, pattern in self.targets:
+            try:
+                names = os.listdir(directory)
+            except OSError:
+                continue
+            for name in names:
+                if pattern is not None and not fnmatch.fnmatchcase(name, pattern):
+                    continue
+                p = directory / name
+                try:
+                    st = p.stat()
+                except OSError:
+                    continue
+                snap[p] = (st.st_mtime_ns, st.st_size)
+        return snap
+
+    def wait(self, timeout: Optional[float] = None) -> list[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            now = self._snapshot()
+            changed = sorted(p for p in set(now) | set(self._last) if now.get(p) != self._last.get(p))
+            self._last = now
+            if changed:
+                return changed
+            if deadline is not None:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    return []
+                time.sleep(min(self.interval, left))
+            else:
+                time.sleep(self.interval)
+
+
+_libc: Optional[ctypes.CDLL] = None
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    global _libc
+    if _libc is None and sys.platform.startswith("linux"):
+        try:
+            lib = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            lib.inotify_init1.argtypes = [ctypes.c_int]
+            lib.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+            _libc = lib
+        except (OSError, AttributeError):
+            _libc = None
+    return _libc
+
+
+class InotifyWatcher(Watcher):
+    """Linux inotify through a ``ctypes`` binding; idles in ``select()``."""
+
+    backend = "inotify"
+
+    def __init__(self, targets: Iterable[Path | str]):
+        super().__init__(targets)
+        libc = _load_libc()
+        if libc is None:
+            raise OSError("inotify unavailable")
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._fd = fd
+        self._dirs: dict[int, Path] = {}
+        try:
+            for directory in {d for d, _ in self.targets}:
+                wd = libc.inotify_add_watch(fd, os.fsencode(directory), _MASK)
+                if wd < 0:
+                    err = ctypes.get_errno()
+                    raise OSError(err, f"inotify_add_watch {directory}: {os.strerror(err)}")
+                self._dirs[wd] = directory
+        except OSError:
+            os.close(fd)
+            raise
+
+    def _all_targets(self) -> list[Path]:
+        return [d if pattern is None else d / pattern for d, pattern in self.targets]
+
+    def _drain(self) -> set[Path]:
+        changed: set[Path] = set()
+        while True:
+            try:
+                buf = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            if not buf:
+                return changed
+            off = 0
+            while off + _EVENT.size <= len(buf):
+                wd, mask, _cookie, length = _EVENT.unpack_from(buf, off)
+                off += _EVENT.size
+                name = buf[off:off + length].rstrip(b"\0").decode("utf-8", "surrogateescape")
+                off += length
+                if mask & IN_Q_OVERFLOW:
+                    changed.update(self._all_targets())
+                    continue
+                directory = self._dirs.get(wd)
+                if directory is None:
+                    continue
+                if mask & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+                    # The watched directory itself went away: everything in it changed
+                    changed.update(directory / (p or "") for d, p in self.targets if d == directory)
+                elif name and self._matches(directory, name):
+                    changed.add(directory / name)
+
+    def wait(self, timeout: Optional[float] = None) -> list[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            left = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self._fd], [], [], left)
+            if not ready:
+                return []
+            changed = self._drain()
+            if changed:
+                time.sleep(_DEBOUNCE_S)
+                changed |= self._drain()
+                return sorted(changed)
+            # Only unrelated files in a watched directory changed; keep waiting
+            if deadline is not None and time.monotonic() >= deadline:
+                return []
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def watch(targets: Iterable[Path | str]) -> Watcher:
+    """Best available watcher for ``targets`` (inotify, else polling)."""
+    targets = list(targets)
+    if (os.getenv("OCEAN_WATCHER") or "").strip().lower() != "poll":
+        try:
+            return InotifyWatcher(targets)
+        except OSError:
+            pass
+    return PollingWatcher(targets)
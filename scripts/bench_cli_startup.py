@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Cold-start benchmark for the ``ocean`` CLI (``import ocean.cli``, ``ocean status``, ``ocean ingest``).
+
+Each sample is a fresh interpreter, as when hooks call ``ocean ingest`` / ``ocean status``.
+With ``--max-ms`` the script exits non-zero if any median exceeds the budget, so it can
+guard against import-time regressions in CI.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+CASES = {
+    "import": "import ocean.cli",
+    "status": "import sys; sys.argv = ['ocean', 'status']; from ocean.cli import entrypoint; entrypoint()",
+    "ingest": "import sys; sys.argv = ['ocean', 'ingest', 'bench note']; from ocean.cli import entrypoint; entrypoint()",
+}
+
+
+def _sample(code: str, cwd: str, env: dict[str, str]) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env, capture_output=True, check=False)
+    return (time.perf_counter() - start) * 1000
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--runs", type=int, default=10)
+    ap.add_argument("--max-ms", type=float, default=None, help="fail if any case's median exceeds this")
+    ap.add_argument("cases", nargs="*", metavar="case", help=f"subset of: {', '.join(CASES)}")
+    args = ap.parse_args(argv)
+    unknown = [c for c in args.cases if c not in CASES]
+    if unknown:
+        ap.error(f"unknown case(s): {', '.join(unknown)}")
+    args.cases = args.cases or list(CASES)
+
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(ROOT),
+        "OCEAN_DISABLE_WORKSPACE": "1",
+        "OCEAN_DISABLE_CODEX": "1",
+        "OCEAN_TEST": "1",
+    }
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline = statistics.median(_sample("pass", tmp, env) for _ in range(args.runs))
+        print(f"{'python -c pass':<16} median {baseline:7.1f} ms")
+        for name in args.cases:
+            times = [_sample(CASES[name], tmp, env) for _ in range(args.runs)]
+            med = statistics.median(times)
+            over = args.max_ms is not None and med > args.max_ms
+            failed |= over
+            print(
+                f"{'ocean ' + name:<16} median {med:7.1f} ms  (min {min(times):.1f}, +{med - baseline:.1f} over bare python)"
+                + ("  OVER BUDGET" if over else "")
+            )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
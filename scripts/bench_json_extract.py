@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: JSON extraction from large Codex transcripts.
+
+Compares the old suffix-retry extractor with ``ocean.json_extract`` over recorded
+outputs (``logs/codex-*.log``, ``logs/codex-last-*.txt`` or any paths given) plus a
+synthetic transcript (banner + tool logs + multi-file mapping) of ``--size`` KB.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from ocean.json_extract import extract_json  # noqa: E402
+
+
+def legacy_extract(stdout: str):
+    """Previous codex_exec._extract_json: json.loads on every suffix ending in '}'."""
+    start = stdout.find("{")
+    if start == -1:
+        return None
+    for end in range(len(stdout) - 1, start, -1):
+        if stdout[end] == "}":
+            try:
+                return json.loads(stdout[start : end + 1])
+            except Exception:
+                continue
+    return None
+
+
+def synthetic(size_kb: int) -> str:
+    files = {
+        f"src/module_{i}.js": "function f() { return {a: 1, b: [1, 2, {c: 3}]}; }\n" * 20 for i in range(40)
+    }
+    mapping = json.dumps(files)
+    logs = []
+    n = 0
+    while n < size_kb * 1024:
+        line = "[tool] exec: sed -n '1,200p' src/app.py  # {exit: 0} } done\n"
+        logs.append(line)
+        n += len(line)
+    # Mapping first, then brace-heavy tool logs: the old extractor re-parses the whole
+    # mapping once per trailing '}'.
+    return "codex v0.30 session banner\n" + mapping + "\n" + "".join(logs) + "-- tokens used: 1234 }\n"
+
+
+def _time(fn, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("paths", nargs="*", type=Path, help="recorded outputs (default: logs/codex-*)")
+    parser.add_argument("--size", type=int, default=256, help="synthetic transcript size in KB")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-legacy", action="store_true", help="only time the new extractor")
+    args = parser.parse_args(argv)
+
+    root = Path(__file__).resolve().parents[1]
+    paths = args.paths or sorted(root.glob("logs/codex-*.log")) + sorted(root.glob("logs/codex-last-*.txt"))
+    samples = [(f"synthetic-{args.size}KB", synthetic(args.size))]
+    for p in paths:
+        try:
+            samples.append((p.name, p.read_text(encoding="utf-8", errors="replace")))
+        except OSError:
+            continue
+
+    print(f"{'sample':40} {'KB':>8} {'legacy ms':>10} {'new ms':>10}")
+    for name, text in samples:
+        new = _time(extract_json, text, args.repeat) * 1000
+        old = float("nan") if args.skip_legacy else _time(legacy_extract, text, args.repeat) * 1000
+        print(f"{name[:40]:40} {len(text) / 1024:8.1f} {old:10.1f} {new:10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
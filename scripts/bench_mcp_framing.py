@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Throughput benchmark: MCP stdio framing over a pipe.
+
+Streams ``--count`` Content-Length frames of ``--size`` KB through an OS pipe and times
+the old byte-at-a-time reader against ``ocean.jsonrpc_framing.FrameReader``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from ocean.jsonrpc_framing import FrameReader, frame_lsp  # noqa: E402
+
+
+def legacy_read(stream) -> bytes | None:
+    """Previous MCPServer._read_message loop (1-byte reads until the header ends)."""
+    buf = b""
+    while b"\r\n\r\n" not in buf:
+        chunk = stream.read(1)
+        if not chunk:
+            return None
+        buf += chunk
+    header, rest = buf.split(b"\r\n\r\n", 1)
+    length = int(header.split(b":", 1)[1])
+    while len(rest) < length:
+        chunk = stream.read(length - len(rest))
+        if not chunk:
+            return None
+        rest += chunk
+    return rest[:length]
+
+
+def _run(wire: bytes, count: int, read_one) -> float:
+    rfd, wfd = os.pipe()
+
+    def writer() -> None:
+        with os.fdopen(wfd, "wb") as w:
+            w.write(wire)
+
+    t = threading.Thread(target=writer)
+    t0 = time.perf_counter()
+    t.start()
+    with os.fdopen(rfd, "rb") as rf:
+        read = read_one(rf)
+        for _ in range(count):
+            assert read() is not None
+    t.join()
+    return time.perf_counter() - t0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=64, help="payload size per frame in KB")
+    parser.add_argument("--count", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    body = json.dumps({"jsonrpc": "2.0", "id": 1, "params": {"blob": "x" * (args.size * 1024)}}).encode()
+    wire = frame_lsp(body) * args.count
+    mb = len(wire) / 1e6
+    legacy = _run(wire, args.count, lambda rf: (lambda: legacy_read(rf)))
+    chunked = _run(wire, args.count, lambda rf: FrameReader(rf).read_frame)
+    print(f"{args.count} frames x {args.size} KB ({mb:.1f} MB)")
+    print(f"legacy   {legacy * 1000:8.1f} ms  {mb / legacy:8.1f} MB/s")
+    print(f"chunked  {chunked * 1000:8.1f} ms  {mb / chunked:8.1f} MB/s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,156 @@
+"""Incremental Control Room activity stream (``/api/events/stream``)."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from ocean import event_bus
+from ocean.activity_stream import ActivityStream, Cursor, sse
+from ocean.events_emit import emit_event
+from ocean.product_loop import bootstrap_doctrine
+
+
+@pytest.fixture
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    log = tmp_path / "logs" / "events-test.jsonl"
+    monkeypatch.setenv("OCEAN_EVENTS_FILE", str(log))
+    monkeypatch.delenv("OCEAN_EVENTS_FLUSH_MS", raising=False)
+    bootstrap_doctrine(tmp_path)
+    yield tmp_path
+    event_bus.log_for(log).close()
+
+
+def _chat(root: Path, message: str) -> None:
+    path = root / ".ocean" / "chat.jsonl"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write(json.dumps({"ts": "t", "message": message, "response": "ok"}) + "\n")
+
+
+def _types(messages: list[dict]) -> list[str]:
+    return [m["type"] for m in messages]
+
+
+def test_fresh_connection_gets_snapshot_and_event_backlog(project: Path) -> None:
+    _chat(project, "old")
+    for i in range(5):
+        emit_event("note", agent="Tony", title=f"n{i}")
+    messages = ActivityStream(project, backlog=3).poll()
+    assert _types(messages) == ["state", "event", "event", "event"]
+    state = messages[0]["data"]
+    assert state["full"] is True and len(state["actors"]) == 5 and "VISION.md" in state["doctrine"]
+    assert [m["data"]["title"] for m in messages[1:]] == ["n2", "n3", "n4"]
+
+
+def test_polls_deliver_only_deltas(project: Path) -> None:
+    stream = ActivityStream(project)
+    stream.poll()
+    assert stream.poll() == []
+
+    _chat(project, "hello")
+    emit_event("task_start", agent="Mario", title="ci")
+    (project / "ROADMAP.md").write_text("# Roadmap\n\nShip it.\n", encoding="utf-8")
+    messages = stream.poll()
+    assert _types(messages) == ["chat", "state", "event"]
+    assert messages[0]["data"]["message"] == "hello"
+    assert messages[1]["data"] == {"full": False, "doctrine": {"ROADMAP.md": "# Roadmap\n\nShip it.\n"}}
+    assert messages[2]["data"]["event"] == "task_start"
+
+    actors = json.loads((project / ".ocean" / "actors.json").read_text(encoding="utf-8"))
+    actors[0]["active"] = False
+    (project / ".ocean" / "actors.json").write_text(json.dumps(actors, indent=2) + "\n", encoding="utf-8")
+    messages = stream.poll()
+    assert "actors" in _types(messages)
+    assert next(m for m in messages if m["type"] == "actors")["data"]["actors"][0]["active"] is False
+
+
+def test_resume_from_last_event_id(project: Path) -> None:
+    stream = ActivityStream(project)
+    emit_event("note", title="a")
+    last_id = stream.poll()[-1]["id"]
+    emit_event("note", title="b")
+    _chat(project, "while away")
+
+    resumed = ActivityStream(project, Cursor.decode(last_id))
+    messages = resumed.poll()
+    # Same state digest: no snapshot re-sent; nothing missed, nothing repeated
+    assert _types(messages) == ["chat", "event"]
+    assert messages[1]["data"]["title"] == "b"
+
+
+def test_cursor_and_sse_framing() -> None:
+    assert Cursor.decode("garbage") is None
+    assert Cursor.decode(None) is None
+    cur = Cursor("events-x.jsonl", 7, 120, "abc", 3)
+    assert Cursor.decode(cur.encode()) == cur
+    assert Cursor.decode("v1|events-x.jsonl|7|120|abc") is None
+    frame = sse({"id": cur.encode(), "type": "chat", "data": {"message": "hi"}})
+    assert frame == f'id: {cur.encode()}\nevent: chat\ndata: {{"message":"hi"}}\n\n'
+
+
+def test_chat_follows_rotation(project: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from ocean.product_chat import append_chat
+
+    monkeypatch.setenv("OCEAN_CHAT_MAX_MB", str(400 / (1024 * 1024)))
+    stream = ActivityStream(project)
+    stream.poll()
+    for i in range(12):
+        append_chat(project, {"message": f"c{i}", "response": "ok"})
+        if i % 5 == 4:
+            assert [m["data"]["message"] for m in stream.poll() if m["type"] == "chat"] == [
+                f"c{j}" for j in range(i - 4, i + 1)
+            ]
+
+
+def test_resume_after_rotation_while_disconnected(project: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from ocean.product_chat import append_chat
+
+    monkeypatch.setenv("OCEAN_CHAT_MAX_MB", str(1000 / (1024 * 1024)))
+    append_chat(project, {"message": "seen", "response": "ok"})
+    stream = ActivityStream(project)
+    stream.poll()
+    append_chat(project, {"message": "c0", "response": "ok"})
+    last_id = stream.poll()[-1]["id"]
+
+    # While away: the live file rotates and the new one grows past the old offset
+    i = 1
+    while len(list((project / ".ocean").glob("chat.jsonl.*[0-9]"))) < 1:
+        append_chat(project, {"message": f"c{i}", "response": "ok"})
+        i += 1
+    for _ in range(6):
+        append_chat(project, {"message": f"c{i}", "response": "ok"})
+        i += 1
+    assert (project / ".ocean" / "chat.jsonl").stat().st_size > Cursor.decode(last_id).chat
+
+    resumed = ActivityStream(project, Cursor.decode(last_id))
+    got = [m["data"]["message"] for m in resumed.poll() if m["type"] == "chat"]
+    assert got == [f"c{j}" for j in range(1, i)]
+
+
+def test_concurrent_session_logs_do_not_replay(project: Path) -> None:
+    logs = project / "logs"
+    logs.mkdir(exist_ok=True)
+    older, newer = logs / "events-20260101-090000.jsonl", logs / "events-20260101-100000.jsonl"
+
+    def write(path: Path, seq: int) -> None:
+        log = event_bus.log_for(path)
+        log.append({"event": "note", "title": f"{path.name[7:22]}:{seq}"})
+        log.flush()
+
+    write(older, 1)
+    stream = ActivityStream(project)
+    stream.poll()
+    write(newer, 1)
+    titles = [m["data"]["title"] for m in stream.poll() if m["type"] == "event"]
+    assert titles == ["20260101-100000:1"]
+    for seq in range(2, 5):
+        # The older session writes last, so it has the newest mtime
+        write(newer, seq)
+        write(older, seq)
+        titles = [m["data"]["title"] for m in stream.poll() if m["type"] == "event"]
+        assert titles == [f"20260101-100000:{seq}"]
+    for path in (older, newer):
+        event_bus.log_for(path).close()
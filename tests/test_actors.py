@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+
+from ocean.actors import actor_store_path, add_actor_skill, coverage_report, load_actors
+
+
+def test_load_actors_creates_store_then_reads_without_writing(tmp_path: Path):
+    actors = load_actors(tmp_path)
+    path = actor_store_path(tmp_path)
+    assert len(actors) == 5
+    assert path.exists()
+
+    before = path.stat().st_mtime_ns
+    os.utime(path, ns=(before - 10_000_000, before - 10_000_000))
+    stamped = path.stat().st_mtime_ns
+    for _ in range(3):
+        assert load_actors(tmp_path) == actors
+    coverage_report(tmp_path)
+    assert path.stat().st_mtime_ns == stamped
+
+
+def test_load_actors_returns_copies(tmp_path: Path):
+    first = load_actors(tmp_path)
+    first[0]["skills"].append("mutated by caller")
+    assert "mutated by caller" not in load_actors(tmp_path)[0]["skills"]
+
+
+def test_load_actors_picks_up_external_edits(tmp_path: Path):
+    actors = load_actors(tmp_path)
+    path = actor_store_path(tmp_path)
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data[0]["skills"].append("hand-edited skill")
+    path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    assert "hand-edited skill" in load_actors(tmp_path)[0]["skills"]
+
+    # Legacy / un-normalized content is merged and rewritten once
+    path.write_text(json.dumps([{"id": actors[1]["id"], "active": False}]), encoding="utf-8")
+    reloaded = load_actors(tmp_path)
+    assert reloaded[1]["active"] is False
+    assert json.loads(path.read_text(encoding="utf-8")) == reloaded
+
+
+def test_concurrent_reads_and_skill_update(tmp_path: Path):
+    actor_id = load_actors(tmp_path)[0]["id"]
+    errors: list[BaseException] = []
+
+    def poll() -> None:
+        try:
+            for _ in range(50):
+                assert len(load_actors(tmp_path)) == 5
+        except BaseException as exc:  # noqa: BLE001
+            errors.append(exc)
+
+    threads = [threading.Thread(target=poll) for _ in range(4)]
+    for t in threads:
+        t.start()
+    add_actor_skill(actor_id, "parallel skill", tmp_path)
+    for t in threads:
+        t.join()
+    assert not errors
+    assert "parallel skill" in load_actors(tmp_path)[0]["skills"]
@@ -24,7 +24,7 @@ def test_early_brain_openai_mock(monkeypatch, tmp_path: Path) -> None:
     resp.raise_for_status = MagicMock()
 
     with patch("ocean.brain_client.get_codegen_backend", return_value="openai_api"):
-        with patch("ocean.brain_client.httpx.post", return_value=resp) as post:
+        with patch("ocean.llm_transport.post", return_value=resp) as post:
             out = fetch_early_loop_brain_text(cwd=tmp_path, timeout=5.0)
     assert out
     assert "- First" in out
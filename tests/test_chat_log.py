@@ -0,0 +1,75 @@
+"""Chat log: tail-seek reads, rotation, ``before`` pagination."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from ocean import chat_log
+from ocean.product_chat import append_chat, recent_chat
+
+
+@pytest.fixture(autouse=True)
+def _small_blocks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(chat_log, "_BLOCK", 64)  # force many backward block reads
+    for name in ("OCEAN_CHAT_MAX_MB", "OCEAN_CHAT_KEEP"):
+        monkeypatch.delenv(name, raising=False)
+
+
+def _msgs(entries: list[dict]) -> list[str]:
+    return [e["message"] for e in entries]
+
+
+def test_recent_chat_reads_only_the_tail(tmp_path: Path) -> None:
+    for i in range(50):
+        append_chat(tmp_path, {"message": f"m{i}", "response": "x" * (i % 7)})
+    assert _msgs(recent_chat(tmp_path, limit=3)) == ["m47", "m48", "m49"]
+    assert _msgs(recent_chat(tmp_path, limit=100)) == [f"m{i}" for i in range(50)]
+    assert recent_chat(tmp_path / "nothing-here") == []
+
+
+def test_skips_partial_and_corrupt_lines(tmp_path: Path) -> None:
+    append_chat(tmp_path, {"message": "a"})
+    path = chat_log.chat_path(tmp_path)
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write("not json\n")
+    append_chat(tmp_path, {"message": "b"})
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write('{"message": "half')  # writer mid-line
+    assert _msgs(recent_chat(tmp_path, limit=2)) == ["a", "b"]
+
+
+def test_pages_back_across_rotated_archives(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OCEAN_CHAT_MAX_MB", str(300 / (1024 * 1024)))  # ~300 bytes per segment
+    for i in range(30):
+        append_chat(tmp_path, {"message": f"m{i:02d}", "response": "r"})
+    segs = chat_log.segments(chat_log.chat_path(tmp_path))
+    assert len(segs) > 3
+
+    seen: list[str] = []
+    before = None
+    while True:
+        page = chat_log.page(tmp_path, limit=4, before=before)
+        seen = _msgs(page["messages"]) + seen
+        before = page["next_before"]
+        if before is None:
+            break
+    assert seen == [f"m{i:02d}" for i in range(30)]
+
+    # A cursor into the live file stays valid after that file is rotated
+    cursor = chat_log.page(tmp_path, limit=1)["next_before"]
+    expected = _msgs(chat_log.page(tmp_path, limit=2, before=cursor)["messages"])
+    for i in range(30, 40):
+        append_chat(tmp_path, {"message": f"m{i}", "response": "r"})
+    assert _msgs(chat_log.page(tmp_path, limit=2, before=cursor)["messages"]) == expected
+
+
+def test_rotation_prunes_old_archives(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OCEAN_CHAT_MAX_MB", str(100 / (1024 * 1024)))
+    monkeypatch.setenv("OCEAN_CHAT_KEEP", "2")
+    for i in range(40):
+        append_chat(tmp_path, {"message": f"m{i}"})
+    path = chat_log.chat_path(tmp_path)
+    assert len(chat_log.segments(path)) == 3
+    assert chat_log.page(tmp_path, before="1:0") == {"messages": [], "next_before": None}
@@ -0,0 +1,98 @@
+"""Batched codegen: one request for several of an agent's tasks."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from ocean import codex_exec
+from ocean.agents import Mario
+from ocean.codex_exec import CodegenJob
+from ocean.models import ProjectSpec, Task
+
+_JOBS = [
+    CodegenJob("ci", "Write CI.", [".github/workflows/ci.yml"]),
+    CodegenJob("docker", "Write Docker files.", ["Dockerfile", ".dockerignore"]),
+    CodegenJob("deploy", "Write deploy config.", ["devops/deploy.yaml"]),
+]
+
+
+@pytest.fixture
+def calls(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, list[str]]]:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("OCEAN_EVENTS_FILE", str(tmp_path / "events.jsonl"))
+    for name in ("OCEAN_CODEGEN_BATCH", "OCEAN_CODEGEN_BATCH_TOKENS"):
+        monkeypatch.delenv(name, raising=False)
+    seen: list[tuple[str, list[str]]] = []
+
+    def fake(instruction, suggested_files=None, context_file=None, timeout=240, agent=None):
+        seen.append((instruction, list(suggested_files or [])))
+        return {f: f"# {f}\n" for f in suggested_files or []}
+
+    monkeypatch.setattr(codex_exec, "generate_files", fake)
+    return seen
+
+
+def _batch_event(tmp_path: Path) -> dict:
+    rows = [json.loads(x) for x in (tmp_path / "events.jsonl").read_text(encoding="utf-8").splitlines()]
+    return [r for r in rows if r["event"] == "codegen_batch"][-1]
+
+
+def test_jobs_share_one_request_and_are_attributed(calls, tmp_path: Path) -> None:
+    out = codex_exec.generate_batch(_JOBS, agent="Mario")
+    assert len(calls) == 1
+    assert "### Task 2 [docker] — files: Dockerfile, .dockerignore" in calls[0][0]
+    assert set(out["docker"]) == {"Dockerfile", ".dockerignore"}
+    assert set(out["deploy"]) == {"devops/deploy.yaml"}
+    ev = _batch_event(tmp_path)
+    assert ev["requests"] == 1 and [t["status"] for t in ev["tasks"]] == ["ok"] * 3
+
+
+def test_token_ceiling_splits_batches(calls, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OCEAN_CODEGEN_BATCH_TOKENS", "4000")  # ~1500 tokens per file
+    assert [[j.key for j in b] for b in codex_exec.split_batches(_JOBS)] == [["ci"], ["docker"], ["deploy"]]
+    monkeypatch.setenv("OCEAN_CODEGEN_BATCH_TOKENS", "5000")
+    assert [[j.key for j in b] for b in codex_exec.split_batches(_JOBS)] == [["ci", "docker"], ["deploy"]]
+    out = codex_exec.generate_batch(_JOBS)
+    assert len(calls) == 2 and all(out.values())
+
+
+def test_job_missing_from_merged_response_is_retried_alone(calls, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    def fake(instruction, suggested_files=None, context_file=None, timeout=240, agent=None):
+        calls.append((instruction, list(suggested_files or [])))
+        if len(suggested_files or []) > 1:  # the merged request forgets deploy.yaml
+            return {".github/workflows/ci.yml": "ci", "Dockerfile": "FROM python", ".github/dependabot.yml": "x"}
+        return {"devops/deploy.yaml": "deploy"}
+
+    monkeypatch.setattr(codex_exec, "generate_files", fake)
+    out = codex_exec.generate_batch(_JOBS)
+    # an unlisted file outside every job's directories goes to the first job with output
+    assert out["ci"] == {".github/workflows/ci.yml": "ci", ".github/dependabot.yml": "x"}
+    assert out["docker"] == {"Dockerfile": "FROM python"}
+    assert out["deploy"] == {"devops/deploy.yaml": "deploy"}
+    assert [files for _, files in calls][1] == ["devops/deploy.yaml"]
+    ev = _batch_event(tmp_path)
+    assert ev["requests"] == 2
+    assert {t["key"]: t["status"] for t in ev["tasks"]} == {"ci": "ok", "docker": "ok", "deploy": "retried"}
+
+
+def test_disabled_batching_sends_one_request_per_job(calls, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OCEAN_CODEGEN_BATCH", "0")
+    codex_exec.generate_batch(_JOBS)
+    assert [files for _, files in calls] == [j.files for j in _JOBS]
+
+
+def test_mario_uploads_context_once_for_three_codegen_tasks(calls, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(codex_exec, "available", lambda: True)
+    monkeypatch.setenv("OCEAN_VERBOSE", "0")
+    spec = ProjectSpec(name="X", kind="web")
+    mario = Mario()
+    tasks = [t for t in mario.propose_tasks(spec) if mario.batchable(t)]
+    assert len(tasks) == 3
+    mario.execute(tasks, spec)
+    assert len(calls) == 1
+    assert (tmp_path / "Dockerfile").read_text(encoding="utf-8") == "# Dockerfile\n"
+    assert (tmp_path / "devops" / "deploy.yaml").exists()
+    assert not mario._prefetched
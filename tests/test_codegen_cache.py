@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from ocean import codegen_cache, codex_exec
+
+
+@pytest.fixture
+def cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.chdir(tmp_path)
+    events = tmp_path / "events.jsonl"
+    monkeypatch.setenv("OCEAN_EVENTS_FILE", str(events))
+    for name in ("OCEAN_CODEGEN_CACHE", "OCEAN_CODEGEN_CACHE_TTL", "OCEAN_CODEGEN_CACHE_MB"):
+        monkeypatch.delenv(name, raising=False)
+    return tmp_path
+
+
+def _events(root: Path) -> list[dict]:
+    path = root / "events.jsonl"
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+def test_round_trip_and_events(cache_dir: Path) -> None:
+    key = codegen_cache.make_key("openai_api", "gpt", "prompt")
+    assert codegen_cache.get(key, backend="openai_api", model="gpt") is None
+    codegen_cache.put(key, {"a.py": "x = 1\n"}, backend="openai_api", model="gpt")
+    assert codegen_cache.get(key, backend="openai_api", model="gpt") == {"a.py": "x = 1\n"}
+    assert (cache_dir / ".ocean" / "cache" / "codegen.sqlite").exists()
+    results = [e["result"] for e in _events(cache_dir) if e.get("event") == "codegen_cache"]
+    assert results == ["miss", "hit"]
+
+
+def test_key_covers_backend_model_and_variant() -> None:
+    base = codegen_cache.make_key("gemini_api", "g", "p")
+    assert base == codegen_cache.make_key("gemini_api", "g", "p")
+    assert base != codegen_cache.make_key("openai_api", "g", "p")
+    assert base != codegen_cache.make_key("gemini_api", "g2", "p")
+    assert base != codegen_cache.make_key("gemini_api", "g", "p", "json")
+
+
+def test_expired_entries_miss(cache_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    key = codegen_cache.make_key("openai_api", "gpt", "p")
+    codegen_cache.put(key, {"a": "1"}, backend="openai_api", model="gpt")
+    monkeypatch.setenv("OCEAN_CODEGEN_CACHE_TTL", "0.000001")
+    assert codegen_cache.get(key) is None
+    assert codegen_cache.stats()["entries"] == 0
+
+
+def test_size_bound_evicts_least_recently_used(cache_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OCEAN_CODEGEN_CACHE_MB", str(2500 / (1024 * 1024)))
+    keys = [codegen_cache.make_key("openai_api", "m", str(i)) for i in range(3)]
+    codegen_cache.put(keys[0], {"f": "a" * 1000}, backend="openai_api", model="m")
+    codegen_cache.put(keys[1], {"f": "b" * 1000}, backend="openai_api", model="m")
+    assert codegen_cache.get(keys[0]) is not None  # touch: keys[1] is now the LRU entry
+    codegen_cache.put(keys[2], {"f": "c" * 1000}, backend="openai_api", model="m")
+    assert codegen_cache.get(keys[1]) is None
+    assert codegen_cache.get(keys[0]) is not None
+    assert codegen_cache.get(keys[2]) is not None
+
+
+def test_fallback_serves_repeat_prompt_from_cache(cache_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr("ocean.backends.get_codegen_backend", lambda *a, **k: "openai_api")
+    calls: list[str] = []
+
+    def fake(full_prompt: str, timeout: int):
+        calls.append(full_prompt)
+        return {"app.py": "print('hi')\n"}
+
+    monkeypatch.setattr(codex_exec, "_openai_api_codegen", fake)
+    first = codex_exec.generate_files_with_fallback("Add a CI workflow")
+    second = codex_exec.generate_files_with_fallback("Add a CI workflow")
+    assert first == second == {"app.py": "print('hi')\n"}
+    assert len(calls) == 1
+
+    monkeypatch.setenv("OCEAN_CODEGEN_CACHE", "0")
+    codex_exec.generate_files_with_fallback("Add a CI workflow")
+    assert len(calls) == 2
+
+
+def test_execute_backlog_cycle_hits_cache(cache_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from ocean import agents
+    from ocean.models import ProjectSpec, Task
+    from ocean.planner import execute_backlog
+
+    monkeypatch.setenv("OCEAN_CODEGEN_BACKEND", "codex")
+    monkeypatch.setenv("OCEAN_PREFER_OPENAI_API", "1")
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("OCEAN_USE_CREWAI", "0")
+    monkeypatch.setattr(codex_exec, "available", lambda: True)
+    monkeypatch.setattr(agents.Tony, "_run_tests_and_report", lambda self: None)
+    calls: list[str] = []
+
+    def fake(full_prompt: str, timeout: int):
+        calls.append(full_prompt)
+        return {"docs/architecture.md": "# Architecture\n"}
+
+    monkeypatch.setattr(codex_exec, "_openai_api_codegen", fake)
+    spec = ProjectSpec(name="X", kind="web")
+    task = Task(title="Design web application architecture", description="d", owner="Moroni",
+                files_touched=["docs/architecture.md"])
+    for _ in range(3):
+        execute_backlog([task], cache_dir / "docs", spec)
+    # The first cycle writes docs/backlog.json and plan.md into the context; after that
+    # an unchanged cycle sends an identical prompt
+    assert len(calls) == 2
+    assert [e["result"] for e in _events(cache_dir) if e.get("event") == "codegen_cache"] == ["miss", "miss", "hit"]
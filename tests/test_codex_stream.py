@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import json
+import sys
+import time
+
+from ocean import codex_stream, rate_limiter
+
+_MAPPING = {"app.py": "print('hi')\n"}
+
+
+def _script(body: str) -> list[str]:
+    return [sys.executable, "-c", "import json, sys, time\n" + body]
+
+
+def test_final_message_and_tokens_from_current_event_shape() -> None:
+    events = [
+        {"type": "thread.started", "thread_id": "t1"},
+        {"type": "item.completed", "item": {"type": "reasoning", "text": "thinking"}},
+        {"type": "item.completed", "item": {"type": "agent_message", "text": json.dumps(_MAPPING)}},
+        {"type": "turn.completed", "usage": {"input_tokens": 120, "output_tokens": 30}},
+    ]
+    body = "".join(f"print(json.dumps({e!r}), flush=True)\n" for e in events)
+    seen: list[str] = []
+    result = codex_stream.run_stream(_script(body), timeout=30, on_event=lambda ev: seen.append(ev.kind))
+    assert json.loads(result.stdout) == _MAPPING
+    assert result.tokens == 150
+    assert result.events == 4
+    assert seen == ["thread.started", "reasoning", "agent_message", "turn.completed"]
+    assert result.returncode == 0
+
+
+def test_legacy_task_complete_and_token_count() -> None:
+    events = [
+        {"id": "0", "msg": {"type": "token_count", "info": {"total_token_usage": {"total_tokens": 77}}}},
+        {"id": "1", "msg": {"type": "task_complete", "last_agent_message": "{\"a\": \"b\"}"}},
+    ]
+    body = "".join(f"print(json.dumps({e!r}), flush=True)\n" for e in events)
+    result = codex_stream.run_stream(_script(body), timeout=30)
+    assert result.final_message == '{"a": "b"}'
+    assert result.tokens == 77
+
+
+def test_heavy_stderr_does_not_deadlock_and_tail_is_bounded() -> None:
+    body = (
+        "for i in range(5000):\n"
+        "    sys.stderr.write('warn %05d ' % i + 'x' * 60 + '\\n')\n"
+        "sys.stderr.flush()\n"
+        "print(json.dumps({'type': 'turn.completed', 'usage': {'total_tokens': 1}}))\n"
+    )
+    result = codex_stream.run_stream(_script(body), timeout=30)
+    assert not result.timed_out
+    tail = result.stderr_tail.lines()
+    assert tail[-1].startswith("warn 04999")
+    assert len(tail) <= codex_stream.TAIL_LINES
+    assert result.stderr_tail.dropped > 0
+
+
+def test_exits_early_once_final_message_seen(monkeypatch) -> None:
+    monkeypatch.setattr(codex_stream, "_EXIT_GRACE", 0.2)
+    body = (
+        "print(json.dumps({'type': 'turn.completed', 'usage': {}}), flush=True)\n"
+        "time.sleep(30)\n"
+    )
+    start = time.monotonic()
+    result = codex_stream.run_stream(_script(body), timeout=60)
+    assert result.early_exit and not result.timed_out
+    assert time.monotonic() - start < 10
+
+
+def test_timeout_kills_child() -> None:
+    start = time.monotonic()
+    result = codex_stream.run_stream(_script("time.sleep(30)\n"), timeout=0.5)
+    assert result.timed_out
+    assert time.monotonic() - start < 10
+    assert result.returncode is not None
+
+
+def test_non_json_lines_go_to_on_line() -> None:
+    lines: list[str] = []
+    result = codex_stream.run_stream(_script("print('banner'); print('{not json')\n"), timeout=30, on_line=lines.append)
+    assert lines == ["banner", "{not json"]
+    assert result.final_message is None
+    assert result.stdout == "banner\n{not json"
+
+
+def test_ring_buffer_bounds_bytes() -> None:
+    buf = codex_stream.RingBuffer(max_lines=100, max_bytes=10)
+    for ch in "abcdef":
+        buf.append(ch * 4)
+    assert buf.lines() == ["eeee", "ffff"]
+    assert buf.dropped == 4
+
+
+def _fake_codex(tmp_path, monkeypatch, body: str) -> list[str]:
+    """Put a scripted ``codex`` on PATH; returns the rate-limiter outcomes it produces."""
+    from ocean import codex_health
+
+    bindir = tmp_path / "bin"
+    bindir.mkdir()
+    script = bindir / "codex"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import json, sys, time\n"
+        "if 'exec' not in sys.argv:\n"
+        "    sys.exit(0)\n" + body,
+        encoding="utf-8",
+    )
+    script.chmod(0o755)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("PATH", f"{bindir}:/usr/bin:/bin")
+    monkeypatch.setenv("OCEAN_CODEX_AUTH", "1")
+    monkeypatch.setenv("CODEX_AUTH_TOKEN", "tok")
+    for name in ("OPENAI_API_KEY", "OCEAN_DISABLE_CODEX", "OCEAN_PREFER_OPENAI_API", "OCEAN_EVENTS_FILE"):
+        monkeypatch.delenv(name, raising=False)
+    codex_health.invalidate()
+    outcomes: list[str] = []
+    real = rate_limiter.Lease.report
+    monkeypatch.setattr(rate_limiter.Lease, "report", lambda self, o, ra=None: (outcomes.append(o), real(self, o, ra)))
+    return outcomes
+
+
+def test_generate_files_streams_through_fake_codex(tmp_path, monkeypatch) -> None:
+    from ocean import codex_exec
+
+    final = {"type": "item.completed", "item": {"type": "agent_message", "text": json.dumps(_MAPPING)}}
+    outcomes = _fake_codex(
+        tmp_path,
+        monkeypatch,
+        f"print(json.dumps({final!r}), flush=True)\n"
+        "print(json.dumps({'type': 'turn.completed', 'usage': {'total_tokens': 5}}), flush=True)\n"
+        "time.sleep(30)\n",
+    )
+    monkeypatch.setenv("OCEAN_CODEX_STREAM", "1")
+    monkeypatch.setattr(codex_stream, "_EXIT_GRACE", 0.2)
+    assert codex_exec.generate_files("Add app.py") == _MAPPING
+    # Stopped early after turn.completed: a success for the limiter, not a -15 error
+    assert outcomes == [rate_limiter.OK]
+
+
+def test_successful_bypass_retry_ignores_stderr_noise(tmp_path, monkeypatch) -> None:
+    from ocean import codex_exec
+
+    outcomes = _fake_codex(
+        tmp_path,
+        monkeypatch,
+        "if '--dangerously-bypass-approvals-and-sandbox' not in sys.argv:\n"
+        "    print('sandbox denied', file=sys.stderr); sys.exit(1)\n"
+        "print('retry after 429 from upstream', file=sys.stderr)\n"
+        f"print(json.dumps({_MAPPING!r}))\n",
+    )
+    monkeypatch.delenv("OCEAN_CODEX_STREAM", raising=False)
+    monkeypatch.setattr("time.sleep", lambda s: None)  # skip the retry backoff
+    assert codex_exec.generate_files("Add app.py") == _MAPPING
+    assert outcomes == [rate_limiter.ERROR, rate_limiter.ERROR, rate_limiter.OK]
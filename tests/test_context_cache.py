@@ -0,0 +1,112 @@
+"""Incremental context bundle cache (`.ocean/context_cache.json`)."""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+from ocean import context as ctx
+
+
+def _seed(root: Path) -> None:
+    (root / "docs").mkdir()
+    (root / "backend").mkdir()
+    (root / "docs" / "prd.md").write_text("# PRD\nship it\n", encoding="utf-8")
+    (root / "backend" / "app.py").write_text("print('hi')\n", encoding="utf-8")
+    deep = root / "a" / "b" / "c"
+    deep.mkdir(parents=True)
+    (deep / "too_deep.txt").write_text("x", encoding="utf-8")
+
+
+def test_bundle_contents(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    _seed(tmp_path)
+    bundle = ctx.build_context_bundle(None)
+    text = bundle.read_text(encoding="utf-8")
+    assert "## prd.md (truncated)\n\n# PRD" in text
+    assert "### backend/app.py\n\nprint('hi')" in text
+    assert "backend/app.py" in text.split("## file samples")[0]
+    assert "too_deep.txt" not in text
+    # Generated artifacts never feed back into the next bundle
+    assert "### docs/context_bundle.md" not in ctx.build_context_bundle(None).read_text(encoding="utf-8")
+
+
+def test_unchanged_inputs_skip_rewrite(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    _seed(tmp_path)
+    bundle = ctx.build_context_bundle(None)
+    os.utime(bundle, ns=(1, 1))
+    os.utime(tmp_path / "docs" / "context_summary.md", ns=(1, 1))
+    ctx.build_context_bundle(None)
+    # mtimes differ from what the cache recorded, so both are rewritten once
+    first = bundle.stat().st_mtime_ns
+    assert first != 1
+    again = ctx.build_context_bundle(None)
+    assert again == bundle
+    assert bundle.stat().st_mtime_ns == first
+
+
+def test_changed_input_rebuilds(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    _seed(tmp_path)
+    ctx.build_context_bundle(None)
+    (tmp_path / "backend" / "app.py").write_text("print('changed')\n", encoding="utf-8")
+    text = ctx.build_context_bundle(None).read_text(encoding="utf-8")
+    assert "print('changed')" in text
+    assert "print('hi')" not in text
+
+
+def test_cache_disabled(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("OCEAN_CONTEXT_CACHE", "0")
+    _seed(tmp_path)
+    ctx.build_context_bundle(None)
+    assert not (tmp_path / ".ocean" / "context_cache.json").exists()
+
+
+def test_budget_outlines_large_files_and_lists_omitted(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("OCEAN_CONTEXT_TOKENS", "4000")
+    _seed(tmp_path)
+    big = "\n".join(f"def handler_{i}(request, *, retries: int = 3) -> dict:\n    return {{'i': {i}}}\n" for i in range(200))
+    (tmp_path / "ui").mkdir()
+    for i in range(40):
+        (tmp_path / "ui" / f"page{i}.html").write_text(f"<p>{i}</p>\n" + "x" * 800, encoding="utf-8")
+    routes = tmp_path / "backend" / "routes.py"
+    routes.write_text('"""Route table."""\n' + big, encoding="utf-8")
+    os.utime(routes, ns=(time.time_ns() + 10**9,) * 2)  # newest file is packed first
+    text = ctx.build_context_bundle(None).read_text(encoding="utf-8")
+    assert ctx.estimate_tokens(text) <= 4000
+    assert "def handler_7(request, *, retries: int=3) -> dict: ..." in text
+    assert "return {'i': 7}" not in text
+    assert "Omitted (over context budget): " in text
+
+
+def test_repeated_paragraphs_are_sent_once(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    _seed(tmp_path)
+    para = "Shared licence text that every generated file repeats verbatim, long enough to count."
+    (tmp_path / "backend" / "a.md").write_text(f"# A\n\n{para}\n", encoding="utf-8")
+    (tmp_path / "backend" / "b.md").write_text(f"# B\n\n{para}\n", encoding="utf-8")
+    text = ctx.build_context_bundle(None).read_text(encoding="utf-8")
+    assert text.count(para) == 1
+    # PRD is already a core section; it is not repeated as a sample
+    assert "### docs/prd.md" not in text
+
+
+def test_focus_context_ranks_relevant_samples_first(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    _seed(tmp_path)
+    (tmp_path / "ui").mkdir()
+    (tmp_path / "ui" / "index.html").write_text("<h1>dashboard</h1>\n", encoding="utf-8")
+    (tmp_path / "backend" / "billing.py").write_text("def invoice_total():\n    return 0\n", encoding="utf-8")
+    text = ctx.build_context_bundle(None).read_text(encoding="utf-8")
+    focused = ctx.focus_context(text, "Fix the invoice_total rounding", ["backend/billing.py"])
+    order = [ln for ln in focused.splitlines() if ln.startswith("### ")]
+    assert order[0] == "### backend/billing.py"
+    tight = ctx.focus_context(focused, "Fix the invoice_total rounding", ["backend/billing.py"],
+                              budget=ctx.estimate_tokens(focused.split("## file samples")[0]) + 100)
+    assert "### backend/billing.py" in tight and "### ui/index.html" not in tight
+    assert "Omitted (over context budget): " in tight
+    assert ctx.focus_context("plain context", "x") == "plain context"
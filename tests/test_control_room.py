@@ -91,3 +91,85 @@ def test_chat_saves_screenshot_as_artifact(tmp_path):
     assert path.startswith(".ocean/screenshots/")
     artifact = client.get("/api/artifacts", params={"project_root": str(tmp_path), "path": path})
     assert artifact.status_code == 200
+
+
+def test_state_is_cached_with_etag(tmp_path, monkeypatch):
+    import backend.app as control_room
+
+    client = TestClient(app)
+    params = {"project_root": str(tmp_path)}
+    client.get("/api/state", params=params)  # bootstraps doctrine + actors
+
+    calls = []
+    real = control_room.bootstrap_doctrine
+    monkeypatch.setattr(control_room, "bootstrap_doctrine", lambda root: calls.append(root) or real(root))
+    first = client.get("/api/state", params=params)
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "no-cache"
+    second = client.get("/api/state", params=params)
+    assert second.json() == first.json() and second.headers["etag"] == etag
+    assert len(calls) <= 1  # at most the one settling rebuild after bootstrap
+
+    unchanged = client.get("/api/state", params=params, headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304 and unchanged.content == b""
+
+    (tmp_path / "VISION.md").write_text("# Vision\n\nSomething new.\n", encoding="utf-8")
+    changed = client.get("/api/state", params=params, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert "Something new." in changed.json()["doctrine"]["VISION.md"]
+
+
+def test_chat_history_and_files_support_if_none_match(tmp_path):
+    client = TestClient(app)
+    params = {"project_root": str(tmp_path)}
+    (tmp_path / "README.md").write_text("# Hello\n", encoding="utf-8")
+    for route in ("/api/chat", "/api/files"):
+        etag = client.get(route, params=params).headers["etag"]
+        assert client.get(route, params=params, headers={"If-None-Match": etag}).status_code == 304
+
+    etag = client.get("/api/chat", params=params).headers["etag"]
+    client.post("/api/chat", json={"project_root": str(tmp_path), "message": "hello", "use_advisor": False})
+    after = client.get("/api/chat", params=params, headers={"If-None-Match": etag})
+    assert after.status_code == 200 and after.json()["messages"]
+
+
+def test_read_cache_shares_one_build_across_viewers(tmp_path):
+    import threading
+    import time
+
+    from backend.app import ReadCache
+
+    cache = ReadCache()
+    dep = tmp_path / "dep.txt"
+    dep.write_text("a", encoding="utf-8")
+
+    def build():
+        time.sleep(0.1)
+        return {"v": dep.read_text(encoding="utf-8")}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get(("state", str(tmp_path)), [dep], build)))
+        for _ in range(6)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert cache.builds == 1
+    assert len({etag for _, etag in results}) == 1
+
+
+def test_chat_history_pages_back_with_before(tmp_path):
+    from ocean.product_chat import append_chat
+
+    client = TestClient(app)
+    for i in range(5):
+        append_chat(tmp_path, {"ts": str(i), "message": f"m{i}", "response": "ok"})
+    latest = client.get("/api/chat", params={"project_root": str(tmp_path), "limit": 2}).json()
+    assert [m["message"] for m in latest["messages"]] == ["m3", "m4"]
+    older = client.get(
+        "/api/chat", params={"project_root": str(tmp_path), "limit": 2, "before": latest["next_before"]}
+    ).json()
+    assert [m["message"] for m in older["messages"]] == ["m1", "m2"]
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from ocean import event_bus
+from ocean.events_emit import emit_event
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def events(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = tmp_path / "logs" / "events-test.jsonl"
+    monkeypatch.setenv("OCEAN_EVENTS_FILE", str(path))
+    for name in ("OCEAN_EVENTS_MAX_MB", "OCEAN_EVENTS_MAX_AGE", "OCEAN_EVENTS_KEEP", "OCEAN_EVENTS_FLUSH_MS"):
+        monkeypatch.delenv(name, raising=False)
+    yield path
+    event_bus.log_for(path).close()
+
+
+def _lines(path: Path) -> list[dict]:
+    return [json.loads(x) for x in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_emit_writes_through_with_seq_and_ts(events: Path) -> None:
+    emit_event("note", agent="Tony", title="a")
+    emit_event("note", agent="Tony", title="b")
+    rows = _lines(events)
+    assert [r["title"] for r in rows] == ["a", "b"]
+    assert [r["seq"] for r in rows] == [1, 2]
+    assert all(r["event"] == "note" and r["ts"] for r in rows)
+
+
+def test_rotation_keeps_seq_and_prunes_archives(events: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OCEAN_EVENTS_MAX_MB", str(400 / (1024 * 1024)))
+    monkeypatch.setenv("OCEAN_EVENTS_KEEP", "2")
+    for i in range(40):
+        emit_event("tick", i=i, pad="x" * 40)
+    segs = event_bus.segments(events)
+    assert segs[-1] == events
+    assert len(segs) == 3  # two archives kept + live
+    assert not any(p.name.endswith(".jsonl") for p in segs[:-1])
+    seqs = [ev["seq"] for ev in event_bus.read(events, since_seq=0)]
+    assert seqs == sorted(seqs) and seqs[-1] == 40
+    assert seqs == list(range(seqs[0], 41))
+
+
+def test_index_seek_by_seq_and_ts(events: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OCEAN_EVENTS_MAX_MB", str(300 / (1024 * 1024)))
+    for i in range(10):
+        emit_event("tick", i=i)
+    mid = time.time()
+    time.sleep(0.01)
+    for i in range(10, 20):
+        emit_event("tick", i=i)
+    assert len(event_bus.segments(events)) > 2
+    assert [ev["i"] for ev in event_bus.read(events, since_seq=15)] == list(range(14, 20))
+    assert [ev["i"] for ev in event_bus.read(events, since_ts=mid)] == list(range(10, 20))
+    assert list(event_bus.read(events, since_seq=999)) == []
+
+
+def test_follow_streams_across_rotation(events: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OCEAN_EVENTS_MAX_MB", str(200 / (1024 * 1024)))
+    monkeypatch.setenv("OCEAN_EVENTS_KEEP", "100")
+    emit_event("tick", i=0)
+    stop = threading.Event()
+    seen: list[int] = []
+
+    def consume() -> None:
+        for ev in event_bus.follow(events, since_seq=0, stop=stop, poll=0.1):
+            seen.append(ev["i"])
+            if len(seen) == 30:
+                stop.set()
+
+    t = threading.Thread(target=consume, daemon=True)
+    t.start()
+    for i in range(1, 30):
+        emit_event("tick", i=i)
+        time.sleep(0.002)
+    t.join(timeout=10)
+    assert seen == list(range(30))
+    assert len(event_bus.segments(events)) > 1
+
+
+def test_buffered_writes_flush_in_batches(events: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OCEAN_EVENTS_FLUSH_MS", "60000")
+    emit_event("tick", i=0)  # first event of the window is written immediately
+    emit_event("tick", i=1)
+    emit_event("tick", i=2)
+    assert [r["i"] for r in _lines(events)] == [0]
+    event_bus.flush_all()
+    assert [r["seq"] for r in _lines(events)] == [1, 2, 3]
+
+
+def test_seq_is_unique_across_processes(events: Path) -> None:
+    code = (
+        "import sys\n"
+        "from ocean.events_emit import emit_event\n"
+        "for i in range(50):\n"
+        "    emit_event('tick', who=sys.argv[1], i=i)\n"
+    )
+    env = {"OCEAN_EVENTS_FILE": str(events), "PYTHONPATH": str(ROOT), "PATH": "/usr/bin:/bin"}
+    procs = [subprocess.Popen([sys.executable, "-c", code, str(n)], env=env) for n in range(3)]
+    assert all(p.wait(timeout=60) == 0 for p in procs)
+    rows = _lines(events)
+    assert len(rows) == 150
+    assert sorted(r["seq"] for r in rows) == list(range(1, 151))
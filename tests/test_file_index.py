@@ -0,0 +1,150 @@
+"""Pruned, incrementally refreshed file index behind ``/api/files``."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from ocean.file_index import FileIndex, _glob_regex
+
+
+@pytest.fixture(autouse=True)
+def _no_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OCEAN_FILE_INDEX_TTL", "0")
+
+
+def _touch(root: Path, rel: str, text: str = "x") -> None:
+    p = root / rel
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(text, encoding="utf-8")
+
+
+def _bump(path: Path) -> None:
+    # Directory mtimes can be coarse; push them forward so the change is visible
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_prunes_ignored_dirs_without_descending(tmp_path: Path) -> None:
+    _touch(tmp_path, "README.md", "# readme")
+    _touch(tmp_path, "src/app.py")
+    for i in range(20):
+        _touch(tmp_path, f"node_modules/pkg{i}/index.js")
+    _touch(tmp_path, ".git/HEAD")
+    idx = FileIndex(tmp_path)
+    assert idx.paths() == ["README.md", "src/app.py"]
+    assert idx.scans == 2  # root and src only
+
+
+def test_gitignore_rules_and_negation(tmp_path: Path) -> None:
+    _touch(tmp_path, ".gitignore", "*.log\n/out/\n!keep.log\ncache/\n")
+    _touch(tmp_path, "a.log")
+    _touch(tmp_path, "keep.log")
+    _touch(tmp_path, "out/x.txt")
+    _touch(tmp_path, "pkg/out/y.txt")
+    _touch(tmp_path, "pkg/cache/z.txt")
+    _touch(tmp_path, "pkg/.gitignore", "secret.txt\n")
+    _touch(tmp_path, "pkg/secret.txt")
+    _touch(tmp_path, "secret.txt")
+    assert FileIndex(tmp_path).paths() == [".gitignore", "keep.log", "pkg/.gitignore", "pkg/out/y.txt", "secret.txt"]
+
+
+def test_glob_semantics() -> None:
+    assert _glob_regex("docs/**/*.md", True).fullmatch("docs/a/b/c.md")
+    assert _glob_regex("docs/**/*.md", True).fullmatch("docs/c.md")
+    assert not _glob_regex("*.md", True).fullmatch("docs/c.md")
+    assert _glob_regex("*.md", False).fullmatch("docs/c.md")
+
+
+def test_refresh_rescans_only_changed_dirs(tmp_path: Path) -> None:
+    for d in ("a", "b", "c"):
+        _touch(tmp_path, f"{d}/one.txt")
+    idx = FileIndex(tmp_path)
+    idx.refresh()
+    assert idx.scans == 4
+    idx.refresh()
+    assert idx.scans == 4  # nothing changed
+
+    _touch(tmp_path, "b/two.txt")
+    _bump(tmp_path / "b")
+    _touch(tmp_path, "d/new/deep.txt")
+    _bump(tmp_path)
+    assert "b/two.txt" in idx.paths() and "d/new/deep.txt" in idx.paths()
+    assert idx.scans == 4 + 4  # b, root, d, d/new
+
+    (tmp_path / "a" / "one.txt").unlink()
+    (tmp_path / "a").rmdir()
+    _bump(tmp_path)
+    assert not [p for p in idx.paths() if p.startswith("a/")]
+
+
+def test_gitignore_change_rebuilds(tmp_path: Path) -> None:
+    _touch(tmp_path, "x.tmp")
+    _touch(tmp_path, "y.py")
+    idx = FileIndex(tmp_path)
+    assert idx.paths() == ["x.tmp", "y.py"]
+    _touch(tmp_path, ".gitignore", "*.tmp\n")
+    os.utime(tmp_path / ".gitignore", ns=(0, 10**18))
+    assert idx.paths() == [".gitignore", "y.py"]
+
+
+def test_nested_gitignore_edits_apply(tmp_path: Path) -> None:
+    _touch(tmp_path, "pkg/.gitignore", "*.tmp\n")
+    _touch(tmp_path, "pkg/a.log")
+    _touch(tmp_path, "pkg/b.tmp")
+    _touch(tmp_path, "pkg/sub/c.log")
+    idx = FileIndex(tmp_path)
+    assert idx.paths() == ["pkg/.gitignore", "pkg/a.log", "pkg/sub/c.log"]
+    # Edited in place: the directory mtime does not change
+    gi = tmp_path / "pkg" / ".gitignore"
+    dir_mtime = os.stat(tmp_path / "pkg").st_mtime_ns
+    with open(gi, "a", encoding="utf-8") as fh:
+        fh.write("*.log\n")
+    _bump(gi)
+    assert os.stat(tmp_path / "pkg").st_mtime_ns == dir_mtime
+    assert idx.paths() == ["pkg/.gitignore"]
+    gi.write_text("", encoding="utf-8")
+    _bump(gi)
+    assert idx.paths() == ["pkg/.gitignore", "pkg/a.log", "pkg/b.tmp", "pkg/sub/c.log"]
+
+
+def test_new_nested_gitignore_hides_indexed_subdirs(tmp_path: Path) -> None:
+    _touch(tmp_path, "pkg/lib/gen/out.js")
+    _touch(tmp_path, "pkg/main.py")
+    idx = FileIndex(tmp_path)
+    assert idx.paths() == ["pkg/lib/gen/out.js", "pkg/main.py"]
+    # pkg/lib itself is unchanged, so only a rebuild applies the new rule to it
+    _touch(tmp_path, "pkg/.gitignore", "gen/\n")
+    _bump(tmp_path / "pkg")
+    assert idx.paths() == ["pkg/.gitignore", "pkg/main.py"]
+
+
+def test_ttl_throttles_refresh(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OCEAN_FILE_INDEX_TTL", "3600")
+    _touch(tmp_path, "a.txt")
+    idx = FileIndex(tmp_path)
+    assert idx.paths() == ["a.txt"]
+    _touch(tmp_path, "b.txt")
+    _bump(tmp_path)
+    assert idx.paths() == ["a.txt"]
+    idx.refresh(force=True)
+    assert idx.paths() == ["a.txt", "b.txt"]
+
+
+def test_query_prefix_and_pagination(tmp_path: Path) -> None:
+    for i in range(5):
+        _touch(tmp_path, f"src/m{i}.py", "y" * i)
+    _touch(tmp_path, "srcx.txt")
+    _touch(tmp_path, "tests/t.py")
+    idx = FileIndex(tmp_path)
+    page = idx.query(prefix="src/", offset=0, limit=2)
+    assert page == {
+        "files": [{"path": "src/m0.py", "size": 0}, {"path": "src/m1.py", "size": 1}],
+        "total": 5,
+        "next_offset": 2,
+    }
+    last = idx.query(prefix="src/", offset=4, limit=2)
+    assert last["files"] == [{"path": "src/m4.py", "size": 4}] and last["next_offset"] is None
+    assert idx.query(limit=100)["total"] == 7
@@ -24,7 +24,7 @@ def test_gemini_api_codegen_parses_mapping(monkeypatch: pytest.MonkeyPatch) -> N
 
         return Resp()
 
-    monkeypatch.setattr("ocean.codex_exec.httpx.post", fake_post)
+    monkeypatch.setattr("ocean.llm_transport.post", fake_post)
     monkeypatch.setenv("GEMINI_API_KEY", "test-key")
     monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
 
@@ -56,7 +56,7 @@ def test_gemini_api_uses_prefs_model(monkeypatch: pytest.MonkeyPatch, tmp_path:
 
         return Resp()
 
-    monkeypatch.setattr("ocean.codex_exec.httpx.post", fake_post)
+    monkeypatch.setattr("ocean.llm_transport.post", fake_post)
     monkeypatch.setenv("GEMINI_API_KEY", "test-key")
     monkeypatch.delenv("OCEAN_GEMINI_MODEL", raising=False)
 
@@ -83,7 +83,7 @@ def test_openai_api_branch_in_fallback(monkeypatch: pytest.MonkeyPatch, tmp_path
 
         return Resp()
 
-    monkeypatch.setattr("ocean.codex_exec.httpx.post", fake_post)
+    monkeypatch.setattr("ocean.llm_transport.post", fake_post)
     monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
     monkeypatch.delenv("OCEAN_CODEGEN_BACKEND", raising=False)
 
@@ -117,7 +117,7 @@ def test_chat_advisor_auto_uses_gemini_backend(monkeypatch: pytest.MonkeyPatch,
 
         return Resp()
 
-    monkeypatch.setattr("ocean.advisor.httpx.post", fake_post)
+    monkeypatch.setattr("ocean.llm_transport.post", fake_post)
 
     from ocean.advisor import ask_chat_advisor
 
@@ -156,7 +156,7 @@ def test_chat_advisor_auto_uses_openai_backend(monkeypatch: pytest.MonkeyPatch,
 
         return Resp()
 
-    monkeypatch.setattr("ocean.advisor.httpx.post", fake_post)
+    monkeypatch.setattr("ocean.llm_transport.post", fake_post)
 
     from ocean.advisor import ask_chat_advisor
 
@@ -0,0 +1,51 @@
+"""Shared JSON extraction for model output."""
+
+from __future__ import annotations
+
+import json
+import time
+
+from ocean import advisor, claude_exec, codex_exec
+from ocean.json_extract import extract_json, is_file_map, iter_json_objects
+
+
+def test_iter_skips_prose_braces_and_finds_each_object() -> None:
+    text = 'banner {not json} fn() { return 1; }\n{"a": 1} tail } {"b": {"c": 2}}'
+    assert list(iter_json_objects(text)) == [{"a": 1}, {"b": {"c": 2}}]
+
+
+def test_extract_prefers_match_then_falls_back() -> None:
+    text = '{"event": "start", "n": 1}\n{"app.py": "print(1)"}'
+    assert extract_json(text) == {"event": "start", "n": 1}
+    assert extract_json(text, is_file_map) == {"app.py": "print(1)"}
+    assert extract_json('{"n": 1}', is_file_map) == {"n": 1}
+    assert extract_json('{"n": 1}', is_file_map, require_match=True) is None
+
+
+def test_backends_share_extractor() -> None:
+    fenced = 'Here you go:\n```json\n{"ui/index.html": "<h1>}</h1>"}\n```\nDone }'
+    assert codex_exec._extract_json(fenced) == {"ui/index.html": "<h1>}</h1>"}
+    assert claude_exec._extract_json(fenced) == {"ui/index.html": "<h1>}</h1>"}
+    wrapped = json.dumps({"result": fenced, "usage": {"input_tokens": 3}})
+    assert claude_exec._extract_json(wrapped) == {"ui/index.html": "<h1>}</h1>"}
+    assert advisor._extract_json('PM says {"summary": "ok"} then } more') == {"summary": "ok"}
+    assert codex_exec._extract_json("no json here") is None
+
+
+def test_large_transcript_is_linear() -> None:
+    mapping = json.dumps({f"f{i}.js": "x = {a: 1};\n" * 50 for i in range(50)})
+    text = "banner\n" + mapping + "\n" + "[tool] {exit: 0} }\n" * 20000
+    t0 = time.perf_counter()
+    obj = codex_exec._extract_json(text)
+    assert time.perf_counter() - t0 < 1.0
+    assert obj is not None and len(obj) == 50
+
+
+def test_malformed_reply_does_not_yield_nested_object() -> None:
+    truncated = 'files:\n{"files": {"a.py": "print(1)", "nested": {"b.py": "y"}'
+    assert list(iter_json_objects(truncated)) == []
+    assert codex_exec._extract_json(truncated) is None
+    # A balanced but invalid object is skipped whole; later top-level objects still count
+    broken = '{"a": {"b.py": "y"}, oops} then {"c.py": "z"}'
+    assert list(iter_json_objects(broken)) == [{"c.py": "z"}]
+    assert list(iter_json_objects('{"s": "}{\\"x\\": 1", bad} {"ok": "1"}')) == [{"ok": "1"}]
@@ -0,0 +1,60 @@
+"""Chunked stdio framing for MCP (Content-Length and NDJSON)."""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import threading
+
+import pytest
+
+from ocean.jsonrpc_framing import FrameReader, FramingError, frame_lsp, frame_ndjson
+
+
+def test_lsp_frames_split_across_arbitrary_chunks() -> None:
+    bodies = [json.dumps({"id": i, "x": "y" * i}).encode() for i in range(1, 6)]
+    wire = b"".join(frame_lsp(b) for b in bodies)
+    r = FrameReader()
+    out = []
+    for i in range(0, len(wire), 7):
+        r.feed(wire[i : i + 7])
+        while (body := r.next_frame()) is not None:
+            out.append(body)
+    assert out == bodies
+    assert r.buffered() == 0
+
+
+def test_auto_detects_ndjson_and_headers() -> None:
+    r = FrameReader(io.BytesIO(frame_ndjson(b'{"a":1}') + b"\n" + frame_lsp(b'{"b":2}') + b'{"c":3}\n'))
+    assert r.read_frame() == b'{"a":1}'
+    assert r.last_framing == "ndjson"
+    assert r.read_frame() == b'{"b":2}'
+    assert r.last_framing == "lsp"
+    assert r.read_frame() == b'{"c":3}'
+    assert r.read_frame() is None
+
+
+def test_missing_content_length_raises() -> None:
+    r = FrameReader(framing="lsp")
+    r.feed(b"X-Other: 1\r\n\r\n{}")
+    with pytest.raises(FramingError):
+        r.next_frame()
+
+
+def test_large_frame_over_pipe() -> None:
+    body = json.dumps({"payload": "z" * 2_000_000}).encode()
+    rfd, wfd = os.pipe()
+
+    def writer() -> None:
+        with os.fdopen(wfd, "wb") as w:
+            w.write(frame_lsp(body) * 2)
+
+    t = threading.Thread(target=writer)
+    t.start()
+    with os.fdopen(rfd, "rb") as rf:
+        r = FrameReader(rf)
+        assert r.read_frame() == body
+        assert r.read_frame() == body
+        assert r.read_frame() is None
+    t.join()
@@ -0,0 +1,130 @@
+"""Pooled LLM transport against a local stub server (no network)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ocean import llm_transport
+
+
+class _Stub:
+    def __init__(self) -> None:
+        self.fail_first = 0
+        self.fail_status = 429
+        self.delay = 0.0
+        self.requests: list[tuple[str, dict]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:  # keep pytest output clean
+                pass
+
+            def do_POST(self) -> None:
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with stub.lock:
+                    stub.requests.append((self.path, body))
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                    fail = stub.fail_first > 0
+                    if fail:
+                        stub.fail_first -= 1
+                time.sleep(stub.delay)
+                with stub.lock:
+                    stub.in_flight -= 1
+                if fail:
+                    payload, status = {"error": {"message": "slow down"}}, stub.fail_status
+                elif "generateContent" in self.path:
+                    text = body["contents"][0]["parts"][0]["text"]
+                    payload, status = {"candidates": [{"content": {"parts": [{"text": f"gemini:{text}"}]}}]}, 200
+                else:
+                    text = body["messages"][-1]["content"]
+                    payload, status = {"choices": [{"message": {"content": f"openai:{text}"}}]}, 200
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                if fail:
+                    self.send_header("Retry-After", "0")
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+
+@pytest.fixture
+def stub(monkeypatch: pytest.MonkeyPatch, tmp_path):
+    monkeypatch.setenv("OCEAN_LIMITER_STATE", str(tmp_path / "limiter.json"))  # fresh limiter state per test
+    s = _Stub()
+    monkeypatch.setenv("OCEAN_OPENAI_BASE_URL", s.url)
+    monkeypatch.setenv("OCEAN_GEMINI_BASE_URL", s.url)
+    yield s
+    llm_transport.close()
+    s.server.shutdown()
+
+
+def test_post_retries_429_then_succeeds(stub: _Stub) -> None:
+    stub.fail_first = 2
+    target, headers, body = llm_transport.build_request("openai", "hi", model="m", api_key="k")
+    resp = llm_transport.post(target, headers=headers, json=body, timeout=5)
+    assert resp.status_code == 200
+    assert llm_transport.response_text("openai", resp.json()) == "openai:hi"
+    assert len(stub.requests) == 3
+
+
+def test_post_returns_last_response_when_retries_exhausted(stub: _Stub, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OCEAN_HTTP_RETRIES", "1")
+    stub.fail_first = 5
+    target, headers, body = llm_transport.build_request("openai", "hi", model="m", api_key="k")
+    resp = llm_transport.post(target, headers=headers, json=body, timeout=5)
+    assert resp.status_code == 429
+    assert len(stub.requests) == 2
+
+
+def test_post_does_not_retry_conflict(stub: _Stub) -> None:
+    stub.fail_first, stub.fail_status = 1, 409
+    target, headers, body = llm_transport.build_request("openai", "hi", model="m", api_key="k")
+    resp = llm_transport.post(target, headers=headers, json=body, timeout=5)
+    assert resp.status_code == 409
+    assert len(stub.requests) == 1
+
+
+def test_post_reuses_pooled_client(stub: _Stub) -> None:
+    target, headers, body = llm_transport.build_request("gemini", "x", model="g", api_key="k")
+    assert target == f"{stub.url}/v1beta/models/g:generateContent"
+    for _ in range(3):
+        llm_transport.post(target, headers=headers, json=body, timeout=5)
+    assert llm_transport.client(target) is llm_transport.client(target)
+
+
+def test_generate_many_runs_prompts_concurrently(stub: _Stub, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OCEAN_CONCURRENCY_GEMINI_API", "3")
+    stub.delay = 0.2
+    prompts = [f"p{i}" for i in range(6)]
+    results = asyncio.run(llm_transport.generate_many(prompts, provider="gemini", model="g", api_key="k", system="sys"))
+    assert [r.text for r in results] == [f"gemini:p{i}" for i in range(6)]
+    assert all(r.ok for r in results)
+    assert stub.max_in_flight == 3
+    assert stub.requests[0][1]["systemInstruction"] == {"parts": [{"text": "sys"}]}
+
+
+def test_generate_many_reports_errors_per_prompt(stub: _Stub, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OCEAN_HTTP_RETRIES", "0")
+    stub.fail_first = 1
+    results = asyncio.run(
+        llm_transport.generate_many(["a", "b"], provider="openai", model="m", api_key="k", concurrency=1)
+    )
+    assert results[0].error and "429" in results[0].error
+    assert results[1].text == "openai:b"
@@ -0,0 +1,123 @@
+"""In-process MCP server: concurrent tools/call, cancellation and per-tool timeouts."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from ocean import mcp_server
+from ocean.jsonrpc_framing import FrameReader, frame_lsp
+
+
+class _Harness:
+    def __init__(self) -> None:
+        in_r, self._in_w = os.pipe()
+        out_r, out_w = os.pipe()
+        self.server = mcp_server.MCPServer(stdin=os.fdopen(in_r, "rb"), stdout=os.fdopen(out_w, "wb"))
+        self._out = FrameReader(os.fdopen(out_r, "rb"))
+        self._thread = threading.Thread(target=self.server.run, daemon=True)
+        self._thread.start()
+
+    def send(self, message: dict) -> None:
+        os.write(self._in_w, frame_lsp(json.dumps(message).encode("utf-8")))
+
+    def call(self, msg_id: int, name: str, **args) -> None:
+        self.send({"jsonrpc": "2.0", "id": msg_id, "method": "tools/call", "params": {"name": name, "arguments": args}})
+
+    def recv(self) -> dict:
+        body = self._out.read_frame()
+        assert body is not None
+        return json.loads(body)
+
+    def close(self) -> None:
+        try:
+            os.close(self._in_w)
+        except OSError:
+            pass  # already closed by the test
+        self._thread.join(timeout=5)
+
+
+@pytest.fixture
+def harness(monkeypatch: pytest.MonkeyPatch):
+    release = threading.Event()
+    started: list[str] = []
+
+    def slow(args: dict) -> dict:
+        started.append(args.get("tag", ""))
+        release.wait(float(args.get("wait", 5)))
+        return {"tag": args.get("tag")}
+
+    monkeypatch.setitem(mcp_server.HANDLERS, "test_slow", slow)
+    monkeypatch.setitem(mcp_server.HANDLERS, "test_fast", lambda args: {"tag": args.get("tag")})
+    h = _Harness()
+    h.release = release  # type: ignore[attr-defined]
+    h.started = started  # type: ignore[attr-defined]
+    yield h
+    release.set()
+    h.close()
+
+
+def test_ping_and_fast_call_answered_while_slow_call_runs(harness) -> None:
+    harness.call(1, "test_slow", tag="slow")
+    harness.send({"jsonrpc": "2.0", "id": 2, "method": "ping"})
+    assert harness.recv()["id"] == 2
+    harness.call(3, "test_fast", tag="fast")
+    fast = harness.recv()
+    assert fast["id"] == 3
+    assert fast["result"]["structuredContent"] == {"tag": "fast"}
+    harness.release.set()
+    slow = harness.recv()
+    assert slow["id"] == 1
+    assert slow["result"]["structuredContent"] == {"tag": "slow"}
+
+
+def test_cancelled_request_gets_no_response(harness) -> None:
+    harness.call(1, "test_slow", tag="a")
+    deadline = time.time() + 5
+    while not harness.started and time.time() < deadline:
+        time.sleep(0.01)
+    harness.send({"jsonrpc": "2.0", "method": "notifications/cancelled", "params": {"requestId": 1}})
+    harness.release.set()
+    harness.send({"jsonrpc": "2.0", "id": 2, "method": "ping"})
+    assert harness.recv()["id"] == 2
+    harness.call(3, "test_fast", tag="b")
+    # The cancelled call's late result is dropped; the next frame is the fast call.
+    assert harness.recv()["id"] == 3
+
+
+def test_tool_timeout_returns_error_once(harness, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(mcp_server.TOOL_TIMEOUTS, "test_slow", 0.2)
+    harness.call(1, "test_slow", tag="late", wait=1)
+    resp = harness.recv()
+    assert resp["id"] == 1
+    assert resp["error"]["code"] == -32001
+    harness.release.set()
+    harness.call(2, "test_fast", tag="next")
+    assert harness.recv()["id"] == 2
+
+
+def test_tool_timeout_env_override(monkeypatch: pytest.MonkeyPatch) -> None:
+    assert mcp_server._tool_timeout("ocean_turn") == 120.0
+    assert mcp_server._tool_timeout("ocean_health") == mcp_server.DEFAULT_TOOL_TIMEOUT
+    monkeypatch.setenv("OCEAN_MCP_TOOL_TIMEOUT", "5")
+    assert mcp_server._tool_timeout("ocean_turn") == 5.0
+
+
+def test_stdin_eof_waits_for_in_flight_calls(harness) -> None:
+    harness.call(1, "test_fast", tag="a")
+    harness.call(2, "test_fast", tag="b")
+    harness.call(3, "test_slow", tag="c")
+    deadline = time.time() + 5
+    while not harness.started and time.time() < deadline:
+        time.sleep(0.01)
+    os.close(harness._in_w)
+    time.sleep(0.1)
+    assert harness._thread.is_alive()  # still waiting on id 3
+    harness.release.set()
+    assert sorted(harness.recv()["id"] for _ in range(3)) == [1, 2, 3]
+    harness._thread.join(timeout=5)
+    assert not harness._thread.is_alive()
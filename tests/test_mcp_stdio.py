@@ -82,3 +82,14 @@ def test_mcp_stdio_rejects_unknown_method(mcp_stdio_cmd: list[str]) -> None:
             client.rpc("tools/noSuchThing", {}, timeout=5)
     finally:
         client.stop()
+
+
+def test_mcp_stdio_answers_ndjson_hosts(mcp_stdio_cmd: list[str], monkeypatch) -> None:
+    monkeypatch.setenv("OCEAN_MCP_FRAMING", "ndjson")
+    client = StdioJsonRpcClient(cmd=mcp_stdio_cmd)
+    try:
+        client.start()
+        assert client.initialize(timeout=10)["serverInfo"]["name"] == "ocean"
+        assert client.rpc("ping", {}, timeout=5) == {}
+    finally:
+        client.stop()
@@ -44,3 +44,31 @@ def test_bare_ocean_executable_runs_chat_smoke():
     assert r.returncode == 0, blob[-6000:]
     assert "Session complete" in blob
     assert "Crew assembled" in blob
+
+
+def test_cli_import_stays_lazy():
+    """``ocean status`` / ``ocean ingest`` must not pay for agents, planner, httpx or rich."""
+    heavy = ["httpx", "ocean.agents", "ocean.planner", "ocean.codex_exec", "ocean.runtime.cycle", "rich.console", "yaml"]
+    code = "import sys, ocean.cli; print(' '.join(m for m in %r if m in sys.modules))" % (heavy,)
+    r = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, timeout=60)
+    assert r.returncode == 0, r.stderr[-2000:]
+    assert r.stdout.strip() == ""
+
+
+def test_profile_startup_reports_modules():
+    from ocean.cli import parse_importtime
+
+    rows, other = parse_importtime(
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        340 |   ocean.models\n"
+        "warning: unrelated\n"
+    )
+    assert rows == [(120, 340, "   ocean.models")]
+    assert other == ["warning: unrelated"]
+
+    env = {**os.environ, "PYTHONPATH": str(REPO_ROOT)}
+    code = "import sys; from ocean.cli import entrypoint; sys.argv = ['ocean', '--profile-startup']; entrypoint()"
+    r = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, env=env, capture_output=True, text=True, timeout=60)
+    assert r.returncode == 0, r.stderr[-2000:]
+    assert "ocean startup profile" in r.stdout
+    assert "ocean.cli" in r.stdout
@@ -1,6 +1,8 @@
 from pathlib import Path
 
-from ocean.product_loop import bootstrap_doctrine, next_action, normalize_advisor_recommendation, record_feedback, turn
+import ocean.product_loop as pl
+from ocean.product_chat import product_chat
+from ocean.product_loop import ProjectSnapshot, bootstrap_doctrine, next_action, normalize_advisor_recommendation, record_feedback, turn
 
 
 def test_bootstrap_and_feedback_update_doctrine(tmp_path: Path):
@@ -76,3 +78,38 @@ def test_normalizes_reasoning_engine_json():
     assert parsed["recommended_task"]["title"] == "Create Cursor MCP onboarding"
     assert parsed["recommended_task"]["scores"]["user_value"] == 5
     assert parsed["feature_set"] == ["Cursor config", "first successful turn"]
+
+
+def test_product_chat_computes_project_context_once(tmp_path: Path, monkeypatch):
+    bootstrap_doctrine(tmp_path)
+    calls = {"context": 0, "advisor": 0}
+    real_collect = pl.collect_build_context
+
+    def collect(root):
+        calls["context"] += 1
+        return real_collect(root)
+
+    def advisor(payload, cwd=None):
+        calls["advisor"] += 1
+        return None
+
+    monkeypatch.setattr(pl, "collect_build_context", collect)
+    monkeypatch.setattr(pl, "ask_pm_advisor", advisor)
+    monkeypatch.setattr("ocean.product_chat.ask_chat_advisor", lambda prompt, cwd=None: None)
+    result = product_chat(tmp_path, "What should we do next?")
+
+    assert result["loop_result"] is not None
+    assert result["job_plan"] is not None
+    assert calls == {"context": 1, "advisor": 1}
+
+
+def test_project_snapshot_refreshes_when_doctrine_changes(tmp_path: Path):
+    bootstrap_doctrine(tmp_path)
+    snapshot = ProjectSnapshot.capture(tmp_path)
+    first = next_action(tmp_path, user_turn="next", use_advisor=False, snapshot=snapshot)
+    assert next_action(tmp_path, user_turn="next", use_advisor=False, snapshot=snapshot) is first
+
+    (tmp_path / "VISION.md").write_text("# Vision\n\nA rewritten vision for the snapshot test.\n", encoding="utf-8")
+    second = next_action(tmp_path, user_turn="next", use_advisor=False, snapshot=snapshot)
+    assert second is not first
+    assert "rewritten vision" in snapshot.doctrine_summary["VISION.md"]
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from ocean import pytest_runner
+from ocean.pytest_runner import discover_test_files, format_report, run_pytest
+
+
+def _project(tmp_path: Path) -> Path:
+    tests = tmp_path / "tests"
+    tests.mkdir()
+    (tests / "test_ok.py").write_text("def test_a():\n    assert True\n\ndef test_b():\n    assert True\n", encoding="utf-8")
+    (tests / "test_bad.py").write_text(
+        "import pytest\n\n"
+        "class TestThing:\n    def test_fails(self):\n        assert 1 == 2\n\n"
+        "@pytest.mark.skip\ndef test_skipped():\n    pass\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "helper.py").write_text("X = 1\n", encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture(autouse=True)
+def _no_xdist(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(pytest_runner, "_has_xdist", lambda: False)
+
+
+def test_discover_respects_testpaths(tmp_path: Path) -> None:
+    root = _project(tmp_path)
+    (root / "scripts").mkdir()
+    (root / "scripts" / "test_tool.py").write_text("", encoding="utf-8")
+    assert len(discover_test_files(root)) == 3
+    (root / "pytest.ini").write_text("[pytest]\ntestpaths = tests\n", encoding="utf-8")
+    assert discover_test_files(root) == ["tests/test_bad.py", "tests/test_ok.py"]
+
+
+@pytest.mark.parametrize("workers,mode", [(1, "serial"), (2, "sharded")])
+def test_run_pytest_structured_results(tmp_path: Path, workers: int, mode: str) -> None:
+    root = _project(tmp_path)
+    run = run_pytest(root, workers=workers, timeout=120)
+    assert run.mode == mode
+    assert run.exit_code == 1
+    assert (run.tests, run.passed, run.failed, run.skipped) == (4, 2, 1, 1)
+    assert run.failures == ["tests/test_bad.py::TestThing::test_fails"]
+    assert json.loads((root / ".ocean" / "test_lastfailed.json").read_text()) == run.failures
+    report = format_report(run, "now")
+    assert "2 passed, 1 failed" in report
+    assert "`tests/test_bad.py::TestThing::test_fails`" in report
+    assert "Exit code: 1" in report
+
+
+def test_last_failed_reruns_only_failures(tmp_path: Path) -> None:
+    root = _project(tmp_path)
+    run_pytest(root, workers=1, timeout=120)
+    (root / "tests" / "test_bad.py").write_text("def test_fixed():\n    assert True\n", encoding="utf-8")
+    run = run_pytest(root, workers=2, last_failed=True, timeout=120)
+    assert run.exit_code == 0
+    assert run.tests == 1
+    assert run.failures == []
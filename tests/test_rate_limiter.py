@@ -0,0 +1,147 @@
+"""Per-user adaptive rate limiter (`~/.ocean/limiter.json`)."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from ocean import rate_limiter
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture(autouse=True)
+def _isolated(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("OCEAN_EVENTS_FILE", str(tmp_path / "events.jsonl"))
+    monkeypatch.setenv("OCEAN_LIMITER_STATE", str(tmp_path / ".ocean" / "limiter.json"))
+    for name in ("OCEAN_RATE_LIMITER", "OCEAN_CONCURRENCY_CODEX", "OCEAN_RATE_CODEX"):
+        monkeypatch.delenv(name, raising=False)
+
+
+def test_concurrency_is_capped_across_threads(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OCEAN_CONCURRENCY_CODEX", "2")
+    monkeypatch.setenv("OCEAN_RATE_CODEX", "6000")
+    live = peak = 0
+    lock = threading.Lock()
+
+    def call() -> None:
+        nonlocal live, peak
+        with rate_limiter.acquire("codex"):
+            with lock:
+                live += 1
+                peak = max(peak, live)
+            time.sleep(0.1)
+            with lock:
+                live -= 1
+
+    threads = [threading.Thread(target=call) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=20)
+    assert peak == 2
+    assert rate_limiter.status("codex")["codex"]["in_flight"] == 0
+
+
+def test_429_halves_limits_and_cools_down_then_recovers(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("OCEAN_CONCURRENCY_CODEX", "4")
+    monkeypatch.setenv("OCEAN_RATE_CODEX", "600")
+    with rate_limiter.acquire("codex") as lease:
+        lease.report_status(429, "0.3")
+    st = rate_limiter.status("codex")["codex"]
+    assert st["limit"] == 2.0 and st["rate"] == 300.0 and st["cooldown"] > 0
+    start = time.monotonic()
+    with rate_limiter.acquire("codex"):
+        pass
+    assert time.monotonic() - start >= 0.2  # waited out Retry-After
+    for _ in range(10):
+        with rate_limiter.acquire("codex"):
+            pass
+    assert rate_limiter.status("codex")["codex"]["limit"] == 4.0  # additive increase back to the ceiling
+    rows = [json.loads(x) for x in (tmp_path / "events.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [r["outcome"] for r in rows if r["event"] == "rate_limit"] == ["rate_limited"]
+
+
+def test_timeout_and_cli_output_classification(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OCEAN_CONCURRENCY_CODEX", "4")
+    with pytest.raises(subprocess.TimeoutExpired):
+        with rate_limiter.acquire("codex"):
+            raise subprocess.TimeoutExpired("codex", 1)
+    assert rate_limiter.status("codex")["codex"]["limit"] == 3.0
+    lease = rate_limiter.Lease("codex")
+    lease.report_output("ERROR: stream error: 429 Too Many Requests", 1)
+    assert lease.outcome == rate_limiter.RATE_LIMITED
+    lease.report_output("", 0)
+    assert lease.outcome == rate_limiter.OK
+
+
+def test_token_bucket_paces_requests(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OCEAN_CONCURRENCY_CODEX", "1")
+    monkeypatch.setenv("OCEAN_RATE_CODEX", "240")  # one every 0.25s after a burst of 1
+    start = time.monotonic()
+    for _ in range(3):
+        with rate_limiter.acquire("codex"):
+            pass
+    assert time.monotonic() - start >= 0.4
+
+
+def test_processes_share_one_budget(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    code = (
+        "import time\n"
+        "from ocean import rate_limiter\n"
+        "with rate_limiter.acquire('codex'):\n"
+        "    open('log', 'a').write(f'{time.time()} start\\n')\n"
+        "    time.sleep(0.3)\n"
+        "    open('log', 'a').write(f'{time.time()} end\\n')\n"
+    )
+    env = {
+        "PYTHONPATH": str(ROOT), "PATH": "/usr/bin:/bin", "OCEAN_CONCURRENCY_CODEX": "1",
+        "OCEAN_RATE_CODEX": "6000", "OCEAN_EVENTS_FILE": str(tmp_path / "events.jsonl"),
+        "OCEAN_LIMITER_STATE": str(tmp_path / ".ocean" / "limiter.json"),
+    }
+    procs = [subprocess.Popen([sys.executable, "-c", code], cwd=tmp_path, env=env) for _ in range(3)]
+    assert all(p.wait(timeout=60) == 0 for p in procs)
+    marks = sorted((float(t), kind) for t, kind in (ln.split() for ln in (tmp_path / "log").read_text().splitlines()))
+    depth = peak = 0
+    for _, kind in marks:
+        depth += 1 if kind == "start" else -1
+        peak = max(peak, depth)
+    assert peak == 1
+
+
+def test_dead_process_lease_is_reclaimed(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("OCEAN_CONCURRENCY_CODEX", "1")
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    state = {"codex": {"limit": 1, "rate": 20, "tokens": 1, "t": time.time(), "until": 0,
+                       "leases": {"x": {"pid": dead.pid, "t": time.time()}}}}
+    (tmp_path / ".ocean").mkdir()
+    (tmp_path / ".ocean" / "limiter.json").write_text(json.dumps(state), encoding="utf-8")
+    with rate_limiter.acquire("codex", timeout=2):
+        pass
+
+
+def test_disabled_limiter_is_a_no_op(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("OCEAN_RATE_LIMITER", "0")
+    with rate_limiter.acquire("codex") as lease:
+        lease.report_status(429)
+    assert not (tmp_path / ".ocean" / "limiter.json").exists()
+
+
+def test_state_is_per_user_not_per_project(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.delenv("OCEAN_LIMITER_STATE")
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    for project in ("a", "b"):
+        (tmp_path / project).mkdir()
+        monkeypatch.chdir(tmp_path / project)
+        with rate_limiter.acquire("codex") as lease:
+            lease.report_status(200)
+    assert (tmp_path / "home" / ".ocean" / "limiter.json").exists()
+    assert not (tmp_path / "a" / ".ocean").exists() and not (tmp_path / "b" / ".ocean").exists()
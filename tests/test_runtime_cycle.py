@@ -1,7 +1,7 @@
 import json
 from pathlib import Path
 
-from ocean.runtime import format_status_text, ingest_message, run_cycle
+from ocean.runtime import ProductState, format_status_text, ingest_message, run_cycle
 from ocean.runtime.inbox import list_pending
 
 
@@ -36,10 +36,8 @@ def test_cycle_dry_plan_only(tmp_path, monkeypatch):
     assert len(data) >= 5
     plan = (tmp_path / "docs" / "plan.md").read_text(encoding="utf-8")
     assert "Backlog" in plan
-    st_path = tmp_path / ".ocean" / "product_state.json"
-    assert st_path.is_file()
-    st = json.loads(st_path.read_text(encoding="utf-8"))
-    assert st["cycle_count"] == 1
+    st = ProductState.load(tmp_path / ".ocean")
+    assert st.cycle_count == 1
 
 
 def test_cycle_budget_skip(tmp_path, monkeypatch):
@@ -59,10 +57,9 @@ def test_cycle_budget_skip(tmp_path, monkeypatch):
     assert res.ok
     assert res.skipped_execution
     assert res.backlog_json is None
-    st_path = tmp_path / ".ocean" / "product_state.json"
-    st = json.loads(st_path.read_text(encoding="utf-8"))
-    assert st["cycle_count"] == 1
-    assert st["tokens_used_last_cycle"] == 0
+    st = ProductState.load(tmp_path / ".ocean")
+    assert st.cycle_count == 1
+    assert st.tokens_used_last_cycle == 0
     assert not (tmp_path / "docs" / "backlog.json").exists()
 
 
@@ -0,0 +1,98 @@
+"""Repo-scout fan-out/fan-in pipeline."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from ocean import codex_exec, scout
+
+
+@pytest.fixture
+def reports(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("OCEAN_EVENTS_FILE", str(tmp_path / "events.jsonl"))
+    (tmp_path / "bundle.md").write_text("ctx", encoding="utf-8")
+    return tmp_path / "docs" / "repo_scout"
+
+
+def _fake(delays: dict[str, float], seen: list[tuple[str, float]], synth_inputs: list[str]):
+    def generate(instruction, suggested_files=None, context_file=None, timeout=240, agent=None):
+        if agent == "Moroni":
+            synth_inputs.append(Path(context_file).read_text(encoding="utf-8"))
+            return {suggested_files[0]: "# Synthesis\n"}
+        time.sleep(delays.get(agent, 0.2))
+        seen.append((agent, time.monotonic()))
+        return {suggested_files[0]: f"# Findings\n{agent}\n"}
+
+    return generate
+
+
+def test_audits_run_concurrently_then_synthesis(reports: Path, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    seen: list[tuple[str, float]] = []
+    synth: list[str] = []
+    monkeypatch.setattr(codex_exec, "generate_files", _fake({}, seen, synth))
+    start = time.monotonic()
+    result = scout.run_scout(tmp_path / "bundle.md", reports)
+    assert time.monotonic() - start < 0.7  # four 0.2s audits overlap
+    assert sorted(result.reports) == ["Edna", "Mario", "Q", "Tony"]
+    assert (reports / "Q.md").read_text(encoding="utf-8") == "# Findings\nQ\n"
+    assert result.synthesis == reports / "Moroni-synthesis.md" and result.synthesis.exists()
+    assert all(f"\n{a}\n" in synth[0] for a in ("Q", "Edna", "Mario", "Tony"))
+    latency = json.loads((reports / "latency.json").read_text(encoding="utf-8"))["latency"]
+    assert set(latency) == {"Q", "Edna", "Mario", "Tony"} and all(v >= 0.2 for v in latency.values())
+    rows = [json.loads(x) for x in (tmp_path / "events.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert sorted(r["agent"] for r in rows if r["event"] == "scout_report") == ["Edna", "Mario", "Q", "Tony"]
+
+
+def test_deadline_starts_synthesis_without_stragglers(reports: Path, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    seen: list[tuple[str, float]] = []
+    synth: list[str] = []
+    monkeypatch.setattr(codex_exec, "generate_files", _fake({"Tony": 1.5}, seen, synth))
+    start = time.monotonic()
+    result = scout.run_scout(tmp_path / "bundle.md", reports, deadline=0.5)
+    assert time.monotonic() - start < 1.2
+    assert result.missing == ["Tony"]
+    assert "Reports not available in time: Tony" in synth[0]
+    assert json.loads((reports / "latency.json").read_text(encoding="utf-8"))["late"] == ["Tony"]
+    # the straggler still lands its report afterwards
+    for t in [t for t in threading.enumerate() if t.name.startswith("scout")]:
+        t.join(timeout=5)
+    assert (reports / "Tony.md").exists()
+
+
+def test_workers_bound_parallelism(reports: Path, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    live = peak = 0
+    lock = threading.Lock()
+
+    def generate(instruction, suggested_files=None, context_file=None, timeout=240, agent=None):
+        nonlocal live, peak
+        if agent != "Moroni":
+            with lock:
+                live += 1
+                peak = max(peak, live)
+            time.sleep(0.1)
+            with lock:
+                live -= 1
+        return None
+
+    monkeypatch.setattr(codex_exec, "generate_files", generate)
+    result = scout.run_scout(tmp_path / "bundle.md", reports, workers=2)
+    assert peak == 2
+    assert result.missing == ["Q", "Edna", "Mario", "Tony"] and result.synthesis is None
+
+
+def test_queued_audits_still_run_after_deadline(reports: Path, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    seen: list[tuple[str, float]] = []
+    synth: list[str] = []
+    monkeypatch.setattr(codex_exec, "generate_files", _fake({a: 0.3 for a in ("Q", "Edna", "Mario", "Tony")}, seen, synth))
+    result = scout.run_scout(tmp_path / "bundle.md", reports, workers=1, deadline=0.5)
+    assert result.missing == ["Edna", "Mario", "Tony"]
+    for t in [t for t in threading.enumerate() if t.name.startswith("scout")]:
+        t.join(timeout=5)
+    # Audits still queued at the deadline were not cancelled
+    assert all((reports / f"{a}.md").exists() for a in ("Q", "Edna", "Mario", "Tony"))
@@ -16,6 +16,9 @@ from pathlib import Path
 
 import pytest
 
+from ocean.runtime import ProductState
+from ocean.runtime.inbox import list_archive, list_pending
+
 REPO = Path(__file__).resolve().parents[1]
 
 _REQUIRED_TASK_KEYS = frozenset({"title", "description", "owner", "files_touched"})
@@ -126,9 +129,8 @@ def test_ingest_status_cycle_writes_artifacts_and_state(mini_project: Path) -> N
 
     r1 = run(["ingest", note])
     assert r1.returncode == 0, _blob(r1)
-    pending_dir = mini_project / ".ocean" / "inbox" / "pending"
-    assert pending_dir.is_dir()
-    assert list(pending_dir.glob("msg-*.json")), "ingest should create a pending JSON file"
+    pending = list_pending(mini_project)
+    assert [m["text"] for m in pending] == [note], "ingest should add a pending inbox message"
 
     r2 = run(["status"])
     assert r2.returncode == 0, _blob(r2)
@@ -139,23 +141,20 @@ def test_ingest_status_cycle_writes_artifacts_and_state(mini_project: Path) -> N
 
     _assert_backlog_and_plan(mini_project / "docs")
 
-    archived = list((mini_project / ".ocean" / "inbox" / "archive").glob("msg-*.json"))
-    assert archived, "consumed inbox message should be under .ocean/inbox/archive"
-    arc_data = json.loads(archived[-1].read_text(encoding="utf-8"))
-    assert arc_data.get("consumed") is True
-    assert arc_data.get("text") == note
-
-    state_path = mini_project / ".ocean" / "product_state.json"
-    assert state_path.is_file()
-    st = json.loads(state_path.read_text(encoding="utf-8"))
-    assert st.get("cycle_count") == 1
-    assert st.get("last_cycle_at")
-    assert st.get("tokens_used_last_cycle", 0) > 0
-    log = st.get("decision_log") or []
-    actors = {e.get("actor") for e in log if isinstance(e, dict)}
+    assert not list_pending(mini_project)
+    archived = list_archive(mini_project)
+    assert archived, "consumed inbox message should be archived"
+    assert archived[-1].get("consumed") is True
+    assert archived[-1].get("text") == note
+
+    st = ProductState.load(mini_project / ".ocean")
+    assert st.cycle_count == 1
+    assert st.last_cycle_at
+    assert st.tokens_used_last_cycle > 0
+    actors = {e.get("actor") for e in st.decision_log}
     assert "You" in actors
     assert "system" in actors
-    notes = st.get("user_notes") or []
+    notes = st.user_notes
     assert any(note in n for n in notes)
 
     r4 = run(["status"])
@@ -0,0 +1,114 @@
+"""Dependency-aware backlog scheduler."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from ocean.models import ProjectSpec, Task
+from ocean.planner import generate_backlog
+from ocean.task_graph import TaskScheduler, batch_groups, build_dependencies, critical_path, merge_tasks
+
+
+def _t(title: str, owner: str, out: list[str], inputs: list[str] | None = None) -> Task:
+    return Task(title=title, description="", owner=owner, files_touched=out, inputs=inputs or [])
+
+
+def test_dependencies_from_inputs_outputs_and_owner() -> None:
+    tasks = [
+        _t("arch", "Moroni", ["docs/architecture.md"]),
+        _t("backend", "Q", ["backend/app.py"], ["docs/architecture.md"]),
+        _t("ui", "Edna", ["ui/index.html"], ["docs/architecture.md"]),
+        _t("ci", "Mario", [".github/workflows/ci.yml"]),
+        _t("docker", "Mario", ["Dockerfile"], ["backend/*"]),
+        _t("tests", "Tony", ["docs/test_report.md"], ["*"]),
+    ]
+    deps = build_dependencies(tasks)
+    assert deps[1] == {0} and deps[2] == {0}
+    assert deps[3] == set()  # CI is independent of the rest
+    assert deps[4] == {1, 3}  # reads backend/*, same owner as ci
+    assert deps[5] == {0, 1, 2, 3, 4}
+
+
+def test_default_web_backlog_runs_q_and_edna_in_parallel() -> None:
+    backlog = generate_backlog(ProjectSpec(name="X", kind="web"))
+    deps = build_dependencies(backlog)
+    idx = {t.title: i for i, t in enumerate(backlog)}
+    q, edna = idx["Create web backend"], idx["Create web interface design"]
+    assert q not in deps[edna] and edna not in deps[q]
+    assert len(critical_path(backlog)) < len(backlog)
+
+
+def test_scheduler_overlaps_independent_tasks_and_respects_limits(monkeypatch) -> None:
+    monkeypatch.setenv("OCEAN_CONCURRENCY_CODEX", "2")
+    tasks = [_t(f"t{i}", f"A{i}", [f"f{i}"]) for i in range(4)]
+    live = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def run(task: Task) -> list[Task]:
+        nonlocal live, peak
+        with lock:
+            live += 1
+            peak = max(peak, live)
+        time.sleep(0.05)
+        with lock:
+            live -= 1
+        return [task]
+
+    out = TaskScheduler(run, backend_for=lambda t: "codex", workers=4).run(tasks)
+    assert [t.title for t in out] == ["t0", "t1", "t2", "t3"]
+    assert peak == 2
+
+
+def test_scheduler_orders_dependent_tasks_and_reraises() -> None:
+    order: list[str] = []
+    tasks = [
+        _t("first", "A", ["a.txt"]),
+        _t("second", "B", ["b.txt"], ["a.txt"]),
+        _t("boom", "C", ["c.txt"], ["b.txt"]),
+        _t("after", "D", ["d.txt"], ["c.txt"]),
+    ]
+
+    def run(task: Task) -> list[Task]:
+        order.append(task.title)
+        if task.title == "boom":
+            raise RuntimeError("codegen failed")
+        return [task]
+
+    with pytest.raises(RuntimeError):
+        TaskScheduler(run, workers=4).run(tasks)
+    assert order == ["first", "second", "boom"]
+
+
+def test_batch_groups_merge_an_owners_codegen_tasks() -> None:
+    tasks = [
+        _t("backend", "Q", ["backend/app.py"]),
+        _t("context", "Mario", ["docs/context_summary.md"]),
+        _t("ci", "Mario", [".github/workflows/ci.yml"]),
+        _t("docker", "Mario", ["Dockerfile"], ["backend/*"]),
+        _t("deploy", "Mario", ["devops/deploy.yaml"], ["Dockerfile"]),
+        _t("runtime", "Mario", [], ["backend/*"]),
+        _t("tests", "Tony", ["docs/test_report.md"], ["*"]),
+    ]
+    codegen = {"ci", "docker", "deploy"}
+    assert batch_groups(tasks, lambda t: t.title in codegen) == [[0], [1], [2, 3, 4], [5], [6]]
+    merged = merge_tasks([tasks[i] for i in (2, 3, 4)])
+    assert merged.title == "ci + docker + deploy"
+    assert merged.files_touched == [".github/workflows/ci.yml", "Dockerfile", "devops/deploy.yaml"]
+    assert merged.inputs == ["backend/*"]  # deploy's read of Dockerfile is satisfied in-batch
+
+
+def test_batch_groups_stop_at_conflicting_tasks_in_between() -> None:
+    tasks = [
+        _t("a", "Q", ["backend/app.py"]),
+        _t("ui", "Edna", ["ui/index.html"], ["backend/app.py"]),
+        _t("b", "Q", ["backend/models.py"], ["ui/*"]),
+        _t("c", "Q", ["backend/extra.py"]),
+        _t("tests", "Tony", [], ["*"]),
+        _t("d", "Q", ["backend/late.py"]),
+    ]
+    groups = batch_groups(tasks, lambda t: t.owner == "Q")
+    assert groups == [[0], [1], [2, 3], [4], [5]]
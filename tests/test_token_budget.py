@@ -13,7 +13,7 @@ def test_note_and_usage_recent(tmp_path: Path, monkeypatch) -> None:
     monkeypatch.chdir(tmp_path)
     token_budget.note_usage(100, cwd=tmp_path)
     token_budget.note_usage(50, cwd=tmp_path)
-    assert token_budget.usage_recent(token_budget._ledger_path(tmp_path)) == 150
+    assert token_budget.usage_recent(cwd=tmp_path) == 150
 
 
 def test_budget_cap_from_env(tmp_path: Path, monkeypatch) -> None:
@@ -32,3 +32,62 @@ def test_prune_old_events(tmp_path: Path, monkeypatch) -> None:
         encoding="utf-8",
     )
     assert token_budget.usage_recent(p) == 1
+
+
+def test_ledger_lives_in_runtime_store(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    p = token_budget._ledger_path(tmp_path)
+    token_budget.note_usage(10, cwd=tmp_path)
+    token_budget.note_usage(5, cwd=tmp_path)
+    assert not p.exists()
+    assert (tmp_path / ".ocean" / "runtime.sqlite").is_file()
+    assert token_budget.usage_recent(p) == 15
+    assert token_budget.usage_recent(p, window_s=0) == 0
+
+
+def test_legacy_ledger_is_migrated(tmp_path: Path) -> None:
+    legacy = tmp_path / ".ocean" / "token_ledger.json"
+    legacy.parent.mkdir(parents=True)
+    legacy.write_text(json.dumps({"events": [{"t": time.time(), "n": 42}]}, indent=2), encoding="utf-8")
+    assert token_budget.usage_recent(cwd=tmp_path) == 42
+    assert not legacy.exists()
+
+
+def test_legacy_jsonl_is_folded_in_without_expired_events(tmp_path: Path) -> None:
+    p = token_budget._ledger_path(tmp_path)
+    p.write_text(
+        "".join(json.dumps({"t": time.time() - 7200, "n": 1}) + "\n" for _ in range(20)),
+        encoding="utf-8",
+    )
+    token_budget.note_usage(7, cwd=tmp_path)
+    assert not p.exists()
+    assert token_budget.usage_recent(p) == 7
+
+
+def test_seconds_until_under(tmp_path: Path) -> None:
+    p = token_budget._ledger_path(tmp_path)
+    now = time.time()
+    p.write_text(
+        json.dumps({"t": now - 3000, "n": 60}) + "\n" + json.dumps({"t": now - 10, "n": 50}) + "\n",
+        encoding="utf-8",
+    )
+    assert token_budget.seconds_until_under(200, cwd=tmp_path) == 0.0
+    wait = token_budget.seconds_until_under(100, cwd=tmp_path)
+    assert 590 <= wait <= 610
+
+
+def _append_many(root: str) -> None:
+    for _ in range(50):
+        token_budget.note_usage(1, cwd=Path(root))
+
+
+def test_concurrent_writers_do_not_lose_events(tmp_path: Path, monkeypatch) -> None:
+    import multiprocessing as mp
+
+    ctx = mp.get_context("fork")
+    procs = [ctx.Process(target=_append_many, args=(str(tmp_path),)) for _ in range(4)]
+    for pr in procs:
+        pr.start()
+    for pr in procs:
+        pr.join(30)
+    assert token_budget.usage_recent(cwd=tmp_path) == 200
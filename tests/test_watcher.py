@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from ocean import watcher
+
+
+@pytest.fixture(params=["inotify", "poll"])
+def make_watcher(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch):
+    if request.param == "inotify" and not sys.platform.startswith("linux"):
+        pytest.skip("inotify is Linux-only")
+    monkeypatch.setenv("OCEAN_WATCHER", request.param)
+    monkeypatch.setenv("OCEAN_WATCH_POLL", "0.05")
+    made: list[watcher.Watcher] = []
+
+    def make(targets):
+        w = watcher.watch(targets)
+        made.append(w)
+        assert w.backend == request.param
+        return w
+
+    yield make
+    for w in made:
+        w.close()
+
+
+def _later(delay: float, fn) -> None:
+    threading.Timer(delay, fn).start()
+
+
+def test_wait_times_out_without_changes(tmp_path: Path, make_watcher) -> None:
+    w = make_watcher([tmp_path / "prd.md"])
+    start = time.monotonic()
+    assert w.wait(timeout=0.2) == []
+    assert time.monotonic() - start >= 0.15
+
+
+def test_wakes_on_creation_of_missing_file(tmp_path: Path, make_watcher) -> None:
+    target = tmp_path / "prd.md"
+    w = make_watcher([target])
+    _later(0.1, lambda: target.write_text("# PRD\n", encoding="utf-8"))
+    assert w.wait(timeout=5) == [target]
+
+
+def test_ignores_unrelated_files_and_matches_patterns(tmp_path: Path, make_watcher) -> None:
+    w = make_watcher([tmp_path / "events-*.jsonl"])
+    _later(0.05, lambda: (tmp_path / "notes.txt").write_text("x", encoding="utf-8"))
+    _later(0.3, lambda: (tmp_path / "events-1.jsonl").write_text("{}\n", encoding="utf-8"))
+    assert w.wait(timeout=5) == [tmp_path / "events-1.jsonl"]
+
+
+def test_directory_target_reports_any_child(tmp_path: Path, make_watcher) -> None:
+    w = make_watcher([tmp_path])
+    _later(0.1, lambda: (tmp_path / "a.txt").write_text("x", encoding="utf-8"))
+    assert w.wait(timeout=5) == [tmp_path / "a.txt"]
+
+
+def test_missing_parent_falls_back_to_polling(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("OCEAN_WATCHER", raising=False)
+    with watcher.watch([tmp_path / "nope" / "file"]) as w:
+        assert w.backend == "poll"
+
+
+def test_loop_wait_returns_on_continue_signal(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from ocean import cli
+
+    monkeypatch.setattr(cli, "LOGS", tmp_path / "logs")
+    monkeypatch.setattr(cli, "DOCS", tmp_path / "docs")
+    monkeypatch.delenv("OCEAN_EVENTS_FILE", raising=False)
+    assert cli._wait_for_continue_or_change(cli._spec_paths(), timeout=1) is False
+    _later(0.1, lambda: (tmp_path / "logs" / "continue").touch())
+    start = time.monotonic()
+    assert cli._wait_for_continue_or_change(cli._spec_paths(), timeout=10) is True
+    assert time.monotonic() - start < 5
+    assert not (tmp_path / "logs" / "continue").exists()
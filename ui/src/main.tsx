@@ -9,7 +9,17 @@ import {
   Send,
 } from "lucide-react";
 import "../styles.css";
-import type { AppState, ChatEntry, FileItem, Job, TeamMessage } from "./types";
+import type {
+  ActivityEvent,
+  Actor,
+  AppState,
+  ChatEntry,
+  ChatPage,
+  FileItem,
+  Job,
+  StateDelta,
+  TeamMessage,
+} from "./types";
 
 declare global {
   interface Window {
@@ -80,6 +90,9 @@ function App() {
   const [busy, setBusy] = useState(false);
   const [error, setError] = useState("");
   const [healthy, setHealthy] = useState(false);
+  const [streamRoot, setStreamRoot] = useState("");
+  const [activity, setActivity] = useState<ActivityEvent[]>([]);
+  const [chatBefore, setChatBefore] = useState<string | null>(null);
 
   async function refresh(root = projectRoot) {
     setBusy(true);
@@ -89,12 +102,14 @@ function App() {
         fetch(apiUrl("/healthz")).then((response) => response.ok).catch(() => false),
         apiGet<AppState>("/api/state", { project_root: root }),
         apiGet<{ files: FileItem[] }>("/api/files", { project_root: root }),
-        apiGet<{ messages: ChatEntry[] }>("/api/chat", { project_root: root }),
+        apiGet<ChatPage>("/api/chat", { project_root: root }),
       ]);
       setHealthy(health);
       setState(nextState);
       setFiles(fileResult.files);
       setChat(history.messages);
+      setChatBefore(history.next_before);
+      setStreamRoot(nextState.project_root);
     } catch (err) {
       setHealthy(false);
       setError(err instanceof Error ? err.message : String(err));
@@ -107,6 +122,58 @@ function App() {
     void refresh();
   }, []);
 
+  // Live deltas instead of re-polling snapshots; EventSource resends Last-Event-ID on reconnect.
+  useEffect(() => {
+    if (!streamRoot) {
+      return;
+    }
+    setActivity([]);
+    const query = new URLSearchParams({ project_root: streamRoot }).toString();
+    const source = new EventSource(apiUrl(`/api/events/stream?${query}`));
+    source.addEventListener("state", (event) => {
+      setState((current) => applyStateDelta(current, streamRoot, JSON.parse((event as MessageEvent).data)));
+    });
+    source.addEventListener("actors", (event) => {
+      const data = JSON.parse((event as MessageEvent).data) as { actors: Actor[] };
+      setState((current) => (current ? { ...current, actors: data.actors } : current));
+    });
+    source.addEventListener("chat", (event) => {
+      const entry = JSON.parse((event as MessageEvent).data) as ChatEntry;
+      setChat((items) =>
+        items.some((item) => item.ts === entry.ts && item.message === entry.message) ? items : [...items, entry],
+      );
+    });
+    source.addEventListener("event", (event) => {
+      const entry = JSON.parse((event as MessageEvent).data) as ActivityEvent;
+      setActivity((items) => [...items, entry].slice(-100));
+    });
+    source.onopen = () => setHealthy(true);
+    source.onerror = () => setHealthy(source.readyState === EventSource.OPEN);
+    return () => source.close();
+  }, [streamRoot]);
+
+  async function loadEarlierChat() {
+    if (!chatBefore) {
+      return;
+    }
+    try {
+      const older = await apiGet<ChatPage>("/api/chat", { project_root: projectRoot, before: chatBefore });
+      setChat((items) => [...older.messages, ...items]);
+      setChatBefore(older.next_before);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : String(err));
+    }
+  }
+
+  async function refreshFiles(root = projectRoot) {
+    try {
+      const fileResult = await apiGet<{ files: FileItem[] }>("/api/files", { project_root: root });
+      setFiles(fileResult.files);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : String(err));
+    }
+  }
+
   const visibleFiles = useMemo(() => {
     const term = filter.trim().toLowerCase();
     if (!term) {
@@ -151,7 +218,8 @@ function App() {
       setMessage("");
       setScreenshots([]);
       setTestNotes("");
-      await refresh(projectRoot);
+      // Actors, doctrine and chat arrive over the event stream; only the file list is re-read
+      await refreshFiles(projectRoot);
     } catch (err) {
       setError(err instanceof Error ? err.message : String(err));
     } finally {
@@ -217,6 +285,26 @@ function App() {
           </div>
         </section>
 
+        <section className="side-section activity-section">
+          <div className="section-head">
+            <h2>Activity</h2>
+            <span>{activity.length}</span>
+          </div>
+          <div className="activity-list">
+            {activity.length === 0 ? <div className="empty">No agent activity yet.</div> : null}
+            {activity
+              .slice(-20)
+              .reverse()
+              .map((item, index) => (
+                <div className="activity-row" key={`${item.seq ?? item.ts}-${index}`}>
+                  <strong>{item.agent || "Ocean"}</strong>
+                  <span>{item.title || item.event}</span>
+                  <small>{formatDate(item.ts)}</small>
+                </div>
+              ))}
+          </div>
+        </section>
+
         <section className="side-section files-section">
           <div className="section-head">
             <h2>Files</h2>
@@ -260,6 +348,11 @@ function App() {
             <span>Chat first</span>
             <p>Send a product signal, screenshot, or test note. Ocean will capture it, rank the next move, and hand Cursor a job.</p>
           </div>
+          {chatBefore ? (
+            <button className="secondary" onClick={() => void loadEarlierChat()} type="button">
+              Load earlier messages
+            </button>
+          ) : null}
           {chat.length === 0 ? <div className="empty">No conversation yet.</div> : null}
           {chat.map((entry, index) => (
             <ChatMessage
@@ -466,6 +559,29 @@ function formatBytes(size: number): string {
   return `${(size / 1024 / 1024).toFixed(1)} MB`;
 }
 
+function applyStateDelta(current: AppState | null, root: string, delta: StateDelta): AppState | null {
+  if (delta.full) {
+    return {
+      ...(current || {}),
+      project_root: root,
+      actors: delta.actors || [],
+      doctrine: (delta.doctrine || {}) as Record<string, string>,
+    };
+  }
+  if (!current) {
+    return current;
+  }
+  const doctrine = { ...current.doctrine };
+  for (const [name, content] of Object.entries(delta.doctrine || {})) {
+    if (content === null) {
+      delete doctrine[name];
+    } else {
+      doctrine[name] = content;
+    }
+  }
+  return { ...current, doctrine, actors: delta.actors || current.actors };
+}
+
 function formatDate(value: string): string {
   const date = new Date(value);
   return Number.isNaN(date.getTime()) ? value : date.toLocaleString();
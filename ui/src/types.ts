@@ -49,6 +49,11 @@ export type ChatEntry = {
   job_plan?: { jobs: Job[] };
 };
 
+export type ChatPage = {
+  messages: ChatEntry[];
+  next_before: string | null;
+};
+
 export type SetupProfile = {
   project_root: string;
   github_url: string;
@@ -59,6 +64,21 @@ export type SetupProfile = {
   saved: boolean;
 };
 
+export type ActivityEvent = {
+  event: string;
+  ts: string;
+  seq?: number;
+  agent?: string;
+  title?: string;
+  [key: string]: unknown;
+};
+
+export type StateDelta = {
+  full: boolean;
+  actors?: Actor[];
+  doctrine?: Record<string, string | null>;
+};
+
 export type AppState = {
   project_root: string;
   actors: Actor[];